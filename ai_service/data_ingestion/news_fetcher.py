@@ -8,7 +8,6 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 import time
 from urllib.parse import urlparse
-import yaml
 from pathlib import Path
 import sys
 
@@ -25,6 +24,32 @@ except ImportError as e:
     logger.error(f"Settings modülü import edilemedi: {e}")
     raise ImportError(f"Settings modülü bulunamadı. Hata: {e}")
 
+from utils.rule_store import RuleStore, get_rule_store
+
+# Kural dosyası yüklenemediğinde kullanılan varsayılan kurallar
+DEFAULT_FETCHING_RULES = {
+    "finnhub": {"market_news": {"categories": ["general"]}},
+    "newsdata": {
+        "category_queries": [{"category": "business", "keywords": ["market"]}],
+        "general_keyword_sweep": {"keywords": ["stock market", "inflation"]}
+    }
+}
+
+
+def compile_fetching_rules(rules_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    fetching_rules.yaml içeriğini doğrular ve döndürür (RuleStore derleyicisi).
+    
+    Args:
+        rules_data: fetching_rules.yaml içeriği
+        
+    Returns:
+        Dict[str, Any]: Çekme kuralları
+    """
+    if not isinstance(rules_data, dict) or not ({"finnhub", "newsdata"} & set(rules_data)):
+        raise ValueError("fetching_rules.yaml 'finnhub' veya 'newsdata' bölümü içermiyor")
+    return rules_data
+
 class NewsFetcher:
     """
     Kural tabanlı hibrit NewsFetcher modülü.
@@ -38,7 +63,8 @@ class NewsFetcher:
             newsdata_api_key: Optional[str] = None,
             finnhub_api_key: Optional[str] = None,
             language: str = "en",
-            countries: List[str] = None
+            countries: List[str] = None,
+            rule_store: Optional[RuleStore] = None
         ):
         """
         NewsFetcher sınıfı başlatıcısı.
@@ -48,6 +74,7 @@ class NewsFetcher:
             finnhub_api_key: Finnhub API anahtarı (opsiyonel, verilmezse settings'ten alınır)
             language: Haberlerin dili (varsayılan "en" - İngilizce)
             countries: Ülke kodları (us, gb, vb.)
+            rule_store: Çekme kurallarını sağlayan RuleStore. None ise paylaşılan depo kullanılır.
         """
         # API anahtarlarını al - önce parametre olarak verilenleri kontrol et, yoksa settings'ten al
         self.newsdata_api_key = newsdata_api_key or settings.NEWSDATA_API_KEY
@@ -65,21 +92,19 @@ class NewsFetcher:
         self.newsdata_base_url = "https://newsdata.io/api/1/news"
         self.finnhub_base_url = "https://finnhub.io/api/v1/news"
         
-        # Kural dosyasını yükle
-        rules_path = Path(__file__).parent.parent / "rules" / "fetching_rules.yaml"
-        try:
-            with open(rules_path, 'r') as file:
-                self.rules = yaml.safe_load(file)
-            logger.info(f"Kural dosyası başarıyla yüklendi: {rules_path}")
-        except Exception as e:
-            logger.error(f"Kural dosyası yüklenirken hata: {e}")
-            self.rules = {
-                "finnhub": {"market_news": {"categories": ["general"]}},
-                "newsdata": {
-                    "category_queries": [{"category": "business", "keywords": ["market"]}],
-                    "general_keyword_sweep": {"keywords": ["stock market", "inflation"]}
-                }
-            }
+        # Kural dosyasını yükle (dosya değiştiğinde RuleStore yeni sürümü kendiliğinden yükler)
+        self.rules_path = str(Path(__file__).parent.parent / "rules" / "fetching_rules.yaml")
+        self.rule_store = rule_store or get_rule_store()
+        if self.rule_store.get(self.rules_path, compile_fetching_rules) is not None:
+            logger.info(f"Kural dosyası başarıyla yüklendi: {self.rules_path}")
+        else:
+            logger.error(f"Kural dosyası yüklenemedi, varsayılan kurallar kullanılacak: {self.rules_path}")
+    
+    @property
+    def rules(self) -> Dict[str, Any]:
+        """Güncel çekme kuralları (yüklenemezse varsayılan kurallar)."""
+        rules = self.rule_store.get(self.rules_path, compile_fetching_rules)
+        return rules if rules is not None else DEFAULT_FETCHING_RULES
     
     def fetch_from_newsdata(self, category: Optional[str] = None, q: Optional[str] = None, days_back: int = 1, max_results: int = 100) -> List[Dict[str, Any]]:
         """
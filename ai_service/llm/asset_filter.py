@@ -8,15 +8,18 @@ ve gerçekten etkilenebilecek enstrümanları belirleyen LLMAssetFilter sınıf
 import os
 import json
 import logging
+import concurrent.futures
 from typing import Dict, List, Any, Optional
 
-from pydantic import BaseModel, Field, ValidationError
+from pydantic import BaseModel, Field, RootModel, ValidationError
 from typing import List, Literal
 
 from ..core.llm_client import LLMClient
 from ..core.config import settings
+from ..core.rate_limiter import estimate_tokens, CHARS_PER_TOKEN
 # Mutlak import yolunu kullanarak modul yapisi sorununu cozume
 from ai_service.src.llm.parser import LLMOutputParser
+from .response_cache import get_llm_response_cache
 
 # Logger yapılandırması
 logger = logging.getLogger(__name__)
@@ -29,9 +32,19 @@ class AffectedAsset(BaseModel):
     impact: Literal["positive", "negative", "neutral"]
 
 
-class AssetImpactResponse(BaseModel):
+class AssetImpactResponse(RootModel[List[AffectedAsset]]):
     """LLM'den dönen etkilenen finansal enstrümanlar listesini temsil eder."""
-    __root__: List[AffectedAsset]
+
+
+class ArticleAssetImpact(BaseModel):
+    """Toplu analizde tek bir haberin sonucunu temsil eder."""
+    news_id: int
+    affected_assets: List[AffectedAsset] = Field(default_factory=list)
+
+
+class BatchAssetImpactResponse(BaseModel):
+    """Toplu analizde LLM'den dönen haber bazlı sonuç listesini temsil eder."""
+    results: List[ArticleAssetImpact]
 
 
 class LLMAssetFilter:
@@ -40,6 +53,10 @@ class LLMAssetFilter:
     
     Bu sınıf, AssetMapper tarafından belirlenen aday enstrüman listesini alır, 
     haberin içeriğini analiz eder ve gerçekten etkilenebilecek finansal enstrümanları belirler.
+    
+    filter_assets_batch ile birden fazla haber tek bir LLM çağrısında analiz edilebilir;
+    haberler prompt token bütçesine sığacak şekilde gruplanır ve ayrıştırılamayan yanıtlarda
+    grup ikiye bölünerek tekrar denenir (en fazla ASSET_FILTER_MAX_RETRY_DEPTH kez).
     """
 
     def __init__(self, prompt_path: str = None):
@@ -55,6 +72,9 @@ class LLMAssetFilter:
         # LLM istemcisini başlat
         self.llm_client = LLMClient()
         
+        # Paylaşılan LLM yanıt önbelleği
+        self.response_cache = get_llm_response_cache()
+        
         # Eğer özel bir dosya yolu belirtilmemişse varsayılan konumu kullan
         if not prompt_path:
             base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -86,6 +106,19 @@ class LLMAssetFilter:
                 Yalnızca haberin içeriğiyle doğrudan ilişkili finansal enstrümanları dahil et.
             """
             logger.warning("Varsayılan prompt şablonu kullanılıyor")
+            
+        # Toplu analiz prompt şablonunu yükle
+        batch_prompt_path = os.path.join(os.path.dirname(prompt_path), "ASSET_IMPACT_ANALYSIS_BATCH_V1.0.txt")
+        try:
+            with open(batch_prompt_path, 'r', encoding='utf-8') as file:
+                self.batch_prompt_template = file.read()
+            logger.info("Toplu analiz prompt şablonu başarıyla yüklendi")
+        except Exception as e:
+            logger.error(f"Toplu analiz prompt şablonu yüklenirken hata, haberler tek tek analiz edilecek: {e}")
+            self.batch_prompt_template = None
+            
+        # Başarısız toplu yanıtlardan sonra küçültülen batch boyutu üst sınırı
+        self.max_batch_items = settings.ASSET_FILTER_BATCH_MAX_ITEMS
 
     def filter_assets(self, text: str, candidate_assets: List[str]) -> List[Dict[str, Any]]:
         """
@@ -112,8 +145,15 @@ class LLMAssetFilter:
             
             logger.info(f"LLM isteği gönderiliyor: {len(candidate_assets)} aday enstrüman ile")
             
-            # LLM isteği
-            response = self.llm_client.generate_text(prompt)
+            # LLM isteği (önbellekte yoksa)
+            response = self.response_cache.get_or_generate(
+                task_type="asset_impact_analysis",
+                prompt_version="V1.0",
+                model_name=settings.GEMINI_MODEL_NAME,
+                prompt=prompt,
+                generate=lambda: self.llm_client.generate_text(prompt),
+                validator=lambda text: LLMOutputParser.extract_json_from_response(text) is not None
+            )
             
             if not response:
                 logger.error("LLM yanıt vermedi")
@@ -132,8 +172,8 @@ class LLMAssetFilter:
                 
                 # Pydantic model ile doğrulama
                 try:
-                    validated_response = AssetImpactResponse(__root__=raw_result)
-                    affected_assets_info = validated_response.__root__
+                    validated_response = AssetImpactResponse(raw_result)
+                    affected_assets_info = validated_response.root
                     
                     # Etkilenen varlıkların adlarını loglamak için
                     affected_assets = [item.asset for item in affected_assets_info]
@@ -141,7 +181,7 @@ class LLMAssetFilter:
                     logger.info(f"Filtreleme sonucu {len(affected_assets)} finansal enstrüman belirlendi: {', '.join(affected_assets)}")
                     
                     # Sözlük formatına dönüştürerek döndür
-                    return [item.dict() for item in affected_assets_info]
+                    return [item.model_dump() for item in affected_assets_info]
                 
                 except ValidationError as ve:
                     logger.error(f"Yanıt doğrulama hatası: {ve}")
@@ -154,5 +194,186 @@ class LLMAssetFilter:
         except Exception as e:
             logger.error(f"Varlık filtreleme sırasında hata oluştu: {e}")
             return []
-    
 
+    def filter_assets_batch(self, items: List[Dict[str, Any]]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Birden fazla haberin aday enstrümanlarını az sayıda LLM çağrısıyla filtreler.
+        
+        Haber metinleri ASSET_FILTER_TEXT_MAX_TOKENS token'a kısaltılır ve haberler, prompt
+        ASSET_FILTER_MAX_PROMPT_TOKENS bütçesini ve batch boyutu sınırını aşmayacak şekilde
+        gruplanır. Gruplar eşzamanlı olarak (ortak hız sınırlayıcısı altında) işlenir.
+        
+        Args:
+            items: Her biri 'id', 'text' ve 'candidate_assets' alanlarını içeren haber listesi
+            
+        Returns:
+            Dict[int, List[Dict[str, Any]]]: Haber ID'si -> filter_assets formatında etkilenen enstrümanlar
+        """
+        items = [item for item in items if item.get("text") and item.get("candidate_assets")]
+        if not items:
+            return {}
+            
+        if not self.batch_prompt_template:
+            return {item["id"]: self.filter_assets(item["text"], item["candidate_assets"]) for item in items}
+        
+        batches = self._pack_batches(items)
+        logger.info(f"{len(items)} haber için varlık filtreleme {len(batches)} LLM çağrısına bölündü")
+        
+        results: Dict[int, List[Dict[str, Any]]] = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, settings.ASSET_FILTER_MAX_CONCURRENCY)) as executor:
+            for batch_result in executor.map(self._filter_batch, batches):
+                results.update(batch_result)
+        
+        return results
+    
+    def _article_block(self, item: Dict[str, Any]) -> str:
+        """Tek bir haberin prompt içindeki bölümünü oluşturur (metin token bütçesine göre kısaltılır)."""
+        text = item["text"][:settings.ASSET_FILTER_TEXT_MAX_TOKENS * CHARS_PER_TOKEN]
+        return (
+            f"### HABER news_id={item['id']}\n"
+            f"Potansiyel finansal enstrümanlar: {', '.join(item['candidate_assets'])}\n"
+            f"Haber metni: {text}\n"
+        )
+    
+    def _pack_batches(self, items: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Haberleri prompt token bütçesine ve batch boyutu sınırına göre gruplar.
+        
+        Args:
+            items: Filtrelenecek haberler
+            
+        Returns:
+            List[List[Dict[str, Any]]]: Haber grupları
+        """
+        budget = settings.ASSET_FILTER_MAX_PROMPT_TOKENS - estimate_tokens(self.batch_prompt_template)
+        max_items = max(1, self.max_batch_items)
+        
+        batches = []
+        current = []
+        current_tokens = 0
+        for item in items:
+            item_tokens = estimate_tokens(self._article_block(item))
+            if current and (len(current) >= max_items or current_tokens + item_tokens > budget):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(item)
+            current_tokens += item_tokens
+        if current:
+            batches.append(current)
+        return batches
+    
+    def _filter_batch(self, batch: List[Dict[str, Any]], depth: int = 0) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Bir haber grubunu tek LLM çağrısıyla filtreler.
+        
+        Yanıt ayrıştırılamazsa veya gruptaki hiçbir haberi içermiyorsa (ör. bağlam penceresi
+        aşıldı, çıktı kesildi) grup ikiye bölünerek tekrar denenir ve sonraki gruplar için batch
+        boyutu üst sınırı düşürülür. Yanıtta eksik kalan haberler ayrıca işlenir. Her yeniden
+        deneme daha küçük bir grupla yapılır; tek habere veya ASSET_FILTER_MAX_RETRY_DEPTH
+        derinliğine inildiğinde haberler filter_assets ile tek tek analiz edilir.
+        
+        Args:
+            batch: Haber grubu
+            depth: Yeniden deneme derinliği
+            
+        Returns:
+            Dict[int, List[Dict[str, Any]]]: Haber ID'si -> etkilenen enstrümanlar
+        """
+        if len(batch) == 1 or depth >= settings.ASSET_FILTER_MAX_RETRY_DEPTH:
+            if len(batch) > 1:
+                logger.warning(f"Yeniden deneme sınırına ulaşıldı, {len(batch)} haber tek tek analiz ediliyor")
+            return {item["id"]: self.filter_assets(item["text"], item["candidate_assets"]) for item in batch}
+        
+        results = self._request_batch(batch)
+        if results is None:
+            self.max_batch_items = max(1, min(self.max_batch_items, len(batch) // 2))
+            logger.warning(f"{len(batch)} haberlik toplu yanıt işlenemedi, grup ikiye bölünüyor "
+                           f"(yeni batch üst sınırı: {self.max_batch_items})")
+            middle = len(batch) // 2
+            return {**self._filter_batch(batch[:middle], depth + 1), **self._filter_batch(batch[middle:], depth + 1)}
+        
+        # Yanıtta eksik kalan haberleri ayrıca işle (results boş değil, eksik grup daha küçük)
+        missing = [item for item in batch if item["id"] not in results]
+        if missing:
+            logger.warning(f"Toplu yanıtta {len(missing)} haber eksik, yeniden işleniyor")
+            results.update(self._filter_batch(missing, depth + 1))
+        
+        return results
+    
+    def _request_batch(self, batch: List[Dict[str, Any]]) -> Optional[Dict[int, List[Dict[str, Any]]]]:
+        """
+        Toplu prompt'u gönderir ve yanıtı haber bazında doğrular.
+        
+        Args:
+            batch: Haber grubu
+            
+        Returns:
+            Optional[Dict[int, List[Dict[str, Any]]]]: Haber ID'si -> etkilenen enstrümanlar
+                veya yanıt alınamadı/ayrıştırılamadı ya da gruptaki hiçbir haberi içermiyorsa None
+        """
+        prompt = self.batch_prompt_template.format(
+            articles="\n".join(self._article_block(item) for item in batch)
+        )
+        batch_ids = {item["id"] for item in batch}
+        
+        try:
+            logger.info(f"Toplu LLM isteği gönderiliyor: {len(batch)} haber")
+            response = self.response_cache.get_or_generate(
+                task_type="asset_impact_analysis_batch",
+                prompt_version="V1.0",
+                model_name=settings.GEMINI_MODEL_NAME,
+                prompt=prompt,
+                generate=lambda: self.llm_client.generate_text(prompt),
+                # Yalnızca gruptaki haberleri eksiksiz kapsayan yanıtlar önbelleğe yazılır/okunur
+                validator=lambda text: self._response_news_ids(text) == batch_ids
+            )
+        except Exception as e:
+            logger.error(f"Toplu varlık filtreleme isteği sırasında hata: {e}")
+            return None
+        
+        parsed = self._parse_batch_response(response) if response else None
+        if parsed is None:
+            return None
+        
+        # Yalnızca ilgili haberin aday listesindeki enstrümanları kabul et
+        candidates_by_id = {item["id"]: set(item["candidate_assets"]) for item in batch}
+        results = {}
+        for article in parsed.results:
+            if article.news_id not in candidates_by_id:
+                continue
+            results[article.news_id] = [
+                asset.model_dump() for asset in article.affected_assets
+                if asset.asset in candidates_by_id[article.news_id]
+            ]
+        
+        if not results:
+            logger.warning(f"Toplu yanıt gruptaki {len(batch)} haberin hiçbirini içermiyor")
+            return None
+        return results
+    
+    def _response_news_ids(self, response: str) -> Optional[set]:
+        """Toplu yanıttaki news_id kümesini döndürür; yanıt ayrıştırılamazsa None."""
+        parsed = self._parse_batch_response(response)
+        if parsed is None:
+            return None
+        return {article.news_id for article in parsed.results}
+    
+    def _parse_batch_response(self, response: str) -> Optional[BatchAssetImpactResponse]:
+        """
+        Toplu LLM yanıtını BatchAssetImpactResponse modeline dönüştürür.
+        
+        Args:
+            response: Ham LLM yanıtı
+            
+        Returns:
+            Optional[BatchAssetImpactResponse]: Doğrulanmış yanıt veya None
+        """
+        json_str = LLMOutputParser.extract_json_from_response(response)
+        if not json_str:
+            return None
+        
+        try:
+            return BatchAssetImpactResponse(**json.loads(json_str))
+        except (json.JSONDecodeError, ValidationError, TypeError) as e:
+            logger.error(f"Toplu yanıt doğrulama hatası: {e}")
+            return None
@@ -9,11 +9,11 @@ Markdown formatında nihai bir rapor üretir.
 import logging
 from typing import Dict, List, Optional, Any, Union
 from pathlib import Path
-from tenacity import retry, stop_after_attempt, wait_exponential
-import google.generativeai as genai
 
 from ..core.config import settings
+from ..core.llm_client import LLMClient
 from ..utils.prompt_helper import get_prompt_path
+from .response_cache import get_llm_response_cache
 
 # Logger yapılandırması
 logger = logging.getLogger(__name__)
@@ -33,14 +33,12 @@ class LLMSynthesizer:
         LLMSynthesizer sınıfını başlatır ve gereken LLM modelini yapılandırır.
         """
         try:
-            # Gemini modeli için API anahtarını ayarla
-            genai.configure(api_key=settings.GEMINI_API_KEY)
+            # Paylaşılan hız sınırı, yeniden deneme ve devre kesici ile Gemini istemcisi
+            self.llm_client = LLMClient()
+            logger.info(f"Gemini istemcisi başlatıldı: {settings.GEMINI_MODEL_NAME}")
             
-            # Gemini modelini yapılandır
-            self.gemini_model = genai.GenerativeModel(
-                model_name=settings.GEMINI_MODEL_NAME
-            )
-            logger.info(f"Gemini modeli başlatıldı: {settings.GEMINI_MODEL_NAME}")
+            # Paylaşılan LLM yanıt önbelleği
+            self.response_cache = get_llm_response_cache()
             
             # Prompt şablonunu yükle
             self.synthesis_prompt_template = Path(get_prompt_path("synthesis/v1.0.txt")).read_text(encoding="utf-8")
@@ -50,7 +48,6 @@ class LLMSynthesizer:
             logger.error(f"LLMSynthesizer başlatılırken hata: {e}")
             raise
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def synthesize_report(self, story_context: Dict) -> Optional[str]:
         """
         Verilen bağlam bilgilerine göre stratejik sinyal raporu sentezler.
@@ -90,14 +87,20 @@ class LLMSynthesizer:
             
             # Gemini'ye istek gönder
             logger.info("LLM'e stratejik rapor üretimi isteği gönderiliyor...")
-            response = self.gemini_model.generate_content(prompt)
+            response_text = self.response_cache.get_or_generate(
+                task_type="synthesis",
+                prompt_version="v1.0",
+                model_name=settings.GEMINI_MODEL_NAME,
+                prompt=prompt,
+                generate=lambda: self.llm_client.generate_text(prompt)
+            )
             
             # Yanıtı kontrol et
-            if not response.text or not response.text.strip():
+            if not response_text or not response_text.strip():
                 logger.error("LLM boş yanıt döndü")
                 return None
             
-            report_text = response.text.strip()
+            report_text = response_text.strip()
             logger.info(f"Stratejik sinyal raporu başarıyla üretildi ({len(report_text)} karakter)")
             return report_text
             
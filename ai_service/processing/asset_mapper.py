@@ -4,16 +4,138 @@ Asset Mapper Module
 Bu modül, haber metinlerinde tespit edilen varlıkları (entities) kullanarak
 potansiyel olarak etkilenebilecek finansal enstrümanları (assets) eşleştiren
 AssetMapper sınıfını içerir.
+
+Kurallar yükleme sırasında varlık türü başına bir indekse derlenir; böylece eşleştirme
+maliyeti kural sayısından bağımsız olur ve varlık sayısıyla (yaklaşık) doğrusal artar.
+Derlenmiş kurallar RuleStore üzerinden paylaşılır ve kural dosyası değiştiğinde servis
+yeniden başlatılmadan güncellenir.
 """
 
 import os
+import re
 import logging
-import yaml
-from typing import Dict, List, Set, Any, Optional
+from typing import Dict, FrozenSet, List, Set, Any, Optional, Tuple
+
+from utils.rule_store import RuleStore, get_rule_store
 
 # Logger yapılandırması
 logger = logging.getLogger(__name__)
 
+# Varlık -> eşleşen kural önbelleğinin maksimum boyutu
+ENTITY_CACHE_SIZE = 10000
+
+
+class _EntityTypeIndex:
+    """
+    Tek bir varlık türü (ORG, GPE, ...) için derlenmiş varlık adı indeksi.
+
+    Önceki eşleştirme kuralı korunur: kural adı ile varlık (küçük harfle) eşitse veya biri
+    diğerini alt dize olarak içeriyorsa eşleşme vardır.
+
+    - substrings: Kural adlarının tüm alt dizeleri -> kural indeksleri. Varlığın normalize
+      karşılığı tek sözlük erişimiyle bulunur; tam eşleşme ve "varlık kural adının içinde"
+      durumlarını kapsar.
+    - contains_pattern: Tüm kural adlarından derlenmiş tek bir düzenli ifade (önek ağacı
+      gibi çalışan alternasyon). Varlık üzerinde tek geçişte, içinde geçen kural adları
+      bulunur ("kural adı varlığın içinde"). Aynı konumda başlayan ve birbirinin öneki olan
+      adlar önek tablosundan tamamlanır.
+    """
+
+    def __init__(self):
+        self.substrings: Dict[str, Set[int]] = {}
+        self.names: Dict[str, Set[int]] = {}
+        self.contains_pattern: Optional[re.Pattern] = None
+        self.prefixes: Dict[str, Tuple[str, ...]] = {}
+
+    def add(self, name: str, mapping_idx: int) -> None:
+        """Küçük harfli kural adını indekse ekler."""
+        substrings = self.substrings
+        for start in range(len(name) + 1):
+            for end in range(start, len(name) + 1):
+                substrings.setdefault(name[start:end], set()).add(mapping_idx)
+        self.names.setdefault(name, set()).add(mapping_idx)
+
+    def freeze(self) -> None:
+        """Alt dize tablosunu dondurur ve kural adlarını tek bir düzenli ifadeye derler."""
+        self.substrings = {key: frozenset(ids) for key, ids in self.substrings.items()}
+
+        # Uzun adlar önce denenir; aynı konumdaki kısa adlar önek tablosundan bulunur
+        ordered = sorted((name for name in self.names if name), key=len, reverse=True)
+        if ordered:
+            self.contains_pattern = re.compile("(?=(" + "|".join(re.escape(name) for name in ordered) + "))")
+        self.prefixes = {
+            name: tuple(other for other in ordered if name.startswith(other))
+            for name in ordered
+        }
+
+    def lookup(self, entity_lower: str) -> Set[int]:
+        """
+        Küçük harfli varlıkla eşleşen kural indekslerini döndürür.
+
+        Args:
+            entity_lower: Küçük harfe çevrilmiş varlık adı
+
+        Returns:
+            Set[int]: Eşleşen kural indeksleri
+        """
+        matched: Set[int] = set(self.substrings.get(entity_lower, ()))
+        if "" in self.names:
+            matched.update(self.names[""])
+
+        if self.contains_pattern is not None:
+            names, prefixes = self.names, self.prefixes
+            for longest in {match.group(1) for match in self.contains_pattern.finditer(entity_lower)}:
+                for name in prefixes[longest]:
+                    matched.update(names[name])
+
+        return matched
+
+
+class CompiledAssetRules:
+    """asset_rules.yaml dosyasının derlenmiş hali (RuleStore tarafından önbelleğe alınır)."""
+
+    def __init__(self, mappings: List[Dict[str, Any]], type_indexes: Dict[str, _EntityTypeIndex],
+                 mapping_assets: List[Tuple[str, ...]]):
+        self.mappings = mappings
+        self.type_indexes = type_indexes
+        self.mapping_assets = mapping_assets
+
+
+def compile_asset_rules(rules_data: Dict[str, Any]) -> CompiledAssetRules:
+    """
+    Eşleştirme kurallarını varlık türüne göre indeksler (kural adları bir kez küçük harfe çevrilir).
+
+    Args:
+        rules_data: asset_rules.yaml içeriği
+
+    Returns:
+        CompiledAssetRules: Derlenmiş kurallar
+    """
+    mappings = rules_data.get('mappings', []) or []
+    type_indexes: Dict[str, _EntityTypeIndex] = {}
+    mapping_assets: List[Tuple[str, ...]] = []
+
+    for mapping_idx, mapping in enumerate(mappings):
+        mapping_assets.append(tuple(mapping.get('assets', []) or []))
+        index = type_indexes.setdefault(mapping.get('entity_type'), _EntityTypeIndex())
+        for name in mapping.get('entity_names', []) or []:
+            index.add(name.lower(), mapping_idx)
+
+    for index in type_indexes.values():
+        index.freeze()
+
+    # İstatistiksel bilgi
+    entity_count = sum(len(mapping.get('entity_names', []) or []) for mapping in mappings)
+    asset_count = sum(len(assets) for assets in mapping_assets)
+    logger.info(f"{len(mappings)} eşleştirme kuralı derlendi: {len(type_indexes)} varlık türü, "
+                f"{entity_count} varlık adı ve {asset_count} finansal enstrüman")
+
+    return CompiledAssetRules(mappings=mappings, type_indexes=type_indexes, mapping_assets=mapping_assets)
+
+
+# Kural dosyası yüklenemediğinde kullanılan boş kurallar
+_EMPTY_RULES = CompiledAssetRules(mappings=[], type_indexes={}, mapping_assets=[])
+
 
 class AssetMapper:
     """
@@ -24,13 +146,14 @@ class AssetMapper:
     finansal enstrümanların bir listesini oluşturur.
     """
 
-    def __init__(self, rules_path: str = None):
+    def __init__(self, rules_path: str = None, rule_store: Optional[RuleStore] = None):
         """
         AssetMapper sınıfını başlatır.
         
         Args:
             rules_path: Varlık-enstrüman eşleştirme kurallarını içeren YAML dosyasının yolu.
                        None ise varsayılan konum kullanılır.
+            rule_store: Derlenmiş kuralları sağlayan RuleStore. None ise paylaşılan depo kullanılır.
         """
         logger.info("AssetMapper başlatılıyor...")
 
@@ -39,31 +162,45 @@ class AssetMapper:
             base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
             rules_path = os.path.join(base_dir, "rules", "asset_rules.yaml")
         
-        try:
-            # YAML dosyasını yükle
-            logger.info(f"Varlık-enstrüman eşleştirme kuralları yükleniyor: {rules_path}")
-            with open(rules_path, 'r', encoding='utf-8') as file:
-                rules_data = yaml.safe_load(file)
-            
-            # Kuralları sınıf değişkenine kaydet
-            self.mappings = rules_data.get('mappings', [])
-            
-            # İstatistiksel bilgi
-            entity_types = set()
-            entity_count = 0
-            asset_count = 0
-            
-            for mapping in self.mappings:
-                entity_types.add(mapping.get('entity_type', ''))
-                entity_count += len(mapping.get('entity_names', []))
-                asset_count += len(mapping.get('assets', []))
-            
-            logger.info(f"{len(self.mappings)} eşleştirme kuralı yüklendi")
-            logger.info(f"Toplam {len(entity_types)} varlık türü, {entity_count} varlık adı ve {asset_count} finansal enstrüman tanımlandı")
-        
-        except Exception as e:
-            logger.error(f"Varlık-enstrüman eşleştirme kuralları yüklenirken hata oluştu: {e}")
-            self.mappings = []
+        self.rules_path = rules_path
+        self.rule_store = rule_store or get_rule_store()
+
+        # Varlık -> eşleşen kural önbelleği; kural sürümü değiştiğinde sıfırlanır
+        self._entity_cache: Dict[Tuple[str, str], FrozenSet[int]] = {}
+        self._cache_rules: Optional[CompiledAssetRules] = None
+
+        logger.info(f"Varlık-enstrüman eşleştirme kuralları yükleniyor: {rules_path}")
+        if self.rule_store.get(rules_path, compile_asset_rules) is None:
+            logger.error("Varlık-enstrüman eşleştirme kuralları yüklenemedi, eşleştirme yapılamayacak")
+
+    def _compiled(self) -> CompiledAssetRules:
+        """Güncel derlenmiş kuralları döndürür (dosya değiştiyse yeni sürüm)."""
+        compiled = self.rule_store.get(self.rules_path, compile_asset_rules)
+        return compiled if compiled is not None else _EMPTY_RULES
+
+    @property
+    def mappings(self) -> List[Dict[str, Any]]:
+        """Güncel varlık-enstrüman eşleştirme kuralları."""
+        return self._compiled().mappings
+
+    def _lookup_entity(self, compiled: CompiledAssetRules, entity_type: str, entity: str) -> FrozenSet[int]:
+        """Varlıkla eşleşen kural indekslerini (önbellekten veya indeksten) döndürür."""
+        if compiled is not self._cache_rules:
+            self._entity_cache = {}
+            self._cache_rules = compiled
+
+        key = (entity_type, entity)
+        cached = self._entity_cache.get(key)
+        if cached is not None:
+            return cached
+
+        index = compiled.type_indexes.get(entity_type)
+        matched = frozenset(index.lookup(entity.lower())) if index is not None else frozenset()
+
+        if len(self._entity_cache) >= ENTITY_CACHE_SIZE:
+            self._entity_cache.clear()
+        self._entity_cache[key] = matched
+        return matched
 
     def map_assets(self, entities: Dict[str, List[str]]) -> List[str]:
         """
@@ -77,7 +214,9 @@ class AssetMapper:
         Returns:
             List[str]: Eşleştirilen finansal enstrümanların (assets) listesi
         """
-        if not entities or not self.mappings:
+        # Eşleştirme boyunca aynı kural sürümü kullanılır (arada yeniden yükleme olsa bile)
+        compiled = self._compiled()
+        if not entities or not compiled.mappings:
             logger.warning("Varlık eşleştirmesi yapılamıyor: Varlıklar veya kurallar boş")
             return []
         
@@ -85,30 +224,20 @@ class AssetMapper:
         candidate_assets: Set[str] = set()
         matched_entities: List[str] = []
         
-        # Her bir eşleştirme kuralını kontrol et
-        for mapping in self.mappings:
-            entity_type = mapping.get('entity_type')
-            entity_names = mapping.get('entity_names', [])
-            assets = mapping.get('assets', [])
-            
-            # Eğer varlık türü (ORG, GPE, vb.) metinde varsa
-            if entity_type in entities:
-                # Metindeki bu türdeki her bir varlığı kontrol et
-                for entity in entities[entity_type]:
-                    # Kural listesindeki her bir varlık adıyla karşılaştır
-                    for rule_entity in entity_names:
-                        # Tam eşleşme veya alt dize olarak içerme kontrolü
-                        if (rule_entity.lower() == entity.lower() or 
-                            rule_entity.lower() in entity.lower() or 
-                            entity.lower() in rule_entity.lower()):
-                            
-                            # Eşleşme bulundu, finansal enstrümanları listeye ekle
-                            candidate_assets.update(assets)
-                            matched_entities.append(f"{entity} ({entity_type})")
-                            
-                            # Eşleşme bilgisini logla
-                            logger.debug(f"Eşleşme: '{entity}' -> {assets}")
-                            break  # Bir eşleşme bulunduğunda sonraki rule_entity'e geçme
+        # Yalnızca kurallarda tanımlı varlık türlerini indeks üzerinden kontrol et
+        for entity_type, entity_list in entities.items():
+            if entity_type not in compiled.type_indexes:
+                continue
+            for entity in entity_list:
+                for mapping_idx in self._lookup_entity(compiled, entity_type, entity):
+                    assets = compiled.mapping_assets[mapping_idx]
+                    
+                    # Eşleşme bulundu, finansal enstrümanları listeye ekle
+                    candidate_assets.update(assets)
+                    matched_entities.append(f"{entity} ({entity_type})")
+                    
+                    # Eşleşme bilgisini logla
+                    logger.debug(f"Eşleşme: '{entity}' -> {list(assets)}")
         
         # Sonuçları logla
         if candidate_assets:
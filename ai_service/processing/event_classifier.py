@@ -3,17 +3,138 @@ Event Type Classification Module
 
 Bu modül, haber metinlerini önceden tanımlanmış finansal olay türlerine göre 
 otomatik olarak etiketleyen EventTypeClassifier sınıfını içerir.
+
+Kurallar yükleme sırasında bir kez derlenir: tüm anahtar kelimeler tek bir birleşik
+düzenli ifadede toplanır ve varlık değerleri varlık türüne göre (sözlük) ayrı
+eşleştiricilerde tutulur. Böylece sınıflandırma, kural başına metin taraması yerine
+metin üzerinde tek geçişle yapılır. Derlenmiş kurallar RuleStore üzerinden paylaşılır
+ve kural dosyası değiştiğinde servis yeniden başlatılmadan güncellenir.
 """
 
 import os
+import re
 import logging
-import yaml
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+
+from utils.rule_store import RuleStore, get_rule_store
 
 # Logger yapılandırması
 logger = logging.getLogger(__name__)
 
 
+class _TermMatcher:
+    """
+    Çok sayıda terimi tek geçişte arayan derlenmiş eşleştirici.
+
+    Terimler, kelime başında (solunda harf/rakam olmayan konumda) başlamalıdır; sağ tarafta
+    sınır aranmaz, böylece Türkçe ekli biçimler de eşleşir ("enflasyon" -> "enflasyonun").
+    Aynı konumda başlayan ve birbirinin öneki olan terimler (ör. "tutanaklar" ve
+    "tutanakları") önceden hesaplanan önek listesiyle birlikte raporlanır.
+    """
+
+    def __init__(self, terms: Dict[str, List[int]]):
+        """
+        Args:
+            terms: Küçük harfli terim -> terimi içeren kural indeksleri
+        """
+        self.terms = terms
+        # Uzun terimler önce denenir; aynı konumdaki kısa terimler önek listesinden bulunur
+        ordered = sorted(terms, key=len, reverse=True)
+        self.pattern = re.compile(r"(?<!\w)(?=(" + "|".join(re.escape(term) for term in ordered) + "))") if ordered else None
+        self.prefixes: Dict[str, List[str]] = {
+            term: [other for other in ordered if term.startswith(other)]
+            for term in ordered
+        }
+
+    def find(self, text_lower: str) -> Dict[int, List[str]]:
+        """
+        Metinde geçen terimleri bulur.
+
+        Args:
+            text_lower: Küçük harfe çevrilmiş metin
+
+        Returns:
+            Dict[int, List[str]]: Kural indeksi -> metinde bulunan terimler (ilk görülme sırasıyla)
+        """
+        found: Dict[int, List[str]] = {}
+        if self.pattern is None:
+            return found
+
+        seen = set()
+        for match in self.pattern.finditer(text_lower):
+            longest = match.group(1)
+            if longest in seen:
+                continue
+            seen.add(longest)
+            for term in self.prefixes[longest]:
+                for rule_idx in self.terms[term]:
+                    terms_for_rule = found.setdefault(rule_idx, [])
+                    if term not in terms_for_rule:
+                        terms_for_rule.append(term)
+        return found
+
+
+class CompiledEventRules:
+    """event_rules.yaml dosyasının derlenmiş hali (RuleStore tarafından önbelleğe alınır)."""
+
+    def __init__(self, rules: List[Dict[str, Any]], keyword_matcher: _TermMatcher,
+                 entity_matchers: Dict[str, _TermMatcher]):
+        self.rules = rules
+        self.keyword_matcher = keyword_matcher
+        self.entity_matchers = entity_matchers
+
+
+def compile_event_rules(rules_data: Dict[str, Any]) -> CompiledEventRules:
+    """
+    Olay türü kurallarını tek geçişli eşleştiricilere derler.
+
+    - Anahtar kelimeler: tüm kurallar için tek bir _TermMatcher
+    - Varlıklar: varlık türü -> _TermMatcher sözlüğü (yalnızca haberde bulunan türler aranır)
+
+    Args:
+        rules_data: event_rules.yaml içeriği
+
+    Returns:
+        CompiledEventRules: Derlenmiş kurallar
+    """
+    rules = rules_data.get('events', []) or []
+    keyword_terms: Dict[str, List[int]] = {}
+    entity_terms: Dict[str, Dict[str, List[int]]] = {}
+
+    for rule_idx, rule in enumerate(rules):
+        for keyword in rule.get('keywords', []) or []:
+            term = str(keyword).strip().lower()
+            if term and rule_idx not in keyword_terms.setdefault(term, []):
+                keyword_terms[term].append(rule_idx)
+
+        for entity_type, entity_values in (rule.get('entities', {}) or {}).items():
+            terms = entity_terms.setdefault(entity_type, {})
+            for value in entity_values or []:
+                term = str(value).strip().lower()
+                if term and rule_idx not in terms.setdefault(term, []):
+                    terms[term].append(rule_idx)
+
+    # Öncelik bilgisini loglama
+    priority_counts: Dict[int, int] = {}
+    for rule in rules:
+        priority = rule.get('priority', 999)
+        priority_counts[priority] = priority_counts.get(priority, 0) + 1
+
+    priority_info = ', '.join([f"P{p}: {c} kural" for p, c in sorted(priority_counts.items())])
+    logger.info(f"{len(rules)} olay türü kuralı derlendi ({priority_info}): {len(keyword_terms)} anahtar kelime, "
+                f"{sum(len(t) for t in entity_terms.values())} varlık değeri")
+
+    return CompiledEventRules(
+        rules=rules,
+        keyword_matcher=_TermMatcher(keyword_terms),
+        entity_matchers={entity_type: _TermMatcher(terms) for entity_type, terms in entity_terms.items()}
+    )
+
+
+# Kural dosyası yüklenemediğinde kullanılan boş kurallar
+_EMPTY_RULES = CompiledEventRules(rules=[], keyword_matcher=_TermMatcher({}), entity_matchers={})
+
+
 class EventTypeClassifier:
     """
     Haber metinlerini olay türlerine göre sınıflandıran sınıf.
@@ -23,13 +144,14 @@ class EventTypeClassifier:
     Genişletilmiş yapı ile birlikte öncelik (priority) ve gerekçe (rationale) bilgilerini de işler.
     """
 
-    def __init__(self, rules_path: str = None):
+    def __init__(self, rules_path: str = None, rule_store: Optional[RuleStore] = None):
         """
         EventTypeClassifier sınıfını başlatır.
         
         Args:
             rules_path: Olay türü kurallarını içeren YAML dosyasının yolu.
                        None ise varsayılan konum kullanılır.
+            rule_store: Derlenmiş kuralları sağlayan RuleStore. None ise paylaşılan depo kullanılır.
         """
         logger.info("EventTypeClassifier başlatılıyor...")
 
@@ -38,30 +160,74 @@ class EventTypeClassifier:
             base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
             rules_path = os.path.join(base_dir, "rules", "event_rules.yaml")
         
-        try:
-            # YAML dosyasını yükle
-            logger.info(f"Olay türü kuralları yükleniyor: {rules_path}")
-            with open(rules_path, 'r', encoding='utf-8') as file:
-                rules_data = yaml.safe_load(file)
-            
-            # Kuralları sınıf değişkenine kaydet ve önceliğe göre sırala
-            self.rules = rules_data.get('events', [])
-            
-            # Öncelik bilgisini loglama
-            priority_counts = {}
-            for rule in self.rules:
-                priority = rule.get('priority', 999)
-                event_type = rule.get('event_type')
-                if priority not in priority_counts:
-                    priority_counts[priority] = 0
-                priority_counts[priority] += 1
-                
-            priority_info = ', '.join([f"P{p}: {c} kural" for p, c in sorted(priority_counts.items())])
-            logger.info(f"{len(self.rules)} olay türü kuralı başarıyla yüklendi ({priority_info})")
+        self.rules_path = rules_path
+        self.rule_store = rule_store or get_rule_store()
+
+        logger.info(f"Olay türü kuralları yükleniyor: {rules_path}")
+        if self.rule_store.get(rules_path, compile_event_rules) is None:
+            logger.error("Olay türü kuralları yüklenemedi, sınıflandırma yapılamayacak")
+
+    def _compiled(self) -> CompiledEventRules:
+        """Güncel derlenmiş kuralları döndürür (dosya değiştiyse yeni sürüm)."""
+        compiled = self.rule_store.get(self.rules_path, compile_event_rules)
+        return compiled if compiled is not None else _EMPTY_RULES
+
+    @property
+    def rules(self) -> List[Dict[str, Any]]:
+        """Güncel olay türü kuralları."""
+        return self._compiled().rules
+
+    def find_matches(self, text: str, entities: Optional[Dict[str, List[str]]] = None) -> List[Dict[str, Any]]:
+        """
+        Metin ve varlıklarla eşleşen tüm kuralları önceliğe göre sıralı döndürür.
         
-        except Exception as e:
-            logger.error(f"Olay türü kuralları yüklenirken hata oluştu: {e}")
-            self.rules = []
+        Args:
+            text: Haber metni
+            entities: FeatureExtractor'dan gelen varlıklar sözlüğü
+        
+        Returns:
+            List[Dict[str, Any]]: {'event_type', 'priority', 'match_type', 'match_value'[, 'entity_type']}
+                                  sözlükleri; önce öncelik, sonra kural sırasına göre sıralı
+        """
+        return [match for _, match in self._match_rules(self._compiled(), text, entities)]
+
+    @staticmethod
+    def _match_rules(compiled: CompiledEventRules,
+                     text: str,
+                     entities: Optional[Dict[str, List[str]]]) -> List[Tuple[int, Dict[str, Any]]]:
+        """Eşleşmeleri kural indeksleriyle birlikte, sıralı olarak döndürür."""
+        matches: List[Tuple[int, int, Dict[str, Any]]] = []
+        
+        # 1. Anahtar kelime kontrolü (metin üzerinde tek geçiş)
+        for rule_idx, keywords in compiled.keyword_matcher.find(text.lower()).items():
+            rule = compiled.rules[rule_idx]
+            for keyword in keywords:
+                matches.append((rule_idx, 0, {
+                    'event_type': rule.get('event_type'),
+                    'priority': rule.get('priority', 999),
+                    'match_type': 'keyword',
+                    'match_value': keyword
+                }))
+        
+        # 2. Varlık kontrolü (yalnızca kurallarda geçen varlık türleri için)
+        for entity_type, entity_list in (entities or {}).items():
+            matcher = compiled.entity_matchers.get(entity_type)
+            if matcher is None:
+                continue
+            for entity in entity_list or []:
+                for rule_idx in matcher.find(str(entity).lower()):
+                    rule = compiled.rules[rule_idx]
+                    matches.append((rule_idx, 1, {
+                        'event_type': rule.get('event_type'),
+                        'priority': rule.get('priority', 999),
+                        'match_type': 'entity',
+                        'match_value': entity,
+                        'entity_type': entity_type
+                    }))
+        
+        # Eşit öncelikte YAML'daki kural sırası (ve kural içinde anahtar kelimeler) önce gelir
+        matches.sort(key=lambda item: (item[2]['priority'], item[0], item[1]))
+        return [(rule_idx, match) for rule_idx, _, match in matches]
 
     def classify(self, text: str, entities: Dict[str, List[str]]) -> Dict[str, Any]:
         """
@@ -74,73 +240,39 @@ class EventTypeClassifier:
         
         Returns:
             Dict[str, Any]: Eşleşen olay türü bilgilerini içeren sözlük veya None (eşleşme bulunamazsa)
-                            {'event_type': str, 'description': str, 'priority': int, 'rationale': str}
+                            {'event_type': str, 'description': str, 'priority': int, 'rationale': str,
+                             'matches': List[Dict]}  (matches: tüm eşleşmeler, önceliğe göre sıralı)
         """
-        if not text or not self.rules:
+        # Sınıflandırma boyunca aynı kural sürümü kullanılır (arada yeniden yükleme olsa bile)
+        compiled = self._compiled()
+        if not text or not compiled.rules:
             logger.warning("Sınıflandırma yapılamıyor: Metin veya kurallar boş")
             return None
         
-        # Metni küçük harfe çevir (arama için)
-        text_lower = text.lower()
-        
-        # En yüksek öncelikli (düşük priority değeri) eşleşmeleri bulmak için
-        matching_rules = []
-        
-        # Her bir olay türü kuralını kontrol et
-        for rule in self.rules:
-            event_type = rule.get('event_type')
-            priority = rule.get('priority', 999)  # Öncelik belirtilmemişse en düşük önceliği ver
-            
-            # 1. Anahtar kelime kontrolü
-            keywords = rule.get('keywords', [])
-            for keyword in keywords:
-                # Anahtar kelimelerde liste içindeki elemanlar veya doğrudan string olabilir
-                keyword_str = keyword.lower() if isinstance(keyword, str) else keyword.lower()
-                if keyword_str in text_lower:
-                    logger.info(f"Olay türü belirlendi: {event_type} (anahtar kelime: {keyword_str})")
-                    matching_rules.append({
-                        'rule': rule,
-                        'match_type': 'keyword',
-                        'match_value': keyword_str,
-                        'priority': priority
-                    })
-            
-            # 2. Varlık kontrolü
-            rule_entities = rule.get('entities', {})
-            if entities and rule_entities:
-                for entity_type, entity_values in rule_entities.items():
-                    # Metinde bulunan varlık türü kuralda var mı?
-                    if entity_type in entities:
-                        # Metin varlıkları ile kural varlıkları arasında eşleşme var mı?
-                        for entity in entities[entity_type]:
-                            # Her bir varlık adını kuralda belirtilen varlık değerleriyle karşılaştır
-                            for rule_entity in entity_values:
-                                if rule_entity.lower() in entity.lower():
-                                    logger.info(f"Olay türü belirlendi: {event_type} (varlık: {entity}, tür: {entity_type})")
-                                    matching_rules.append({
-                                        'rule': rule,
-                                        'match_type': 'entity',
-                                        'match_value': entity,
-                                        'entity_type': entity_type,
-                                        'priority': priority
-                                    })
+        ranked_matches = self._match_rules(compiled, text, entities)
+        matches = [match for _, match in ranked_matches]
         
         # Eşleşme bulunamazsa
-        if not matching_rules:
+        if not matches:
             logger.info("Metin için olay türü belirlenemedi")
             return None
-            
-        # En yüksek öncelikli (düşük priority değeri) kuralı bul
-        best_match = min(matching_rules, key=lambda x: x['priority'])
-        rule = best_match['rule']
+        
+        for match in matches:
+            logger.debug(f"Olay türü eşleşmesi: {match['event_type']} ({match['match_type']}: {match['match_value']})")
+        
+        # En yüksek öncelikli (düşük priority değeri) kural listenin başındadır
+        rule_idx, best_match = ranked_matches[0]
+        rule = compiled.rules[rule_idx]
         
         # Eşleşen kuraldan olay bilgilerini oluştur
         event_info = {
             'event_type': rule.get('event_type'),
             'description': rule.get('description', ''),
             'priority': rule.get('priority', 999),
-            'rationale': rule.get('rationale', '')
+            'rationale': rule.get('rationale', ''),
+            'matches': matches
         }
         
-        logger.info(f"Seçilen olay türü: {event_info['event_type']} (öncelik: {event_info['priority']})")
+        logger.info(f"Seçilen olay türü: {event_info['event_type']} (öncelik: {event_info['priority']}, "
+                    f"{len(matches)} eşleşme, {best_match['match_type']}: {best_match['match_value']})")
         return event_info
@@ -12,12 +12,12 @@ import logging
 from typing import Dict, List, Optional, Any, Union
 from pathlib import Path
 from pydantic import BaseModel, Field, validator
-import google.generativeai as genai
-from tenacity import retry, stop_after_attempt, wait_exponential
-from sentence_transformers import SentenceTransformer
 
 from ..core.config import settings
+from ..core.llm_client import LLMClient
+from ..core.embedding_service import get_embedding_service
 from ..utils.prompt_helper import get_prompt_path
+from ..llm.response_cache import get_llm_response_cache
 
 # Logger yapılandırması
 logger = logging.getLogger(__name__)
@@ -63,18 +63,16 @@ class StoryProcessor:
         StoryProcessor sınıfını başlatır ve gereken modelleri yükler.
         """
         try:
-            # Gemini modeli için API anahtarını ayarla
-            genai.configure(api_key=settings.GEMINI_API_KEY)
+            # Paylaşılan hız sınırı, yeniden deneme ve devre kesici ile Gemini istemcisi
+            self.llm_client = LLMClient()
+            logger.info(f"Gemini istemcisi başlatıldı: {settings.GEMINI_MODEL_NAME}")
             
-            # Gemini modelini yapılandır
-            self.gemini_model = genai.GenerativeModel(
-                model_name=settings.GEMINI_MODEL_NAME
-            )
-            logger.info(f"Gemini modeli başlatıldı: {settings.GEMINI_MODEL_NAME}")
+            # Paylaşılan LLM yanıt önbelleği
+            self.response_cache = get_llm_response_cache()
             
-            # Sentence-transformers modelini yükle
-            self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-            logger.info("Sentence transformer modeli başlatıldı: all-MiniLM-L6-v2")
+            # Paylaşılan embedding servisini al (model süreç başına bir kez yüklenir)
+            self.embedding_service = get_embedding_service(settings.EMBEDDING_MODEL_NAME)
+            logger.info(f"Embedding servisi alındı: {self.embedding_service.model_name}")
             
             # Prompt şablonunu yükle
             self.memory_prompt_template = Path(get_prompt_path("memory_generation/v1.0.txt")).read_text(encoding="utf-8")
@@ -84,7 +82,6 @@ class StoryProcessor:
             logger.error(f"StoryProcessor başlatılırken hata: {e}")
             raise
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def _generate_memory_components(self, analysis_summary: str) -> Optional[Dict]:
         """
         Hikaye analiz özetinden metin bazlı hafıza bileşenlerini üretir.
@@ -103,15 +100,20 @@ class StoryProcessor:
             
             # Gemini'ye istek gönder
             logger.info("Hafıza bileşenleri üretimi için LLM isteği gönderiliyor...")
-            response = self.gemini_model.generate_content(prompt)
+            response_text = self.response_cache.get_or_generate(
+                task_type="memory_generation",
+                prompt_version="v1.0",
+                model_name=settings.GEMINI_MODEL_NAME,
+                prompt=prompt,
+                generate=lambda: self.llm_client.generate_text(prompt)
+            )
             
             # Yanıtı işle
-            if not response.text:
+            if not response_text:
                 logger.error("LLM boş yanıt döndü")
                 return None
             
             # JSON yanıtı ayıkla
-            response_text = response.text
             
             # Yanıt bir JSON bloğu içeriyorsa (``` ile sarılıysa), sadece JSON kısmını al
             if "```json" in response_text:
@@ -153,8 +155,8 @@ class StoryProcessor:
         """
         try:
             logger.info("Hikaye özü için gömme vektörü üretiliyor...")
-            # Sentence-transformers ile gömme vektörü oluştur
-            embedding_vector = self.embedding_model.encode(story_essence_text)
+            # Paylaşılan embedding servisi ile (önbellek destekli) gömme vektörü oluştur
+            embedding_vector = self.embedding_service.encode_one(story_essence_text)
             
             logger.info(f"Gömme vektörü üretildi: boyut={embedding_vector.shape}")
             return embedding_vector
@@ -1,13 +1,108 @@
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Tuple
 
+import numpy as np
+
+from ..src.core.config import settings
 from ..src.db.persistence_manager import PersistenceManager
 
 # Logger yapılandırması
 logger = logging.getLogger(__name__)
 
 
+def _to_utc_naive(value: datetime) -> datetime:
+    """Zaman dilimli tarihleri UTC'ye çevirip saf (naive) datetime döndürür; saf tarihler UTC kabul edilir."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class EconomicCalendarIndex:
+    """
+    Ekonomik olayların bellek içi takvim indeksi.
+
+    Olaylar bir kez yüklenip zamana göre sıralı datetime64 dizisinde tutulur. Her olay ailesi
+    (olay türünden çıkarılan anahtar kelime kümesi) için, adı anahtar kelimelerden birini
+    içeren olayların sıralı zaman dizisi ilk sorguda oluşturulup önbelleğe alınır; en yakın
+    olay searchsorted ile bulunur. Önceki SQL sorgusundaki ILIKE '%kelime%' koşulunun
+    karşılığı olarak küçük harfe çevrilmiş olay adında alt dize araması yapılır.
+    """
+
+    def __init__(self, events: List[Dict[str, Any]], coverage_start: datetime, version: int = 0):
+        """
+        EconomicCalendarIndex sınıfını başlatır.
+
+        Args:
+            events: {event_name, event_time, actual_value, forecast_value, ...} sözlükleri
+            coverage_start: İndeksin kapsadığı en erken zaman (sonrası eksiksiz yüklenmiştir)
+            version: Yüklendiği andaki PersistenceManager.economic_events_version değeri
+        """
+        events = [event for event in events if event.get('event_time')]
+        times = np.array([_to_utc_naive(event['event_time']) for event in events], dtype='datetime64[us]')
+        order = np.argsort(times, kind='stable')
+
+        self.times = times[order]
+        self.events = [events[i] for i in order]
+        self.names = [(event.get('event_name') or '').lower() for event in self.events]
+        self.coverage_start = np.datetime64(_to_utc_naive(coverage_start), 'us')
+        self.version = version
+        self._families: Dict[Tuple[str, ...], Tuple[np.ndarray, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def covers(self, start: datetime) -> bool:
+        """Verilen zamandan itibaren tüm olayların indekste olup olmadığını döndürür."""
+        return np.datetime64(_to_utc_naive(start), 'us') >= self.coverage_start
+
+    def _family(self, keywords: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Anahtar kelime ailesine ait olayların (sıralı zamanlar, olay indeksleri) dizilerini döndürür."""
+        key = tuple(sorted(set(keywords)))
+        family = self._families.get(key)
+        if family is None:
+            if key:
+                mask = np.fromiter((any(keyword in name for keyword in key) for name in self.names),
+                                   dtype=bool, count=len(self.names))
+                indices = np.flatnonzero(mask)
+            else:
+                indices = np.arange(len(self.names))
+            family = (self.times[indices], indices)
+            self._families[key] = family
+        return family
+
+    def find_closest(self, keywords: List[str], target_date: datetime, window: timedelta) -> Optional[Dict[str, Any]]:
+        """
+        Anahtar kelime ailesinde hedef tarihe en yakın (pencere içindeki) olayı bulur.
+
+        Args:
+            keywords: Olay adında aranacak anahtar kelimeler (biri yeterli)
+            target_date: Hedef tarih
+            window: Hedef tarihe izin verilen en büyük uzaklık
+
+        Returns:
+            Optional[Dict[str, Any]]: En yakın olay veya pencerede olay yoksa None
+        """
+        times, indices = self._family(keywords)
+        if len(times) == 0:
+            return None
+
+        target = np.datetime64(_to_utc_naive(target_date), 'us')
+        window_us = np.timedelta64(int(window.total_seconds() * 1_000_000), 'us')
+        position = int(np.searchsorted(times, target))
+
+        best, best_diff = None, None
+        # Hedefin hemen öncesindeki ve sonrasındaki olaylar; eşit uzaklıkta sonraki olay tercih edilir
+        for candidate in (position - 1, position):
+            if 0 <= candidate < len(times):
+                diff = abs(times[candidate] - target)
+                if diff <= window_us and (best_diff is None or diff <= best_diff):
+                    best, best_diff = candidate, diff
+
+        return self.events[indices[best]] if best is not None else None
+
+
 class SurpriseScoreCalculator:
     """
     Ekonomik olayların piyasa beklentilerinden sapma derecesini ölçen bir sürpriz skoru hesaplayıcı.
@@ -29,6 +124,38 @@ class SurpriseScoreCalculator:
         else:
             from ..src.db.persistence_manager import PersistenceManager
             self.persistence_manager = PersistenceManager()
+        
+        # Bellek içi ekonomik takvim (ilk kullanımda veya refresh_calendar ile yüklenir)
+        self.calendar: Optional[EconomicCalendarIndex] = None
+        self._calendar_lock = threading.Lock()
+    
+    def refresh_calendar(self) -> Optional[EconomicCalendarIndex]:
+        """
+        Ekonomik takvimi veritabanından tek sorguyla yeniden yükler.
+        
+        Faz 1 çalıştırmasının başında çağrılır; böylece başka bir süreçte (ör.
+        run_daily_actuals_update.py) yazılan gerçekleşen değerler de görülür.
+        
+        Returns:
+            Optional[EconomicCalendarIndex]: Yeni takvim veya yüklenemezse önceki takvim
+        """
+        with self._calendar_lock:
+            version = self.persistence_manager.economic_events_version
+            coverage_start = datetime.now(timezone.utc) - timedelta(days=settings.SURPRISE_CALENDAR_LOOKBACK_DAYS)
+            events = self.persistence_manager.fetch_economic_events_since(coverage_start)
+            if events is None:
+                return self.calendar
+            
+            self.calendar = EconomicCalendarIndex(events, coverage_start, version)
+            logger.info(f"Ekonomik takvim indeksi yüklendi: {len(self.calendar)} olay")
+            return self.calendar
+    
+    def _get_calendar(self) -> Optional[EconomicCalendarIndex]:
+        """Güncel takvimi döndürür; bu süreçte save_economic_events yeni veri yazdıysa yeniler."""
+        calendar = self.calendar
+        if calendar is None or calendar.version != self.persistence_manager.economic_events_version:
+            calendar = self.refresh_calendar()
+        return calendar
     
     def calculate_score(self, event_type: str, publication_date: datetime) -> Optional[float]:
         """
@@ -51,51 +178,107 @@ class SurpriseScoreCalculator:
             # Önce ilgili ekonomik olayı bulalım
             # publication_date'den önce ve sonra belirli bir zaman aralığında arama yapacağız
             # Genellikle ekonomik olaylar ve bunlarla ilgili haberler aynı gün veya 1-2 gün içinde yayınlanır
-            date_range_before = publication_date - timedelta(days=2)
-            date_range_after = publication_date + timedelta(days=2)
+            window = timedelta(days=settings.SURPRISE_EVENT_WINDOW_DAYS)
+            date_range_before = publication_date - window
+            date_range_after = publication_date + window
             
             # Olay türünden anahtar kelimeleri çıkar (örn: "INFLATION_DATA" -> "inflation")
             search_keywords = self._extract_keywords_from_event_type(event_type)
             
-            # Veritabanında bu zaman aralığında ve olay türüne uygun ekonomik olayları ara
-            economic_events = self.persistence_manager.find_economic_events_by_date_range_and_keywords(
-                date_range_before, 
-                date_range_after,
-                search_keywords
-            )
+            calendar = self._get_calendar()
+            if calendar is not None and calendar.covers(date_range_before):
+                # Bellek içi takvimden en yakın olayı bul (veritabanı sorgusu yok)
+                closest_event = calendar.find_closest(search_keywords, publication_date, window)
+            else:
+                # Takvimin kapsamadığı eski tarihler için veritabanında ara
+                economic_events = self.persistence_manager.find_economic_events_by_date_range_and_keywords(
+                    date_range_before, 
+                    date_range_after,
+                    search_keywords
+                )
+                closest_event = self._find_closest_event_by_date(economic_events, publication_date)
             
-            if not economic_events:
+            if not closest_event:
                 logger.info(f"Sürpriz skoru hesabı için {event_type} türüne uygun ekonomik olay bulunamadı")
                 return None
             
-            # En uygun olayı bul (tarih olarak en yakın)
-            closest_event = self._find_closest_event_by_date(economic_events, publication_date)
+            return self._score_event(closest_event)
             
-            if not closest_event:
-                return None
+        except Exception as e:
+            logger.error(f"Sürpriz skoru hesaplanırken hata: {e}")
+            return None
+    
+    def calculate_scores_batch(self, lookups: List[Tuple[Any, str, datetime]]) -> Dict[Any, Optional[float]]:
+        """
+        Birden fazla haber için sürpriz skorlarını en fazla bir veritabanı sorgusuyla hesaplar.
+        
+        Takvim indeksinin kapsadığı tarihler bellekten, kalanlar tek bir toplu sorguyla
+        (PersistenceManager.find_economic_events_for_lookups) yanıtlanır.
+        
+        Args:
+            lookups: (anahtar, olay_türü, yayın_tarihi) demetleri; anahtar sonuçta geri döner (ör. haber ID'si)
             
-            # Actual ve forecast değerleri kontrol et
-            actual_value = closest_event.get('actual_value')
-            forecast_value = closest_event.get('forecast_value')
+        Returns:
+            Dict[Any, Optional[float]]: Anahtar -> sürpriz skoru (olay bulunamazsa None)
+        """
+        scores: Dict[Any, Optional[float]] = {}
+        try:
+            window = timedelta(days=settings.SURPRISE_EVENT_WINDOW_DAYS)
+            calendar = self._get_calendar()
+            pending: List[Tuple[Any, List[str], datetime]] = []
             
-            if actual_value is None or forecast_value is None:
-                logger.info(f"Olay ID {closest_event.get('id')} için actual_value veya forecast_value değeri yok")
-                return None
+            for key, event_type, publication_date in lookups:
+                search_keywords = self._extract_keywords_from_event_type(event_type)
+                if calendar is not None and calendar.covers(publication_date - window):
+                    scores[key] = self._score_event(calendar.find_closest(search_keywords, publication_date, window))
+                else:
+                    pending.append((key, search_keywords, publication_date))
             
-            # Değerlerin sayı olduğundan emin ol
-            try:
-                actual_value = float(actual_value)
-                forecast_value = float(forecast_value)
-            except (ValueError, TypeError):
-                logger.warning(f"Olay ID {closest_event.get('id')} için sayısal olmayan değerler: actual={actual_value}, forecast={forecast_value}")
-                return None
-            
-            # Sürpriz skorunu hesapla (0.0 - 1.0 arasında normalize et)
-            return self._calculate_normalized_surprise_score(actual_value, forecast_value)
+            if pending:
+                events_by_lookup = self.persistence_manager.find_economic_events_for_lookups([
+                    (idx, search_keywords, publication_date - window, publication_date + window)
+                    for idx, (_, search_keywords, publication_date) in enumerate(pending)
+                ])
+                for idx, (key, _, publication_date) in enumerate(pending):
+                    closest_event = self._find_closest_event_by_date(events_by_lookup.get(idx, []), publication_date)
+                    scores[key] = self._score_event(closest_event)
             
         except Exception as e:
-            logger.error(f"Sürpriz skoru hesaplanırken hata: {e}")
+            logger.error(f"Toplu sürpriz skoru hesaplanırken hata: {e}")
+        
+        return scores
+    
+    def _score_event(self, event: Optional[Dict[str, Any]]) -> Optional[float]:
+        """
+        Olayın actual ve forecast değerlerinden sürpriz skorunu hesaplar.
+        
+        Args:
+            event: Ekonomik olay (None ise None döner)
+            
+        Returns:
+            Optional[float]: 0.0-1.0 arası skor veya değerler eksik/sayısal değilse None
+        """
+        if not event:
+            return None
+        
+        # Actual ve forecast değerleri kontrol et
+        actual_value = event.get('actual_value')
+        forecast_value = event.get('forecast_value')
+        
+        if actual_value is None or forecast_value is None:
+            logger.info(f"Olay ID {event.get('id')} için actual_value veya forecast_value değeri yok")
             return None
+        
+        # Değerlerin sayı olduğundan emin ol
+        try:
+            actual_value = float(actual_value)
+            forecast_value = float(forecast_value)
+        except (ValueError, TypeError):
+            logger.warning(f"Olay ID {event.get('id')} için sayısal olmayan değerler: actual={actual_value}, forecast={forecast_value}")
+            return None
+        
+        # Sürpriz skorunu hesapla (0.0 - 1.0 arasında normalize et)
+        return self._calculate_normalized_surprise_score(actual_value, forecast_value)
     
     def _extract_keywords_from_event_type(self, event_type: str) -> List[str]:
         """
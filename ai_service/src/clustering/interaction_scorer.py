@@ -14,16 +14,24 @@ Hesaplanan skorlar, graf oluşturma işlemleri için graph_edges tablosuna kayde
 
 import logging
 import time
-from typing import Dict, List, Tuple, Set, Optional
+from typing import Any, Dict, List, Tuple, Set, Optional
 import numpy as np
 import faiss
-from datetime import datetime
+from scipy import sparse
+from datetime import datetime, timezone
 from ..core.config import settings
 from ..db.persistence_manager import PersistenceManager
+from .news_vector_index import NewsVectorIndex
 
 # Logger konfigürasyonu
 logger = logging.getLogger(__name__)
 
+# Zamansal skorun yarı değer ölçeği (gün)
+TEMPORAL_SCALE_DAYS = 7.0
+
+# Yayın tarihi bilinmeyen çiftler için kullanılan orta değer
+DEFAULT_TEMPORAL_SCORE = 0.5
+
 
 class InteractionScorer:
     """
@@ -31,16 +39,25 @@ class InteractionScorer:
     
     Bu sınıf, faiss kütüphanesini kullanarak verimli bir şekilde aday haber çiftleri bulur
     ve her bir çift için semantik, varlık ve zamansal skorları hesaplayarak bunları
-    birleştirir. Sonuçlar graph_edges tablosuna kaydedilir.
+    birleştirir. Skorlar çift başına Python döngüsüyle değil, tüm aday çiftler için
+    NumPy/SciPy dizi işlemleriyle tek seferde hesaplanır. Sonuçlar graph_edges
+    tablosuna kaydedilir.
+    
+    Artımlı modda (calculate_incremental_scores) yalnızca yeni işlenen haberler, daha önce
+    skorlanmış haberleri tutan kalıcı NewsVectorIndex'e karşı skorlanır.
     """
     
-    def __init__(self, persistence_manager: Optional[PersistenceManager] = None):
+    def __init__(self,
+                 persistence_manager: Optional[PersistenceManager] = None,
+                 vector_index: Optional[NewsVectorIndex] = None):
         """
         InteractionScorer sınıfının başlatıcısı.
         
         Args:
             persistence_manager: Veritabanı işlemleri için PersistenceManager nesnesi.
                                  None ise yeni bir nesne oluşturulur.
+            vector_index: Artımlı skorlama için kalıcı haber vektör indeksi.
+                          None ise ilk artımlı çalıştırmada oluşturulur.
         """
         # Yapılandırma değerlerini al
         self.semantic_weight = settings.INTERACTION_SCORER_SEMANTIC_WEIGHT
@@ -48,256 +65,497 @@ class InteractionScorer:
         self.temporal_weight = settings.INTERACTION_SCORER_TEMPORAL_WEIGHT
         self.interaction_threshold = settings.INTERACTION_THRESHOLD
         self.k_neighbors = settings.INTERACTION_SCORER_K_NEIGHBORS
+        self.index_type = settings.INTERACTION_SCORER_INDEX_TYPE.lower()
+        self.ann_min_size = settings.INTERACTION_SCORER_ANN_MIN_SIZE
         
         # Veritabanı yöneticisini ayarla
         self.persistence_manager = persistence_manager or PersistenceManager()
+        self._vector_index = vector_index
         
         logger.info(f"InteractionScorer başlatıldı. Ağırlıklar: semantik={self.semantic_weight}, "
                    f"varlık={self.entity_weight}, zamansal={self.temporal_weight}, "
                    f"eşik={self.interaction_threshold}, k={self.k_neighbors}")
     
-    def _find_candidate_pairs(self, news_list: List[Dict]) -> List[Tuple[int, int]]:
+    @property
+    def vector_index(self) -> NewsVectorIndex:
+        """Artımlı skorlamada kullanılan kalıcı haber vektör indeksi (ilk erişimde yüklenir)."""
+        if self._vector_index is None:
+            self._vector_index = NewsVectorIndex()
+        return self._vector_index
+    
+    def _prepare_features(self, news_list: List[Dict]) -> Optional[Dict[str, Any]]:
         """
-        Her bir haber için en yakın k komşuyu bularak aday çiftlerini oluşturur.
-        
-        FAISS kütüphanesi, büyük vektör setleri arasında etkili benzerlik araması yapar.
-        Böylece O(n²) karşılaştırması yerine vektör tabanlı en yakın komşu araması yapılır.
+        Haber listesinden skorlama için gereken dizileri bir kez oluşturur.
         
         Args:
-            news_list: İşlenecek haberler listesi. 
-                      Her haber sözlüğünde 'id' ve 'embedding_vector' olmalı.
+            news_list: İşlenecek haberler listesi.
+                      Her haber sözlüğünde 'id' ve 'embedding_vector' olmalı;
+                      'entities' ve 'published_at' isteğe bağlıdır.
                       
         Returns:
-            List[Tuple[int, int]]: (kaynak_haber_id, hedef_haber_id) şeklinde aday çiftlerin listesi.
+            Optional[Dict[str, Any]]: Aşağıdaki alanları içeren sözlük veya yeterli veri yoksa None
+                - ids: (n,) int64 haber ID'leri
+                - embeddings: (n, d) L2-normalize edilmiş float32 embedding matrisi
+                - epochs: (n,) int64 yayın zamanları (Unix saniyesi)
+                - has_time: (n,) bool, yayın zamanı bilinen haberler
+                - incidence: (n, varlık sayısı) CSR haber×varlık matrisi
+                - entity_counts: (n,) her haberdeki farklı varlık sayısı
         """
-        start_time = time.time()
-        candidate_pairs = []
+        valid_news = [news for news in news_list if news.get('embedding_vector') is not None]
         
-        # Yeterli haber yoksa boş liste döndür
-        if len(news_list) < 2:
-            logger.warning("Aday çift oluşturmak için yeterli haber yok")
-            return []
+        if len(valid_news) < 2:
+            logger.warning("Yeterli embedding vektörü bulunamadı")
+            return None
+        
+        features = self._prepare_pair_features(valid_news)
+        features['embeddings'] = self._normalize_embeddings(valid_news)
+        return features
+    
+    def _normalize_embeddings(self, news_list: List[Dict]) -> np.ndarray:
+        """
+        Embedding vektörlerini L2-normalize edilmiş float32 matrise dönüştürür.
         
-        # Embedding vektörlerini numpy dizisine dönüştür
-        embeddings = []
-        ids = []
+        Sıfır vektörler sıfır olarak kalır.
         
-        for news in news_list:
-            if news.get('embedding_vector') is None:
-                continue
+        Args:
+            news_list: 'embedding_vector' alanı olan haber listesi
             
-            embeddings.append(news['embedding_vector'])
-            ids.append(news['id'])
+        Returns:
+            np.ndarray: (n, d) C-sıralı float32 matris
+        """
+        embeddings = np.asarray([news['embedding_vector'] for news in news_list], dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return np.ascontiguousarray(embeddings / norms, dtype=np.float32)
+    
+    def _prepare_pair_features(self, news_list: List[Dict]) -> Dict[str, Any]:
+        """
+        Varlık ve zamansal skorlar için gereken dizileri (embedding hariç) oluşturur.
         
-        if len(embeddings) < 2:
-            logger.warning("Yeterli embedding vektörü bulunamadı")
-            return []
+        Args:
+            news_list: 'id' alanı olan haber listesi; 'entities' ve 'published_at' isteğe bağlıdır
+            
+        Returns:
+            Dict[str, Any]: ids, epochs, has_time, incidence ve entity_counts alanları
+        """
+        epochs, has_time = self._build_epoch_array(news_list)
+        incidence = self._build_entity_incidence(news_list)
+        
+        return {
+            'ids': np.array([news['id'] for news in news_list], dtype=np.int64),
+            'epochs': epochs,
+            'has_time': has_time,
+            'incidence': incidence,
+            'entity_counts': np.diff(incidence.indptr)
+        }
+    
+    def _build_epoch_array(self, news_list: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Yayın tarihlerini int64 Unix zaman damgası dizisine dönüştürür.
         
-        # numpy dizisine dönüştür
-        embeddings_np = np.array(embeddings, dtype=np.float32)
+        Tarihler haber başına bir kez ayrıştırılır. Saat dilimi bilgisi olmayan
+        tarihler UTC kabul edilir.
         
-        # FAISS indeksi oluştur (L2 mesafesi için)
-        dimension = embeddings_np.shape[1]
-        index = faiss.IndexFlatL2(dimension)
+        Args:
+            news_list: Haber listesi
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (epoch dizisi, tarihi bilinen haberler maskesi)
+        """
+        epochs = np.zeros(len(news_list), dtype=np.int64)
+        has_time = np.zeros(len(news_list), dtype=bool)
         
-        # Vektörleri indekse ekle
-        index.add(embeddings_np)
+        for index, news in enumerate(news_list):
+            published_at = news.get('published_at')
+            if not published_at:
+                continue
+            
+            try:
+                if isinstance(published_at, (int, float)):
+                    epochs[index] = int(published_at)
+                else:
+                    if isinstance(published_at, str):
+                        published_at = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
+                    if published_at.tzinfo is None:
+                        published_at = published_at.replace(tzinfo=timezone.utc)
+                    epochs[index] = int(published_at.timestamp())
+                has_time[index] = True
+            except (ValueError, TypeError, AttributeError) as e:
+                logger.warning(f"Haber ID {news.get('id')} için yayın tarihi ayrıştırılamadı: {e}")
+        
+        return epochs, has_time
+    
+    def _build_entity_incidence(self, news_list: List[Dict]) -> sparse.csr_matrix:
+        """
+        Haber×varlık ikili (0/1) seyrek matrisini oluşturur.
         
-        # En yakın k komşuyu bul (kendisi hariç)
-        k = min(self.k_neighbors + 1, len(embeddings))  # +1 çünkü kendisi de sonuçta olacak
-        distances, neighbors = index.search(embeddings_np, k)
+        Varlık adları küçük harfe çevrilerek karşılaştırılır; aynı haberdeki tekrarlanan
+        varlıklar bir kez sayılır.
         
-        # Aday çiftleri oluştur
-        for i, neighbor_indices in enumerate(neighbors):
-            source_id = ids[i]
+        Args:
+            news_list: Haber listesi ('entities' alanı [{'name': ...}, ...] formatında)
             
-            # İlk sonuç kendisi olacaktır, onu atla
-            for j in neighbor_indices[1:]:  # 0. indeksi atla
-                if j < len(ids):  # Geçerli indeks kontrolü
-                    target_id = ids[j]
-                    # Çift sıralamasını normalize et (küçük ID her zaman önce)
-                    if source_id < target_id:
-                        candidate_pairs.append((source_id, target_id))
-                    else:
-                        candidate_pairs.append((target_id, source_id))
-        
-        # Tekrarlanan çiftleri kaldır
-        unique_pairs = list(set(candidate_pairs))
-        
-        logger.info(f"{len(unique_pairs)} aday çift belirlendi (işlem süresi: {time.time() - start_time:.2f}s)")
-        return unique_pairs
+        Returns:
+            sparse.csr_matrix: (haber sayısı, varlık sözlüğü boyutu) CSR matrisi
+        """
+        vocabulary: Dict[str, int] = {}
+        rows = []
+        cols = []
+        
+        for row, news in enumerate(news_list):
+            names = {
+                entity['name'].lower()
+                for entity in (news.get('entities') or [])
+                if entity.get('name')
+            }
+            for name in names:
+                rows.append(row)
+                cols.append(vocabulary.setdefault(name, len(vocabulary)))
+        
+        data = np.ones(len(rows), dtype=np.float32)
+        return sparse.csr_matrix(
+            (data, (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64))),
+            shape=(len(news_list), max(len(vocabulary), 1))
+        )
     
-    def _calculate_semantic_score(self, news1: Dict, news2: Dict) -> float:
+    def _build_search_index(self, embeddings: np.ndarray) -> faiss.Index:
         """
-        İki haber arasındaki semantik benzerlik skorunu hesaplar (kosinüs benzerliği).
+        Normalize edilmiş vektörler için iç çarpım (kosinüs) tabanlı FAISS indeksi oluşturur.
+        
+        Haber sayısı INTERACTION_SCORER_ANN_MIN_SIZE değerinin altındaysa kesin sonuç veren
+        IndexFlatIP kullanılır. Üzerindeyse yapılandırmaya göre yaklaşık arama yapan HNSW
+        veya IVF indeksi kullanılır.
         
         Args:
-            news1: Birinci haber
-            news2: İkinci haber
+            embeddings: (n, d) L2-normalize edilmiş float32 matris
             
         Returns:
-            float: 0-1 arasında semantik benzerlik skoru
+            faiss.Index: Vektörleri eklenmiş arama indeksi
         """
-        # Embedding vektörleri kontrolü
-        if (not news1.get('embedding_vector')) or (not news2.get('embedding_vector')):
-            return 0.0
-        
-        # Vektörleri numpy dizileri olarak al
-        vec1 = np.array(news1['embedding_vector'])
-        vec2 = np.array(news2['embedding_vector'])
-        
-        # Kosinüs benzerliğini hesapla: cos(θ) = (vec1·vec2)/(|vec1|·|vec2|)
-        dot_product = np.dot(vec1, vec2)
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
-        
-        # Sıfıra bölme hatalarını önle
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-            
-        cosine_similarity = dot_product / (norm1 * norm2)
+        n, dimension = embeddings.shape
+        index_type = self.index_type if n >= self.ann_min_size else "flat"
+        
+        if index_type == "hnsw":
+            index = faiss.IndexHNSWFlat(dimension, settings.INTERACTION_SCORER_HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efSearch = max(settings.INTERACTION_SCORER_HNSW_EF_SEARCH, self.k_neighbors + 1)
+        elif index_type == "ivf":
+            # Her küme merkezi için yeterli eğitim örneği olmasını sağla
+            nlist = max(1, min(settings.INTERACTION_SCORER_IVF_NLIST, n // 39))
+            quantizer = faiss.IndexFlatIP(dimension)
+            index = faiss.IndexIVFFlat(quantizer, dimension, nlist, faiss.METRIC_INNER_PRODUCT)
+            index.train(embeddings)
+            index.nprobe = min(settings.INTERACTION_SCORER_IVF_NPROBE, nlist)
+        else:
+            index_type = "flat"
+            index = faiss.IndexFlatIP(dimension)
         
-        # Değerin 0-1 arasında olduğundan emin ol
-        return max(0.0, min(1.0, cosine_similarity))
+        index.add(embeddings)
+        logger.info(f"FAISS arama indeksi oluşturuldu (tür: {index_type}, vektör sayısı: {n})")
+        return index
     
-    def _calculate_entity_score(self, news1: Dict, news2: Dict) -> float:
+    def _find_candidate_pairs(self, features: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
-        İki haber arasındaki varlık benzerliği skorunu hesaplar (Jaccard benzerliği).
+        Her bir haber için en yakın k komşuyu bularak aday çiftlerini oluşturur.
+        
+        FAISS kütüphanesi, büyük vektör setleri arasında etkili benzerlik araması yapar.
+        Böylece O(n²) karşılaştırması yerine vektör tabanlı en yakın komşu araması yapılır.
+        Vektörler normalize edildiğinden indeksin döndürdüğü iç çarpım doğrudan kosinüs
+        benzerliğidir ve semantik skor olarak kullanılır.
         
         Args:
-            news1: Birinci haber
-            news2: İkinci haber
-            
+            features: _prepare_features çıktısı
+                      
         Returns:
-            float: 0-1 arasında varlık benzerlik skoru
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Tekrarsız aday çiftlerin satır indeksleri
+                (kaynak_indeksleri, hedef_indeksleri; kaynak < hedef) ve kosinüs benzerlikleri
         """
-        # Entities listelerini kontrol et
-        if (not news1.get('entities')) or (not news2.get('entities')):
-            return 0.0
+        start_time = time.time()
+        embeddings = features['embeddings']
+        n = len(embeddings)
         
-        # Entity setlerini oluştur
-        entities1 = {entity['name'].lower() for entity in news1['entities']}
-        entities2 = {entity['name'].lower() for entity in news2['entities']}
+        index = self._build_search_index(embeddings)
         
-        # Boş set kontrolü
-        if not entities1 or not entities2:
-            return 0.0
+        # En yakın k komşuyu bul (+1 çünkü kendisi de sonuçta olacak)
+        k = min(self.k_neighbors + 1, n)
+        similarities, neighbors = index.search(embeddings, k)
         
-        # Jaccard benzerliğini hesapla: |A ∩ B| / |A ∪ B|
-        intersection = len(entities1.intersection(entities2))
-        union = len(entities1.union(entities2))
+        sources = np.repeat(np.arange(n, dtype=np.int64), k)
+        targets = neighbors.ravel().astype(np.int64)
+        similarities = similarities.ravel()
         
-        if union == 0:
-            return 0.0
+        # Geçersiz sonuçları (-1) ve haberin kendisini at
+        valid = (targets >= 0) & (targets != sources)
+        sources, targets, similarities = sources[valid], targets[valid], similarities[valid]
+        
+        sources, targets, similarities = self._unique_pairs(sources, targets, similarities, n)
+        
+        logger.info(f"{len(sources)} aday çift belirlendi (işlem süresi: {time.time() - start_time:.2f}s)")
+        return sources, targets, similarities
+    
+    def _unique_pairs(self,
+                      sources: np.ndarray,
+                      targets: np.ndarray,
+                      similarities: np.ndarray,
+                      n: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Çift sıralamasını (kaynak < hedef) normalize eder ve tekrarlanan çiftleri kaldırır.
+        
+        Args:
+            sources: Kaynak satır indeksleri
+            targets: Hedef satır indeksleri
+            similarities: Çiftlerin kosinüs benzerlikleri
+            n: Satır sayısı
             
-        return intersection / union
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Tekrarsız (kaynak, hedef, benzerlik) dizileri
+        """
+        low = np.minimum(sources, targets)
+        high = np.maximum(sources, targets)
+        pair_keys, first_positions = np.unique(low * n + high, return_index=True)
+        return pair_keys // n, pair_keys % n, similarities[first_positions]
+    
+    def _entity_scores(self, features: Dict[str, Any], sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        """
+        Aday çiftler için varlık Jaccard benzerliğini seyrek matris işlemleriyle hesaplar.
+        
+        |A ∩ B|, iki haberin ikili satırlarının eleman bazlı çarpımının toplamıdır;
+        |A ∪ B| = |A| + |B| - |A ∩ B|.
+        
+        Args:
+            features: _prepare_features çıktısı (CSR haber×varlık matrisi)
+            sources: Kaynak satır indeksleri
+            targets: Hedef satır indeksleri
+            
+        Returns:
+            np.ndarray: 0-1 arasında varlık benzerlik skorları
+        """
+        incidence = features['incidence']
+        entity_counts = features['entity_counts']
+        
+        intersection = np.asarray(
+            incidence[sources].multiply(incidence[targets]).sum(axis=1)
+        ).ravel().astype(np.float64)
+        union = entity_counts[sources] + entity_counts[targets] - intersection
+        
+        return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
     
-    def _calculate_temporal_score(self, news1: Dict, news2: Dict) -> float:
+    def _temporal_scores(self, features: Dict[str, Any], sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
         """
-        İki haber arasındaki zamansal yakınlık skorunu hesaplar.
+        Aday çiftler için zamansal yakınlık skorunu hesaplar.
         
         Yayın tarihleri arasındaki farkın üstel azalma formülüyle hesaplanır:
         score = e^(-abs(date_diff) / scale_factor)
+        Tarihlerden biri bilinmiyorsa orta değer (0.5) kullanılır.
         
         Args:
-            news1: Birinci haber
-            news2: İkinci haber
+            features: _prepare_features çıktısı (epoch dizisi)
+            sources: Kaynak satır indeksleri
+            targets: Hedef satır indeksleri
             
         Returns:
-            float: 0-1 arasında zamansal yakınlık skoru (1: çok yakın, 0: çok uzak)
+            np.ndarray: 0-1 arasında zamansal yakınlık skorları (1: çok yakın, 0: çok uzak)
         """
-        # Published_at alanlarını kontrol et
-        if (not news1.get('published_at')) or (not news2.get('published_at')):
-            return 0.5  # Yayın tarihi yoksa orta değer döndür
-        
-        # Tarihleri datetime nesnelerine dönüştür
-        try:
-            if isinstance(news1['published_at'], str):
-                date1 = datetime.fromisoformat(news1['published_at'].replace('Z', '+00:00'))
-            else:
-                date1 = news1['published_at']
-            
-            if isinstance(news2['published_at'], str):
-                date2 = datetime.fromisoformat(news2['published_at'].replace('Z', '+00:00'))
-            else:
-                date2 = news2['published_at']
-            
-            # Tarih farkını gün olarak hesapla
-            date_diff = abs((date1 - date2).total_seconds() / (24 * 3600))
-            
-            # Üstel azalma fonksiyonu kullan
-            # Scale_factor değeri, yarı değer süresidir (bu değerde skor 0.5 olur)
-            # Örneğin 7 gün için: 7 gün fark varsa skor 0.5 olur
-            scale_factor = 7.0
-            temporal_score = np.exp(-date_diff / scale_factor)
-            
-            return temporal_score
-            
-        except (ValueError, TypeError) as e:
-            logger.warning(f"Zamansal skor hesaplama hatası: {e}")
-            return 0.5  # Hata durumunda orta değer döndür
+        epochs = features['epochs']
+        has_time = features['has_time']
+        
+        date_diff_days = np.abs(epochs[sources] - epochs[targets]) / (24 * 3600)
+        temporal_scores = np.exp(-date_diff_days / TEMPORAL_SCALE_DAYS)
+        
+        return np.where(has_time[sources] & has_time[targets], temporal_scores, DEFAULT_TEMPORAL_SCORE)
     
-    def calculate_and_save_scores(self, news_list: List[Dict]) -> None:
+    def calculate_and_save_scores(self, news_list: List[Dict]) -> int:
         """
         Haberler arasındaki etkileşim skorlarını hesaplar ve veritabanına kaydeder.
         
         Args:
             news_list: İşlenecek haberler listesi
+            
+        Returns:
+            int: Kaydedilen kenar sayısı
         """
         start_time = time.time()
         
         logger.info(f"{len(news_list)} haber için etkileşim skorları hesaplanıyor")
         
-        # Haber listesinden indeks oluştur (ID -> haber sözlüğü)
-        news_dict = {news['id']: news for news in news_list}
+        # Yeterli haber yoksa işlem yapma
+        if len(news_list) < 2:
+            logger.warning("Aday çift oluşturmak için yeterli haber yok")
+            return 0
+        
+        features = self._prepare_features(news_list)
+        if features is None:
+            return 0
         
-        # Aday çiftleri bul
-        candidate_pairs = self._find_candidate_pairs(news_list)
+        # Aday çiftleri ve indeksin döndürdüğü kosinüs benzerliklerini bul
+        sources, targets, similarities = self._find_candidate_pairs(features)
         
-        if not candidate_pairs:
-            logger.warning("Etkileşim için uygun aday çift bulunamadı")
-            return
+        return self._score_and_save_pairs(features, sources, targets, similarities, start_time)
+    
+    def calculate_incremental_scores(self, new_news: List[Dict]) -> int:
+        """
+        Yalnızca yeni işlenen haberleri kalıcı vektör indeksine karşı skorlar ve kenarları kaydeder.
+        
+        Adımlar:
+        1. Zaman penceresi (GRAPH_WINDOW_HOURS) dışına çıkan haberler indeksten ID ile silinir.
+        2. Yeni haberler indekse eklenir (yeniden işlenmiş haberlerin vektörü güncellenir).
+        3. Her yeni haber için tüm penceredeki en yakın k komşu aranır; eski haberlerin varlık
+           ve tarih bilgisi indeks meta verisinden alınır.
+        4. Kenarlar upsert edilir, indeks ve watermark diske yazılır.
         
-        # Her çift için skorları hesapla
-        edge_records = []
-        skipped_count = 0
+        Böylece bir çalıştırmanın maliyeti pencere boyutunun karesiyle değil, yeni haber
+        sayısıyla orantılıdır.
         
-        for source_id, target_id in candidate_pairs:
-            # Haberleri bul
-            source_news = news_dict.get(source_id)
-            target_news = news_dict.get(target_id)
+        Args:
+            new_news: fetch_newly_processed_news çıktısı ('processed_at' alanı watermark için kullanılır)
             
-            if not source_news or not target_news:
-                skipped_count += 1
-                continue
+        Returns:
+            int: Kaydedilen kenar sayısı
+        """
+        start_time = time.time()
+        vector_index = self.vector_index
+        
+        cutoff_epoch = time.time() - settings.GRAPH_WINDOW_HOURS * 3600
+        vector_index.expire(cutoff_epoch)
+        
+        valid_news = [news for news in new_news if news.get('embedding_vector') is not None]
+        saved_edges = 0
+        
+        if valid_news:
+            new_features = self._prepare_pair_features(valid_news)
+            embeddings = self._normalize_embeddings(valid_news)
             
-            # Skorları hesapla
-            semantic_score = self._calculate_semantic_score(source_news, target_news)
-            entity_score = self._calculate_entity_score(source_news, target_news)
-            temporal_score = self._calculate_temporal_score(source_news, target_news)
+            # Yayın tarihi pencere dışında kalan haberler indekse eklenmez
+            in_window = ~new_features['has_time'] | (new_features['epochs'] >= cutoff_epoch)
+            new_ids = new_features['ids'][in_window]
+            embeddings = embeddings[in_window]
             
-            # Toplam skoru ağırlıklı ortalama ile hesapla
-            total_score = (
-                self.semantic_weight * semantic_score +
-                self.entity_weight * entity_score +
-                self.temporal_weight * temporal_score
-            )
+            vector_index.add(new_ids, embeddings, [
+                {
+                    'published_at': int(new_features['epochs'][row]) if new_features['has_time'][row] else None,
+                    'entities': sorted({
+                        entity['name'].lower()
+                        for entity in (valid_news[row].get('entities') or [])
+                        if entity.get('name')
+                    })
+                }
+                for row in np.flatnonzero(in_window)
+            ])
+            
+            # Yeni haberleri tüm pencereye karşı ara (+1 çünkü haberin kendisi de sonuçta olacak)
+            similarities, neighbor_ids = vector_index.search(embeddings, self.k_neighbors + 1)
+            k = neighbor_ids.shape[1]
             
-            # Eşik değerini geçenleri kaydet
-            if total_score >= self.interaction_threshold:
-                edge_records.append({
-                    'source_news_id': source_id,
-                    'target_news_id': target_id,
-                    'semantic_score': float(semantic_score),
-                    'entity_score': float(entity_score),
-                    'temporal_score': float(temporal_score),
-                    'total_score': float(total_score)
-                })
+            if k > 0:
+                source_ids = np.repeat(new_ids, k)
+                target_ids = neighbor_ids.ravel().astype(np.int64)
+                similarities = similarities.ravel()
+                
+                valid = (target_ids >= 0) & (target_ids != source_ids)
+                source_ids, target_ids, similarities = source_ids[valid], target_ids[valid], similarities[valid]
+                
+                # Çiftlerde geçen haberlerin meta verisinden özellik dizilerini oluştur
+                pair_ids = np.unique(np.concatenate([source_ids, target_ids]))
+                features = self._prepare_pair_features(vector_index.get_metadata(pair_ids))
+                
+                sources, targets, similarities = self._unique_pairs(
+                    np.searchsorted(pair_ids, source_ids),
+                    np.searchsorted(pair_ids, target_ids),
+                    similarities,
+                    len(pair_ids)
+                )
+                logger.info(f"{len(new_ids)} yeni haber için {len(vector_index)} haberlik pencerede "
+                            f"{len(sources)} aday çift belirlendi")
+                
+                saved_edges = self._score_and_save_pairs(features, sources, targets, similarities, start_time)
+        
+        # Watermark'ı çekilen son habere ilerlet (skorlanamayan haberler de tekrar çekilmez)
+        last_news = new_news[-1] if new_news else None
+        if last_news is not None and last_news.get('processed_at') is not None:
+            vector_index.watermark = (last_news['processed_at'], int(last_news['id']))
+        vector_index.save()
+        
+        return saved_edges
+    
+    def _score_and_save_pairs(self,
+                              features: Dict[str, Any],
+                              sources: np.ndarray,
+                              targets: np.ndarray,
+                              similarities: np.ndarray,
+                              start_time: float) -> int:
+        """
+        Aday çiftlerin skorlarını dizi işlemleriyle hesaplar ve eşiği geçenleri kaydeder.
+        
+        Args:
+            features: Özellik dizileri (ids, epochs, has_time, incidence, entity_counts)
+            sources: Kaynak satır indeksleri
+            targets: Hedef satır indeksleri
+            similarities: Çiftlerin kosinüs benzerlikleri
+            start_time: Loglanacak işlem süresinin başlangıcı
+            
+        Returns:
+            int: Kaydedilen kenar sayısı
+        """
+        if len(sources) == 0:
+            logger.warning("Etkileşim için uygun aday çift bulunamadı")
+            return 0
+        
+        # Tüm çiftlerin skorlarını dizi işlemleriyle hesapla
+        semantic_scores = np.clip(similarities, 0.0, 1.0)
+        entity_scores = self._entity_scores(features, sources, targets)
+        temporal_scores = self._temporal_scores(features, sources, targets)
+        
+        # Toplam skoru ağırlıklı ortalama ile hesapla
+        total_scores = (
+            self.semantic_weight * semantic_scores +
+            self.entity_weight * entity_scores +
+            self.temporal_weight * temporal_scores
+        )
+        
+        edge_records = self._build_edge_records(
+            features, sources, targets, semantic_scores, entity_scores, temporal_scores, total_scores
+        )
         
         # Veritabanına toplu olarak kaydet
         if edge_records:
             self.persistence_manager.save_graph_edges(edge_records)
-            logger.info(f"{len(edge_records)} kenar kaydedildi (toplam çift: {len(candidate_pairs)}, "
-                      f"atlanan: {skipped_count}, işlem süresi: {time.time() - start_time:.2f}s)")
+            logger.info(f"{len(edge_records)} kenar kaydedildi (toplam çift: {len(sources)}, "
+                      f"işlem süresi: {time.time() - start_time:.2f}s)")
         else:
             logger.warning("Eşik değerini geçen etkileşim bulunamadı")
+        
+        return len(edge_records)
+    
+    def _build_edge_records(self,
+                            features: Dict[str, Any],
+                            sources: np.ndarray,
+                            targets: np.ndarray,
+                            semantic_scores: np.ndarray,
+                            entity_scores: np.ndarray,
+                            temporal_scores: np.ndarray,
+                            total_scores: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Eşik değerini geçen çiftler için graph_edges kayıtlarını oluşturur.
+        
+        Returns:
+            List[Dict[str, Any]]: save_graph_edges formatında kenar kayıtları
+                                  (küçük haber ID'si her zaman kaynak olarak yazılır)
+        """
+        mask = total_scores >= self.interaction_threshold
+        ids = features['ids']
+        source_ids = np.minimum(ids[sources[mask]], ids[targets[mask]])
+        target_ids = np.maximum(ids[sources[mask]], ids[targets[mask]])
+        
+        return [
+            {
+                'source_news_id': int(source_id),
+                'target_news_id': int(target_id),
+                'semantic_score': float(semantic_score),
+                'entity_score': float(entity_score),
+                'temporal_score': float(temporal_score),
+                'total_score': float(total_score)
+            }
+            for source_id, target_id, semantic_score, entity_score, temporal_score, total_score in zip(
+                source_ids, target_ids, semantic_scores[mask], entity_scores[mask],
+                temporal_scores[mask], total_scores[mask]
+            )
+        ]
@@ -0,0 +1,289 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+News Vector Index Module
+
+Bu modül, etkileşim skorları daha önce hesaplanmış haberlerin embedding vektörlerini
+diskte kalıcı olarak saklayan NewsVectorIndex sınıfını içerir.
+
+İndeks, haber ID'leri ile eşlenmiş bir FAISS iç çarpım indeksidir (IndexIDMap2 +
+IndexFlatIP). Her haber için yayın zamanı ve varlık adları yan dosyada tutulur; böylece
+yeni haberler, eski haberlerin verileri veritabanından tekrar çekilmeden tüm zaman
+penceresine karşı skorlanabilir. Pencere dışına çıkan haberler ID ile indeksten silinir.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import faiss
+
+from ..core.config import settings
+from ..core.paths import get_cache_dir
+
+# Logger yapılandırması
+logger = logging.getLogger(__name__)
+
+INDEX_FILE_NAME = "news_vectors.faiss"
+METADATA_FILE_NAME = "news_vectors.meta.json"
+
+
+class NewsVectorIndex:
+    """
+    Skorlanmış haberlerin vektörlerini ve skorlama meta verilerini tutan kalıcı FAISS indeksi.
+
+    Meta veri (haber başına):
+    - published_at: Yayın zamanı (Unix saniyesi) veya None
+    - indexed_at: İndekse eklenme zamanı (yayın zamanı bilinmeyen haberlerin pencereden
+      çıkarılması için kullanılır)
+    - entities: Küçük harfe çevrilmiş varlık adları
+
+    Watermark, indekse en son eklenen haberin (işlenme zamanı, haber ID'si) ikilisidir ve
+    bir sonraki çalıştırmada yalnızca bundan sonra işlenen haberlerin çekilmesini sağlar.
+    """
+
+    def __init__(self, index_dir: Optional[Path] = None):
+        """
+        NewsVectorIndex sınıfını başlatır ve diskteki indeksi (varsa) yükler.
+
+        Args:
+            index_dir: İndeks dosyalarının dizini. None ise ayarlardan veya
+                       varsayılan önbellek dizininden alınır.
+        """
+        if index_dir is None:
+            index_dir = Path(settings.NEWS_VECTOR_INDEX_DIR) if settings.NEWS_VECTOR_INDEX_DIR else get_cache_dir("news_index")
+        self.index_dir = Path(index_dir)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.index_dir / INDEX_FILE_NAME
+        self.metadata_path = self.index_dir / METADATA_FILE_NAME
+
+        self.index: Optional[faiss.Index] = None
+        self.metadata: Dict[int, Dict[str, Any]] = {}
+        self.watermark: Optional[Tuple[datetime, int]] = None
+        self._lock = threading.RLock()
+
+        self.load()
+
+    def __len__(self) -> int:
+        return self.index.ntotal if self.index is not None else 0
+
+    def __contains__(self, news_id: int) -> bool:
+        return int(news_id) in self.metadata
+
+    @property
+    def dimension(self) -> Optional[int]:
+        """İndeksteki vektörlerin boyutu (indeks boşsa None)."""
+        return self.index.d if self.index is not None else None
+
+    def load(self) -> bool:
+        """
+        İndeksi ve meta veriyi diskten yükler. Dosyalar tutarsızsa indeks sıfırlanır.
+
+        Returns:
+            bool: Mevcut bir indeks yüklendiyse True
+        """
+        with self._lock:
+            if not self.index_path.exists() or not self.metadata_path.exists():
+                self.reset()
+                return False
+
+            try:
+                index = faiss.read_index(str(self.index_path))
+                with open(self.metadata_path, "r", encoding="utf-8") as f:
+                    payload = json.load(f)
+
+                metadata = {int(news_id): item for news_id, item in payload.get("items", {}).items()}
+                if index.ntotal != len(metadata):
+                    logger.warning(f"Haber vektör indeksi ile meta veri tutarsız "
+                                   f"({index.ntotal} vektör, {len(metadata)} kayıt), indeks sıfırlanıyor")
+                    self.reset()
+                    return False
+
+                watermark = payload.get("watermark")
+                self.index = index
+                self.metadata = metadata
+                self.watermark = (
+                    (datetime.fromisoformat(watermark["processed_at"]), int(watermark["news_id"]))
+                    if watermark else None
+                )
+                logger.info(f"Haber vektör indeksi yüklendi: {self.index_path} ({len(self.metadata)} haber)")
+                return True
+
+            except Exception as e:
+                logger.error(f"Haber vektör indeksi yüklenemedi, indeks sıfırlanıyor: {e}")
+                self.reset()
+                return False
+
+    def save(self) -> bool:
+        """
+        İndeksi ve meta veriyi diske yazar. Dosyalar önce geçici dosyaya yazılıp
+        ardından yerine taşındığından yarım kalan yazma mevcut indeksi bozmaz.
+
+        Returns:
+            bool: Kayıt başarılıysa True
+        """
+        with self._lock:
+            if self.index is None:
+                return False
+
+            try:
+                payload = {
+                    "dimension": self.index.d,
+                    "watermark": (
+                        {"processed_at": self.watermark[0].isoformat(), "news_id": self.watermark[1]}
+                        if self.watermark else None
+                    ),
+                    "items": {str(news_id): item for news_id, item in self.metadata.items()}
+                }
+
+                index_tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+                metadata_tmp = self.metadata_path.with_name(self.metadata_path.name + ".tmp")
+                faiss.write_index(self.index, str(index_tmp))
+                with open(metadata_tmp, "w", encoding="utf-8") as f:
+                    json.dump(payload, f, ensure_ascii=False)
+
+                os.replace(index_tmp, self.index_path)
+                os.replace(metadata_tmp, self.metadata_path)
+                return True
+
+            except Exception as e:
+                logger.error(f"Haber vektör indeksi kaydedilemedi: {e}")
+                return False
+
+    def reset(self, dimension: Optional[int] = None) -> None:
+        """
+        İndeksi boşaltır. Watermark da sıfırlandığından bir sonraki çalıştırmada
+        zaman penceresindeki tüm haberler yeniden eklenir.
+
+        Args:
+            dimension: Yeni indeksin vektör boyutu. None ise indeks ilk eklemede oluşturulur.
+        """
+        with self._lock:
+            self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(dimension)) if dimension else None
+            self.metadata = {}
+            self.watermark = None
+
+    def add(self, news_ids: np.ndarray, embeddings: np.ndarray, metadata: List[Dict[str, Any]]) -> None:
+        """
+        Haberleri indekse ekler. İndekste zaten bulunan haberler (yeniden işlenmiş haberler)
+        önce silinir, böylece güncel vektörleri kullanılır.
+
+        Args:
+            news_ids: (n,) int64 haber ID'leri
+            embeddings: (n, d) L2-normalize edilmiş float32 embedding matrisi
+            metadata: Her haber için {'published_at', 'entities'} sözlükleri
+        """
+        if len(news_ids) == 0:
+            return
+
+        news_ids = np.asarray(news_ids, dtype=np.int64)
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+
+        with self._lock:
+            if self.index is not None and self.index.d != embeddings.shape[1]:
+                logger.warning(f"Embedding boyutu değişmiş ({self.index.d} -> {embeddings.shape[1]}), "
+                               f"haber vektör indeksi sıfırlanıyor")
+                self.reset()
+            if self.index is None:
+                self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(embeddings.shape[1]))
+
+            existing = [news_id for news_id in news_ids.tolist() if news_id in self.metadata]
+            if existing:
+                self.remove(existing)
+
+            self.index.add_with_ids(embeddings, news_ids)
+            indexed_at = int(time.time())
+            for news_id, item in zip(news_ids.tolist(), metadata):
+                self.metadata[news_id] = {
+                    "published_at": item.get("published_at"),
+                    "indexed_at": indexed_at,
+                    "entities": list(item.get("entities") or [])
+                }
+
+    def remove(self, news_ids: List[int]) -> int:
+        """
+        Haberleri ID ile indeksten siler.
+
+        Args:
+            news_ids: Silinecek haber ID'leri
+
+        Returns:
+            int: Silinen vektör sayısı
+        """
+        with self._lock:
+            if self.index is None or not news_ids:
+                return 0
+
+            removed = self.index.remove_ids(np.asarray(news_ids, dtype=np.int64))
+            for news_id in news_ids:
+                self.metadata.pop(int(news_id), None)
+            return int(removed)
+
+    def expire(self, cutoff_epoch: float) -> int:
+        """
+        Zaman penceresinin dışında kalan haberleri indeksten siler.
+
+        Yayın zamanı bilinmeyen haberler için indekse eklenme zamanı kullanılır.
+
+        Args:
+            cutoff_epoch: Pencerenin başlangıcı (Unix saniyesi)
+
+        Returns:
+            int: Silinen haber sayısı
+        """
+        with self._lock:
+            expired = [
+                news_id for news_id, item in self.metadata.items()
+                if (item.get("published_at") or item.get("indexed_at") or 0) < cutoff_epoch
+            ]
+            removed = self.remove(expired)
+            if removed:
+                logger.info(f"Zaman penceresi dışındaki {removed} haber indeksten çıkarıldı")
+            return removed
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sorgu vektörlerine en yakın k haberi tüm indeks içinde arar.
+
+        Args:
+            queries: (m, d) L2-normalize edilmiş float32 sorgu matrisi
+            k: Sorgu başına döndürülecek komşu sayısı
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (m, k) kosinüs benzerlikleri ve haber ID'leri
+                                           (bulunamayan komşular için ID -1)
+        """
+        with self._lock:
+            if self.index is None or self.index.ntotal == 0 or len(queries) == 0:
+                return np.zeros((len(queries), 0), dtype=np.float32), np.zeros((len(queries), 0), dtype=np.int64)
+
+            k = min(k, self.index.ntotal)
+            return self.index.search(np.ascontiguousarray(queries, dtype=np.float32), k)
+
+    def get_metadata(self, news_ids: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Haberlerin skorlama meta verisini _prepare_features ile uyumlu formatta döndürür.
+
+        Args:
+            news_ids: Haber ID'leri
+
+        Returns:
+            List[Dict[str, Any]]: {'id', 'published_at', 'entities': [{'name': ...}]} sözlükleri
+        """
+        with self._lock:
+            records = []
+            for news_id in np.asarray(news_ids, dtype=np.int64).tolist():
+                item = self.metadata.get(news_id, {})
+                records.append({
+                    "id": news_id,
+                    "published_at": item.get("published_at"),
+                    "entities": [{"name": name} for name in item.get("entities", [])]
+                })
+            return records
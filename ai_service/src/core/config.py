@@ -42,7 +42,86 @@ class Settings(BaseSettings):
     # Feature Extraction Models
     EMBEDDING_MODEL_NAME: str = "all-MiniLM-L6-v2"
     SPACY_MODEL_NAME: str = "en_core_web_sm"
-    
+
+    # Phase 1 Batch Processing Settings
+    PHASE1_BATCH_SIZE: int = 64  # NLP aşamasına tek seferde verilecek haber sayısı
+    NLP_BATCH_SIZE: int = 32  # spaCy nlp.pipe batch boyutu
+    NLP_N_PROCESS: int = 1  # spaCy nlp.pipe süreç sayısı (CPU çekirdek sayısına göre artırılabilir)
+    EMBEDDING_BATCH_SIZE: int = 32  # SentenceTransformer encode batch boyutu
+    PHASE1_BATCHED_WRITES: bool = True  # Sonuçları BatchedFeatureWriter ile toplu kaydet
+    PHASE1_WRITE_BATCH_SIZE: int = 50  # Tek işlemde (transaction) yazılacak haber sayısı
+    PHASE1_WRITE_FLUSH_SECONDS: float = 2.0  # Bir sonucun yazılmadan önce en fazla bekleme süresi
+
+    # Surprise Score Settings
+    SURPRISE_CALENDAR_LOOKBACK_DAYS: int = 120  # Bellek içi ekonomik takvime yüklenecek geçmiş gün sayısı
+    SURPRISE_EVENT_WINDOW_DAYS: int = 2  # Habere en fazla bu kadar gün uzaklıktaki olaylar eşleştirilir
+
+    # Embedding Cache Settings
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_DIR: Optional[str] = None  # None ise ai_service/.cache/embeddings
+    EMBEDDING_CACHE_CAPACITY: int = 100000  # Önbellekte tutulacak maksimum vektör sayısı
+
+    # Article Download Settings
+    DOWNLOAD_TIMEOUT: float = 10.0  # İstek başına zaman aşımı (saniye)
+    DOWNLOAD_MAX_CONCURRENCY: int = 100  # Toplam eşzamanlı indirme sayısı
+    DOWNLOAD_PER_DOMAIN_CONCURRENCY: int = 6  # Alan adı başına eşzamanlı indirme sayısı
+    DOWNLOAD_HTTP2: bool = True  # 'h2' paketi kuruluysa HTTP/2 kullan
+
+    # Scrape Cache Settings
+    SCRAPE_CACHE_ENABLED: bool = True
+    SCRAPE_CACHE_PATH: Optional[str] = None  # None ise ai_service/.cache/scrape_cache.sqlite3
+    SCRAPE_CACHE_TTL_SECONDS: int = 86400  # Başarılı kayıtlar için tazelik süresi (1 gün)
+    SCRAPE_CACHE_FAILURE_TTL_SECONDS: int = 21600  # Başarısız indirmeler için tazelik süresi (6 saat)
+    SCRAPE_CACHE_MAX_BYTES: int = 512 * 1024 * 1024  # Önbelleğin maksimum boyutu (512 MB)
+
+    # LLM Concurrency Settings
+    CLUSTER_MAX_CONCURRENCY: int = 8  # Faz 3/4'te aynı anda işlenecek küme sayısı
+    LLM_REQUESTS_PER_MINUTE: int = 60  # Tüm LLM çağrıları için dakika başına istek sınırı (0: sınırsız)
+    LLM_TOKENS_PER_MINUTE: int = 250000  # Tüm LLM çağrıları için dakika başına tahmini token sınırı (0: sınırsız)
+    LLM_CALL_TIMEOUT_SECONDS: float = 120.0  # Yeniden denemeler dahil tek bir LLM çağrısının toplam süresi
+    LLM_MAX_RETRIES: int = 4  # 429/503 gibi geçici hatalarda yeniden deneme sayısı
+    LLM_RETRY_BASE_SECONDS: float = 2.0  # Üstel geri çekilmenin başlangıç süresi
+    LLM_RETRY_MAX_SECONDS: float = 60.0  # Tek bir yeniden deneme beklemesinin üst sınırı
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 5  # Devre kesicinin açılması için art arda hata sayısı
+    LLM_CIRCUIT_RESET_SECONDS: float = 30.0  # Açık devrenin deneme çağrısına izin vermeden önce bekleme süresi
+
+    # LLM Response Cache Settings
+    LLM_CACHE_ENABLED: bool = True  # Yanıtları llm_interactions tablosunda önbelleğe al
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600  # Kayıtlı yanıtların geçerlilik süresi (7 gün)
+
+    # Asset Filter Batch Settings
+    ASSET_FILTER_BATCH_MODE: bool = True  # Faz 1'de varlık filtrelemeyi birden fazla haber için tek çağrıda yap
+    ASSET_FILTER_BATCH_MAX_ITEMS: int = 8  # Bir LLM çağrısındaki maksimum haber sayısı
+    ASSET_FILTER_MAX_PROMPT_TOKENS: int = 24000  # Toplu prompt için tahmini token bütçesi
+    ASSET_FILTER_TEXT_MAX_TOKENS: int = 750  # Haber başına metin token bütçesi (~3000 karakter)
+    ASSET_FILTER_MAX_CONCURRENCY: int = 4  # Eşzamanlı toplu filtreleme çağrısı sayısı
+    ASSET_FILTER_MAX_RETRY_DEPTH: int = 3  # Eksik/boş toplu yanıtlarda grubu bölerek yeniden deneme derinliği
+
+    # Story Grouping (Aşama 1) Prompt Settings
+    GROUPING_MAX_PROMPT_TOKENS: int = 30000  # Bir gruplama çağrısındaki haber verisi için token bütçesi
+    GROUPING_LEAD_TOKENS: int = 120  # Haber başına kısaltılmış giriş metni (lead) token bütçesi
+    GROUPING_MAX_KEYWORDS: int = 8  # Haber başına prompt'a eklenecek anahtar kelime sayısı
+    GROUPING_MERGE_THRESHOLD: float = 0.80  # Parçalar arası grup birleştirme için kosinüs benzerliği eşiği
+    ANALYSIS_MAX_NEWS: int = 500  # Tek analiz çalıştırmasında hazırlanacak maksimum haber sayısı
+    STAGE2_MAX_CONCURRENCY: int = 4  # Aşama 2'de (detaylı analiz) aynı anda analiz edilecek grup sayısı
+
+    # Analysis Job Settings
+    JOB_HEARTBEAT_SECONDS: float = 30.0  # Çalışan işin heartbeat güncelleme aralığı
+    JOB_STALE_SECONDS: float = 180.0  # Bu süre heartbeat göndermeyen aktif iş zaman aşımına uğramış sayılır
+    JOB_CANCEL_WAIT_SECONDS: float = 5.0  # İptal isteğinde işin durmasının bekleneceği süre
+    JOB_FINISH_RETRIES: int = 3  # İşin bitiş durumunu yazma deneme sayısı
+
+    # Result Sink (Spring Boot'a akışlı gönderim) Settings
+    RESULT_SINK_ENABLED: bool = True  # Hikayeleri tamamlandıkça partiler halinde gönder
+    RESULT_SINK_BATCH_SIZE: int = 3  # Parti başına hikaye sayısı
+    RESULT_SINK_FLUSH_SECONDS: float = 10.0  # Eksik partinin en fazla bekletileceği süre (saniye)
+    RESULT_SINK_GZIP: bool = True  # İstek gövdesini gzip ile sıkıştır
+    RESULT_SINK_MAX_RETRIES: int = 3  # Parti başına yeniden deneme sayısı (aynı Idempotency-Key ile)
+    RESULT_SINK_TIMEOUT_SECONDS: float = 30.0  # HTTP istek zaman aşımı (saniye)
+
+    # Story Enrichment Settings
+    ENRICHMENT_SINGLE_CALL: bool = True  # Etiket ve gerekçeyi tek LLM çağrısında üret
+
     # Interaction Scorer Settings
     SEMANTIC_SIMILARITY_WEIGHT: float = 0.50
     ENTITY_SIMILARITY_WEIGHT: float = 0.30
@@ -50,7 +129,21 @@ class Settings(BaseSettings):
     TOP_K_NEAREST: int = 50  # Yakın komşu sayısı
     INTERACTION_THRESHOLD: float = 0.65  # Graf kenarları için eşik değer
     INTERACTION_SCORER_K_NEIGHBORS: int = 10
-    
+    INTERACTION_SCORER_INDEX_TYPE: str = "hnsw"  # Büyük veri setleri için: "flat", "hnsw" veya "ivf"
+    INTERACTION_SCORER_ANN_MIN_SIZE: int = 10000  # Bu sayının altında her zaman kesin (flat) arama yapılır
+    INTERACTION_SCORER_HNSW_M: int = 32
+    INTERACTION_SCORER_HNSW_EF_SEARCH: int = 64
+    INTERACTION_SCORER_IVF_NLIST: int = 256
+    INTERACTION_SCORER_IVF_NPROBE: int = 8
+
+    # Incremental Graph Settings
+    INCREMENTAL_GRAPH_EDGES: bool = True  # Yalnızca yeni işlenen haberleri kalıcı indekse karşı skorla
+    GRAPH_WINDOW_HOURS: int = 168  # Etkileşim penceresi; daha eski haberler indeksten çıkarılır (7 gün)
+    GRAPH_INCREMENTAL_BATCH_SIZE: int = 1000  # Tek seferde çekilip skorlanacak yeni haber sayısı
+    NEWS_VECTOR_INDEX_DIR: Optional[str] = None  # None ise ai_service/.cache/news_index
+    GRAPH_WINDOW_MAX_NEWS: int = 5000  # Tam yeniden skorlamada penceredeki en yeni haberlerden alınacak sayı
+    PROCESSED_NEWS_CHUNK_SIZE: int = 500  # Sunucu taraflı imleçten parça başına çekilecek haber sayısı
+
     @property
     def DATABASE_URL(self) -> str:
         """PostgreSQL bağlantı URI'sini oluşturur."""
@@ -0,0 +1,298 @@
+"""
+Embedding Service Module
+
+Bu modül, metin gömme vektörlerini üreten ve süreç genelinde paylaşılan
+EmbeddingService sınıfını içerir. SentenceTransformer modeli süreç başına yalnızca
+bir kez yüklenir; FeatureExtractor ve StoryProcessor aynı servisi kullanır.
+
+Üretilen vektörler, (normalize edilmiş metnin sha256 özeti, model adı) anahtarıyla
+kalıcı bir önbellekte (EmbeddingCache) saklanır. Böylece yeniden işleme, tekrar
+denemeler ve aynı içeriğe sahip sendikasyon haberleri için model tekrar çalıştırılmaz.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import torch
+from sentence_transformers import SentenceTransformer
+
+from .config import settings
+from .paths import get_cache_dir
+
+# Logger yapılandırması
+logger = logging.getLogger(__name__)
+
+# Anahtar olarak kullanılan sha256 özetinin bayt uzunluğu
+KEY_SIZE = 32
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Metni önbellek anahtarı üretmek için normalize eder (Unicode NFC, boşluk sadeleştirme).
+
+    Args:
+        text: Normalize edilecek metin
+
+    Returns:
+        str: Normalize edilmiş metin
+    """
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def make_cache_key(text: str, model_name: str) -> bytes:
+    """
+    Metin ve model adı için önbellek anahtarını üretir.
+
+    Args:
+        text: Gömme vektörü üretilecek metin
+        model_name: Embedding modelinin adı
+
+    Returns:
+        bytes: 32 baytlık sha256 özeti
+    """
+    payload = f"{model_name}\x00{normalize_text(text)}".encode("utf-8")
+    return hashlib.sha256(payload).digest()
+
+
+class EmbeddingCache:
+    """
+    Gömme vektörlerini bellek eşlemeli (memory-mapped) dosyalarda saklayan LRU önbellek.
+
+    Üç dosya kullanılır:
+    - <model>.f32: (kapasite, boyut) float32 vektör matrisi
+    - <model>.keys: Her satırın anahtarını (sha256) tutan indeks dosyası
+    - <model>.access: Her satırın son erişim zamanı (LRU için; 0 = boş satır)
+
+    Okuma sırasında satırdaki anahtar tekrar doğrulandığından, dosyayı başka bir sürecin
+    güncellemesi yanlış vektör döndürülmesine yol açmaz; yalnızca önbellek ıskası olur.
+    """
+
+    def __init__(self, cache_dir: Path, model_name: str, dimension: int, capacity: int):
+        """
+        EmbeddingCache sınıfını başlatır ve mevcut dosyaları yükler.
+
+        Args:
+            cache_dir: Önbellek dosyalarının bulunduğu dizin
+            model_name: Embedding modelinin adı (dosya adlarında kullanılır)
+            dimension: Vektör boyutu
+            capacity: Saklanabilecek maksimum vektör sayısı
+        """
+        self.model_name = model_name
+        self.dimension = dimension
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", model_name)
+        base_path = Path(cache_dir) / f"{safe_name}-{dimension}d"
+        self._vectors = self._open_memmap(Path(f"{base_path}.f32"), np.float32, (capacity, dimension))
+        self._keys = self._open_memmap(Path(f"{base_path}.keys"), np.uint8, (capacity, KEY_SIZE))
+        self._access = self._open_memmap(Path(f"{base_path}.access"), np.float64, (capacity,))
+
+        # Anahtar -> satır indeksini dosyadan yeniden oluştur
+        self._index: Dict[bytes, int] = {}
+        for row in np.flatnonzero(self._access > 0):
+            self._index[self._keys[row].tobytes()] = int(row)
+
+        logger.info(f"Embedding önbelleği yüklendi: {base_path} ({len(self._index)}/{capacity} kayıt)")
+
+    @staticmethod
+    def _open_memmap(path: Path, dtype, shape) -> np.memmap:
+        """Dosya varsa ve boyutu uyuyorsa açar, aksi halde sıfırlarla oluşturur."""
+        expected_size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        mode = "r+" if path.exists() and path.stat().st_size == expected_size else "w+"
+        return np.memmap(path, dtype=dtype, mode=mode, shape=shape)
+
+    def get_many(self, keys: List[bytes]) -> Dict[int, np.ndarray]:
+        """
+        Anahtarlar için önbellekteki vektörleri getirir.
+
+        Args:
+            keys: Aranacak anahtarlar
+
+        Returns:
+            Dict[int, np.ndarray]: Girdi listesindeki konum -> vektör (bulunanlar için)
+        """
+        found = {}
+        now = time.time()
+        with self._lock:
+            for position, key in enumerate(keys):
+                row = self._index.get(key)
+                if row is not None and self._keys[row].tobytes() == key:
+                    found[position] = np.array(self._vectors[row])
+                    self._access[row] = now
+                elif row is not None:
+                    # Satır başka bir süreç tarafından yeniden kullanılmış
+                    del self._index[key]
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, keys: List[bytes], vectors: np.ndarray) -> None:
+        """
+        Vektörleri önbelleğe yazar; kapasite doluysa en uzun süredir erişilmeyen satırlar yeniden kullanılır.
+
+        Args:
+            keys: Vektörlerin anahtarları
+            vectors: (len(keys), boyut) vektör matrisi
+        """
+        if not keys:
+            return
+
+        with self._lock:
+            new_keys = []
+            new_vectors = []
+            seen = set()
+            for key, vector in zip(keys, vectors):
+                if key not in self._index and key not in seen:
+                    seen.add(key)
+                    new_keys.append(key)
+                    new_vectors.append(vector)
+
+            if not new_keys:
+                return
+
+            # Boş satırlar önce, ardından en eski erişilenler (LRU)
+            count = min(len(new_keys), self.capacity)
+            rows = np.argpartition(self._access, count - 1)[:count] if count < self.capacity else np.arange(self.capacity)
+
+            now = time.time()
+            for row, key, vector in zip(rows, new_keys[:count], new_vectors[:count]):
+                row = int(row)
+                if self._access[row] > 0:
+                    self._index.pop(self._keys[row].tobytes(), None)
+                self._vectors[row] = vector
+                self._keys[row] = np.frombuffer(key, dtype=np.uint8)
+                self._access[row] = now
+                self._index[key] = row
+
+    def flush(self) -> None:
+        """Bellek eşlemeli dosyalardaki değişiklikleri diske yazar."""
+        with self._lock:
+            self._vectors.flush()
+            self._keys.flush()
+            self._access.flush()
+
+    def stats(self) -> Dict[str, int]:
+        """Önbellek isabet/ıska sayaçlarını ve doluluk bilgisini döndürür."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._index), "capacity": self.capacity}
+
+
+class EmbeddingService:
+    """
+    SentenceTransformer modelini bir kez yükleyip tüm bileşenlere gömme vektörü sağlayan servis.
+
+    encode çağrısı önce önbelleğe bakar, yalnızca önbellekte bulunmayan metinleri tek bir
+    model çağrısıyla kodlar ve sonuçları önbelleğe yazar.
+    """
+
+    def __init__(self, model_name: Optional[str] = None, cache_enabled: Optional[bool] = None):
+        """
+        EmbeddingService sınıfını başlatır ve modeli yükler.
+
+        Args:
+            model_name: Embedding modelinin adı. None ise ayarlardan alınır.
+            cache_enabled: Kalıcı önbellek kullanılsın mı? None ise ayarlardan alınır.
+        """
+        self.model_name = model_name or settings.EMBEDDING_MODEL_NAME
+
+        logger.info(f"Embedding modeli yükleniyor: {self.model_name}")
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.model = SentenceTransformer(self.model_name).to(self.device)
+        self.dimension = self.model.get_sentence_embedding_dimension()
+        logger.info(f"Embedding modeli başarıyla yüklendi (Cihaz: {self.device}, boyut: {self.dimension})")
+
+        self.cache = None
+        use_cache = settings.EMBEDDING_CACHE_ENABLED if cache_enabled is None else cache_enabled
+        if use_cache:
+            try:
+                self.cache = EmbeddingCache(
+                    cache_dir=Path(settings.EMBEDDING_CACHE_DIR) if settings.EMBEDDING_CACHE_DIR else get_cache_dir("embeddings"),
+                    model_name=self.model_name,
+                    dimension=self.dimension,
+                    capacity=settings.EMBEDDING_CACHE_CAPACITY
+                )
+            except Exception as e:
+                logger.error(f"Embedding önbelleği açılamadı, önbelleksiz devam ediliyor: {e}")
+
+    def encode(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+        """
+        Metinler için gömme vektörlerini üretir (önbellek destekli).
+
+        Args:
+            texts: Kodlanacak metinler
+            batch_size: Model batch boyutu. None ise ayarlardan alınır.
+
+        Returns:
+            np.ndarray: (len(texts), boyut) float32 gömme matrisi
+        """
+        embeddings = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        if not texts:
+            return embeddings
+
+        keys = [make_cache_key(text, self.model_name) for text in texts] if self.cache else []
+        cached = self.cache.get_many(keys) if self.cache else {}
+        for position, vector in cached.items():
+            embeddings[position] = vector
+
+        missing = [position for position in range(len(texts)) if position not in cached]
+        if missing:
+            encoded = self.model.encode(
+                [texts[position] for position in missing],
+                batch_size=batch_size or settings.EMBEDDING_BATCH_SIZE,
+                show_progress_bar=False
+            )
+            embeddings[missing] = np.asarray(encoded, dtype=np.float32)
+
+            if self.cache:
+                self.cache.put_many([keys[position] for position in missing], embeddings[missing])
+                self.cache.flush()
+
+        if cached:
+            logger.info(f"{len(texts)} metnin {len(cached)} tanesi için gömme vektörü önbellekten alındı")
+        return embeddings
+
+    def encode_one(self, text: str) -> np.ndarray:
+        """
+        Tek bir metin için gömme vektörü üretir.
+
+        Args:
+            text: Kodlanacak metin
+
+        Returns:
+            np.ndarray: (boyut,) float32 gömme vektörü
+        """
+        return self.encode([text])[0]
+
+
+# Model adı -> süreç genelinde paylaşılan servis örneği
+_services: Dict[str, EmbeddingService] = {}
+_services_lock = threading.Lock()
+
+
+def get_embedding_service(model_name: Optional[str] = None) -> EmbeddingService:
+    """
+    Verilen model için paylaşılan EmbeddingService örneğini döndürür, gerekirse oluşturur.
+
+    Args:
+        model_name: Embedding modelinin adı. None ise ayarlardan alınır.
+
+    Returns:
+        EmbeddingService: Süreç genelinde tek servis örneği
+    """
+    model_name = model_name or settings.EMBEDDING_MODEL_NAME
+    with _services_lock:
+        if model_name not in _services:
+            _services[model_name] = EmbeddingService(model_name)
+        return _services[model_name]
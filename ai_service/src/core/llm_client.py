@@ -0,0 +1,433 @@
+"""
+LLM Client Module
+
+Bu modül, tüm Gemini çağrılarının geçtiği LLMClient sınıfını içerir.
+
+Önceden her LLM sınıfı kendi genai.configure / GenerativeModel kurulumunu yapıyor ve
+birbirinden habersiz tenacity yeniden denemeleriyle bloklayan çağrılar yapıyordu. LLMClient
+bunların yerine şunları sağlar:
+- Süreç genelinde paylaşılan hız sınırlayıcısı (RPM/TPM token kovası)
+- Yeniden denemeler dahil çağrı başına toplam süre sınırı (deadline)
+- 429/503 gibi geçici hatalarda retry-after değerini dikkate alan, jitter'lı üstel geri çekilme;
+  429'da sınırlayıcı tüm çağıranlar için duraklatılır (thundering herd önlenir)
+- Art arda hatalarda çağrıları bir süre hızlıca reddeden devre kesici
+- generate_content_async / generate_text_async ile olay döngüsünü bloklamayan çağrılar
+"""
+
+import asyncio
+import logging
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+
+from .config import settings
+from .rate_limiter import RateLimiter, get_llm_rate_limiter, estimate_tokens
+
+# Logger yapılandırması
+logger = logging.getLogger(__name__)
+
+# Yeniden denenebilir (geçici) sağlayıcı hataları
+RETRYABLE_EXCEPTIONS = (
+    google_exceptions.ResourceExhausted,     # 429
+    google_exceptions.TooManyRequests,       # 429
+    google_exceptions.ServiceUnavailable,    # 503
+    google_exceptions.InternalServerError,   # 500
+    google_exceptions.DeadlineExceeded,      # 504
+    ConnectionError,
+    TimeoutError,
+)
+
+# Kota hatası mesajlarındaki bekleme süresi ("retry_delay { seconds: 17 }" veya "retry in 17.5s")
+_RETRY_DELAY_PATTERNS = (
+    re.compile(r"retry_delay\s*\{\s*seconds:\s*(\d+(?:\.\d+)?)"),
+    re.compile(r"retry in\s*(\d+(?:\.\d+)?)\s*s", re.IGNORECASE),
+)
+
+
+class LLMClientError(Exception):
+    """LLM çağrısı tüm denemelere rağmen başarısız olduğunda fırlatılır."""
+
+
+class CircuitOpenError(LLMClientError):
+    """Devre kesici açıkken yapılan çağrılar için fırlatılır."""
+
+
+class CircuitBreaker:
+    """
+    Art arda geçici hatalarda açılan, belirli bir süre sonra tek bir deneme çağrısına
+    izin veren (yarı açık) iş parçacığı güvenli devre kesici.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        """
+        CircuitBreaker sınıfını başlatır.
+
+        Args:
+            failure_threshold: Devrenin açılması için art arda hata sayısı (0: devre kesici kapalı)
+            reset_timeout: Açık devrenin deneme çağrısına izin vermeden önce bekleme süresi (saniye)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
+
+    def allow(self) -> bool:
+        """
+        Çağrıya izin verilip verilmediğini döndürür. Açık devrede bekleme süresi dolduysa
+        yalnızca bir deneme çağrısına izin verilir.
+        """
+        return self.admit() is not None
+
+    def admit(self) -> Optional[bool]:
+        """
+        Çağrıyı kabul eder ve deneme (probe) çağrısı olup olmadığını döndürür.
+
+        Deneme çağrısı modele ulaşmadan biterse (hız sınırı, süre sınırı, iptal) çağıran
+        release_probe ile denemeyi bırakmalıdır; aksi halde devre yarı açık kalır.
+
+        Returns:
+            Optional[bool]: None reddedildi, False normal çağrı, True deneme çağrısı
+        """
+        if self.failure_threshold <= 0:
+            return False
+
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            if self._probe_in_flight or time.monotonic() - self._opened_at < self.reset_timeout:
+                return None
+            self._probe_in_flight = True
+            return True
+
+    def release_probe(self) -> None:
+        """Sonucu kaydedilmeden biten deneme çağrısını bırakır; sonraki çağrı yeniden deneyebilir."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        """Başarılı çağrıdan sonra devreyi kapatır."""
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("LLM devre kesicisi kapandı")
+            self._failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Geçici hatayı kaydeder; eşik aşıldıysa devreyi açar."""
+        if self.failure_threshold <= 0:
+            return
+
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                logger.error(f"LLM devre kesicisi açıldı ({self._failures} art arda hata), "
+                             f"çağrılar {self.reset_timeout:.0f}s boyunca reddedilecek")
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """
+    Hatadan sağlayıcının önerdiği bekleme süresini çıkarır.
+
+    Önce HTTP yanıtındaki Retry-After başlığına, ardından hata mesajındaki
+    retry_delay bilgisine bakılır.
+
+    Args:
+        error: Sağlayıcı hatası
+
+    Returns:
+        Optional[float]: Bekleme süresi (saniye) veya None
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers:
+        value = headers.get("Retry-After") or headers.get("retry-after")
+        try:
+            if value is not None:
+                return float(value)
+        except (TypeError, ValueError):
+            pass
+
+    message = str(error)
+    for pattern in _RETRY_DELAY_PATTERNS:
+        match = pattern.search(message)
+        if match:
+            return float(match.group(1))
+    return None
+
+
+_configure_lock = threading.Lock()
+_configured_api_key: Optional[str] = None
+
+
+def _configure_genai() -> None:
+    """genai kütüphanesini süreç başına bir kez yapılandırır."""
+    global _configured_api_key
+    with _configure_lock:
+        if _configured_api_key != settings.GEMINI_API_KEY:
+            genai.configure(api_key=settings.GEMINI_API_KEY)
+            _configured_api_key = settings.GEMINI_API_KEY
+
+
+class LLMClient:
+    """
+    Paylaşılan hız sınırlayıcısı, süre sınırı, yeniden deneme ve devre kesici ile
+    Gemini çağrıları yapan istemci.
+
+    Aynı süreçteki tüm LLMClient örnekleri varsayılan olarak aynı hız sınırlayıcısını
+    ve devre kesiciyi paylaşır.
+    """
+
+    def __init__(self,
+                 model_name: Optional[str] = None,
+                 generation_config: Optional[Dict[str, Any]] = None,
+                 safety_settings: Optional[List[Dict[str, Any]]] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 timeout: Optional[float] = None,
+                 max_retries: Optional[int] = None):
+        """
+        LLMClient sınıfını başlatır.
+
+        Args:
+            model_name: Gemini model adı. None ise GEMINI_MODEL_NAME kullanılır.
+            generation_config: Modelin üretim ayarları (temperature, max_output_tokens vb.)
+            safety_settings: Modelin güvenlik ayarları
+            rate_limiter: Hız sınırlayıcısı. None ise süreç genelindeki sınırlayıcı kullanılır.
+            circuit_breaker: Devre kesici. None ise süreç genelindeki devre kesici kullanılır.
+            timeout: Yeniden denemeler dahil çağrı başına toplam süre. None ise LLM_CALL_TIMEOUT_SECONDS.
+            max_retries: Geçici hatalarda yeniden deneme sayısı. None ise LLM_MAX_RETRIES.
+        """
+        _configure_genai()
+
+        self.model_name = model_name or settings.GEMINI_MODEL_NAME
+        self.model = genai.GenerativeModel(
+            model_name=self.model_name,
+            generation_config=generation_config,
+            safety_settings=safety_settings
+        )
+        self.rate_limiter = rate_limiter or get_llm_rate_limiter()
+        self.circuit_breaker = circuit_breaker or get_llm_circuit_breaker()
+        self.timeout = timeout if timeout is not None else settings.LLM_CALL_TIMEOUT_SECONDS
+        self.max_retries = max_retries if max_retries is not None else settings.LLM_MAX_RETRIES
+
+    def generate_content(self, prompt: str, timeout: Optional[float] = None) -> Any:
+        """
+        Gemini'ye istek gönderir ve ham yanıt nesnesini döndürür.
+
+        Args:
+            prompt: Gönderilecek prompt
+            timeout: Bu çağrı için toplam süre sınırı (saniye). None ise istemcinin varsayılanı.
+
+        Returns:
+            Any: Gemini GenerateContentResponse nesnesi
+
+        Raises:
+            CircuitOpenError: Devre kesici açıksa
+            LLMClientError: Süre dolduysa veya tüm denemeler başarısız olduysa
+        """
+        deadline = time.monotonic() + (timeout if timeout is not None else self.timeout)
+        tokens = estimate_tokens(prompt)
+        attempt = 0
+
+        while True:
+            is_probe = self._check_circuit()
+            settled = False
+            try:
+                if not self.rate_limiter.acquire(tokens, timeout=self._remaining(deadline)):
+                    raise LLMClientError("LLM hız sınırı beklenirken süre doldu")
+
+                remaining = self._remaining(deadline)
+                try:
+                    response = self.model.generate_content(prompt, request_options={"timeout": remaining})
+                    settled = True
+                    self.circuit_breaker.record_success()
+                    return response
+                except RETRYABLE_EXCEPTIONS as e:
+                    settled = True
+                    delay = self._handle_retryable_error(e, attempt, deadline)
+                except Exception:
+                    # Kalıcı hatalar (ör. geçersiz istek) servisin erişilebilir olduğunu gösterir
+                    settled = True
+                    self.circuit_breaker.record_success()
+                    raise
+            finally:
+                if is_probe and not settled:
+                    # Deneme çağrısı modele ulaşmadan bitti; devre yarı açık kilitli kalmamalı
+                    self.circuit_breaker.release_probe()
+
+            time.sleep(delay)
+            attempt += 1
+
+    async def generate_content_async(self, prompt: str, timeout: Optional[float] = None) -> Any:
+        """
+        generate_content'in olay döngüsünü bloklamayan sürümü.
+
+        Args:
+            prompt: Gönderilecek prompt
+            timeout: Bu çağrı için toplam süre sınırı (saniye). None ise istemcinin varsayılanı.
+
+        Returns:
+            Any: Gemini GenerateContentResponse nesnesi
+
+        Raises:
+            CircuitOpenError: Devre kesici açıksa
+            LLMClientError: Süre dolduysa veya tüm denemeler başarısız olduysa
+        """
+        deadline = time.monotonic() + (timeout if timeout is not None else self.timeout)
+        tokens = estimate_tokens(prompt)
+        attempt = 0
+
+        while True:
+            is_probe = self._check_circuit()
+            settled = False
+            try:
+                if not await self.rate_limiter.acquire_async(tokens, timeout=self._remaining(deadline)):
+                    raise LLMClientError("LLM hız sınırı beklenirken süre doldu")
+
+                remaining = self._remaining(deadline)
+                try:
+                    response = await asyncio.wait_for(self.model.generate_content_async(prompt), timeout=remaining)
+                    settled = True
+                    self.circuit_breaker.record_success()
+                    return response
+                except asyncio.TimeoutError:
+                    settled = True
+                    delay = self._handle_retryable_error(TimeoutError("LLM çağrısı zaman aşımına uğradı"),
+                                                         attempt, deadline)
+                except RETRYABLE_EXCEPTIONS as e:
+                    settled = True
+                    delay = self._handle_retryable_error(e, attempt, deadline)
+                except Exception:
+                    # Kalıcı hatalar (ör. geçersiz istek) servisin erişilebilir olduğunu gösterir
+                    settled = True
+                    self.circuit_breaker.record_success()
+                    raise
+            finally:
+                if is_probe and not settled:
+                    # Deneme çağrısı modele ulaşmadan bitti (hız sınırı, süre sınırı, iptal)
+                    self.circuit_breaker.release_probe()
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def generate_text(self, prompt: str, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Gemini'ye istek gönderir ve yanıt metnini döndürür.
+
+        Args:
+            prompt: Gönderilecek prompt
+            timeout: Bu çağrı için toplam süre sınırı (saniye)
+
+        Returns:
+            Optional[str]: Yanıt metni veya yanıt içerik döndürmediyse (ör. güvenlik filtresi) None
+        """
+        return self._response_text(self.generate_content(prompt, timeout=timeout))
+
+    async def generate_text_async(self, prompt: str, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        generate_text'in olay döngüsünü bloklamayan sürümü.
+
+        Args:
+            prompt: Gönderilecek prompt
+            timeout: Bu çağrı için toplam süre sınırı (saniye)
+
+        Returns:
+            Optional[str]: Yanıt metni veya None
+        """
+        return self._response_text(await self.generate_content_async(prompt, timeout=timeout))
+
+    def _check_circuit(self) -> bool:
+        """
+        Devre kesici açıksa çağrıyı hemen reddeder.
+
+        Returns:
+            bool: Çağrı yarı açık devrenin deneme çağrısıysa True
+        """
+        admitted = self.circuit_breaker.admit()
+        if admitted is None:
+            raise CircuitOpenError("LLM devre kesicisi açık, çağrı yapılmadı")
+        return admitted
+
+    @staticmethod
+    def _remaining(deadline: float) -> float:
+        """Süre sınırına kalan süreyi döndürür; süre dolduysa LLMClientError fırlatır."""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise LLMClientError("LLM çağrısı için süre sınırı doldu")
+        return remaining
+
+    def _handle_retryable_error(self, error: Exception, attempt: int, deadline: float) -> float:
+        """
+        Geçici hatayı kaydeder ve bir sonraki denemeden önceki bekleme süresini hesaplar.
+
+        Bekleme, jitter'lı üstel geri çekilme ile sağlayıcının retry-after değerinin büyüğüdür.
+        Kota hatalarında (429) paylaşılan sınırlayıcı da duraklatılır.
+
+        Raises:
+            LLMClientError: Deneme hakkı bittiyse veya bekleme süre sınırını aşacaksa
+        """
+        self.circuit_breaker.record_failure()
+
+        if attempt >= self.max_retries:
+            raise LLMClientError(f"LLM çağrısı {attempt + 1} denemede başarısız oldu: {error}") from error
+
+        backoff = random.uniform(0, min(settings.LLM_RETRY_MAX_SECONDS,
+                                        settings.LLM_RETRY_BASE_SECONDS * (2 ** attempt)))
+        retry_after = _retry_after(error)
+        delay = max(backoff, retry_after or 0.0)
+
+        if retry_after and isinstance(error, (google_exceptions.ResourceExhausted, google_exceptions.TooManyRequests)):
+            self.rate_limiter.pause(retry_after)
+
+        if time.monotonic() + delay >= deadline:
+            raise LLMClientError(f"LLM çağrısı süre sınırı içinde tamamlanamadı: {error}") from error
+
+        logger.warning(f"Geçici LLM hatası ({type(error).__name__}), {delay:.1f}s sonra yeniden denenecek "
+                       f"(deneme {attempt + 1}/{self.max_retries}): {error}")
+        return delay
+
+    @staticmethod
+    def _response_text(response: Any) -> Optional[str]:
+        """Yanıt metnini döndürür; yanıt engellendiyse veya boşsa None."""
+        try:
+            return response.text
+        except ValueError as e:
+            logger.warning(f"LLM yanıtı metin içermiyor: {e}")
+            return None
+
+
+# Süreç genelinde paylaşılan devre kesici
+_llm_circuit_breaker: Optional[CircuitBreaker] = None
+_llm_circuit_breaker_lock = threading.Lock()
+
+
+def get_llm_circuit_breaker() -> CircuitBreaker:
+    """
+    Tüm LLMClient örneklerinin paylaştığı CircuitBreaker örneğini döndürür, gerekirse oluşturur.
+
+    Returns:
+        CircuitBreaker: LLM_CIRCUIT_FAILURE_THRESHOLD ve LLM_CIRCUIT_RESET_SECONDS ile yapılandırılmış devre kesici
+    """
+    global _llm_circuit_breaker
+    with _llm_circuit_breaker_lock:
+        if _llm_circuit_breaker is None:
+            _llm_circuit_breaker = CircuitBreaker(
+                failure_threshold=settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+                reset_timeout=settings.LLM_CIRCUIT_RESET_SECONDS
+            )
+        return _llm_circuit_breaker
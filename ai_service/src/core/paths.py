@@ -35,3 +35,17 @@ def get_prompt_path(prompt_type: str, version: str) -> Path:
         Path: Prompt dosyasının tam yolu
     """
     return PROJECT_ROOT / "prompts" / prompt_type / f"{version}.txt"
+
+def get_cache_dir(*parts: str) -> Path:
+    """
+    Yerel önbellek dizinini (veya alt dizinini) döndürür, yoksa oluşturur.
+    
+    Args:
+        *parts: Önbellek kök dizini altındaki alt dizin adları (örn. 'embeddings')
+        
+    Returns:
+        Path: Önbellek dizininin tam yolu
+    """
+    cache_dir = PROJECT_ROOT.joinpath(".cache", *parts)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
@@ -0,0 +1,193 @@
+"""
+Rate Limiter Module
+
+Bu modül, süreç genelindeki tüm LLM çağrılarının sağlayıcı kotalarını (dakika başına
+istek ve dakika başına token) aşmamasını sağlayan RateLimiter sınıfını içerir.
+
+Eşzamanlı çalışan küme işleyicileri aynı sınırlayıcıyı paylaşır; kota dolduğunda
+çağrılar hata almak yerine gerekli süre kadar bekletilir.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Optional
+
+from .config import settings
+
+# Logger yapılandırması
+logger = logging.getLogger(__name__)
+
+# Token tahmininde kullanılan ortalama karakter/token oranı
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """
+    Metnin yaklaşık token sayısını tahmin eder (ortalama 4 karakter = 1 token).
+
+    Args:
+        text: Token sayısı tahmin edilecek metin
+
+    Returns:
+        int: Tahmini token sayısı (en az 1)
+    """
+    if not text:
+        return 1
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+class _TokenBucket:
+    """Dakika başına kapasiteyle sürekli dolan basit token kovası (kilit dışarıda tutulur)."""
+
+    def __init__(self, capacity_per_minute: float):
+        self.capacity = float(capacity_per_minute)
+        self.rate = self.capacity / 60.0
+        self.available = self.capacity
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.available = min(self.capacity, self.available + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """amount kadar kapasitenin birikmesi için gereken süre (saniye)."""
+        return 0.0 if self.available >= amount else (amount - self.available) / self.rate
+
+
+class RateLimiter:
+    """
+    Dakika başına istek (RPM) ve token (TPM) sınırlarını birlikte uygulayan iş parçacığı güvenli sınırlayıcı.
+
+    Her iki sınır da ayrı bir token kovasıyla izlenir; acquire çağrısı her iki kovada da
+    yeterli kapasite oluşana kadar bekler. Sınır değeri 0 veya negatifse o sınır uygulanmaz.
+
+    Sağlayıcı 429 yanıtıyla bekleme süresi bildirdiğinde pause ile tüm çağıranlar birlikte
+    bekletilir; böylece her iş parçacığı kendi başına yeniden denemeye girişmez.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        """
+        RateLimiter sınıfını başlatır.
+
+        Args:
+            requests_per_minute: Dakika başına izin verilen istek sayısı
+            tokens_per_minute: Dakika başına izin verilen (tahmini) token sayısı
+        """
+        self._requests = _TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self._tokens = _TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """
+        Tüm çağıranları verilen süre boyunca bekletir (ör. sağlayıcının retry-after değeri).
+
+        Args:
+            seconds: Bekleme süresi (saniye)
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        logger.warning(f"LLM çağrıları {seconds:.1f}s süreyle duraklatıldı")
+
+    def _reserve(self, tokens: int) -> float:
+        """
+        Kota yeterliyse ayırır ve 0 döndürür; değilse gereken bekleme süresini döndürür.
+
+        Kovanın kapasitesinden büyük token talepleri kapasiteye indirgenir, böylece tek
+        büyük bir istek sonsuza kadar beklemez.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._paused_until - now)
+            token_amount = 0.0
+
+            if self._requests:
+                self._requests.refill(now)
+                wait = max(wait, self._requests.wait_time(1))
+            if self._tokens:
+                self._tokens.refill(now)
+                token_amount = min(float(tokens), self._tokens.capacity)
+                wait = max(wait, self._tokens.wait_time(token_amount))
+
+            if wait <= 0:
+                if self._requests:
+                    self._requests.available -= 1
+                if self._tokens:
+                    self._tokens.available -= token_amount
+            return wait
+
+    def acquire(self, tokens: int = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Bir istek ve verilen token miktarı için kota ayırır; gerekirse bekler.
+
+        Args:
+            tokens: İsteğin tahmini token sayısı
+            timeout: Maksimum bekleme süresi (saniye). None ise süresiz bekler.
+
+        Returns:
+            bool: Kota ayrıldıysa True, süre dolduysa False
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            wait = self._reserve(tokens)
+            if wait <= 0:
+                return True
+
+            if deadline is not None and time.monotonic() + wait > deadline:
+                logger.warning(f"LLM hız sınırı için bekleme süresi aşıldı ({timeout}s)")
+                return False
+
+            logger.debug(f"LLM hız sınırına ulaşıldı, {wait:.2f}s bekleniyor")
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int = 1, timeout: Optional[float] = None) -> bool:
+        """
+        acquire'ın olay döngüsünü bloklamayan sürümü.
+
+        Args:
+            tokens: İsteğin tahmini token sayısı
+            timeout: Maksimum bekleme süresi (saniye). None ise süresiz bekler.
+
+        Returns:
+            bool: Kota ayrıldıysa True, süre dolduysa False
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            wait = self._reserve(tokens)
+            if wait <= 0:
+                return True
+
+            if deadline is not None and time.monotonic() + wait > deadline:
+                logger.warning(f"LLM hız sınırı için bekleme süresi aşıldı ({timeout}s)")
+                return False
+
+            logger.debug(f"LLM hız sınırına ulaşıldı, {wait:.2f}s bekleniyor")
+            await asyncio.sleep(wait)
+
+
+# Süreç genelinde paylaşılan LLM hız sınırlayıcısı
+_llm_rate_limiter: Optional[RateLimiter] = None
+_llm_rate_limiter_lock = threading.Lock()
+
+
+def get_llm_rate_limiter() -> RateLimiter:
+    """
+    Tüm LLM çağrılarının paylaştığı RateLimiter örneğini döndürür, gerekirse oluşturur.
+
+    Returns:
+        RateLimiter: LLM_REQUESTS_PER_MINUTE ve LLM_TOKENS_PER_MINUTE ile yapılandırılmış sınırlayıcı
+    """
+    global _llm_rate_limiter
+    with _llm_rate_limiter_lock:
+        if _llm_rate_limiter is None:
+            _llm_rate_limiter = RateLimiter(
+                requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+                tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE
+            )
+            logger.info(f"LLM hız sınırlayıcısı oluşturuldu (RPM: {settings.LLM_REQUESTS_PER_MINUTE}, "
+                        f"TPM: {settings.LLM_TOKENS_PER_MINUTE})")
+        return _llm_rate_limiter
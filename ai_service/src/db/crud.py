@@ -1,8 +1,19 @@
-from typing import List
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from sqlalchemy.sql import exists
+from sqlalchemy.sql import exists, func
 
-from .models import News, AnalyzedNewsLink
+from .models import News, AnalyzedNewsLink, AnalysisJob
+
+# Analiz işi durumları
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+ACTIVE_JOB_STATUSES = (JOB_QUEUED, JOB_RUNNING)
 
 
 def get_unprocessed_news(db: Session, batch_size: int) -> List[News]:
@@ -61,6 +72,172 @@ def get_unprocessed_news_alt(db: Session, batch_size: int) -> List[News]:
     return query.all()
 
 
+def get_active_job(db: Session, job_type: str) -> Optional[AnalysisJob]:
+    """Verilen türdeki aktif (queued/running) işi döndürür."""
+    return db.query(AnalysisJob)\
+        .filter(AnalysisJob.job_type == job_type, AnalysisJob.status.in_(ACTIVE_JOB_STATUSES))\
+        .order_by(AnalysisJob.created_at.desc())\
+        .first()
+
+
+def get_job(db: Session, job_id: str) -> Optional[AnalysisJob]:
+    """ID'si verilen işi döndürür (geçersiz ID için None)."""
+    try:
+        uuid.UUID(str(job_id))
+    except ValueError:
+        return None
+    return db.get(AnalysisJob, str(job_id))
+
+
+def create_job_if_idle(db: Session,
+                       job_type: str,
+                       owner: Optional[str] = None,
+                       stale_before: Optional[datetime] = None) -> Tuple[AnalysisJob, bool]:
+    """Aynı türden aktif iş yoksa yeni bir 'queued' iş oluşturur (single-flight).
+    
+    Aktif iş kontrolü, analysis_jobs tablosundaki kısmi benzersiz indeksle (uq_analysis_jobs_active)
+    veritabanı seviyesinde de garanti edilir; böylece birden fazla süreç aynı anda iş açamaz.
+    Heartbeat'i stale_before'dan eski olan aktif işler (sahibi çökmüş) önce 'failed' yapılır,
+    böylece yarım kalan bir kayıt yeni tetiklemeleri süresiz engellemez.
+    
+    Args:
+        db: SQLAlchemy veritabanı oturumu
+        job_type: İş türü
+        owner: İşi çalıştıracak süreç
+        stale_before: Bu zamandan önce heartbeat göndermemiş aktif işler zaman aşımına uğramış sayılır
+        
+    Returns:
+        (AnalysisJob, bool): İş ve yeni oluşturulup oluşturulmadığı (False ise mevcut aktif iş)
+    """
+    if stale_before is not None:
+        fail_stale_jobs(db, job_type, "İş heartbeat zaman aşımına uğradı", stale_before)
+    
+    active_job = get_active_job(db, job_type)
+    if active_job:
+        return active_job, False
+    
+    now = datetime.now(timezone.utc)
+    job = AnalysisJob(
+        id=str(uuid.uuid4()),
+        job_type=job_type,
+        status=JOB_QUEUED,
+        created_at=now,
+        owner=owner,
+        heartbeat_at=now
+    )
+    db.add(job)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Başka bir süreç aynı anda iş oluşturdu
+        db.rollback()
+        return get_active_job(db, job_type), False
+    
+    db.refresh(job)
+    return job, True
+
+
+def update_job(db: Session,
+               job_id: str,
+               status: str,
+               result_summary: Optional[Dict[str, Any]] = None,
+               error_message: Optional[str] = None) -> Optional[AnalysisJob]:
+    """İşin durumunu günceller ve zaman damgalarını ayarlar.
+    
+    'running' durumunda started_at ve heartbeat_at, bitiş durumlarında finished_at doldurulur.
+    Bitmiş işler değiştirilmez (ör. zaman aşımıyla 'failed' yapılmış işe geç gelen sonuç).
+    
+    Returns:
+        Güncel iş veya iş bulunamazsa None
+    """
+    job = get_job(db, job_id)
+    if job is None:
+        return None
+    if job.status not in ACTIVE_JOB_STATUSES:
+        return job
+    
+    now = datetime.now(timezone.utc)
+    job.status = status
+    if status == JOB_RUNNING:
+        job.started_at = now
+        job.heartbeat_at = now
+    elif status not in ACTIVE_JOB_STATUSES:
+        job.finished_at = now
+    if result_summary is not None:
+        job.result_summary = result_summary
+    if error_message is not None:
+        job.error_message = error_message
+    
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def heartbeat_job(db: Session, job_id: str, owner: Optional[str]) -> Optional[AnalysisJob]:
+    """Sahibi olunan aktif işin heartbeat zamanını günceller.
+    
+    İş artık aktif değilse (ör. zaman aşımı nedeniyle 'failed' yapıldıysa) veya başka bir
+    sürece aitse güncelleme yapılmaz; iş kaydı yine de döndürülür.
+    
+    Returns:
+        Güncel iş veya iş bulunamazsa None
+    """
+    job = get_job(db, job_id)
+    if job is None:
+        return None
+    
+    if job.status in ACTIVE_JOB_STATUSES and job.owner == owner:
+        job.heartbeat_at = datetime.now(timezone.utc)
+        db.commit()
+        db.refresh(job)
+    return job
+
+
+def request_job_cancel(db: Session, job_id: str) -> Optional[AnalysisJob]:
+    """Aktif işe iptal isteği yazar; sahip süreç isteği heartbeat sırasında görür.
+    
+    Returns:
+        Güncel iş veya iş bulunamazsa None
+    """
+    job = get_job(db, job_id)
+    if job is None:
+        return None
+    
+    if job.status in ACTIVE_JOB_STATUSES and job.cancel_requested_at is None:
+        job.cancel_requested_at = datetime.now(timezone.utc)
+        db.commit()
+        db.refresh(job)
+    return job
+
+
+def fail_stale_jobs(db: Session, job_type: str, error_message: str, stale_before: datetime) -> int:
+    """Heartbeat'i zaman aşımına uğramış aktif işleri 'failed' olarak işaretler.
+    
+    Canlı bir süreçte (başka worker/replica) çalışan işler heartbeat gönderdiği için etkilenmez.
+    
+    Args:
+        db: SQLAlchemy veritabanı oturumu
+        job_type: İş türü
+        error_message: İşe yazılacak hata mesajı
+        stale_before: Bu zamandan önce heartbeat göndermemiş işler güncellenir
+        
+    Returns:
+        Güncellenen iş sayısı
+    """
+    last_seen = func.coalesce(AnalysisJob.heartbeat_at, AnalysisJob.started_at, AnalysisJob.created_at)
+    count = db.query(AnalysisJob)\
+        .filter(AnalysisJob.job_type == job_type,
+                AnalysisJob.status.in_(ACTIVE_JOB_STATUSES),
+                last_seen < stale_before)\
+        .update({
+            AnalysisJob.status: JOB_FAILED,
+            AnalysisJob.finished_at: datetime.now(timezone.utc),
+            AnalysisJob.error_message: error_message
+        }, synchronize_session=False)
+    db.commit()
+    return count
+
+
 # Test etmek için örnek kod (yorum satırı olarak):
 """
 from sqlalchemy import create_engine
@@ -0,0 +1,136 @@
+"""
+Feature Writer Module
+
+Bu modül, Faz 1 sonuçlarını arka planda toplu olarak veritabanına yazan
+BatchedFeatureWriter sınıfını içerir (write-behind).
+
+İşçi iş parçacıkları sonuçlarını submit ile kuyruğa bırakır ve beklemeden devam eder.
+Kuyruk, BATCH_SIZE öğeye ulaştığında veya ilk öğe FLUSH_SECONDS süredir beklediğinde
+PersistenceManager.save_features_batch ile tek bir işlemde yazılır. Böylece haber başına
+bir commit yerine batch başına bir commit yapılır ve bağlantı havuzu üzerindeki baskı azalır.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.config import settings
+from .persistence_manager import PersistenceManager, PROCESSING_FAILED
+
+# Logger yapılandırması
+logger = logging.getLogger(__name__)
+
+
+class BatchedFeatureWriter:
+    """
+    Zenginleştirilmiş haber öğelerini biriktirip toplu olarak kaydeden arka plan yazıcısı.
+
+    Kullanım:
+        with BatchedFeatureWriter(persistence_manager) as writer:
+            future = writer.submit(enriched_item, model_version)
+        status = future.result()
+    """
+
+    def __init__(self,
+                 persistence_manager: PersistenceManager,
+                 batch_size: Optional[int] = None,
+                 flush_interval: Optional[float] = None):
+        """
+        BatchedFeatureWriter sınıfını başlatır ve yazıcı iş parçacığını çalıştırır.
+
+        Args:
+            persistence_manager: Kayıt işlemleri için PersistenceManager örneği
+            batch_size: Tek işlemde yazılacak öğe sayısı. None ise PHASE1_WRITE_BATCH_SIZE kullanılır.
+            flush_interval: Bir öğenin yazılmadan önce en fazla bekleyeceği süre (saniye).
+                            None ise PHASE1_WRITE_FLUSH_SECONDS kullanılır.
+        """
+        self.persistence_manager = persistence_manager
+        self.batch_size = max(1, batch_size or settings.PHASE1_WRITE_BATCH_SIZE)
+        self.flush_interval = flush_interval if flush_interval is not None else settings.PHASE1_WRITE_FLUSH_SECONDS
+
+        # (enriched_item, model_version, future, kuyruğa eklenme zamanı); en eski öğe başta
+        self._pending: List[Tuple[Dict[str, Any], str, Future, float]] = []
+        self._closed = False
+        self._condition = threading.Condition()
+
+        self._thread = threading.Thread(target=self._run, name="batched-feature-writer", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "BatchedFeatureWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def submit(self, enriched_item: Dict[str, Any], model_version: str) -> Future:
+        """
+        Öğeyi yazma kuyruğuna ekler.
+
+        Args:
+            enriched_item: Kaydedilecek zenginleştirilmiş haber öğesi
+            model_version: Gömme vektörü modelinin sürümü
+
+        Returns:
+            Future: Öğe yazıldığında işlem durumunu (PROCESSING_*) döndüren Future
+        """
+        future: Future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("BatchedFeatureWriter kapatıldıktan sonra öğe eklenemez")
+
+            self._pending.append((enriched_item, model_version, future, time.monotonic()))
+
+            # İlk öğe süre sayacını başlatsın diye, dolu batch ise hemen yazılsın diye yazıcıyı uyandır
+            if len(self._pending) == 1 or len(self._pending) >= self.batch_size:
+                self._condition.notify()
+        return future
+
+    def close(self) -> None:
+        """Kuyrukta kalan öğeleri yazar ve yazıcı iş parçacığını durdurur."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Batch dolduğunda, süre dolduğunda veya yazıcı kapatıldığında kuyruğu boşaltır."""
+        while True:
+            with self._condition:
+                while not self._closed and len(self._pending) < self.batch_size:
+                    if not self._pending:
+                        self._condition.wait()
+                        continue
+
+                    # Süre, kuyrukta hâlâ bekleyen en eski öğenin eklenme zamanından ölçülür
+                    remaining = self.flush_interval - (time.monotonic() - self._pending[0][3])
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                if self._closed and not self._pending:
+                    return
+
+                batch = self._pending[:self.batch_size]
+                self._pending = self._pending[self.batch_size:]
+
+            self._write(batch)
+
+    def _write(self, batch: List[Tuple[Dict[str, Any], str, Future, float]]) -> None:
+        """
+        Batch'i tek işlemde kaydeder ve Future'ları sonuçlandırır.
+
+        Args:
+            batch: (enriched_item, model_version, future, kuyruğa eklenme zamanı) dörtlüleri
+        """
+        try:
+            statuses = self.persistence_manager.save_features_batch(
+                [(enriched_item, model_version) for enriched_item, model_version, _, _ in batch]
+            )
+        except Exception as e:
+            logger.error(f"{len(batch)} haberlik batch kaydedilirken hata: {e}")
+            statuses = {}
+
+        for enriched_item, _, future, _ in batch:
+            future.set_result(statuses.get(enriched_item.get("id"), PROCESSING_FAILED))
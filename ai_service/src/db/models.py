@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, BigInteger, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, BigInteger, ForeignKey, Text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 
 from src.db.database import Base
@@ -35,4 +36,28 @@ class AnalyzedNewsLink(Base):
     original_news_id = Column(BigInteger, index=True)  # News.id'ye karşılık gelir
     
     def __repr__(self):
-        return f"<AnalyzedNewsLink(id={self.id}, original_news_id={self.original_news_id})>"
\ No newline at end of file
+        return f"<AnalyzedNewsLink(id={self.id}, original_news_id={self.original_news_id})>"
+
+class AnalysisJob(Base):
+    """Analiz işi tablosu.
+    
+    /trigger-analysis ile başlatılan her çalıştırmanın durumunu (queued/running/done/failed/cancelled)
+    ve zamanlamalarını tutar. Tablo Flyway migration'ı (V13) ile oluşturulur; sahip süreç ve
+    heartbeat sütunları V15 ile eklenir.
+    """
+    __tablename__ = "analysis_jobs"
+    
+    id = Column(UUID(as_uuid=False), primary_key=True)
+    job_type = Column(String(50), nullable=False)
+    status = Column(String(20), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+    result_summary = Column(JSONB)
+    error_message = Column(Text)
+    owner = Column(String(255))  # İşi çalıştıran süreç (V15)
+    heartbeat_at = Column(DateTime(timezone=True))
+    cancel_requested_at = Column(DateTime(timezone=True))
+    
+    def __repr__(self):
+        return f"<AnalysisJob(id={self.id}, job_type='{self.job_type}', status='{self.status}')>"
@@ -12,7 +12,8 @@ import psycopg2.extras
 from psycopg2.extras import execute_values
 import pgvector.psycopg2
 import numpy as np
-from typing import Dict, Any, List, Optional, Tuple
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from ..core.config import settings
 
 # Logger yapılandırması
@@ -42,11 +43,15 @@ class PersistenceManager:
             max_conn: Bağlantı havuzundaki maksimum bağlantı sayısı
         """
         self.conn_pool = None
+        # save_economic_events her başarılı yazmada artırır; bellek içi takvim indeksleri
+        # bu sayaç değiştiğinde kendilerini yeniler
+        self.economic_events_version = 0
         try:
             logger.info(f"Veritabanı bağlantı havuzu oluşturuluyor (Min: {min_conn}, Max: {max_conn})...")
             
-            # Bağlantı havuzunu oluştur
-            self.conn_pool = psycopg2.pool.SimpleConnectionPool(
+            # Bağlantı havuzunu oluştur (Faz 1 işçileri ve küme işleyicileri aynı havuzu
+            # farklı iş parçacıklarından kullandığından iş parçacığı güvenli havuz gerekir)
+            self.conn_pool = psycopg2.pool.ThreadedConnectionPool(
                 minconn=min_conn,
                 maxconn=max_conn,
                 user=settings.POSTGRES_USER,
@@ -252,32 +257,12 @@ class PersistenceManager:
             return PROCESSING_FAILED
             
         news_id = enriched_item["id"]
-        
-        # Varlıklar ve gömme vektörü yoksa kısmi başarı durumu
         has_entities = enriched_item.get("entities") is not None
-        has_embedding = enriched_item.get("embedding_vector") is not None
         
-        if not has_entities and not has_embedding:
-            logger.warning(f"Haber ID {news_id} için varlık ve gömme vektörü yok, işlem atlanıyor")
+        status, error_message = self._resolve_status(enriched_item)
+        if status == PROCESSING_FAILED:
             return PROCESSING_FAILED
             
-        # İşlem durumunu belirle ve kısmi başarı nedenleri için daha ayrıntılı bilgi
-        status = PROCESSING_SUCCESS
-        error_details = []
-        
-        if not has_entities:
-            error_details.append("Entity extraction failed or no entities found")
-            
-        if not has_embedding:
-            error_details.append("Embedding vector generation failed")
-            
-        if error_details:
-            status = PROCESSING_PARTIAL_SUCCESS
-            error_message = "; ".join(error_details)
-            logger.warning(f"Haber ID {news_id} için kısmi başarı: {error_message}")
-        else:
-            error_message = None
-            
         # Veritabanından bir bağlantı al
         conn = None
         try:
@@ -301,7 +286,8 @@ class PersistenceManager:
                 model_version, 
                 enriched_item.get("embedding_vector"),
                 error_message if status == PROCESSING_PARTIAL_SUCCESS else None,
-                enriched_item.get("event_type")
+                enriched_item.get("event_type"),
+                enriched_item.get("surprise_score")
             )
             
             # İşlemi onayla ve commit et
@@ -328,6 +314,145 @@ class PersistenceManager:
             if conn:
                 self.conn_pool.putconn(conn)
                 
+    def save_features_batch(self, items: List[Tuple[Dict[str, Any], str]]) -> Dict[int, str]:
+        """
+        Birden fazla zenginleştirilmiş haber öğesini tek bir işlemde (transaction) kaydeder.
+        
+        Varlıklar _save_entities_batch ile, işlem logları tek bir execute_values upsert'i ile,
+        gömme vektörleri ise tek bir UPDATE ... FROM (VALUES ...) sorgusuyla yazılır. Toplu
+        kayıt başarısız olursa öğeler save_features ile tek tek kaydedilir; böylece hatalı
+        bir öğe diğerlerinin kaydedilmesini engellemez.
+        
+        Args:
+            items: (enriched_item, model_version) ikilileri
+            
+        Returns:
+            Dict[int, str]: Haber ID'si -> işlem durumu
+        """
+        statuses: Dict[int, str] = {}
+        rows: Dict[int, Tuple[Dict[str, Any], str, str, Optional[str]]] = {}
+        
+        for enriched_item, model_version in items:
+            news_id = enriched_item.get("id")
+            if not news_id:
+                logger.error("enriched_item 'id' alanını içermiyor, veritabanına kayıt yapılamadı")
+                continue
+            
+            status, error_message = self._resolve_status(enriched_item)
+            statuses[news_id] = status
+            if status != PROCESSING_FAILED:
+                # Aynı haber birden fazla kez geldiyse son sürüm yazılır
+                rows[news_id] = (enriched_item, model_version, status, error_message)
+                
+        if not rows:
+            return statuses
+            
+        conn = None
+        try:
+            conn = self.conn_pool.getconn()
+            pgvector.psycopg2.register_vector(conn)
+            conn.autocommit = False
+            
+            # Adım 1: Tüm haberlerin varlıklarını toplu kaydet
+            self._save_entities_batch(conn, {
+                news_id: row[0]["entities"]
+                for news_id, row in rows.items()
+                if row[0].get("entities") is not None
+            })
+            
+            with conn.cursor() as cur:
+                # Adım 2: İşlem loglarını tek sorguda upsert et
+                # (None olan isteğe bağlı alanlar mevcut değerin üzerine yazılmaz)
+                execute_values(cur, """
+                    INSERT INTO ai_processing_log
+                    (news_id, status, embedding_model_version, error_message, event_type,
+                     surprise_score, last_attempt_at, attempt_count)
+                    VALUES %s
+                    ON CONFLICT (news_id) DO UPDATE
+                    SET status = EXCLUDED.status,
+                        embedding_model_version = EXCLUDED.embedding_model_version,
+                        error_message = COALESCE(EXCLUDED.error_message, ai_processing_log.error_message),
+                        event_type = COALESCE(EXCLUDED.event_type, ai_processing_log.event_type),
+                        surprise_score = COALESCE(EXCLUDED.surprise_score, ai_processing_log.surprise_score),
+                        last_attempt_at = EXCLUDED.last_attempt_at,
+                        attempt_count = ai_processing_log.attempt_count + 1
+                """, [
+                    (
+                        news_id, status, model_version,
+                        error_message if status == PROCESSING_PARTIAL_SUCCESS else None,
+                        enriched_item.get("event_type"),
+                        enriched_item.get("surprise_score")
+                    )
+                    for news_id, (enriched_item, model_version, status, error_message) in rows.items()
+                ], template="(%s, %s, %s, %s, %s, %s, NOW(), 1)", page_size=len(rows))
+                
+                # Adım 3: Gömme vektörlerini tek sorguda güncelle
+                embeddings = [
+                    (news_id, row[0]["embedding_vector"])
+                    for news_id, row in rows.items()
+                    if row[0].get("embedding_vector") is not None
+                ]
+                if embeddings:
+                    execute_values(cur, """
+                        UPDATE news AS n
+                        SET embedding_vector = v.embedding_vector
+                        FROM (VALUES %s) AS v (id, embedding_vector)
+                        WHERE n.id = v.id
+                    """, embeddings, template="(%s, %s::vector)", page_size=len(embeddings))
+                    
+            conn.commit()
+            logger.info(f"{len(rows)} haberin verileri tek işlemde kaydedildi")
+            return statuses
+            
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"Toplu kayıt sırasında hata, haberler tek tek kaydedilecek: {e}")
+            
+        finally:
+            if conn:
+                self.conn_pool.putconn(conn)
+                
+        for news_id, (enriched_item, model_version, _, _) in rows.items():
+            statuses[news_id] = self.save_features(enriched_item, model_version)
+        return statuses
+        
+    def _resolve_status(self, enriched_item: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+        """
+        Zenginleştirilmiş öğenin işlem durumunu ve kısmi başarı nedenini belirler.
+        
+        Args:
+            enriched_item: Zenginleştirilmiş haber verileri
+            
+        Returns:
+            Tuple[str, Optional[str]]: (işlem durumu, hata mesajı)
+        """
+        news_id = enriched_item.get("id")
+        
+        # Varlıklar ve gömme vektörü yoksa kısmi başarı durumu
+        has_entities = enriched_item.get("entities") is not None
+        has_embedding = enriched_item.get("embedding_vector") is not None
+        
+        if not has_entities and not has_embedding:
+            logger.warning(f"Haber ID {news_id} için varlık ve gömme vektörü yok, işlem atlanıyor")
+            return PROCESSING_FAILED, None
+            
+        # İşlem durumunu belirle ve kısmi başarı nedenleri için daha ayrıntılı bilgi
+        error_details = []
+        
+        if not has_entities:
+            error_details.append("Entity extraction failed or no entities found")
+            
+        if not has_embedding:
+            error_details.append("Embedding vector generation failed")
+            
+        if error_details:
+            error_message = "; ".join(error_details)
+            logger.warning(f"Haber ID {news_id} için kısmi başarı: {error_message}")
+            return PROCESSING_PARTIAL_SUCCESS, error_message
+            
+        return PROCESSING_SUCCESS, None
+        
     def _save_entities(self, conn, news_id: int, entities: Dict[str, List[str]]) -> List[int]:
         """
         Varlıkları veritabanına kaydeder/günceller ve ilişkileri oluşturur.
@@ -340,34 +465,86 @@ class PersistenceManager:
         Returns:
             Eklenen varlıkların ID'lerini içeren liste
         """
-        entity_ids = []
-        with conn.cursor() as cur:
-            # Her bir varlık tipi ve adı için
-            for entity_type, entity_names in entities.items():
+        return self._save_entities_batch(conn, {news_id: entities}).get(news_id, [])
+        
+    def _save_entities_batch(self, conn, entities_by_news: Dict[int, Dict[str, List[str]]]) -> Dict[int, List[int]]:
+        """
+        Birden fazla haberin varlıklarını toplu olarak kaydeder ve ilişkileri oluşturur.
+        
+        Tüm (ad, tip) çiftleri tek bir CTE sorgusuyla upsert edilir; sorgu hem yeni eklenen
+        hem de zaten var olan varlıkların ID'lerini döndürür. Ardından haber-varlık
+        ilişkileri tek bir execute_values çağrısıyla eklenir. Böylece varlık sayısından
+        bağımsız olarak iki sorgu yapılır.
+        
+        Args:
+            conn: Veritabanı bağlantısı
+            entities_by_news: Haber ID'si -> {varlık tipi: [varlık adları]}
+            
+        Returns:
+            Dict[int, List[int]]: Haber ID'si -> ilişkilendirilen varlık ID'leri
+        """
+        pairs_by_news: Dict[int, List[Tuple[str, str]]] = {}
+        for news_id, entities in entities_by_news.items():
+            pairs = []
+            for entity_type, entity_names in (entities or {}).items():
                 for entity_name in entity_names:
-                    if not entity_name or not entity_type:
-                        continue
-                    
-                    # Varlığı ekle veya var olanı getir (UPSERT işlemi)
-                    # V1__Create_AI_Pipeline_Tables.sql migrasyonundaki gerçek sütun adlarını kullan
-                    cur.execute("""
-                        INSERT INTO entities (name, type) 
-                        VALUES (%s, %s)
-                        ON CONFLICT (name, type) DO NOTHING
-                        RETURNING id
-                    """, (entity_name, entity_type))
-                    
-                    entity_id = cur.fetchone()[0]
-                    entity_ids.append(entity_id)
-                    
-                    # Haber-Varlık ilişkisini oluştur
-                    cur.execute("""
-                        INSERT INTO article_entities (news_id, entity_id)
-                        VALUES (%s, %s)
-                        ON CONFLICT (news_id, entity_id) DO NOTHING
-                    """, (news_id, entity_id))
+                    if entity_name and entity_type:
+                        pairs.append((entity_name, entity_type))
+            pairs_by_news[news_id] = list(dict.fromkeys(pairs))
         
-        return entity_ids
+        # Tekrarsız ve sıralı çiftler (eşzamanlı yazımlarda kilitlerin aynı sırayla alınması için)
+        unique_pairs = sorted({pair for pairs in pairs_by_news.values() for pair in pairs})
+        if not unique_pairs:
+            return {news_id: [] for news_id in pairs_by_news}
+        
+        with conn.cursor() as cur:
+            # Adım 1: Varlıkları tek sorguda ekle ve tüm ID'leri al
+            # (DO NOTHING yeni satır döndürmediğinden var olanlar ayrıca seçilir)
+            rows = execute_values(cur, """
+                WITH input (name, type) AS (VALUES %s),
+                inserted AS (
+                    INSERT INTO entities (name, type)
+                    SELECT name, type FROM input
+                    ON CONFLICT (name, type) DO NOTHING
+                    RETURNING id, name, type
+                )
+                SELECT id, name, type FROM inserted
+                UNION ALL
+                SELECT e.id, e.name, e.type
+                FROM entities e
+                JOIN input i ON e.name = i.name AND e.type = i.type
+            """, unique_pairs, page_size=len(unique_pairs), fetch=True)
+            
+            entity_id_map = {(name, entity_type): entity_id for entity_id, name, entity_type in rows}
+            
+            # Sorgu başladıktan sonra başka bir işlemin eklediği varlıklar ilk sorguda görünmez
+            missing = [pair for pair in unique_pairs if pair not in entity_id_map]
+            if missing:
+                rows = execute_values(cur, """
+                    SELECT e.id, e.name, e.type
+                    FROM entities e
+                    JOIN (VALUES %s) AS i (name, type) ON e.name = i.name AND e.type = i.type
+                """, missing, page_size=len(missing), fetch=True)
+                entity_id_map.update({(name, entity_type): entity_id for entity_id, name, entity_type in rows})
+            
+            # Adım 2: Haber-Varlık ilişkilerini toplu olarak oluştur
+            entity_ids_by_news = {
+                news_id: [entity_id_map[pair] for pair in pairs if pair in entity_id_map]
+                for news_id, pairs in pairs_by_news.items()
+            }
+            links = [
+                (news_id, entity_id)
+                for news_id, entity_ids in entity_ids_by_news.items()
+                for entity_id in dict.fromkeys(entity_ids)
+            ]
+            if links:
+                execute_values(cur, """
+                    INSERT INTO article_entities (news_id, entity_id)
+                    VALUES %s
+                    ON CONFLICT (news_id, entity_id) DO NOTHING
+                """, links, page_size=1000)
+        
+        return entity_ids_by_news
         
     def _update_news_and_log(
             self, 
@@ -429,13 +606,15 @@ class PersistenceManager:
             # UPDATE sorgusu oluştur
             update_str = ", ".join([f"{field} = %s" for field in update_fields])
             
-            # Tam sorgu
+            # Tam sorgu (last_attempt_at, artımlı graf hesaplamasının watermark'ı olarak kullanılır)
             query = f"""
                 INSERT INTO ai_processing_log 
-                ({fields_str})
-                VALUES ({placeholders})
+                ({fields_str}, last_attempt_at, attempt_count)
+                VALUES ({placeholders}, NOW(), 1)
                 ON CONFLICT (news_id) DO UPDATE
-                SET {update_str}
+                SET {update_str},
+                    last_attempt_at = NOW(),
+                    attempt_count = ai_processing_log.attempt_count + 1
             """
             
             # Tüm parametreleri birleştir
@@ -467,11 +646,12 @@ class PersistenceManager:
                 # V1__Create_AI_Pipeline_Tables.sql migrasyonundaki gerçek sütun adlarına uygun sorgu
                 cur.execute("""
                     INSERT INTO ai_processing_log 
-                    (news_id, status, error_message)
-                    VALUES (%s, %s, %s)
+                    (news_id, status, error_message, last_attempt_at)
+                    VALUES (%s, %s, %s, NOW())
                     ON CONFLICT (news_id) DO UPDATE
                     SET status = %s,
-                        error_message = %s
+                        error_message = %s,
+                        last_attempt_at = NOW()
                 """, (news_id, PROCESSING_FAILED, error_message, 
                       PROCESSING_FAILED, error_message))
         except Exception as e:
@@ -524,17 +704,57 @@ class PersistenceManager:
             if conn:
                 self.conn_pool.putconn(conn)
                 
-    def fetch_processed_news(self, limit: int = 1000) -> List[Dict]:
+    def fetch_processed_news(self, limit: int = 1000, window_hours: Optional[int] = None) -> List[Dict]:
         """
-        İşlenmiş haberleri veritabanından çeker.
+        Zaman penceresindeki işlenmiş haberleri veritabanından çeker.
+        
+        Haberler yayın tarihine göre yeniden eskiye (eşitlikte ID'ye göre) sıralanır; böylece
+        aynı veri için her çalıştırmada aynı haberler seçilir.
         
         Args:
             limit: Çekilecek maksimum haber sayısı
+            window_hours: Geriye dönük pencere (saat). None ise GRAPH_WINDOW_HOURS kullanılır.
             
         Returns:
             List[Dict]: İşlenmiş haber listesi (id, embedding_vector, entities ve published_at içeren)
         """
         processed_news = []
+        for chunk in self.iter_processed_news(window_hours=window_hours, max_items=limit):
+            processed_news.extend(chunk)
+        
+        logger.info(f"{len(processed_news)} işlenmiş haber bulundu")
+        return processed_news
+        
+    def iter_processed_news(
+            self,
+            window_hours: Optional[int] = None,
+            max_items: Optional[int] = None,
+            chunk_size: Optional[int] = None
+        ) -> Iterator[List[Dict]]:
+        """
+        Zaman penceresindeki işlenmiş haberleri sunucu taraflı imleçle parça parça döndürür.
+        
+        Sorgu sonucu sunucuda tutulur ve istemciye chunk_size'lık parçalar halinde aktarılır;
+        varlıklar da parça başına tek sorguda eklenir. Bu sayede bellek kullanımı pencere
+        boyutundan bağımsız olarak sabit kalır.
+        
+        Args:
+            window_hours: Geriye dönük pencere (saat). None ise GRAPH_WINDOW_HOURS kullanılır.
+            max_items: Döndürülecek maksimum haber sayısı. None ise sınır yoktur.
+            chunk_size: Parça başına haber sayısı. None ise PROCESSED_NEWS_CHUNK_SIZE kullanılır.
+            
+        Yields:
+            List[Dict]: Yayın tarihine göre (yeniden eskiye, ardından ID) sıralı haber parçaları
+        """
+        window_hours = window_hours or settings.GRAPH_WINDOW_HOURS
+        chunk_size = chunk_size or settings.PROCESSED_NEWS_CHUNK_SIZE
+        window_start = datetime.now(timezone.utc) - timedelta(hours=window_hours)
+        
+        limit_clause = "LIMIT %s" if max_items else ""
+        params: List[Any] = [PROCESSING_SUCCESS, window_start]
+        if max_items:
+            params.append(max_items)
+        
         conn = None
         
         try:
@@ -542,62 +762,135 @@ class PersistenceManager:
             conn = self.conn_pool.getconn()
             pgvector.psycopg2.register_vector(conn)
             
-            with conn.cursor(cursor_factory=psycopg2.extras.DictCursor) as cur:
-                # İşlenmiş ve embedding_vector'ü olan haberleri çek
-                cur.execute("""
-                    SELECT n.id, n.embedding_vector, n.published_at
+            # İsimli imleç sunucu taraflıdır; satırlar fetchmany ile parça parça gelir
+            with conn.cursor(name="processed_news_window", cursor_factory=psycopg2.extras.DictCursor) as stream:
+                stream.itersize = chunk_size
+                stream.execute(f"""
+                    SELECT n.id, n.embedding_vector, n.publication_date AS published_at
                     FROM news n
                     JOIN ai_processing_log l ON n.id = l.news_id
-                    WHERE l.status = %s AND n.embedding_vector IS NOT NULL
-                    LIMIT %s
-                """, (PROCESSING_SUCCESS, limit))
-                
-                rows = cur.fetchall()
-                news_dict = {row['id']: dict(row) for row in rows}
-                
-                # Hiç haber bulunamadıysa boş liste döndür
-                if not news_dict:
-                    return []
+                    WHERE l.status = %s
+                      AND n.embedding_vector IS NOT NULL
+                      AND n.publication_date >= %s
+                    ORDER BY n.publication_date DESC, n.id DESC
+                    {limit_clause}
+                """, params)
+                
+                with conn.cursor(cursor_factory=psycopg2.extras.DictCursor) as cur:
+                    while True:
+                        rows = stream.fetchmany(chunk_size)
+                        if not rows:
+                            break
+                        
+                        news_dict = {row['id']: dict(row) for row in rows}
+                        self._attach_entities(cur, news_dict)
+                        yield list(news_dict.values())
+            
+        except Exception as e:
+            logger.error(f"İşlenmiş haberleri çekerken hata: {e}")
+            
+        finally:
+            # Salt okunur işlemi kapat (tüketici erken bıraksa bile) ve bağlantıyı havuza geri ver
+            if conn:
+                conn.rollback()
+                self.conn_pool.putconn(conn)
                 
-                # Haberler için varlıkları çek
-                news_ids = list(news_dict.keys())
-                placeholders = ', '.join(['%s'] * len(news_ids))
+    def fetch_newly_processed_news(
+            self,
+            since: Optional[Tuple[datetime, int]],
+            window_start: datetime,
+            limit: int = 1000
+        ) -> List[Dict]:
+        """
+        Verilen watermark'tan sonra başarıyla işlenmiş ve zaman penceresi içindeki haberleri çeker.
+        
+        Haberler (işlenme zamanı, ID) sırasıyla döner; bu ikili üzerinden sayfalama yapıldığından
+        aynı zaman damgasına sahip çok sayıda haber olsa bile hiçbiri atlanmaz veya tekrar edilmez.
+        İşlenme zamanı ai_processing_log.last_attempt_at sütunudur (V17 ile NOT NULL); filtre ve
+        sıralama doğrudan bu sütun üzerinden yapıldığından (status, last_attempt_at, news_id)
+        indeksi kullanılır ve tam tarama/sıralama gerekmez.
+        
+        Args:
+            since: Son skorlanan haberin (işlenme zamanı, haber ID'si) ikilisi. None ise
+                   penceredeki tüm işlenmiş haberler döner.
+            window_start: Zaman penceresinin başlangıcı (daha eski yayınlar alınmaz)
+            limit: Çekilecek maksimum haber sayısı
+            
+        Returns:
+            List[Dict]: İşlenmiş haber listesi (id, embedding_vector, published_at, processed_at
+                        ve entities içeren)
+        """
+        conn = None
+        
+        try:
+            conn = self.conn_pool.getconn()
+            pgvector.psycopg2.register_vector(conn)
+            
+            with conn.cursor(cursor_factory=psycopg2.extras.DictCursor) as cur:
+                since_clause = ""
+                params: List[Any] = [PROCESSING_SUCCESS, window_start]
+                if since is not None:
+                    since_clause = "AND (l.last_attempt_at, l.news_id) > (%s, %s)"
+                    params.extend(since)
+                params.append(limit)
                 
                 cur.execute(f"""
-                    SELECT ae.news_id, e.id, e.name, e.type
-                    FROM article_entities ae
-                    JOIN entities e ON ae.entity_id = e.id
-                    WHERE ae.news_id IN ({placeholders})
-                """, news_ids)
+                    SELECT n.id, n.embedding_vector, n.publication_date AS published_at,
+                           l.last_attempt_at AS processed_at
+                    FROM ai_processing_log l
+                    JOIN news n ON n.id = l.news_id
+                    WHERE l.status = %s
+                      AND n.embedding_vector IS NOT NULL
+                      AND (n.publication_date IS NULL OR n.publication_date >= %s)
+                      {since_clause}
+                    ORDER BY l.last_attempt_at, l.news_id
+                    LIMIT %s
+                """, params)
                 
-                # Haber başına varlıkları grupla
-                for row in cur.fetchall():
-                    news_id = row['news_id']
-                    entity = {
-                        'id': row['id'],
-                        'name': row['name'],
-                        'type': row['type']
-                    }
-                    
-                    if 'entities' not in news_dict[news_id]:
-                        news_dict[news_id]['entities'] = []
-                        
-                    news_dict[news_id]['entities'].append(entity)
+                news_dict = {row['id']: dict(row) for row in cur.fetchall()}
+                if not news_dict:
+                    return []
                 
-                processed_news = list(news_dict.values())
-                logger.info(f"{len(processed_news)} işlenmiş haber bulundu")
+                self._attach_entities(cur, news_dict)
                 
-            return processed_news
+            logger.info(f"Watermark sonrasında işlenmiş {len(news_dict)} yeni haber bulundu")
+            return list(news_dict.values())
             
         except Exception as e:
-            logger.error(f"İşlenmiş haberleri çekerken hata: {e}")
+            logger.error(f"Yeni işlenmiş haberleri çekerken hata: {e}")
             return []
             
         finally:
-            # Bağlantıyı havuza geri ver
             if conn:
                 self.conn_pool.putconn(conn)
                 
+    def _attach_entities(self, cur, news_dict: Dict[int, Dict[str, Any]]) -> None:
+        """
+        Haber sözlüklerine varlık listelerini ('entities') tek sorguda ekler.
+        
+        Args:
+            cur: DictCursor
+            news_dict: Haber ID'si -> haber sözlüğü
+        """
+        news_ids = list(news_dict.keys())
+        placeholders = ', '.join(['%s'] * len(news_ids))
+        
+        cur.execute(f"""
+            SELECT ae.news_id, e.id, e.name, e.type
+            FROM article_entities ae
+            JOIN entities e ON ae.entity_id = e.id
+            WHERE ae.news_id IN ({placeholders})
+        """, news_ids)
+        
+        # Haber başına varlıkları grupla
+        for row in cur.fetchall():
+            entity = {
+                'id': row['id'],
+                'name': row['name'],
+                'type': row['type']
+            }
+            news_dict[row['news_id']].setdefault('entities', []).append(entity)
+                
     def save_graph_edges(self, edge_records: List[Dict]) -> bool:
         """
         Haberler arasındaki etkileşim skorlarını graph_edges tablosuna kaydeder.
@@ -789,6 +1082,103 @@ class PersistenceManager:
             if conn:
                 self.conn_pool.putconn(conn)
     
+    def find_economic_events_for_lookups(self,
+                                         lookups: List[Tuple[int, List[str], datetime, datetime]]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Birden fazla (anahtar kelimeler, tarih aralığı) araması için ekonomik olayları tek sorguda getirir.
+        
+        Aramalar unnest ile satırlara açılır ve economic_events ile birleştirilir; event_name
+        ILIKE koşulları idx_economic_events_name_trgm (pg_trgm GIN) indeksini kullanır.
+        
+        Args:
+            lookups: (arama_id, anahtar_kelimeler, başlangıç, bitiş) demetleri. Anahtar kelime
+                     listesi boşsa aralıktaki tüm olaylar döner.
+            
+        Returns:
+            Dict[int, List[Dict]]: Arama ID'si -> eşleşen olaylar (event_time'a göre azalan)
+        """
+        if not lookups:
+            return {}
+        
+        # Her (arama, anahtar kelime) çifti bir satır olacak şekilde dizileri hazırla
+        lookup_ids, start_times, end_times, patterns = [], [], [], []
+        for lookup_id, keywords, start_time, end_time in lookups:
+            for keyword in (keywords or [""]):
+                lookup_ids.append(lookup_id)
+                start_times.append(start_time)
+                end_times.append(end_time)
+                patterns.append(f"%{keyword}%")
+        
+        conn = None
+        try:
+            conn = self.conn_pool.getconn()
+            with conn.cursor(cursor_factory=psycopg2.extras.DictCursor) as cur:
+                cur.execute(
+                    """
+                    SELECT DISTINCT ON (l.lookup_id, e.event_time, e.id)
+                        l.lookup_id, e.id, e.event_name, e.country, e.event_time,
+                        e.actual_value, e.forecast_value, e.impact
+                    FROM unnest(%s::int[], %s::timestamptz[], %s::timestamptz[], %s::text[])
+                        AS l(lookup_id, start_time, end_time, pattern)
+                    JOIN economic_events e
+                      ON e.event_time BETWEEN l.start_time AND l.end_time
+                     AND e.event_name ILIKE l.pattern
+                    ORDER BY l.lookup_id, e.event_time DESC, e.id
+                    """,
+                    (lookup_ids, start_times, end_times, patterns)
+                )
+                
+                events_by_lookup: Dict[int, List[Dict[str, Any]]] = {}
+                for row in cur.fetchall():
+                    event = dict(row)
+                    events_by_lookup.setdefault(event.pop('lookup_id'), []).append(event)
+                
+                logger.info(f"{len(lookups)} ekonomik olay araması tek sorguda yapıldı, "
+                            f"{sum(len(events) for events in events_by_lookup.values())} eşleşme bulundu")
+                return events_by_lookup
+        except Exception as e:
+            logger.error(f"Toplu ekonomik olay araması sırasında hata: {e}")
+            return {}
+        finally:
+            if conn:
+                self.conn_pool.putconn(conn)
+    
+    def fetch_economic_events_since(self, start_time: datetime) -> Optional[List[Dict[str, Any]]]:
+        """
+        Belirli bir zamandan sonraki (gelecekteki olaylar dahil) tüm ekonomik olayları tek sorguda getirir.
+        
+        Bellek içi ekonomik takvim indeksini (EconomicCalendarIndex) doldurmak için kullanılır;
+        olay adına göre filtreleme uygulama tarafında yapılır.
+        
+        Args:
+            start_time: Başlangıç zamanı
+            
+        Returns:
+            Optional[List[Dict]]: event_time'a göre sıralı olaylar veya hata durumunda None
+        """
+        conn = None
+        try:
+            conn = self.conn_pool.getconn()
+            with conn.cursor(cursor_factory=psycopg2.extras.DictCursor) as cur:
+                cur.execute(
+                    """
+                    SELECT id, event_name, country, event_time, actual_value, forecast_value, impact
+                    FROM economic_events
+                    WHERE event_time >= %s
+                    ORDER BY event_time
+                    """,
+                    (start_time,)
+                )
+                events = [dict(row) for row in cur.fetchall()]
+                logger.info(f"Ekonomik takvim için {len(events)} olay yüklendi ({start_time} sonrası)")
+                return events
+        except Exception as e:
+            logger.error(f"Ekonomik takvim yüklenirken hata: {e}")
+            return None
+        finally:
+            if conn:
+                self.conn_pool.putconn(conn)
+    
     def fetch_graph_edges(self, run_date: date = None, interaction_threshold: float = 0.0) -> List[Dict[str, Any]]:
         """
         Belirli bir tarih için eşik değerini aşan tüm etkileşim kenarlarını getirir.
@@ -1090,6 +1480,8 @@ class PersistenceManager:
                 # İşlemi onayla
                 conn.commit()
                 
+                self.economic_events_version += 1
+                
                 logger.info(f"{len(data_to_insert)} ekonomik olay başarıyla economic_events tablosuna eklendi/güncellendi")
                 return True
                 
@@ -1104,3 +1496,95 @@ class PersistenceManager:
             # Bağlantıyı havuza geri ver
             if conn:
                 self.conn_pool.putconn(conn)
+                
+    def fetch_cached_llm_output(self, prompt_hash: str, max_age_seconds: int) -> Optional[str]:
+        """
+        Verilen prompt özeti için geçerlilik süresi dolmamış en son LLM yanıtını çeker.
+        
+        Args:
+            prompt_hash: LLMResponseCache tarafından üretilen sha256 özeti
+            max_age_seconds: Kaydın en fazla kaç saniye önce oluşturulmuş olabileceği
+            
+        Returns:
+            Optional[str]: Kayıtlı ham yanıt veya None
+        """
+        conn = None
+        
+        try:
+            conn = self.conn_pool.getconn()
+            
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT raw_output
+                    FROM llm_interactions
+                    WHERE prompt_hash = %s
+                      AND raw_output IS NOT NULL
+                      AND request_timestamp >= NOW() - make_interval(secs => %s)
+                    ORDER BY request_timestamp DESC
+                    LIMIT 1
+                """, (prompt_hash, max_age_seconds))
+                
+                row = cur.fetchone()
+            
+            conn.commit()
+            return row[0] if row else None
+            
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"LLM önbelleği okunurken hata: {e}")
+            return None
+            
+        finally:
+            if conn:
+                self.conn_pool.putconn(conn)
+                
+    def save_llm_interaction(
+            self,
+            task_type: str,
+            prompt_version: str,
+            model_version: str,
+            prompt_hash: str,
+            input_prompt: str,
+            raw_output: str,
+            latency_ms: Optional[int] = None
+        ) -> bool:
+        """
+        Bir LLM çağrısını llm_interactions tablosuna kaydeder.
+        
+        Args:
+            task_type: Görev türü (örn. 'validation', 'labeling')
+            prompt_version: Prompt şablonunun sürümü
+            model_version: LLM modelinin adı
+            prompt_hash: Önbellek anahtarı (sha256 özeti)
+            input_prompt: Doldurulmuş prompt metni
+            raw_output: Ham LLM yanıtı
+            latency_ms: Çağrı süresi (milisaniye)
+            
+        Returns:
+            bool: Kayıt başarılıysa True
+        """
+        conn = None
+        
+        try:
+            conn = self.conn_pool.getconn()
+            
+            with conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO llm_interactions
+                    (task_type, prompt_version, model_version, prompt_hash, input_prompt, raw_output, latency_ms)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                """, (task_type, prompt_version, model_version, prompt_hash, input_prompt, raw_output, latency_ms))
+            
+            conn.commit()
+            return True
+            
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"LLM etkileşimi kaydedilirken hata: {e}")
+            return False
+            
+        finally:
+            if conn:
+                self.conn_pool.putconn(conn)
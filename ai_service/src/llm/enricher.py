@@ -9,15 +9,15 @@ etiket (label) ve gerekçe (rationale) bilgilerini üreten StoryEnricher sınıf
 """
 
 import logging
-from typing import Dict, List, Optional
-import google.generativeai as genai
-from tenacity import retry, stop_after_attempt, wait_exponential
+from typing import Dict, List, Optional, Tuple
 from pydantic import BaseModel, Field, validator
 
 from ..core.config import settings
+from ..core.llm_client import LLMClient
 from ..core.paths import get_prompt_path
 from ..db.persistence_manager import PersistenceManager
 from .parser import LLMOutputParser
+from .response_cache import get_llm_response_cache
 
 logger = logging.getLogger(__name__)
 
@@ -45,12 +45,27 @@ class RationaleResponse(BaseModel):
         if not v or len(v.strip()) == 0:
             raise ValueError("Gerekçe boş olamaz")
         return v
+
+
+class EnrichmentResponse(BaseModel):
+    """Tek çağrılık zenginleştirme LLM yanıtı için model (etiket ve gerekçe birlikte)."""
+    label: str = Field(..., description="Haber grubunun kısa etiketi (4-8 kelime)")
+    rationale: str = Field(..., description="Haber grubunun bağlantı gerekçesi")
+    
+    @validator('label', 'rationale')
+    def validate_not_empty(cls, v):
+        """Alanların boş olmadığını doğrula."""
+        if not v or len(v.strip()) == 0:
+            raise ValueError("Etiket ve gerekçe boş olamaz")
+        return v
     
 class StoryEnricher:
     """
     LLMValidator tarafından onaylanmış haber kümelerini zenginleştiren sınıf.
     
-    Her bir haber kümesi için iki ayrı LLM çağrısı yapar:
+    Varsayılan olarak etiket (label) ve gerekçeyi (rationale) tek bir LLM çağrısında,
+    tek bir JSON nesnesi olarak üretir. Yanıt ayrıştırılamazsa iki ayrı çağrı yapan
+    eski yola geri döner:
     1. Haber grubuna kısa bir etiket (label) üretir
     2. Haber grubunun neden bağlantılı olduğuna dair bir gerekçe (rationale) üretir
     """
@@ -65,13 +80,15 @@ class StoryEnricher:
         if persistence_manager is None:
             raise ValueError("PersistenceManager zorunlu bir parametredir ve None olamaz")
             
-        # API anahtarını ayarla ve Gemini modeli oluştur
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel(settings.GEMINI_MODEL_NAME)
+        # Paylaşılan hız sınırı, yeniden deneme ve devre kesici ile Gemini istemcisi
+        self.llm_client = LLMClient()
         
         # PersistenceManager'ı kaydet
         self.persistence_manager = persistence_manager
         
+        # Paylaşılan LLM yanıt önbelleği
+        self.response_cache = get_llm_response_cache()
+        
         # Prompt şablonlarını yükle (paths yardımcı modülü ile)
         labeling_prompt_path = get_prompt_path("labeling", "v1.0")
         
@@ -93,6 +110,18 @@ class StoryEnricher:
         except Exception as e:
             logger.error(f"Gerekçelendirme prompt şablonu yüklenirken hata: {e}")
             self.justification_prompt_template = "# HATA: Gerekçelendirme prompt şablonu yüklenemedi"
+            
+        # Tek çağrılık zenginleştirme prompt şablonunu yükle
+        self.single_call = settings.ENRICHMENT_SINGLE_CALL
+        enrichment_prompt_path = get_prompt_path("enrichment", "v1.0")
+        
+        try:
+            with open(enrichment_prompt_path, "r", encoding="utf-8") as f:
+                self.enrichment_prompt_template = f.read()
+            logger.info(f"Zenginleştirme prompt şablonu yüklendi: {enrichment_prompt_path}")
+        except Exception as e:
+            logger.error(f"Zenginleştirme prompt şablonu yüklenirken hata, iki çağrılı yol kullanılacak: {e}")
+            self.single_call = False
     
     def _prepare_headlines_text(self, news_items: List[Dict]) -> str:
         """
@@ -110,7 +139,43 @@ class StoryEnricher:
         
         return "\n".join(headlines)
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+    def _generate_enrichment(self, headlines_text: str) -> Tuple[Optional[EnrichmentResponse], bool]:
+        """
+        Etiket ve gerekçeyi tek bir LLM çağrısında üretir.
+        
+        Args:
+            headlines_text: Formatlı haber başlıkları metni
+            
+        Returns:
+            Tuple[Optional[EnrichmentResponse], bool]: Doğrulanmış yanıt (veya None) ve
+                yanıtın alınıp ayrıştırılamadığını belirten bayrak (True ise iki çağrılı yola geçilir)
+        """
+        try:
+            filled_prompt = self.enrichment_prompt_template.format(headlines=headlines_text)
+            
+            # Gemini API'sine istek gönder (önbellekte yoksa)
+            response_text = self.response_cache.get_or_generate(
+                task_type="enrichment",
+                prompt_version="v1.0",
+                model_name=settings.GEMINI_MODEL_NAME,
+                prompt=filled_prompt,
+                generate=lambda: self.llm_client.generate_text(filled_prompt),
+                validator=lambda text: LLMOutputParser.parse_model_response(text, EnrichmentResponse) is not None
+            )
+            
+        except Exception as e:
+            logger.error(f"Zenginleştirme isteği sırasında hata: {e}")
+            return None, False
+            
+        validated_response = LLMOutputParser.parse_model_response(response_text, EnrichmentResponse) if response_text else None
+            
+        if validated_response:
+            logger.info(f"Etiket ve gerekçe tek çağrıda üretildi: \"{validated_response.label}\"")
+            return validated_response, False
+            
+        logger.warning("Zenginleştirme yanıtı ayrıştırılamadı, iki çağrılı yola geçiliyor")
+        return None, True
+    
     def _generate_label(self, headlines_text: str) -> Optional[str]:
         """
         Haber başlıklarını kullanarak bir etiket üretir.
@@ -125,9 +190,15 @@ class StoryEnricher:
             # Prompt'u doldur
             filled_prompt = self.labeling_prompt_template.format(headlines=headlines_text)
             
-            # Gemini API'sine istek gönder
-            response = self.model.generate_content(filled_prompt)
-            response_text = response.text
+            # Gemini API'sine istek gönder (önbellekte yoksa)
+            response_text = self.response_cache.get_or_generate(
+                task_type="labeling",
+                prompt_version="v1.0",
+                model_name=settings.GEMINI_MODEL_NAME,
+                prompt=filled_prompt,
+                generate=lambda: self.llm_client.generate_text(filled_prompt),
+                validator=lambda text: LLMOutputParser.parse_model_response(text, LabelResponse) is not None
+            )
             
             # Yanıtı parse et - ortak parser modülünü kullan
             validated_response = LLMOutputParser.parse_model_response(response_text, LabelResponse)
@@ -143,7 +214,6 @@ class StoryEnricher:
             logger.error(f"Etiket üretirken hata: {e}")
             return None
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def _generate_rationale(self, headlines_text: str, label: str) -> Optional[str]:
         """
         Haber başlıkları ve etiketi kullanarak bir gerekçe üretir.
@@ -162,9 +232,15 @@ class StoryEnricher:
                 label=label
             )
             
-            # Gemini API'sine istek gönder
-            response = self.model.generate_content(filled_prompt)
-            response_text = response.text
+            # Gemini API'sine istek gönder (önbellekte yoksa)
+            response_text = self.response_cache.get_or_generate(
+                task_type="justification",
+                prompt_version="v1.0",
+                model_name=settings.GEMINI_MODEL_NAME,
+                prompt=filled_prompt,
+                generate=lambda: self.llm_client.generate_text(filled_prompt),
+                validator=lambda text: LLMOutputParser.parse_model_response(text, RationaleResponse) is not None
+            )
             
             # Yanıtı parse et - ortak parser modülünü kullan
             validated_response = LLMOutputParser.parse_model_response(response_text, RationaleResponse)
@@ -206,15 +282,28 @@ class StoryEnricher:
             # Başlıkları formatlı metne dönüştür
             headlines_text = self._prepare_headlines_text(news_details)
             
-            # 1. Adım: Etiket üret
-            label = self._generate_label(headlines_text)
-            if not label:
-                return None
-                
-            # 2. Adım: Gerekçe üret
-            rationale = self._generate_rationale(headlines_text, label)
-            if not rationale:
-                return None
+            label = None
+            rationale = None
+            
+            # Tek çağrılık mod: etiket ve gerekçe birlikte
+            use_two_calls = not self.single_call
+            if self.single_call:
+                enrichment, use_two_calls = self._generate_enrichment(headlines_text)
+                if enrichment:
+                    label, rationale = enrichment.label, enrichment.rationale
+                elif not use_two_calls:
+                    return None
+            
+            if use_two_calls:
+                # 1. Adım: Etiket üret
+                label = self._generate_label(headlines_text)
+                if not label:
+                    return None
+                    
+                # 2. Adım: Gerekçe üret
+                rationale = self._generate_rationale(headlines_text, label)
+                if not rationale:
+                    return None
                 
             # Zenginleştirilmiş kümeyi döndür
             enriched_cluster = {
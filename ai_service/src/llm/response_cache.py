@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+LLM Response Cache Module
+
+Bu modül, LLM yanıtlarını llm_interactions tablosunda saklayan ve aynı istek tekrar
+geldiğinde Gemini'ye yeniden gitmeden kayıtlı yanıtı döndüren LLMResponseCache sınıfını içerir.
+
+Önbellek anahtarı (görev türü, prompt şablon sürümü, model adı, doldurulmuş prompt)
+dörtlüsünün sha256 özetidir ve llm_interactions.prompt_hash sütununda tutulur. Böylece
+aynı kümenin yeniden işlenmesi veya çökme sonrası pipeline'ın tekrar çalıştırılması
+yeni LLM maliyeti oluşturmaz. Her gerçek LLM çağrısı da bu tabloya kaydedilir.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+from ..core.config import settings
+from ..db.persistence_manager import PersistenceManager
+
+# Logger yapılandırması
+logger = logging.getLogger(__name__)
+
+
+def make_prompt_hash(task_type: str, prompt_version: str, model_name: str, prompt: str) -> str:
+    """
+    Önbellek anahtarını üretir.
+
+    Args:
+        task_type: Görev türü (örn. 'validation', 'labeling')
+        prompt_version: Prompt şablonunun sürümü (örn. 'v1.0')
+        model_name: LLM modelinin adı
+        prompt: Doldurulmuş prompt metni
+
+    Returns:
+        str: 64 karakterlik sha256 hex özeti
+    """
+    payload = "\x00".join([task_type, prompt_version, model_name, prompt]).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    llm_interactions tablosu üzerinde çalışan, TTL destekli LLM yanıt önbelleği.
+
+    Veritabanı bağlantısı yoksa veya önbellek kapalıysa doğrudan LLM çağrısı yapar
+    (önbelleksiz mod). Veritabanı erişimi max_connections ile sınırlandırılır; havuz
+    dolduğunda psycopg2 beklemek yerine PoolError fırlattığından fazla iş parçacıkları
+    burada sıra bekler.
+    """
+
+    def __init__(self,
+                 persistence_manager: Optional[PersistenceManager] = None,
+                 ttl_seconds: Optional[int] = None,
+                 enabled: Optional[bool] = None,
+                 max_connections: Optional[int] = None):
+        """
+        LLMResponseCache sınıfını başlatır.
+
+        Args:
+            persistence_manager: llm_interactions tablosuna erişim için PersistenceManager.
+                                 None ise önbelleksiz modda çalışır.
+            ttl_seconds: Kayıtlı yanıtların geçerlilik süresi. None ise LLM_CACHE_TTL_SECONDS kullanılır.
+            enabled: Önbellek kullanılsın mı? None ise LLM_CACHE_ENABLED kullanılır.
+            max_connections: Aynı anda kullanılabilecek veritabanı bağlantısı sayısı
+                             (persistence_manager havuzunun üst sınırı). None ise sınırlanmaz.
+        """
+        self.persistence_manager = persistence_manager
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.LLM_CACHE_TTL_SECONDS
+        self.enabled = (settings.LLM_CACHE_ENABLED if enabled is None else enabled) and persistence_manager is not None
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection_slots = threading.BoundedSemaphore(max_connections) if max_connections else None
+
+    def get(self, task_type: str, prompt_version: str, model_name: str, prompt: str) -> Optional[str]:
+        """
+        Geçerlilik süresi dolmamış kayıtlı yanıtı döndürür.
+
+        Args:
+            task_type: Görev türü
+            prompt_version: Prompt şablonunun sürümü
+            model_name: LLM modelinin adı
+            prompt: Doldurulmuş prompt metni
+
+        Returns:
+            Optional[str]: Kayıtlı ham yanıt veya None
+        """
+        if not self.enabled:
+            return None
+
+        prompt_hash = make_prompt_hash(task_type, prompt_version, model_name, prompt)
+        with self._connection_slot():
+            return self.persistence_manager.fetch_cached_llm_output(prompt_hash, self.ttl_seconds)
+
+    def get_or_generate(self,
+                        task_type: str,
+                        prompt_version: str,
+                        model_name: str,
+                        prompt: str,
+                        generate: Callable[[], str],
+                        validator: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        """
+        Kayıtlı yanıtı döndürür; yoksa LLM'i çağırır ve yanıtı kaydeder.
+
+        Hız sınırlaması ve yeniden denemeler generate içinde kullanılan LLMClient'a aittir;
+        önbellek isabetleri kotadan düşülmez.
+
+        validator verilmişse yalnızca onu geçen yanıtlar önbellekten kullanılır ve önbelleğe
+        yazılır; böylece ayrıştırılamayan bir yanıt kalıcı hale gelmez.
+
+        Args:
+            task_type: Görev türü (örn. 'validation', 'labeling')
+            prompt_version: Prompt şablonunun sürümü
+            model_name: LLM modelinin adı
+            prompt: Doldurulmuş prompt metni
+            generate: Önbellekte yoksa çağrılacak, ham yanıt metnini döndüren fonksiyon
+                      (genellikle LLMClient.generate_text)
+            validator: Yanıtın kullanılabilir olup olmadığını kontrol eden fonksiyon
+
+        Returns:
+            Optional[str]: Ham yanıt metni (LLM boş yanıt döndürdüyse None)
+        """
+        is_valid = validator or (lambda text: bool(text and text.strip()))
+
+        try:
+            cached = self.get(task_type, prompt_version, model_name, prompt)
+        except Exception as e:
+            logger.warning(f"LLM önbelleği okunamadı ({task_type}): {e}")
+            cached = None
+
+        if cached is not None and is_valid(cached):
+            with self._lock:
+                self.hits += 1
+            logger.info(f"LLM yanıtı önbellekten alındı ({task_type}, isabet: {self.hits}, ıska: {self.misses})")
+            return cached
+
+        with self._lock:
+            self.misses += 1
+
+        start_time = time.time()
+        response_text = generate()
+        latency_ms = int((time.time() - start_time) * 1000)
+
+        if response_text and is_valid(response_text):
+            self.put(task_type, prompt_version, model_name, prompt, response_text, latency_ms)
+
+        return response_text
+
+    def put(self,
+            task_type: str,
+            prompt_version: str,
+            model_name: str,
+            prompt: str,
+            response_text: str,
+            latency_ms: Optional[int] = None) -> bool:
+        """
+        LLM etkileşimini llm_interactions tablosuna kaydeder.
+
+        Args:
+            task_type: Görev türü
+            prompt_version: Prompt şablonunun sürümü
+            model_name: LLM modelinin adı
+            prompt: Doldurulmuş prompt metni
+            response_text: Ham LLM yanıtı
+            latency_ms: LLM çağrısının süresi (milisaniye)
+
+        Returns:
+            bool: Kayıt başarılıysa True
+        """
+        if not self.enabled:
+            return False
+
+        try:
+            with self._connection_slot():
+                return self.persistence_manager.save_llm_interaction(
+                    task_type=task_type,
+                    prompt_version=prompt_version,
+                    model_version=model_name,
+                    prompt_hash=make_prompt_hash(task_type, prompt_version, model_name, prompt),
+                    input_prompt=prompt,
+                    raw_output=response_text,
+                    latency_ms=latency_ms
+                )
+        except Exception as e:
+            logger.warning(f"LLM yanıtı önbelleğe yazılamadı ({task_type}): {e}")
+            return False
+
+    @contextmanager
+    def _connection_slot(self) -> Iterator[None]:
+        """Havuzda boş bağlantı kalmadıysa bir bağlantı serbest kalana kadar bekler."""
+        if self._connection_slots is None:
+            yield
+            return
+        with self._connection_slots:
+            yield
+
+    def stats(self) -> Dict[str, int]:
+        """Önbellek isabet/ıska sayaçlarını döndürür."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+# Süreç genelinde paylaşılan önbellek örneği
+_llm_response_cache: Optional[LLMResponseCache] = None
+_llm_response_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    """
+    Tüm LLM bileşenlerinin paylaştığı LLMResponseCache örneğini döndürür, gerekirse oluşturur.
+
+    Veritabanı bağlantısı kurulamazsa önbelleksiz modda çalışan bir örnek döndürülür.
+
+    Returns:
+        LLMResponseCache: Süreç genelinde tek önbellek örneği
+    """
+    global _llm_response_cache
+    with _llm_response_cache_lock:
+        if _llm_response_cache is None:
+            persistence_manager = None
+            # Önbelleği aynı anda kullanabilecek iş parçacıkları: Faz 3/4 küme işçileri ve
+            # Faz 1 toplu varlık filtreleme işçileri
+            max_conn = max(1, settings.CLUSTER_MAX_CONCURRENCY) + max(1, settings.ASSET_FILTER_MAX_CONCURRENCY)
+            if settings.LLM_CACHE_ENABLED:
+                try:
+                    persistence_manager = PersistenceManager(min_conn=1, max_conn=max_conn)
+                except Exception as e:
+                    logger.error(f"LLM önbelleği için veritabanı bağlantısı kurulamadı, önbelleksiz devam ediliyor: {e}")
+            _llm_response_cache = LLMResponseCache(persistence_manager, max_connections=max_conn)
+        return _llm_response_cache
@@ -14,12 +14,12 @@ import json
 from typing import Dict, List, Optional, Any, Union, Literal
 from datetime import date
 from pathlib import Path
-import google.generativeai as genai
-from tenacity import retry, stop_after_attempt, wait_exponential
 from pydantic import BaseModel, Field, validator
 
 from ..core.config import settings
+from ..core.llm_client import LLMClient
 from ..db.persistence_manager import PersistenceManager
+from .response_cache import get_llm_response_cache
 
 logger = logging.getLogger(__name__)
 
@@ -153,13 +153,15 @@ class LLMValidator:
         if persistence_manager is None:
             raise ValueError("PersistenceManager zorunlu bir parametredir ve None olamaz")
             
-        # API anahtarını ayarla ve Gemini modeli oluştur
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel(settings.GEMINI_MODEL_NAME)
+        # Paylaşılan hız sınırı, yeniden deneme ve devre kesici ile Gemini istemcisi
+        self.llm_client = LLMClient()
         
         # PersistenceManager'ı kaydet
         self.persistence_manager = persistence_manager
         
+        # Paylaşılan LLM yanıt önbelleği
+        self.response_cache = get_llm_response_cache()
+        
         # Prompt şablonunu yükle - Path kullanarak daha güvenli yol hesaplama
         # Proje ana dizinini bul
         project_root = Path(__file__).parent.parent.parent.parent
@@ -212,7 +214,6 @@ class LLMValidator:
         
         return result
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def validate_cluster(self, news_ids: List[int]) -> Optional[Dict]:
         """
         Bir haber kümesini LLM kullanarak doğrular.
@@ -257,9 +258,15 @@ class LLMValidator:
                 shared_entities=input_data["shared_entities"]
             )
             
-            # Gemini API'sine istek gönder
-            response = self.model.generate_content(filled_prompt)
-            response_text = response.text
+            # Gemini API'sine istek gönder (önbellekte yoksa)
+            response_text = self.response_cache.get_or_generate(
+                task_type="validation",
+                prompt_version="v1.1",
+                model_name=settings.GEMINI_MODEL_NAME,
+                prompt=filled_prompt,
+                generate=lambda: self.llm_client.generate_text(filled_prompt),
+                validator=lambda text: LLMOutputParser.parse_validation_response(text) is not None
+            )
             
             # Yanıtı parse et
             result = LLMOutputParser.parse_validation_response(response_text)
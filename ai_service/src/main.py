@@ -1,7 +1,9 @@
+import asyncio
 import logging
-from fastapi import FastAPI, BackgroundTasks
+import threading
+from fastapi import FastAPI, HTTPException
 from sqlalchemy.orm import Session
-from typing import List, Dict, Set, Optional, Any
+from typing import List, Dict, Optional, Any
 
 # Mutlak import kullanarak
 from src.core.logging_config import setup_logging
@@ -9,7 +11,10 @@ from src.core.config import settings, DEFAULT_DISCLAIMER
 from src.db.database import SessionLocal
 from src.processing.data_preparer import prepare_news_for_analysis
 from src.processing.gemini_analyzer import group_news_stories_with_gemini, analyze_individual_story_group
-from src.processing.result_sender import send_results_to_spring_boot
+from src.processing.result_sender import send_results_to_spring_boot, ResultSink, close_http_client
+from src.processing.article_downloader import close_article_downloader
+from src.processing.result_builder import AnalysisResultBuilder
+from src.pipeline.job_manager import AnalysisJobManager, JobCancelledError, raise_if_cancelled
 
 # Loglama sistemini başlat
 setup_logging()
@@ -20,6 +25,9 @@ logger = logging.getLogger(__name__)
 # FastAPI uygulamasını oluştur
 app = FastAPI(title="AI Servisi", description="Finans haberleri analiz servisi")
 
+# Analiz işlerini single-flight olarak yöneten iş yöneticisi
+job_manager = AnalysisJobManager()
+
 @app.on_event("startup")
 async def startup_event():
     """Uygulama başladığında çalışacak fonksiyon."""
@@ -31,6 +39,18 @@ async def startup_event():
     logger.info(f"Spring Boot submit URL: {settings.SPRING_BOOT_SUBMIT_URL}")
     logger.info(f"Gemini API kullanılıyor: {'EVET' if settings.GEMINI_API_KEY else 'HAYIR - API KEY EKSIK!'}")
     logger.info(f"Gemini Model: {settings.GEMINI_MODEL_NAME}")
+    
+    # Önceki süreçten yarım kalan işleri kapat
+    try:
+        await job_manager.recover()
+    except Exception as e:
+        logger.error(f"Yarım kalan analiz işleri kontrol edilemedi: {e}")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Uygulama kapanırken paylaşılan HTTP istemcilerini kapatır."""
+    await close_http_client()
+    await close_article_downloader()
 
 @app.get("/")
 async def root():
@@ -38,214 +58,304 @@ async def root():
     logger.info("Kök endpoint çağrıldı")
     return {"message": "AI Servisi Çalışıyor"}
 
-async def analysis_process_background():
-    """Analiz sürecini arka planda çalıştıracak fonksiyon."""
-    logger.info("Arka plan analiz süreci başlatıldı.")
+async def _analyze_group(idx: int,
+                         group_info: Dict,
+                         result_builder: AnalysisResultBuilder,
+                         gemini_api_key: str,
+                         semaphore: asyncio.Semaphore,
+                         cancel_event: Optional[threading.Event] = None) -> Optional[Dict]:
+    """Tek bir grubun Aşama 2 analizini iş parçacığında çalıştırır (eşzamanlılık semafor ile sınırlı).
+    
+    Args:
+        idx: Grubun sırası (loglama için)
+        group_info: Aşama 1'den gelen {group_label, related_news_ids} sözlüğü
+        result_builder: Hazırlanmış haberleri ID'ye göre indeksleyen AnalysisResultBuilder
+        gemini_api_key: Gemini API anahtarı
+        semaphore: Eşzamanlı analiz sayısını sınırlayan semafor
+        cancel_event: İşin iptal bayrağı; iptal istendiyse analiz başlatılmaz
+        
+    Returns:
+        Disclaimer eklenmiş analiz sonucu veya None
+    """
+    group_label = group_info.get("group_label", "Bilinmeyen Grup")
+    related_ids = group_info.get("related_news_ids", [])
+    
+    # Eğer grup boşsa atla
+    if not related_ids:
+        logger.warning(f"Grup {idx+1}: '{group_label}' için haber ID'leri bulunamadı, atlanıyor.")
+        return None
+    
+    # İkinci prompt için veri hazırla: bu gruptaki haberlerin detaylarını topla
+    current_group_news_details = result_builder.group_details(related_ids)
+    
+    # Eğer haberler bulunamadıysa atla
+    if not current_group_news_details:
+        logger.warning(f"Grup {idx+1}: '{group_label}' için haber detayları bulunamadı, atlanıyor.")
+        return None
+    
+    async with semaphore:
+        # Sırası gelen grup, iptal istendiyse LLM çağrısı yapmadan durur
+        raise_if_cancelled(cancel_event)
+        logger.info(f"Grup {idx+1}: '{group_label}' için detaylı analiz yapılıyor...")
+        
+        # Detaylı analizi çağır (Aşama 2)
+        analyzed_story_result = await asyncio.to_thread(
+            analyze_individual_story_group,
+            news_group_details=current_group_news_details,
+            group_label_from_phase1=group_label,
+            api_key=gemini_api_key
+        )
+    
+    # Analiz sonuçlarını kontrol et
+    if not analyzed_story_result:
+        logger.error(f"Grup {idx+1}: '{group_label}' için detaylı analiz başarısız oldu.")
+        return None
+    
+    # Disclaimer'ı analysis_summary'nin sonuna ekle
+    if "analysis_summary" in analyzed_story_result:
+        analyzed_story_result["analysis_summary"] = f"{analyzed_story_result['analysis_summary']}\n\nUYARI: {DEFAULT_DISCLAIMER}"
+    
+    logger.info(f"Grup {idx+1}: '{group_label}' için detaylı analiz başarılı:")
+    logger.info(f"  Hikaye Başlığı: {analyzed_story_result.get('story_title', 'Başlık bulunamadı')}")
+    logger.info(f"  Kategori(ler): {', '.join(analyzed_story_result.get('main_categories', ['Kategori bulunamadı']))}")
+    
+    # Analiz özetinin ilk 200 karakterini göster
+    summary = analyzed_story_result.get('analysis_summary', '')
+    summary_preview = summary[:200] + "..." if len(summary) > 200 else summary
+    logger.info(f"  Analiz Önizleme: {summary_preview}")
+    
+    # Disclaimer'in eklendiğini logla
+    logger.info("  Disclaimer: Analysis summary'in sonuna eklenmiştir")
+    return analyzed_story_result
+
+def _prepare_news() -> List[Dict]:
+    """Haberleri, bu iş parçacığında açılıp kapatılan bir veritabanı oturumuyla hazırlar.
     
-    # Veritabanı oturumu oluştur
+    SQLAlchemy oturumu iş parçacığı güvenli değildir; oturum kullanıldığı iş parçacığında
+    kapatılır, iş iptal edildiğinde olay döngüsünden kapatılmaz.
+    """
     db = SessionLocal()
     try:
-        # ADIM 1: Veritabanından veri çek ve scraping yap
-        prepared_news_list = prepare_news_for_analysis(db)
+        return prepare_news_for_analysis(db)
+    finally:
+        db.close()
+
+async def analysis_process_background(cancel_event: Optional[threading.Event] = None) -> Dict[str, Any]:
+    """Analiz sürecini arka planda çalıştıracak fonksiyon.
+    
+    Bloklayan adımlar asyncio.to_thread ile iş parçacıklarında çalıştırılır; böylece analiz
+    sürerken olay döngüsü ve diğer endpoint'ler yanıt vermeye devam eder. İptal bayrağı aşama
+    sınırlarında kontrol edilir; süren adım yarıda kesilmez.
+    
+    Args:
+        cancel_event: İşin iptal bayrağı (AnalysisJobManager tarafından verilir)
+    
+    Returns:
+        İş kaydına yazılacak özet sayılar
+    """
+    logger.info("Arka plan analiz süreci başlatıldı.")
+    summary: Dict[str, Any] = {
+        "prepared_news": 0,
+        "groups": 0,
+        "analyzed_stories": 0,
+        "ungrouped_news": 0,
+        "results_sent": False
+    }
+    
+    # ADIM 1: Veritabanından veri çek ve scraping yap
+    # Bloklayan işlemler (veritabanı, scraping, LLM) olay döngüsü dışında, iş parçacığında çalışır
+    prepared_news_list = await asyncio.to_thread(_prepare_news)
+    raise_if_cancelled(cancel_event)
+    
+    if not prepared_news_list:
+        logger.info("Analiz edilecek yeni haber bulunamadı veya içerikleri çekilemedi.")
+        return summary
+    
+    summary["prepared_news"] = len(prepared_news_list)
+    
+    logger.info(f"Toplam {len(prepared_news_list)} adet haber scrape edildi ve Gemini için hazırlandı.")
+    
+    # İlk birkaç haberin detaylarını logla
+    max_preview = min(2, len(prepared_news_list))
+    for i in range(max_preview):
+        news = prepared_news_list[i]
+        logger.info(f"Örnek Haber {i+1}:")
+        logger.info(f"  ID: {news['id']}")
+        logger.info(f"  Başlık: {news['title']}")
+        # Eğer extracted_keywords varsa göster
+        if 'extracted_keywords' in news and news['extracted_keywords']:
+            logger.info(f"  Anahtar Kelimeler: {', '.join(news['extracted_keywords'][:5])}" + 
+                      ("..." if len(news['extracted_keywords']) > 5 else ""))
+        # İçeriğin ilk 200 karakterini göster
+        content_preview = news['content'][:200] + "..." if len(news['content']) > 200 else news['content']
+        logger.info(f"  İçerik Önizleme: {content_preview}")
+    
+    # ADIM 2: Gemini ile haberleri gruplandır (Aşama 1 - Gruplama)
+    logger.info("Gemini Aşama 1 (Gruplama) başlatılıyor...")
+    
+    # Gemini API anahtarını al
+    gemini_api_key = settings.GEMINI_API_KEY
+    if not gemini_api_key:
+        logger.error("GEMINI_API_KEY ayarlanmamış. Lütfen .env dosyanızı kontrol edin.")
+        raise RuntimeError("GEMINI_API_KEY ayarlanmamış")
+    
+    # Haberleri gruplandır
+    grouped_stories_info = await asyncio.to_thread(
+        group_news_stories_with_gemini,
+        news_batch_to_group=prepared_news_list,
+        api_key=gemini_api_key
+    )
+    raise_if_cancelled(cancel_event)
+    
+    # Gruplandırma sonuçlarını işle
+    if grouped_stories_info and len(grouped_stories_info) > 0:
+        # Haberleri ID'ye göre bir kez indeksle; sonuçların birleştirilmesi bu indeks üzerinden yapılır
+        result_builder = AnalysisResultBuilder(prepared_news_list)
+
+        logger.info(f"Gemini Aşama 1 (Gruplama) başarılı. {len(grouped_stories_info)} adet grup bulundu.")
+        summary["groups"] = len(grouped_stories_info)
         
-        if not prepared_news_list:
-            logger.info("Analiz edilecek yeni haber bulunamadı veya içerikleri çekilemedi.")
-            return
+        # Her bir grubun detaylarını logla
+        for idx, group in enumerate(grouped_stories_info):
+            group_label = group.get('group_label', 'Bilinmeyen Grup')
+            related_ids = group.get('related_news_ids', [])
+            
+            logger.info(f"Grup {idx+1}: {group_label}")
+            logger.info(f"  İçerdiği Haber Sayısı: {len(related_ids)}")
+            logger.info(f"  Haber ID'leri: {', '.join(related_ids)}")
+            
+            # Gruba dahil edilen haberlerin başlıklarını da göster
+            if len(related_ids) > 0:
+                related_titles = result_builder.group_titles(related_ids)
+                
+                if related_titles:
+                    logger.info(f"  Haber Başlıkları:")
+                    for title_idx, title in enumerate(related_titles):
+                        logger.info(f"    {title_idx+1}. {title}")
         
-        logger.info(f"Toplam {len(prepared_news_list)} adet haber scrape edildi ve Gemini için hazırlandı.")
+        # Aşama 2 (Detaylı Analiz) - Her grup için detaylı analiz yap
+        logger.info("Aşama 2'ye (Detaylı Analiz) geçiliyor...")
         
-        # İlk birkaç haberin detaylarını logla
-        max_preview = min(2, len(prepared_news_list))
-        for i in range(max_preview):
-            news = prepared_news_list[i]
-            logger.info(f"Örnek Haber {i+1}:")
-            logger.info(f"  ID: {news['id']}")
-            logger.info(f"  Başlık: {news['title']}")
-            # Eğer extracted_keywords varsa göster
-            if 'extracted_keywords' in news and news['extracted_keywords']:
-                logger.info(f"  Anahtar Kelimeler: {', '.join(news['extracted_keywords'][:5])}" + 
-                          ("..." if len(news['extracted_keywords']) > 5 else ""))
-            # İçeriğin ilk 200 karakterini göster
-            content_preview = news['content'][:200] + "..." if len(news['content']) > 200 else news['content']
-            logger.info(f"  İçerik Önizleme: {content_preview}")
+        # Grupların analizini sınırlı eşzamanlılıkla paralel yürüt
+        semaphore = asyncio.Semaphore(max(1, settings.STAGE2_MAX_CONCURRENCY))
+        group_tasks = [
+            asyncio.create_task(_analyze_group(idx, group_info, result_builder, gemini_api_key,
+                                           semaphore, cancel_event))
+            for idx, group_info in enumerate(grouped_stories_info)
+        ]
         
-        # ADIM 2: Gemini ile haberleri gruplandır (Aşama 1 - Gruplama)
-        logger.info("Gemini Aşama 1 (Gruplama) başlatılıyor...")
+        # Akış modunda her hikaye tamamlandıkça Spring Boot'a gönderilir; payload bellekte biriktirilmez
+        sink: Optional[ResultSink] = None
+        if settings.RESULT_SINK_ENABLED and settings.SPRING_BOOT_SUBMIT_URL:
+            sink = ResultSink(settings.SPRING_BOOT_SUBMIT_URL)
         
-        # Gemini API anahtarını al
-        gemini_api_key = settings.GEMINI_API_KEY
-        if not gemini_api_key:
-            logger.error("GEMINI_API_KEY ayarlanmamış. Lütfen .env dosyanızı kontrol edin.")
-            return
+        try:
+            if sink is not None:
+                for next_result in asyncio.as_completed(group_tasks):
+                    analyzed_story_result = await next_result
+                    result_builder.mark_grouped(analyzed_story_result)
+                    await sink.add(analyzed_story_result)
+            else:
+                # Sonuçlar grup sırasıyla döner; başarılı analizleri ekle ve haberlerini gruplanmış olarak işaretle
+                for analyzed_story_result in await asyncio.gather(*group_tasks):
+                    result_builder.add_story(analyzed_story_result)
+        except JobCancelledError:
+            # Süren grup analizlerinin bitmesi beklenir (iş parçacıkları arkada çalışmaya devam etmez);
+            # sırası gelmemiş gruplar iptal bayrağını görüp LLM çağrısı yapmadan döner
+            await asyncio.gather(*group_tasks, return_exceptions=True)
+            if sink is not None:
+                sink.discard()
+            raise
+        except BaseException:
+            # Hata veya servis kapanışında kalan grup analizlerini ve bekleyen gönderimleri bırak
+            for task in group_tasks:
+                task.cancel()
+            if sink is not None:
+                sink.discard()
+            raise
         
-        # Haberleri gruplandır
-        grouped_stories_info = group_news_stories_with_gemini(
-            news_batch_to_group=prepared_news_list,
-            api_key=gemini_api_key
-        )
+        # Gruplandırılamayan haberler tek geçişte belirlenir
+        analyzed_count = result_builder.story_count
+        ungrouped_ids = result_builder.ungrouped_ids()
         
-        # Gruplandırma sonuçlarını işle
-        if grouped_stories_info and len(grouped_stories_info) > 0:
-            logger.info(f"Gemini Aşama 1 (Gruplama) başarılı. {len(grouped_stories_info)} adet grup bulundu.")
-            
-            # Her bir grubun detaylarını logla
-            for idx, group in enumerate(grouped_stories_info):
-                group_label = group.get('group_label', 'Bilinmeyen Grup')
-                related_ids = group.get('related_news_ids', [])
-                
-                logger.info(f"Grup {idx+1}: {group_label}")
-                logger.info(f"  İçerdiği Haber Sayısı: {len(related_ids)}")
-                logger.info(f"  Haber ID'leri: {', '.join(related_ids)}")
-                
-                # Gruba dahil edilen haberlerin başlıklarını da göster
-                if len(related_ids) > 0:
-                    related_titles = []
-                    for news_id in related_ids:
-                        # prepared_news_list içinde bu ID'yi ara
-                        for news in prepared_news_list:
-                            if news['id'] == news_id:
-                                related_titles.append(news['title'])
-                                break
-                    
-                    if related_titles:
-                        logger.info(f"  Haber Başlıkları:")
-                        for title_idx, title in enumerate(related_titles):
-                            logger.info(f"    {title_idx+1}. {title}")
-            
-            # Aşama 2 (Detaylı Analiz) - Her grup için detaylı analiz yap
-            logger.info("Aşama 2'ye (Detaylı Analiz) geçiliyor...")
-            
-            # Başarılı analizleri tutacak liste
-            final_analyzed_stories: List[Dict] = []
-            
-            # Herhangi bir gruba dahil edilen tüm haber ID'lerini takip et
-            processed_news_ids_in_groups: Set[str] = set()
-            
-            # Her grup için Aşama 2 analizini yap
-            for idx, group_info in enumerate(grouped_stories_info):
-                group_label = group_info.get("group_label", "Bilinmeyen Grup")
-                related_ids = group_info.get("related_news_ids", [])
-                
-                # Eğer grup boşsa atla
-                if not related_ids:
-                    logger.warning(f"Grup {idx+1}: '{group_label}' için haber ID'leri bulunamadı, atlanıyor.")
-                    continue
-                
-                # İkinci prompt için veri hazırla: bu gruptaki haberlerin detaylarını topla
-                current_group_news_details: List[Dict] = []
-                for news_id in related_ids:
-                    for news in prepared_news_list:
-                        if news['id'] == news_id:
-                            # Yalnızca analize gereken alanları ekle
-                            current_group_news_details.append({
-                                'id': news['id'],
-                                'title': news['title'],
-                                'extracted_keywords': news.get('extracted_keywords', []),
-                                'content': news['content']
-                            })
-                            break
-                
-                # Eğer haberler bulunamadıysa atla
-                if not current_group_news_details:
-                    logger.warning(f"Grup {idx+1}: '{group_label}' için haber detayları bulunamadı, atlanıyor.")
-                    continue
-                
-                logger.info(f"Grup {idx+1}: '{group_label}' için detaylı analiz yapılıyor...")
-                
-                # Detaylı analizi çağır (Aşama 2)
-                analyzed_story_result = analyze_individual_story_group(
-                    news_group_details=current_group_news_details,
-                    group_label_from_phase1=group_label,
-                    api_key=gemini_api_key
-                )
-                
-                # Analiz sonuçlarını kontrol et
-                if analyzed_story_result:
-                    # Disclaimer'ı analysis_summary'nin sonuna ekle
-                    if analyzed_story_result and "analysis_summary" in analyzed_story_result:
-                        analyzed_story_result["analysis_summary"] = f"{analyzed_story_result['analysis_summary']}\n\nUYARI: {DEFAULT_DISCLAIMER}"
-                    
-                    # Zenginleştirilmiş analizi listeye ekle
-                    final_analyzed_stories.append(analyzed_story_result)
-                    
-                    # Bu hikayeye dahil olan haberleri işlenmiş olarak işaretle
-                    for news_id in analyzed_story_result.get("related_news_ids", []):
-                        processed_news_ids_in_groups.add(news_id)
-                    
-                    logger.info(f"Grup {idx+1}: '{group_label}' için detaylı analiz başarılı:")
-                    logger.info(f"  Hikaye Başlığı: {analyzed_story_result.get('story_title', 'Başlık bulunamadı')}")
-                    logger.info(f"  Kategori(ler): {', '.join(analyzed_story_result.get('main_categories', ['Kategori bulunamadı']))}")
-                    
-                    # Analiz özetinin ilk 200 karakterini göster
-                    summary = analyzed_story_result.get('analysis_summary', '')
-                    summary_preview = summary[:200] + "..." if len(summary) > 200 else summary
-                    logger.info(f"  Analiz Önizleme: {summary_preview}")
-                    
-                    # Disclaimer'in eklendiğini logla
-                    logger.info("  Disclaimer: Analysis summary'in sonuna eklenmiştir")
-                else:
-                    logger.error(f"Grup {idx+1}: '{group_label}' için detaylı analiz başarısız oldu.")
-            
-            # Gruplandırılamayan haberleri belirle
-            all_scraped_ids = {news["id"] for news in prepared_news_list}
-            ungrouped_ids = list(all_scraped_ids - processed_news_ids_in_groups)
-            
-            # Sonuçları logla
-            logger.info(f"Analiz tamamlandı: {len(final_analyzed_stories)} grup başarıyla analiz edildi.")
-            logger.info(f"Gruplara dahil edilemeyen haber sayısı: {len(ungrouped_ids)}")
-            
-            if ungrouped_ids:
-                logger.info(f"Gruplanamayan haber ID'leri: {', '.join(ungrouped_ids)}")
-                
-                # İlk birkaç gruplanamayan haberin başlıklarını göster
-                max_ungrouped_preview = min(3, len(ungrouped_ids))
-                logger.info("Gruplanamayan haberlerin örnekleri:")
-                preview_count = 0
-                
-                for news in prepared_news_list:
-                    if news["id"] in ungrouped_ids:
-                        logger.info(f"  - {news['title']}")
-                        preview_count += 1
-                        if preview_count >= max_ungrouped_preview:
-                            break
+        # Sonuçları logla
+        logger.info(f"Analiz tamamlandı: {analyzed_count} grup başarıyla analiz edildi.")
+        logger.info(f"Gruplara dahil edilemeyen haber sayısı: {len(ungrouped_ids)}")
+        
+        if ungrouped_ids:
+            logger.info(f"Gruplanamayan haber ID'leri: {', '.join(ungrouped_ids)}")
             
-            # Sonuçları Spring Boot'a gönder
-            logger.info(f"Analiz sonuçları hazır: {len(final_analyzed_stories)} grup, {len(ungrouped_ids)} gruplanamayan haber.")
+            # İlk birkaç gruplanamayan haberin başlıklarını göster
+            logger.info("Gruplanamayan haberlerin örnekleri:")
+            for title in result_builder.ungrouped_preview(3):
+                logger.info(f"  - {title}")
+        
+        summary["analyzed_stories"] = analyzed_count
+        summary["ungrouped_news"] = len(ungrouped_ids)
+        
+        # Spring Boot'a gönder
+        if sink is not None:
+            # Kalan hikayeler ve gruplanamayan haber ID'leri son partiyle gönderilir
+            send_result = await sink.close(ungrouped_ids)
             
-            # Payload'u hazırla
-            payload: Dict[str, Any] = {
-                "analyzed_stories": final_analyzed_stories,
-                "ungrouped_news_ids": ungrouped_ids
-            }
+            summary["results_sent"] = send_result
+            if send_result:
+                logger.info("Analiz sonuçları Spring Boot'a başarıyla gönderildi.")
+            else:
+                logger.error(f"Analiz sonuçlarının {sink.failed_batches} partisi Spring Boot'a gönderilemedi.")
+        elif settings.SPRING_BOOT_SUBMIT_URL:
+            logger.info(f"Analiz sonuçları hazır: {analyzed_count} grup, {len(ungrouped_ids)} gruplanamayan haber.")
+            send_result = await send_results_to_spring_boot(
+                payload=result_builder.build_payload(),
+                spring_boot_submit_url=settings.SPRING_BOOT_SUBMIT_URL
+            )
             
-            # Spring Boot'a gönder
-            if settings.SPRING_BOOT_SUBMIT_URL:
-                send_result = await send_results_to_spring_boot(
-                    payload=payload,
-                    spring_boot_submit_url=settings.SPRING_BOOT_SUBMIT_URL
-                )
-                
-                if send_result:
-                    logger.info("Analiz sonuçları Spring Boot'a başarıyla gönderildi.")
-                else:
-                    logger.error("Analiz sonuçları Spring Boot'a gönderilemedi.")
+            summary["results_sent"] = bool(send_result)
+            if send_result:
+                logger.info("Analiz sonuçları Spring Boot'a başarıyla gönderildi.")
             else:
-                logger.warning("SPRING_BOOT_SUBMIT_URL ayarlanmamış, sonuçlar gönderilemedi.")
+                logger.error("Analiz sonuçları Spring Boot'a gönderilemedi.")
         else:
-            logger.error("Gemini Aşama 1 (Gruplama) başarısız oldu veya hiç grup bulunamadı.")
-    
-    finally:
-        # Veritabanı oturumunu kapat
-        db.close()
-    
+            logger.warning("SPRING_BOOT_SUBMIT_URL ayarlanmamış, sonuçlar gönderilemedi.")
+    else:
+        logger.error("Gemini Aşama 1 (Gruplama) başarısız oldu veya hiç grup bulunamadı.")
+        if grouped_stories_info is None:
+            raise RuntimeError("Gemini Aşama 1 (Gruplama) başarısız oldu")
+
     logger.info("Arka plan analiz süreci tamamlandı.")
+    return summary
 
 @app.post("/trigger-analysis")
-async def trigger_analysis(background_tasks: BackgroundTasks):
-    """Haber analiz sürecini tetikleyen endpoint."""
+async def trigger_analysis():
+    """Haber analiz sürecini tetikleyen endpoint.
+    
+    Aktif bir analiz işi varsa yeni iş açılmaz, mevcut işin kaydı döndürülür (single-flight).
+    İşin durumu GET /jobs/{job_id} ile sorgulanabilir.
+    """
     logger.info("/trigger-analysis endpoint'i çağrıldı")
     
-    # Analiz sürecini arka planda başlat
-    background_tasks.add_task(analysis_process_background)
+    # Analiz sürecini arka planda başlat (aktif iş yoksa)
+    job, created = await job_manager.submit(analysis_process_background)
+    
+    message = "Analiz süreci başlatıldı" if created else "Aktif bir analiz süreci zaten çalışıyor"
+    return {"message": message, "created": created, **job}
+
+@app.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """Analiz işinin durumunu ve zamanlamalarını döndürür."""
+    job = await job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="İş bulunamadı")
+    return job
+
+@app.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """Aktif bir analiz işini iptal eder; bitmiş işler değişmeden döndürülür.
     
-    return {"message": "Analiz süreci başlatıldı"}
+    İş, süren adım bitip durduğunda 'cancelled' olur; o zamana kadar 'running' kalır ve
+    cancel_requested_at alanı doludur.
+    """
+    job = await job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="İş bulunamadı")
+    return job
@@ -0,0 +1,317 @@
+"""
+Job Manager Module
+
+Bu modül, /trigger-analysis çalıştırmalarını kalıcı iş kayıtlarıyla (analysis_jobs)
+yöneten AnalysisJobManager sınıfını içerir.
+
+- Single-flight: Aynı türden aktif (queued/running) bir iş varsa yeni iş açılmaz,
+  mevcut işin kaydı döndürülür. Böylece üst üste gelen tetiklemeler aynı haberleri
+  paralel olarak işleyip LLM ve veritabanı yükünü katlamaz.
+- Sahiplik ve heartbeat: Her iş onu çalıştıran süreci (owner) kaydeder ve çalıştığı sürece
+  heartbeat_at alanını günceller. Yeniden başlatmada veya yeni tetiklemede yalnızca
+  heartbeat'i zaman aşımına uğramış işler 'failed' yapılır; başka bir canlı süreçteki iş
+  etkilenmez ve bitiş durumu yazılamayan bir kayıt tetiklemeleri süresiz engellemez.
+- Durum takibi: queued -> running -> done/failed/cancelled geçişleri zaman damgalarıyla
+  kaydedilir; Spring Boot zamanlayıcısı GET /jobs/{id} ile durumu sorgulayabilir.
+- İptal: İşe iptal bayrağı (threading.Event) verilir; iş bayrağı aşama sınırlarında kontrol
+  eder. İş parçacığında süren adım yarıda kesilmez; iş, adım bitip durduğunda 'cancelled'
+  olarak kaydedilir ve single-flight kilidi ancak o zaman serbest kalır.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from src.core.config import settings
+from src.db.database import SessionLocal
+from src.db import crud
+from src.db.models import AnalysisJob
+
+# Logger oluştur
+logger = logging.getLogger(__name__)
+
+# /trigger-analysis işleri için iş türü
+NEWS_ANALYSIS_JOB = "news_analysis"
+
+# İş fonksiyonu: iptal bayrağını alır, sonuç özetini döndürür
+JobFactory = Callable[[threading.Event], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class JobCancelledError(Exception):
+    """İş, iptal isteği üzerine bir aşama sınırında durdurulduğunda fırlatılır."""
+
+
+def raise_if_cancelled(cancel_event: Optional[threading.Event]) -> None:
+    """
+    İptal istendiyse JobCancelledError fırlatır. İş fonksiyonları aşama sınırlarında çağırır.
+
+    Args:
+        cancel_event: İşin iptal bayrağı (None ise kontrol yapılmaz)
+    """
+    if cancel_event is not None and cancel_event.is_set():
+        raise JobCancelledError("İş iptal edildi")
+
+
+def default_owner() -> str:
+    """Bu süreci tanımlayan sahip adını döndürür (hostname:pid:örnek)."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def job_to_dict(job: AnalysisJob) -> Dict[str, Any]:
+    """İş kaydını API yanıtı için sözlüğe dönüştürür."""
+    duration = None
+    if job.started_at and job.finished_at:
+        duration = round((job.finished_at - job.started_at).total_seconds(), 3)
+
+    return {
+        "job_id": str(job.id),
+        "job_type": job.job_type,
+        "status": job.status,
+        "created_at": _isoformat(job.created_at),
+        "started_at": _isoformat(job.started_at),
+        "finished_at": _isoformat(job.finished_at),
+        "duration_seconds": duration,
+        "result_summary": job.result_summary,
+        "error_message": job.error_message,
+        "owner": job.owner,
+        "heartbeat_at": _isoformat(job.heartbeat_at),
+        "cancel_requested_at": _isoformat(job.cancel_requested_at)
+    }
+
+
+class AnalysisJobManager:
+    """
+    Analiz işlerini single-flight olarak çalıştıran ve durumlarını analysis_jobs tablosunda tutan yönetici.
+
+    Veritabanı işlemleri kısa ve bloklayıcı olduğundan asyncio.to_thread ile çalıştırılır.
+    """
+
+    def __init__(self,
+                 session_factory: Callable = SessionLocal,
+                 job_type: str = NEWS_ANALYSIS_JOB,
+                 owner: Optional[str] = None,
+                 heartbeat_seconds: Optional[float] = None,
+                 stale_seconds: Optional[float] = None,
+                 cancel_wait_seconds: Optional[float] = None,
+                 finish_retries: Optional[int] = None):
+        """
+        AnalysisJobManager sınıfını başlatır.
+
+        Args:
+            session_factory: SQLAlchemy oturum üreticisi
+            job_type: Yönetilen işlerin türü
+            owner: Bu süreci tanımlayan sahip adı. None ise hostname:pid:örnek.
+            heartbeat_seconds: Heartbeat aralığı. None ise JOB_HEARTBEAT_SECONDS.
+            stale_seconds: Heartbeat zaman aşımı. None ise JOB_STALE_SECONDS.
+            cancel_wait_seconds: İptal isteğinde işin durmasının bekleneceği süre. None ise JOB_CANCEL_WAIT_SECONDS.
+            finish_retries: Bitiş durumunu yazma deneme sayısı. None ise JOB_FINISH_RETRIES.
+        """
+        self.session_factory = session_factory
+        self.job_type = job_type
+        self.owner = owner or default_owner()
+        self.heartbeat_seconds = heartbeat_seconds if heartbeat_seconds is not None else settings.JOB_HEARTBEAT_SECONDS
+        self.stale_seconds = stale_seconds if stale_seconds is not None else settings.JOB_STALE_SECONDS
+        self.cancel_wait_seconds = (cancel_wait_seconds if cancel_wait_seconds is not None
+                                    else settings.JOB_CANCEL_WAIT_SECONDS)
+        self.finish_retries = max(1, finish_retries if finish_retries is not None else settings.JOB_FINISH_RETRIES)
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._cancel_events: Dict[str, threading.Event] = {}
+        self._lock = asyncio.Lock()
+
+    def _with_session(self, func: Callable, *args, **kwargs) -> Any:
+        """Yeni bir oturum açıp fonksiyonu çalıştırır ve oturumu kapatır."""
+        db = self.session_factory()
+        try:
+            result = func(db, *args, **kwargs)
+            return job_to_dict(result) if isinstance(result, AnalysisJob) else result
+        finally:
+            db.close()
+
+    async def _db(self, func: Callable, *args, **kwargs) -> Any:
+        """Veritabanı işlemini olay döngüsü dışında çalıştırır."""
+        return await asyncio.to_thread(self._with_session, func, *args, **kwargs)
+
+    def _stale_before(self) -> datetime:
+        """Bu zamandan önce heartbeat göndermemiş aktif işler zaman aşımına uğramış sayılır."""
+        return datetime.now(timezone.utc) - timedelta(seconds=self.stale_seconds)
+
+    def _is_alive(self, job: Dict[str, Any]) -> bool:
+        """Aktif işin sahibinin heartbeat göndermeye devam edip etmediğini döndürür."""
+        last_seen = job.get("heartbeat_at") or job.get("started_at") or job.get("created_at")
+        if not last_seen:
+            return False
+        last_seen = datetime.fromisoformat(last_seen)
+        if last_seen.tzinfo is None:
+            last_seen = last_seen.replace(tzinfo=timezone.utc)
+        return last_seen >= self._stale_before()
+
+    async def recover(self) -> int:
+        """
+        Servis başladığında heartbeat'i zaman aşımına uğramış (sahibi çökmüş) aktif işleri
+        'failed' olarak işaretler. Başka canlı süreçlerde çalışan işler değiştirilmez.
+
+        Returns:
+            int: Güncellenen iş sayısı
+        """
+        count = await self._db(crud.fail_stale_jobs, self.job_type,
+                               "İş heartbeat zaman aşımına uğradı, süreç yeniden başlatılmış olabilir",
+                               self._stale_before())
+        if count:
+            logger.warning(f"Heartbeat'i zaman aşımına uğramış {count} aktif iş 'failed' olarak işaretlendi")
+        return count
+
+    async def submit(self, job_factory: JobFactory) -> Tuple[Dict[str, Any], bool]:
+        """
+        Aktif iş yoksa yeni bir iş oluşturup arka planda çalıştırır.
+
+        Args:
+            job_factory: İptal bayrağını alıp çalıştırılacak coroutine'i üreten fonksiyon;
+                sonuç özeti döndürebilir
+
+        Returns:
+            (Dict[str, Any], bool): İş kaydı ve yeni oluşturulup oluşturulmadığı
+        """
+        async with self._lock:
+            job_dict, created = await self._db(self._create_job)
+
+            if not created:
+                logger.info(f"Aktif analiz işi zaten var ({job_dict['job_id']}, {job_dict['status']}), yeni iş açılmadı")
+                return job_dict, False
+
+            job_id = job_dict["job_id"]
+            cancel_event = threading.Event()
+            self._cancel_events[job_id] = cancel_event
+            self._tasks[job_id] = asyncio.create_task(self._run(job_id, job_factory, cancel_event))
+            logger.info(f"Analiz işi kuyruğa alındı: {job_id}")
+            return job_dict, True
+
+    def _create_job(self, db) -> Tuple[Dict[str, Any], bool]:
+        """Aktif iş yoksa bu sürece ait yeni bir iş oluşturur."""
+        job, created = crud.create_job_if_idle(db, self.job_type, self.owner, self._stale_before())
+        return job_to_dict(job), created
+
+    async def _run(self, job_id: str, job_factory: JobFactory, cancel_event: threading.Event) -> None:
+        """İşi çalıştırır, heartbeat gönderir ve durum geçişlerini kaydeder."""
+        heartbeat: Optional[asyncio.Task] = None
+        status, fields = crud.JOB_DONE, {}
+        try:
+            await self._db(crud.update_job, job_id, crud.JOB_RUNNING)
+            heartbeat = asyncio.create_task(self._heartbeat(job_id, cancel_event))
+            logger.info(f"Analiz işi başladı: {job_id}")
+
+            summary = await job_factory(cancel_event)
+            fields = {"result_summary": summary or {}}
+            logger.info(f"Analiz işi tamamlandı: {job_id}")
+
+        except JobCancelledError:
+            status, fields = crud.JOB_CANCELLED, {"error_message": "İş iptal edildi"}
+            logger.warning(f"Analiz işi iptal edildi: {job_id}")
+
+        except asyncio.CancelledError:
+            # Süreç kapanırken görev iptal edildi
+            status, fields = crud.JOB_CANCELLED, {"error_message": "İş, servis kapanırken iptal edildi"}
+            logger.warning(f"Analiz işi servis kapanırken iptal edildi: {job_id}")
+
+        except Exception as e:
+            status, fields = crud.JOB_FAILED, {"error_message": str(e)}
+            logger.error(f"Analiz işi başarısız oldu ({job_id}): {e}")
+
+        finally:
+            if heartbeat is not None:
+                heartbeat.cancel()
+            await self._finish(job_id, status, **fields)
+            self._tasks.pop(job_id, None)
+            self._cancel_events.pop(job_id, None)
+
+    async def _finish(self, job_id: str, status: str, **fields) -> None:
+        """
+        İşin bitiş durumunu yazar; geçici veritabanı hatalarında birkaç kez dener.
+
+        Yazılamazsa heartbeat durduğu için kayıt JOB_STALE_SECONDS sonra zaman aşımıyla kapatılır.
+        """
+        for attempt in range(1, self.finish_retries + 1):
+            try:
+                await self._db(crud.update_job, job_id, status, **fields)
+                return
+            except Exception as e:
+                logger.warning(f"İş durumu yazılamadı ({job_id}, {status}), deneme {attempt}/{self.finish_retries}: {e}")
+                if attempt < self.finish_retries:
+                    await asyncio.sleep(min(2 ** (attempt - 1), self.heartbeat_seconds))
+
+        logger.error(f"İş durumu yazılamadı ({job_id}); kayıt heartbeat zaman aşımıyla kapatılacak")
+
+    async def _heartbeat(self, job_id: str, cancel_event: threading.Event) -> None:
+        """
+        İş sürdükçe heartbeat_at alanını günceller.
+
+        İş başka bir süreç tarafından zaman aşımıyla kapatıldıysa veya kayda iptal isteği
+        yazıldıysa iptal bayrağı ayarlanır; iş bir sonraki aşama sınırında durur.
+        """
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                job = await self._db(crud.heartbeat_job, job_id, self.owner)
+            except Exception as e:
+                logger.warning(f"İş heartbeat'i yazılamadı ({job_id}): {e}")
+                continue
+
+            lost = job is None or job["status"] not in crud.ACTIVE_JOB_STATUSES or job["owner"] != self.owner
+            if (lost or job["cancel_requested_at"]) and not cancel_event.is_set():
+                reason = "iş kaydı artık bu sürece ait değil" if lost else "iptal isteği alındı"
+                logger.warning(f"Analiz işi durduruluyor ({job_id}): {reason}")
+                cancel_event.set()
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        İş kaydını döndürür.
+
+        Args:
+            job_id: İş ID'si
+
+        Returns:
+            Optional[Dict[str, Any]]: İş kaydı veya bulunamazsa None
+        """
+        return await self._db(crud.get_job, job_id)
+
+    async def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Aktif bir işi iptal eder. Bitmiş işler değiştirilmez.
+
+        Bu süreçte çalışan işin iptal bayrağı ayarlanır ve işin durması en fazla
+        cancel_wait_seconds kadar beklenir. İş, süren adım bitip durduğunda 'cancelled'
+        olarak kaydedilir; o zamana kadar kayıt 'running' kalır ve cancel_requested_at doludur.
+        Başka bir canlı süreçte çalışan işe yalnızca iptal isteği yazılır; sahibi olmayan
+        (heartbeat'i zaman aşımına uğramış) iş doğrudan 'cancelled' yapılır.
+
+        Args:
+            job_id: İş ID'si
+
+        Returns:
+            Optional[Dict[str, Any]]: Güncel iş kaydı veya bulunamazsa None
+        """
+        task = self._tasks.get(job_id)
+        cancel_event = self._cancel_events.get(job_id)
+        if task is not None and cancel_event is not None:
+            cancel_event.set()
+            await self._db(crud.request_job_cancel, job_id)
+            # Görev iptal edilmez; iş bir sonraki aşama sınırında kendiliğinden durur
+            await asyncio.wait({task}, timeout=self.cancel_wait_seconds)
+            return await self.get(job_id)
+
+        job = await self.get(job_id)
+        if job and job["status"] in crud.ACTIVE_JOB_STATUSES:
+            if self._is_alive(job):
+                # Başka bir süreçte çalışıyor; sahibi isteği heartbeat sırasında görüp işi durdurur
+                job = await self._db(crud.request_job_cancel, job_id)
+            else:
+                job = await self._db(crud.update_job, job_id, crud.JOB_CANCELLED, error_message="İş iptal edildi")
+        return job
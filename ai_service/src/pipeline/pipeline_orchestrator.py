@@ -8,13 +8,16 @@ ve sonuçları veritabanına kaydeder.
 
 import logging
 import concurrent.futures
+import functools
 from typing import Dict, List, Any, Tuple, Optional
 import time
+from datetime import datetime, timedelta, timezone
 import numpy as np
 # Direkt veritabanı işlemleri yerine PersistenceManager kullanılıyor
 from ..processing.feature_extractor import FeatureExtractor
 from ..processing.event_classifier import EventTypeClassifier
 from ..db.persistence_manager import PersistenceManager, PROCESSING_SUCCESS, PROCESSING_PARTIAL_SUCCESS, PROCESSING_FAILED
+from ..db.feature_writer import BatchedFeatureWriter
 from ..clustering.interaction_scorer import InteractionScorer
 from ..clustering.graph_clusterer import GraphClusterer
 from ..llm.validator import LLMValidator
@@ -25,6 +28,7 @@ from ..tracking.historical_context_retriever import HistoricalContextRetriever
 from ..processing.story_processor import StoryProcessor
 from ..llm.synthesizer import LLMSynthesizer
 from ..llm.asset_filter import LLMAssetFilter
+from ..llm.response_cache import get_llm_response_cache
 from ..processing.surprise_score_calculator import SurpriseScoreCalculator
 from ..core.config import settings
 
@@ -110,12 +114,14 @@ class PipelineOrchestrator:
         
     # _fetch_unprocessed_news metodu kaldırıldı, sorumluluk PersistenceManager'a devredildi
     
-    def _process_news(self, news_item: Dict[str, Any]) -> str:
+    def _process_news(self, news_item: Dict[str, Any], enriched_item: Dict[str, Any]) -> str:
         """
-        Bir haber öğesini işleyerek özelliklerini çıkarır ve sonuçları kaydeder.
+        Özellikleri toplu NLP aşamasında çıkarılmış bir haber öğesini sınıflandırır,
+        etkilenen varlıkları belirler ve sonuçları kaydeder.
         
         Args:
             news_item: İşlenecek haber öğesi (id ve url içermeli)
+            enriched_item: FeatureExtractor.extract_features_batch çıktısındaki ilgili öğe
             
         Returns:
             str: İşlemin durumu (PROCESSING_SUCCESS, PROCESSING_PARTIAL_SUCCESS, PROCESSING_FAILED)
@@ -125,99 +131,11 @@ class PipelineOrchestrator:
             # Başlama zamanını kaydet
             start_time = time.time()
             
-            # Özellikleri çıkar
-            logger.info(f"Haber ID {news_id} için özellik çıkarma başlatılıyor")
-            enriched_item = self.feature_extractor.extract_features(news_item)
-            
-            # Modelin adını al
-            model_version = settings.EMBEDDING_MODEL_NAME
-            
-            # Olay türünü sınıflandır
-            event_info = None
-            if enriched_item.get('full_text') and enriched_item.get('entities'):
-                logger.info(f"Haber ID {news_id} için olay türü sınıflandırması başlatılıyor")
-                event_info = self.event_type_classifier.classify(
-                    enriched_item['full_text'], 
-                    enriched_item.get('entities', {})
-                )
-                if event_info:
-                    event_type = event_info.get('event_type')
-                    priority = event_info.get('priority')
-                    description = event_info.get('description')
-                    rationale = event_info.get('rationale')
-                    
-                    logger.info(f"Haber ID {news_id} için olay türü belirlendi: {event_type} (öncelik: {priority})")
-                    logger.debug(f"Olay açıklaması: {description}")
-                    logger.debug(f"Olay gerekçesi: {rationale}")
-                    
-                    # Sadece event_type'ı enriched_item'a ekle - veritabanı şeması ile uyumlu olması için
-                    enriched_item['event_type'] = event_type
-                    
-                    # Sürpriz skorunu hesapla
-                    try:
-                        publication_date = news_item.get('published_at') or datetime.now()
-                        logger.info(f"Haber ID {news_id} için sürpriz skoru hesaplanıyor (olay türü: {event_type})")
-                        surprise_score = self.surprise_score_calculator.calculate_score(
-                            event_type=event_type,
-                            publication_date=publication_date
-                        )
-                        
-                        if surprise_score is not None:
-                            logger.info(f"Haber ID {news_id} için sürpriz skoru hesaplandı: {surprise_score:.4f}")
-                            enriched_item['surprise_score'] = surprise_score
-                        else:
-                            logger.info(f"Haber ID {news_id} için sürpriz skoru hesaplanamadı (ilgili ekonomik olay bulunamadı)")
-                    except Exception as e:
-                        logger.error(f"Haber ID {news_id} için sürpriz skoru hesaplanırken hata: {e}")
-                    
-                    # İsteğe bağlı olarak, gelecekte bu ek bilgileri de kaydetmek istenirse:
-                    # enriched_item['event_info'] = event_info
-                else:
-                    logger.info(f"Haber ID {news_id} için olay türü belirlenemedi")
-                    
-            # Etkilenen finansal enstrümanları tespit et
-            if enriched_item.get('entities'):
-                logger.info(f"Haber ID {news_id} için etkilenen varlık analizi başlatılıyor")
-                
-                # 1. AssetMapper ile potansiyel varlıkları belirle
-                candidate_assets = self.asset_mapper.map_assets(enriched_item.get('entities', {}))
-                
-                if candidate_assets:
-                    # 2. LLMAssetFilter ile doğrulama yap
-                    try:
-                        logger.info(f"Haber ID {news_id} için {len(candidate_assets)} aday varlık LLM ile filtreleniyor")
-                        affected_assets_info = self.asset_filter.filter_assets(
-                            enriched_item['full_text'],
-                            candidate_assets
-                        )
-                        
-                        # Sonuçları değerlendir
-                        if affected_assets_info:
-                            # Sadece asset listesini al
-                            affected_assets = [item.get("asset") for item in affected_assets_info if item.get("asset")]
-                            
-                            if affected_assets:
-                                logger.info(f"Haber ID {news_id} için etkilenen {len(affected_assets)} varlık bulundu: {', '.join(affected_assets)}")
-                                enriched_item['affected_assets'] = affected_assets
-                                
-                                # Detaylı analiz sonuçlarını loglama
-                                for asset_info in affected_assets_info:
-                                    asset = asset_info.get("asset")
-                                    impact = asset_info.get("impact")
-                                    reason = asset_info.get("reason")
-                                    logger.debug(f"Varlık: {asset}, Etki: {impact}, Neden: {reason}")
-                            else:
-                                logger.info(f"Haber ID {news_id} için etkilenen varlık bulunamadı (LLM filtreleme sonrası)")
-                        else:
-                            logger.info(f"Haber ID {news_id} için etkilenen varlık bulunamadı (LLM yanıt hatası)")
-                    except Exception as e:
-                        logger.error(f"Haber ID {news_id} için varlık filtreleme hatası: {e}")
-                else:
-                    logger.info(f"Haber ID {news_id} için aday varlık bulunamadı")
+            self._analyze_news(news_item, enriched_item)
             
             # Verileri veritabanına kaydet ve işlem durumunu al
             # PersistenceManager zaten doğru durum kodunu döndürüyor
-            status = self.persistence_manager.save_features(enriched_item, model_version)
+            status = self.persistence_manager.save_features(enriched_item, settings.EMBEDDING_MODEL_NAME)
             
             # İşlem süresini hesapla
             process_time = time.time() - start_time
@@ -233,6 +151,184 @@ class PipelineOrchestrator:
             logger.error(f"Haber ID {news_id} işlenirken hata: {e}")
             return PROCESSING_FAILED
             
+    def _analyze_news(self,
+                      news_item: Dict[str, Any],
+                      enriched_item: Dict[str, Any],
+                      filter_assets: bool = True,
+                      score_surprise: bool = True) -> Dict[str, Any]:
+        """
+        Haber öğesini sınıflandırır, sürpriz skorunu hesaplar ve etkilenen varlıkları belirler.
+        
+        Sonuçlar (event_type, surprise_score, affected_assets) enriched_item içine yazılır;
+        kayıt işlemi çağırana bırakılır.
+        
+        Args:
+            news_item: İşlenecek haber öğesi (id ve url içermeli)
+            enriched_item: FeatureExtractor.extract_features_batch çıktısındaki ilgili öğe
+            filter_assets: False ise aday varlıklar LLM ile filtrelenmez, toplu filtreleme için
+                           enriched_item['candidate_assets'] içine bırakılır
+            score_surprise: False ise sürpriz skoru hesaplanmaz, toplu hesaplama için
+                            enriched_item['surprise_lookup'] içine (olay türü, yayın tarihi) bırakılır
+            
+        Returns:
+            Dict[str, Any]: Güncellenmiş enriched_item
+        """
+        news_id = news_item["id"]
+        
+        # Olay türünü sınıflandır
+        event_info = None
+        if enriched_item.get('full_text') and enriched_item.get('entities'):
+            logger.info(f"Haber ID {news_id} için olay türü sınıflandırması başlatılıyor")
+            event_info = self.event_type_classifier.classify(
+                enriched_item['full_text'], 
+                enriched_item.get('entities', {})
+            )
+            if event_info:
+                event_type = event_info.get('event_type')
+                priority = event_info.get('priority')
+                description = event_info.get('description')
+                rationale = event_info.get('rationale')
+                
+                logger.info(f"Haber ID {news_id} için olay türü belirlendi: {event_type} (öncelik: {priority})")
+                logger.debug(f"Olay açıklaması: {description}")
+                logger.debug(f"Olay gerekçesi: {rationale}")
+                
+                # Sadece event_type'ı enriched_item'a ekle - veritabanı şeması ile uyumlu olması için
+                enriched_item['event_type'] = event_type
+                
+                # Sürpriz skorunu hesapla
+                publication_date = news_item.get('published_at') or datetime.now()
+                if not score_surprise:
+                    # Skor run_phase1'deki toplu adımda hesaplanacak
+                    enriched_item['surprise_lookup'] = (event_type, publication_date)
+                else:
+                    try:
+                        logger.info(f"Haber ID {news_id} için sürpriz skoru hesaplanıyor (olay türü: {event_type})")
+                        surprise_score = self.surprise_score_calculator.calculate_score(
+                            event_type=event_type,
+                            publication_date=publication_date
+                        )
+                        self._apply_surprise_score(news_id, enriched_item, surprise_score)
+                    except Exception as e:
+                        logger.error(f"Haber ID {news_id} için sürpriz skoru hesaplanırken hata: {e}")
+                
+                # İsteğe bağlı olarak, gelecekte bu ek bilgileri de kaydetmek istenirse:
+                # enriched_item['event_info'] = event_info
+            else:
+                logger.info(f"Haber ID {news_id} için olay türü belirlenemedi")
+                
+        # Etkilenen finansal enstrümanları tespit et
+        if enriched_item.get('entities'):
+            logger.info(f"Haber ID {news_id} için etkilenen varlık analizi başlatılıyor")
+            
+            # 1. AssetMapper ile potansiyel varlıkları belirle
+            candidate_assets = self.asset_mapper.map_assets(enriched_item.get('entities', {}))
+            
+            if candidate_assets and not filter_assets:
+                # Filtreleme run_phase1'deki toplu adımda yapılacak
+                enriched_item['candidate_assets'] = candidate_assets
+            elif candidate_assets:
+                # 2. LLMAssetFilter ile doğrulama yap
+                try:
+                    logger.info(f"Haber ID {news_id} için {len(candidate_assets)} aday varlık LLM ile filtreleniyor")
+                    affected_assets_info = self.asset_filter.filter_assets(
+                        enriched_item['full_text'],
+                        candidate_assets
+                    )
+                    self._apply_affected_assets(news_id, enriched_item, affected_assets_info)
+                except Exception as e:
+                    logger.error(f"Haber ID {news_id} için varlık filtreleme hatası: {e}")
+            else:
+                logger.info(f"Haber ID {news_id} için aday varlık bulunamadı")
+        
+        return enriched_item
+    
+    def _apply_affected_assets(self,
+                               news_id: int,
+                               enriched_item: Dict[str, Any],
+                               affected_assets_info: List[Dict[str, Any]]) -> None:
+        """
+        LLMAssetFilter sonucunu değerlendirir ve etkilenen varlıkları enriched_item içine yazar.
+        
+        Args:
+            news_id: Haber ID'si
+            enriched_item: Güncellenecek haber öğesi
+            affected_assets_info: filter_assets formatında etkilenen varlık listesi
+        """
+        if affected_assets_info:
+            # Sadece asset listesini al
+            affected_assets = [item.get("asset") for item in affected_assets_info if item.get("asset")]
+            
+            if affected_assets:
+                logger.info(f"Haber ID {news_id} için etkilenen {len(affected_assets)} varlık bulundu: {', '.join(affected_assets)}")
+                enriched_item['affected_assets'] = affected_assets
+                
+                # Detaylı analiz sonuçlarını loglama
+                for asset_info in affected_assets_info:
+                    asset = asset_info.get("asset")
+                    impact = asset_info.get("impact")
+                    reason = asset_info.get("reason")
+                    logger.debug(f"Varlık: {asset}, Etki: {impact}, Neden: {reason}")
+            else:
+                logger.info(f"Haber ID {news_id} için etkilenen varlık bulunamadı (LLM filtreleme sonrası)")
+        else:
+            logger.info(f"Haber ID {news_id} için etkilenen varlık bulunamadı (LLM yanıt hatası)")
+    
+    def _apply_surprise_score(self, news_id: int, enriched_item: Dict[str, Any], surprise_score: Optional[float]) -> None:
+        """Hesaplanan sürpriz skorunu enriched_item'a yazar."""
+        if surprise_score is not None:
+            logger.info(f"Haber ID {news_id} için sürpriz skoru hesaplandı: {surprise_score:.4f}")
+            enriched_item['surprise_score'] = surprise_score
+        else:
+            logger.info(f"Haber ID {news_id} için sürpriz skoru hesaplanamadı (ilgili ekonomik olay bulunamadı)")
+    
+    def _score_surprise_batch(self, enriched_items: List[Dict[str, Any]]) -> None:
+        """
+        Sürpriz skoru bekleyen haberlerin skorlarını SurpriseScoreCalculator.calculate_scores_batch ile hesaplar.
+        
+        Takvim indeksinin kapsamadığı haberler için bile en fazla bir veritabanı sorgusu yapılır.
+        
+        Args:
+            enriched_items: _analyze_news(score_surprise=False) çıktıları
+        """
+        pending = [item for item in enriched_items if item.get('surprise_lookup')]
+        if not pending:
+            return
+        
+        logger.info(f"{len(pending)} haber için sürpriz skorları toplu olarak hesaplanıyor")
+        scores = self.surprise_score_calculator.calculate_scores_batch([
+            (item["id"], *item['surprise_lookup']) for item in pending
+        ])
+        
+        for item in pending:
+            del item['surprise_lookup']
+            self._apply_surprise_score(item["id"], item, scores.get(item["id"]))
+    
+    def _filter_assets_batch(self, enriched_items: List[Dict[str, Any]]) -> None:
+        """
+        Aday varlıkları bekleyen haberleri LLMAssetFilter.filter_assets_batch ile toplu filtreler.
+        
+        Args:
+            enriched_items: _analyze_news(filter_assets=False) çıktıları
+        """
+        pending = [item for item in enriched_items if item.get('candidate_assets')]
+        if not pending:
+            return
+        
+        logger.info(f"{len(pending)} haber için aday varlıklar toplu olarak LLM ile filtreleniyor")
+        try:
+            results = self.asset_filter.filter_assets_batch([
+                {"id": item["id"], "text": item.get("full_text") or "", "candidate_assets": item["candidate_assets"]}
+                for item in pending
+            ])
+        except Exception as e:
+            logger.error(f"Toplu varlık filtreleme hatası: {e}")
+            results = {}
+        
+        for item in pending:
+            del item['candidate_assets']
+            self._apply_affected_assets(item["id"], item, results.get(item["id"], []))
+            
     def run_phase1(self) -> Dict[str, int]:
         """
         Faz 1 boru hattını çalıştırır: özellikleri çıkarır ve verileri kaydeder.
@@ -260,31 +356,116 @@ class PipelineOrchestrator:
             logger.info("İşlenecek haber bulunamadı")
             return results
             
-        logger.info(f"{len(unprocessed_news)} haber paralel olarak işlenecek (max_workers: {self.max_workers})")
+        logger.info(f"{len(unprocessed_news)} haber işlenecek (max_workers: {self.max_workers}, "
+                   f"batch: {settings.PHASE1_BATCH_SIZE})")
+        
+        # Ekonomik takvimi çalıştırma başına bir kez yükle; sürpriz skorları bellekten hesaplanır
+        self.surprise_score_calculator.refresh_calendar()
+        
+        # Aşama 1: Metinleri eşzamanlı olarak indir (ağ yoğun)
+        texts = self.feature_extractor.download_texts(unprocessed_news, max_workers=self.max_workers)
+        
+        # Kayıtlar toplu yazma açıksa BatchedFeatureWriter üzerinden birkaç işlemde yapılır
+        feature_writer = BatchedFeatureWriter(self.persistence_manager) if settings.PHASE1_BATCHED_WRITES else None
         
-        # İş parçacığı havuzu oluştur
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Her bir haber için _process_news metodunu çağır
-            future_to_news = {executor.submit(self._process_news, news): news for news in unprocessed_news}
+        # Toplu varlık filtrelemede analiz edilen haberler PHASE1_BATCH_SIZE'lık gruplar halinde
+        # skorlanıp filtrelenir ve hemen kaydedilir; tüm çalıştırma bellekte biriktirilmez
+        batch_assets = settings.ASSET_FILTER_BATCH_MODE
+        if batch_assets:
+            worker = functools.partial(self._analyze_news, filter_assets=False, score_surprise=False)
+        else:
+            worker = self._analyze_news if feature_writer else self._process_news
+        batch_size = settings.PHASE1_BATCH_SIZE
+        statuses = []
+        save_futures = []
+        analyzed_items = []
+        
+        def save(enriched_item: Dict[str, Any]) -> None:
+            if feature_writer:
+                save_futures.append(feature_writer.submit(enriched_item, settings.EMBEDDING_MODEL_NAME))
+            else:
+                statuses.append(self.persistence_manager.save_features(enriched_item, settings.EMBEDDING_MODEL_NAME))
+        
+        def flush_analyzed() -> None:
+            # Aşama 4: Sürpriz skorlarını toplu hesapla, aday varlıkları az sayıda LLM çağrısıyla filtrele ve kaydet
+            items = analyzed_items[:]
+            analyzed_items.clear()
+            if not items:
+                return
+            self._score_surprise_batch(items)
+            self._filter_assets_batch(items)
+            for enriched_item in items:
+                save(enriched_item)
+        
+        def collect(future: concurrent.futures.Future, news: Dict[str, Any]) -> None:
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"Haber ID {news.get('id')} için Executor hatası: {e}")
+                results["failed"] += 1
+                return
             
-            # Tamamlanan işleri bekle ve sonuçları topla
-            for future in concurrent.futures.as_completed(future_to_news):
-                news = future_to_news[future]
-                try:
-                    # _process_news artık doğrudan durum kodu döndürüyor
-                    status = future.result()
+            if batch_assets:
+                analyzed_items.append(result)
+                if len(analyzed_items) >= batch_size:
+                    flush_analyzed()
+            elif feature_writer:
+                save(result)
+            else:
+                # _process_news artık doğrudan durum kodu döndürüyor
+                statuses.append(result)
+        
+        try:
+            # İş parçacığı havuzu oluştur
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                future_to_news = {}
+                
+                # Aşama 2: Varlık tanıma ve gömme işlemlerini batch'ler halinde yap (CPU yoğun)
+                for batch_start in range(0, len(unprocessed_news), batch_size):
+                    news_batch = unprocessed_news[batch_start:batch_start + batch_size]
+                    try:
+                        enriched_batch = self.feature_extractor.extract_features_batch([
+                            {"id": news["id"], "full_text": texts.get(news["id"])}
+                            for news in news_batch
+                        ])
+                    except Exception as e:
+                        logger.error(f"Haber batch'i ({batch_start}-{batch_start + len(news_batch)}) işlenirken hata: {e}")
+                        results["failed"] += len(news_batch)
+                        continue
                     
-                    # PersistenceManager'dan dönen duruma göre sayaçları güncelle
-                    if status == PROCESSING_SUCCESS:
-                        results["success"] += 1
-                    elif status == PROCESSING_PARTIAL_SUCCESS:
-                        results["partial"] += 1
-                    else:
-                        results["failed"] += 1
-                        
-                except Exception as e:
-                    logger.error(f"Haber ID {news.get('id')} için Executor hatası: {e}")
-                    results["failed"] += 1
+                    # Aşama 3: Sınıflandırma, varlık filtreleme ve kayıt işlemlerini paralel yürüt;
+                    # bu sırada bir sonraki batch'in NLP işlemleri devam eder
+                    for news, enriched_item in zip(news_batch, enriched_batch):
+                        future = executor.submit(worker, news, enriched_item)
+                        future_to_news[future] = news
+                    
+                    # Bu ana kadar tamamlanan işleri beklemeden topla (sonuçlar çalıştırma sonuna bırakılmaz)
+                    for future in [future for future in future_to_news if future.done()]:
+                        collect(future, future_to_news.pop(future))
+                
+                # Kalan işleri tamamlandıkça topla
+                for future in concurrent.futures.as_completed(future_to_news):
+                    collect(future, future_to_news[future])
+            
+            # Son (eksik) grubu işle
+            if batch_assets:
+                flush_analyzed()
+        finally:
+            # Kuyrukta kalan kayıtları yaz
+            if feature_writer:
+                feature_writer.close()
+        
+        for future in save_futures:
+            statuses.append(future.result())
+        
+        # PersistenceManager'dan dönen duruma göre sayaçları güncelle
+        for status in statuses:
+            if status == PROCESSING_SUCCESS:
+                results["success"] += 1
+            elif status == PROCESSING_PARTIAL_SUCCESS:
+                results["partial"] += 1
+            else:
+                results["failed"] += 1
                     
         # Özet sonuçları logla
         logger.info(f"İşlem tamamlandı: {results['success']} başarılı, " + 
@@ -293,6 +474,47 @@ class PipelineOrchestrator:
         
         return results
         
+    def _calculate_interactions(self) -> Dict[str, int]:
+        """
+        Etkileşim skorlarını hesaplar ve graph_edges tablosuna kaydeder (Faz 2a).
+        
+        INCREMENTAL_GRAPH_EDGES açıkken yalnızca son çalıştırmadan beri işlenmiş haberler,
+        watermark üzerinden GRAPH_INCREMENTAL_BATCH_SIZE'lık parçalar halinde çekilip kalıcı
+        vektör indeksine karşı skorlanır. Kapalıyken işlenmiş haberlerin tamamı yeniden skorlanır.
+        
+        Returns:
+            Dict[str, int]: processed_news_count ve saved_edges alanları
+        """
+        results = {"processed_news_count": 0, "saved_edges": 0}
+        
+        if not settings.INCREMENTAL_GRAPH_EDGES:
+            processed_news = self.persistence_manager.fetch_processed_news(limit=settings.GRAPH_WINDOW_MAX_NEWS)
+            results["processed_news_count"] = len(processed_news)
+            if processed_news:
+                results["saved_edges"] = self.interaction_scorer.calculate_and_save_scores(processed_news)
+            return results
+        
+        vector_index = self.interaction_scorer.vector_index
+        window_start = datetime.now(timezone.utc) - timedelta(hours=settings.GRAPH_WINDOW_HOURS)
+        batch_size = settings.GRAPH_INCREMENTAL_BATCH_SIZE
+        
+        while True:
+            watermark = vector_index.watermark
+            new_news = self.persistence_manager.fetch_newly_processed_news(
+                since=watermark, window_start=window_start, limit=batch_size
+            )
+            if not new_news:
+                break
+            
+            results["saved_edges"] += self.interaction_scorer.calculate_incremental_scores(new_news)
+            results["processed_news_count"] += len(new_news)
+            
+            # Son parça ya da watermark ilerlemediyse dur
+            if len(new_news) < batch_size or vector_index.watermark == watermark:
+                break
+        
+        return results
+        
     def run_phase2(self) -> Dict[str, Any]:
         """
         Faz 2 boru hattını çalıştırır: haberler arasındaki etkileşim skorlarını hesaplar 
@@ -300,6 +522,7 @@ class PipelineOrchestrator:
         
         Önce işlenmiş ve embedding vektörü içeren haberleri veritabanından çeker, 
         ardından InteractionScorer ile aralarındaki etkileşim skorlarını hesaplar.
+        Artımlı modda yalnızca son çalıştırmadan beri işlenmiş haberler skorlanır.
         
         Returns:
             Dict[str, Any]: İşlem sonuçlarının özeti
@@ -321,19 +544,11 @@ class PipelineOrchestrator:
         try:
             logger.info("Faz 2: Haber etkileşimleri hesaplanıyor...")
             
-            # İşlenmiş haberleri çek (embedding_vector ve entities içeren)
-            processed_news = self.persistence_manager.fetch_processed_news(limit=1000)
-            results["processed_news_count"] = len(processed_news)
-            
-            if not processed_news:
-                logger.warning("Etkileşim hesaplamak için işlenmiş haber bulunamadı")
-                results["duration"] = time.time() - start_time
-                return results
-                
-            logger.info(f"{len(processed_news)} işlenmiş haber için etkileşimler hesaplanacak")
-            
             # Etkileşimleri hesapla ve kaydet
-            self.interaction_scorer.calculate_and_save_scores(processed_news)
+            results.update(self._calculate_interactions())
+            
+            if not results["processed_news_count"]:
+                logger.warning("Etkileşim hesaplamak için yeni işlenmiş haber bulunamadı")
             
             results["success"] = True
             results["duration"] = time.time() - start_time
@@ -346,6 +561,181 @@ class PipelineOrchestrator:
             results["duration"] = time.time() - start_time
             return results
             
+    def _process_cluster(self, cluster_id: str, news_cluster: List[int]) -> Dict[str, Any]:
+        """
+        Tek bir aday küme için doğrulama, zenginleştirme, izleme ve analiz adımlarını çalıştırır (Faz 3 ve 4).
+        
+        Args:
+            cluster_id: Loglarda kullanılan küme kimliği (örn. "C1")
+            news_cluster: Kümedeki haber ID'leri
+            
+        Returns:
+            Dict[str, Any]: Küme sonucu
+                - cluster_id, size
+                - status: "created", "rejected", "enrichment_failed", "synthesis_failed",
+                          "memory_failed", "save_failed" veya "error"
+                - validated: Küme geçerli bir hikaye olarak doğrulandı mı
+                - story_id: Kaydedilen hikayenin ID'si
+                - linked_story_id: İlişkilendirilen önceki hikayenin ID'si
+                - error: Beklenmeyen hata mesajı
+        """
+        result = {
+            "cluster_id": cluster_id,
+            "size": len(news_cluster),
+            "status": None,
+            "validated": False,
+            "story_id": None,
+            "linked_story_id": None,
+            "error": None
+        }
+        
+        logger.info(f"Küme {cluster_id} işleniyor ({len(news_cluster)} haber)...")
+        
+        try:
+            # a. Kümeyi doğrula
+            validation_result = self.llm_validator.validate_cluster(news_cluster)
+            
+            if not validation_result or not validation_result.get("is_story", False):
+                logger.info(f"Küme {cluster_id} doğrulama başarısız: Geçerli bir hikaye değil")
+                result["status"] = "rejected"
+                return result
+                
+            result["validated"] = True
+            logger.info(f"Küme {cluster_id} doğrulandı: '{validation_result.get('story_type', 'Bilinmeyen Hikaye')}' türünde")
+            
+            # b. Hikayeyi zenginleştir (etiket ve gerekçe üret)
+            enrichment_result = self.story_enricher.enrich_story_cluster(news_cluster)
+            if not enrichment_result:
+                logger.error(f"Küme {cluster_id} zenginleştirilemedi")
+                result["status"] = "enrichment_failed"
+                return result
+                
+            story_label = enrichment_result.get("label")
+            story_rationale = enrichment_result.get("rationale")
+            logger.info(f"Küme {cluster_id} zenginleştirildi: '{story_label}'")
+            
+            # Temsilci vektörünü bir kere hesapla ve tüm işlemlerde kullan
+            # Tüm gerekli detayları (embedding, entities dahil) içeren haber öğelerini çek
+            processed_news_items = self.persistence_manager.fetch_news_by_ids(news_cluster)
+            
+            if not processed_news_items:
+                logger.warning(f"Küme {cluster_id} için haber detayları alınamadı")
+                processed_news_items = []
+            
+            # Bu hikaye kümesi için temsil vektörünü hesapla - sadece bir kez
+            representative_vector = None
+            if len(news_cluster) >= 2 and processed_news_items:  # En az 2 haber olmalı
+                embedding_vectors = []
+                for news in processed_news_items:  # Zaten çekilmiş haber verilerini kullan
+                    if news.get("embedding_vector") is not None:
+                        embedding_vectors.append(np.array(news["embedding_vector"]))
+                
+                if embedding_vectors:
+                    representative_vector = np.mean(embedding_vectors, axis=0)
+                    logger.info(f"Küme {cluster_id} için temsilci vektör hesaplandı")
+            
+            # c. Hikayenin bir önceki hikaye ile ilişkisi var mı kontrol et
+            # Önceden hesaplanan temsilci vektörü kullan
+            parent_story_id = self.story_tracker.track_story(
+                {
+                    "news_ids": news_cluster,
+                    "label": story_label,
+                    "rationale": story_rationale
+                },
+                representative_vector=representative_vector  # Önceden hesaplanan vektörü geç
+            )
+            
+            # d. RAG adımı - Şimdilik basit bir birleştirme yapıyoruz
+            # Önemli haber parçalarını oluştur
+            salient_snippets = [f"{news.get('title', '')} - {news.get('source_name', '')} ({news.get('published_at', '')})" 
+                                for news in processed_news_items]
+            
+            # e. Benzer geçmiş hikayeleri bul - önceden hesaplanan vektörü kullan
+            historical_context = ""
+            similar_stories = []
+            
+            if representative_vector is not None:
+                similar_stories = self.historical_context_retriever.retrieve_similar_stories(
+                    representative_vector, k=3
+                )
+            
+            # Tarihsel bağlam oluştur
+            if similar_stories:
+                historical_context = "Geçmiş benzer hikayeler:\n"
+                for idx, story in enumerate(similar_stories):
+                    historical_context += f"\n{idx+1}. {story.get('story_title', 'Başlıksız Hikaye')} (ID: {story.get('story_id')})\n"
+                    historical_context += f"   Özet: {story.get('story_essence_text', 'Özet bilgi yok')}\n"
+            elif parent_story_id:
+                # Benzer hikayeler bulunamadıysa ancak bir parent hikaye varsa
+                historical_context = f"Bu hikaye, ID'si {parent_story_id} olan önceki bir hikayenin devamı niteliğindedir."
+            
+            # Stratejik sinyal raporu sentezle
+            analysis_summary = self.llm_synthesizer.synthesize_report({
+                "group_label": story_label,
+                "connection_rationale": story_rationale,
+                "salient_snippets": salient_snippets,
+                "historical_context": historical_context
+            })
+            
+            if not analysis_summary:
+                logger.error(f"Küme {cluster_id} için analiz özeti oluşturulamadı")
+                result["status"] = "synthesis_failed"
+                return result
+                
+            # f. Hikaye için hafıza bileşenlerini üret
+            memory_components = self.story_processor.process_story_for_memory(analysis_summary)
+            
+            if not memory_components:
+                logger.error(f"Küme {cluster_id} için hafıza bileşenleri oluşturulamadı")
+                result["status"] = "memory_failed"
+                return result
+                
+            # g. Tüm verileri hikaye veri sözlüğünde topla
+            story_data = {
+                "news_ids": news_cluster,
+                "label": story_label,
+                "rationale": story_rationale,
+                "analysis_summary": analysis_summary,
+                "story_essence_text": memory_components.get("story_essence_text"),
+                "story_context_snippets": memory_components.get("story_context_snippets"),
+                "story_embedding_vector": memory_components.get("story_embedding_vector")
+            }
+            
+            # h. Hikayeyi veritabanına kaydet
+            story_id = self.persistence_manager.save_story(story_data)
+            
+            if not story_id:
+                logger.error(f"Küme {cluster_id} veritabanına kaydedilemedi")
+                result["status"] = "save_failed"
+                return result
+                
+            result["status"] = "created"
+            result["story_id"] = story_id
+            logger.info(f"Küme {cluster_id} veritabanına kaydedildi: Story ID={story_id}")
+            
+            # i. Eğer bir parent hikaye varsa, ilişkiyi kaydet
+            if parent_story_id:
+                relationship_saved = self.persistence_manager.save_story_relationship(
+                    source_story_id=story_id,
+                    target_story_id=parent_story_id,
+                    relationship_type="EVOLVED_FROM",
+                    created_by="PipelineOrchestrator"
+                )
+                
+                if relationship_saved:
+                    result["linked_story_id"] = parent_story_id
+                    logger.info(f"Hikaye ilişkisi kaydedildi: {story_id} -> {parent_story_id} (EVOLVED_FROM)")
+                else:
+                    logger.error(f"Hikaye ilişkisi kaydedilemedi: {story_id} -> {parent_story_id}")
+            
+            return result
+            
+        except Exception as e:
+            logger.error(f"Küme {cluster_id} işlenirken hata: {e}")
+            result["status"] = "error"
+            result["error"] = str(e)
+            return result
+            
     def run_full_pipeline(self, limit: int = 50) -> Dict[str, Any]:
         """
         Tüm pipeline fazlarını sırayla çalıştırır. Bu metod, veri zenginleştirmeden başlayarak
@@ -370,6 +760,7 @@ class PipelineOrchestrator:
             "validated_clusters": 0,
             "created_stories": 0,
             "linked_stories": 0,
+            "cluster_results": [],
             "duration_seconds": 0
         }
         
@@ -384,13 +775,13 @@ class PipelineOrchestrator:
             
             # Faz 2a: Etkileşim skorlarını hesapla ve kaydet
             logger.info("Faz 2a: Etkileşim hesaplama başlıyor...")
-            processed_news = self.persistence_manager.fetch_processed_news(limit=1000)
+            interaction_results = self._calculate_interactions()
             
-            if not processed_news:
+            if not interaction_results["processed_news_count"]:
                 logger.warning("Faz 2a atlanıyor: Skorlanacak işlenmiş haber bulunamadı.")
             else:
-                self.interaction_scorer.calculate_and_save_scores(processed_news)
-                logger.info(f"Faz 2a tamamlandı: {len(processed_news)} haber için etkileşim skorları hesaplandı")
+                logger.info(f"Faz 2a tamamlandı: {interaction_results['processed_news_count']} haber için "
+                            f"etkileşim skorları hesaplandı ({interaction_results['saved_edges']} kenar)")
             
             # Faz 2b: Haber kümelerini oluştur
             logger.info("Faz 2b: Kümeleme başlıyor...")
@@ -403,147 +794,28 @@ class PipelineOrchestrator:
                 candidate_clusters = candidate_clusters[:limit]
                 logger.info(f"İşlenecek küme sayısı {limit} ile sınırlandı")
             
-            # Faz 3 ve 4: Her bir aday küme için doğrulama, zenginleştirme, izleme ve analiz
-            for cluster_index, news_cluster in enumerate(candidate_clusters):
-                cluster_id = f"C{cluster_index+1}"
-                cluster_size = len(news_cluster)
-                
-                logger.info(f"Küme {cluster_id} işleniyor ({cluster_size} haber)...")
-                
-                try:
-                    # a. Kümeyi doğrula
-                    validation_result = self.llm_validator.validate_cluster(news_cluster)
-                    
-                    if not validation_result or not validation_result.get("is_story", False):
-                        logger.info(f"Küme {cluster_id} doğrulama başarısız: Geçerli bir hikaye değil")
-                        continue
-                        
+            # Faz 3 ve 4: Aday kümeleri sınırlı eşzamanlılıkla işle; tüm LLM çağrıları ortak
+            # hız sınırlayıcısını (RPM/TPM) paylaşır. Sonuçlar küme sırasına göre toplanır.
+            cluster_results = []
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=max(1, settings.CLUSTER_MAX_CONCURRENCY),
+                thread_name_prefix="cluster"
+            ) as executor:
+                futures = [
+                    executor.submit(self._process_cluster, f"C{cluster_index+1}", news_cluster)
+                    for cluster_index, news_cluster in enumerate(candidate_clusters)
+                ]
+                for future in futures:
+                    cluster_results.append(future.result())
+            
+            for cluster_result in cluster_results:
+                if cluster_result["validated"]:
                     pipeline_results["validated_clusters"] += 1
-                    logger.info(f"Küme {cluster_id} doğrulandı: '{validation_result.get('story_type', 'Bilinmeyen Hikaye')}' türünde")
-                    
-                    # b. Hikayeyi zenginleştir (etiket ve gerekçe üret)
-                    enrichment_result = self.story_enricher.enrich_story_cluster(news_cluster)
-                    if not enrichment_result:
-                        logger.error(f"Küme {cluster_id} zenginleştirilemedi")
-                        continue
-                        
-                    story_label = enrichment_result.get("label")
-                    story_rationale = enrichment_result.get("rationale")
-                    logger.info(f"Küme {cluster_id} zenginleştirildi: '{story_label}'")
-                    
-                    # Temsilci vektörünü bir kere hesapla ve tüm işlemlerde kullan
-                    # Tüm gerekli detayları (embedding, entities dahil) içeren haber öğelerini çek
-                    processed_news_items = self.persistence_manager.fetch_news_by_ids(news_cluster)
-                    
-                    if not processed_news_items:
-                        logger.warning(f"Küme {cluster_id} için haber detayları alınamadı")
-                        processed_news_items = []
-                    
-                    # Bu hikaye kümesi için temsil vektörünü hesapla - sadece bir kez
-                    representative_vector = None
-                    if len(news_cluster) >= 2 and processed_news_items:  # En az 2 haber olmalı
-                        embedding_vectors = []
-                        for news in processed_news_items:  # Zaten çekilmiş haber verilerini kullan
-                            if news.get("embedding_vector") is not None:
-                                embedding_vectors.append(np.array(news["embedding_vector"]))
-                        
-                        if embedding_vectors:
-                            representative_vector = np.mean(embedding_vectors, axis=0)
-                            logger.info(f"Küme {cluster_id} için temsilci vektör hesaplandı")
-                    
-                    # c. Hikayenin bir önceki hikaye ile ilişkisi var mı kontrol et
-                    # Önceden hesaplanan temsilci vektörü kullan
-                    parent_story_id = self.story_tracker.track_story(
-                        {
-                            "news_ids": news_cluster,
-                            "label": story_label,
-                            "rationale": story_rationale
-                        },
-                        representative_vector=representative_vector  # Önceden hesaplanan vektörü geç
-                    )
-                    
-                    # d. RAG adımı - Şimdilik basit bir birleştirme yapıyoruz
-                    # Önemli haber parçalarını oluştur
-                    salient_snippets = [f"{news.get('title', '')} - {news.get('source_name', '')} ({news.get('published_at', '')})" 
-                                        for news in processed_news_items]
-                    
-                    # e. Benzer geçmiş hikayeleri bul - önceden hesaplanan vektörü kullan
-                    historical_context = ""
-                    similar_stories = []
-                    
-                    if representative_vector is not None:
-                        similar_stories = self.historical_context_retriever.retrieve_similar_stories(
-                            representative_vector, k=3
-                        )
-                    
-                    # Tarihsel bağlam oluştur
-                    if similar_stories:
-                        historical_context = "Geçmiş benzer hikayeler:\n"
-                        for idx, story in enumerate(similar_stories):
-                            historical_context += f"\n{idx+1}. {story.get('story_title', 'Başlıksız Hikaye')} (ID: {story.get('story_id')})\n"
-                            historical_context += f"   Özet: {story.get('story_essence_text', 'Özet bilgi yok')}\n"
-                    elif parent_story_id:
-                        # Benzer hikayeler bulunamadıysa ancak bir parent hikaye varsa
-                        historical_context = f"Bu hikaye, ID'si {parent_story_id} olan önceki bir hikayenin devamı niteliğindedir."
-                    
-                    # Stratejik sinyal raporu sentezle
-                    analysis_summary = self.llm_synthesizer.synthesize_report({
-                        "group_label": story_label,
-                        "connection_rationale": story_rationale,
-                        "salient_snippets": salient_snippets,
-                        "historical_context": historical_context
-                    })
-                    
-                    if not analysis_summary:
-                        logger.error(f"Küme {cluster_id} için analiz özeti oluşturulamadı")
-                        continue
-                        
-                    # f. Hikaye için hafıza bileşenlerini üret
-                    memory_components = self.story_processor.process_story_for_memory(analysis_summary)
-                    
-                    if not memory_components:
-                        logger.error(f"Küme {cluster_id} için hafıza bileşenleri oluşturulamadı")
-                        continue
-                        
-                    # g. Tüm verileri hikaye veri sözlüğünde topla
-                    story_data = {
-                        "news_ids": news_cluster,
-                        "label": story_label,
-                        "rationale": story_rationale,
-                        "analysis_summary": analysis_summary,
-                        "story_essence_text": memory_components.get("story_essence_text"),
-                        "story_context_snippets": memory_components.get("story_context_snippets"),
-                        "story_embedding_vector": memory_components.get("story_embedding_vector")
-                    }
-                    
-                    # h. Hikayeyi veritabanına kaydet
-                    story_id = self.persistence_manager.save_story(story_data)
-                    
-                    if not story_id:
-                        logger.error(f"Küme {cluster_id} veritabanına kaydedilemedi")
-                        continue
-                        
+                if cluster_result["status"] == "created":
                     pipeline_results["created_stories"] += 1
-                    logger.info(f"Küme {cluster_id} veritabanına kaydedildi: Story ID={story_id}")
-                    
-                    # i. Eğer bir parent hikaye varsa, ilişkiyi kaydet
-                    if parent_story_id:
-                        relationship_saved = self.persistence_manager.save_story_relationship(
-                            source_story_id=story_id,
-                            target_story_id=parent_story_id,
-                            relationship_type="EVOLVED_FROM",
-                            created_by="PipelineOrchestrator"
-                        )
-                        
-                        if relationship_saved:
-                            pipeline_results["linked_stories"] += 1
-                            logger.info(f"Hikaye ilişkisi kaydedildi: {story_id} -> {parent_story_id} (EVOLVED_FROM)")
-                        else:
-                            logger.error(f"Hikaye ilişkisi kaydedilemedi: {story_id} -> {parent_story_id}")
-                    
-                except Exception as e:
-                    logger.error(f"Küme {cluster_id} işlenirken hata: {e}")
-                    continue
+                if cluster_result["linked_story_id"]:
+                    pipeline_results["linked_stories"] += 1
+            pipeline_results["cluster_results"] = cluster_results
             
             # Pipeline tamamlandı, sonuçları topla
             pipeline_end_time = time.time()
@@ -557,6 +829,8 @@ class PipelineOrchestrator:
             logger.info(f"Doğrulanan kümeler: {pipeline_results['validated_clusters']}")
             logger.info(f"Oluşturulan hikayeler: {pipeline_results['created_stories']}")
             logger.info(f"İlişkilendirilen hikayeler: {pipeline_results['linked_stories']}")
+            cache_stats = get_llm_response_cache().stats()
+            logger.info(f"LLM önbelleği: {cache_stats['hits']} isabet, {cache_stats['misses']} ıska")
             logger.info("=======================================================")
             
             return pipeline_results
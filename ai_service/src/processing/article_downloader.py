@@ -0,0 +1,408 @@
+"""
+Article Downloader Module
+
+Bu modül, haber URL'lerini asyncio ve httpx kullanarak eşzamanlı olarak indiren
+AsyncArticleDownloader sınıfını içerir. İndirilen HTML, newspaper3k ayrıştırıcısına
+`article.download(input_html=...)` ile verilir; böylece her makale için ayrı ve
+bloklayan bir requests bağlantısı açılmaz.
+
+Özellikler:
+- Keep-alive bağlantı havuzu (aynı sunucuya yapılan isteklerde bağlantı yeniden kullanılır)
+- Alan adı başına eşzamanlılık sınırı (hedef sunucuları aşırı yüklememek için)
+- Sınırlı global eşzamanlılık
+- Mümkün olduğunda HTTP/2 (h2 paketi kuruluysa)
+- Yönlendirme önbelleği (aynı URL tekrar indirildiğinde son adrese doğrudan gidilir)
+- Kalıcı sayfa önbelleği (ScrapeCache): taze kayıtlar ağa gitmeden döndürülür, süresi
+  dolanlar koşullu GET (If-None-Match/If-Modified-Since) ile yeniden doğrulanır
+"""
+
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+import httpx
+from newspaper import Article, Config as NewspaperConfig
+
+from ..core.config import settings
+from .scrape_cache import CacheEntry, ScrapeCache, get_scrape_cache
+
+# HTTP/2 desteği isteğe bağlı h2 paketine bağlıdır
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Logger yapılandırması
+logger = logging.getLogger(__name__)
+
+# Varsayılan User-Agent tanımı
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36'
+
+
+@dataclass
+class DownloadResult:
+    """Tek bir URL için indirme sonucu."""
+    url: str
+    final_url: Optional[str] = None
+    html: Optional[str] = None
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    text: Optional[str] = None  # Önbellekte daha önce ayrıştırılmış metin varsa
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    from_cache: bool = False
+    not_modified: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """İndirme başarılı ve HTML içeriği mevcut mu?"""
+        return self.html is not None
+
+
+class AsyncArticleDownloader:
+    """
+    Haber sayfalarını bağlantı havuzu kullanarak eşzamanlı indiren sınıf.
+
+    Tüm indirmeler, nesneye ait arka plan olay döngüsünde çalışan tek ve uzun ömürlü bir
+    httpx.AsyncClient üzerinden yürütülür; böylece keep-alive bağlantıları yalnızca bir
+    download_many çağrısı içinde değil, ardışık çağrılar arasında da yeniden kullanılır.
+    Yönlendirme önbelleği nesne ömrü boyunca korunur. İstemci ve olay döngüsü aclose()
+    ile kapatılır.
+    """
+
+    def __init__(self,
+                 user_agent: Optional[str] = None,
+                 timeout: Optional[float] = None,
+                 max_concurrency: Optional[int] = None,
+                 per_domain_concurrency: Optional[int] = None,
+                 http2: Optional[bool] = None,
+                 cache: Optional[ScrapeCache] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        AsyncArticleDownloader sınıfını başlatır.
+
+        Args:
+            user_agent: İsteklerde kullanılacak User-Agent. None ise DEFAULT_USER_AGENT kullanılır.
+            timeout: İstek başına zaman aşımı (saniye). None ise ayarlardan alınır.
+            max_concurrency: Aynı anda yapılabilecek toplam istek sayısı
+            per_domain_concurrency: Aynı alan adına aynı anda yapılabilecek istek sayısı
+            http2: HTTP/2 kullanılsın mı? None ise ayarlardan alınır (h2 kurulu değilse devre dışı kalır).
+            cache: Kalıcı sayfa önbelleği. None ise önbellek kullanılmaz.
+            transport: httpx taşıma katmanı (test için). None ise varsayılan bağlantı havuzu kullanılır.
+        """
+        self.user_agent = user_agent or DEFAULT_USER_AGENT
+        self.timeout = timeout or settings.DOWNLOAD_TIMEOUT
+        self.max_concurrency = max_concurrency or settings.DOWNLOAD_MAX_CONCURRENCY
+        self.per_domain_concurrency = per_domain_concurrency or settings.DOWNLOAD_PER_DOMAIN_CONCURRENCY
+
+        use_http2 = settings.DOWNLOAD_HTTP2 if http2 is None else http2
+        if use_http2 and not HTTP2_AVAILABLE:
+            logger.warning("HTTP/2 için 'h2' paketi bulunamadı, HTTP/1.1 kullanılacak")
+        self.http2 = use_http2 and HTTP2_AVAILABLE
+        self.cache = cache
+        self.transport = transport
+
+        # Uzun ömürlü istemci ve onun bağlı olduğu arka plan olay döngüsü (ilk indirmede oluşturulur)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+
+        # Orijinal URL -> son (yönlendirme sonrası) URL
+        self._redirect_cache: Dict[str, str] = {}
+        self._redirect_lock = threading.Lock()
+
+        logger.info(f"AsyncArticleDownloader başlatıldı (eşzamanlılık: {self.max_concurrency}, "
+                   f"alan adı başına: {self.per_domain_concurrency}, http2: {self.http2})")
+
+    def download_many(self, urls: Iterable[str]) -> Dict[str, DownloadResult]:
+        """
+        URL'leri eşzamanlı olarak indirir (senkron arayüz).
+
+        İndirme, indiricinin arka plan olay döngüsünde yürütülür; bu nedenle çalışan bir
+        olay döngüsü içinden de çağrılabilir (çağıran iş parçacığı sonuç gelene kadar bekler).
+
+        Args:
+            urls: İndirilecek URL'ler
+
+        Returns:
+            Dict[str, DownloadResult]: URL -> indirme sonucu
+        """
+        urls = list(urls)
+        return asyncio.run_coroutine_threadsafe(self.fetch_many(urls), self._ensure_loop()).result()
+
+    async def fetch_many(self, urls: Iterable[str]) -> Dict[str, DownloadResult]:
+        """
+        URL'leri tek bir bağlantı havuzu üzerinden eşzamanlı olarak indirir.
+
+        Başka bir olay döngüsünden çağrılırsa iş, istemcinin bağlı olduğu arka plan
+        döngüsüne aktarılır.
+
+        Args:
+            urls: İndirilecek URL'ler (tekrarlananlar bir kez indirilir)
+
+        Returns:
+            Dict[str, DownloadResult]: URL -> indirme sonucu
+        """
+        loop = self._ensure_loop()
+        if asyncio.get_running_loop() is not loop:
+            urls = list(urls)
+            return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self.fetch_many(urls), loop))
+
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        if not unique_urls:
+            return {}
+
+        results: Dict[str, DownloadResult] = {}
+        cached_entries = self.cache.lookup_many(unique_urls) if self.cache else {}
+
+        # Taze önbellek kayıtları ağa gitmeden döndürülür
+        urls_to_fetch = []
+        for url in unique_urls:
+            entry = cached_entries.get(url)
+            if entry and self.cache.is_fresh(entry):
+                results[url] = self._result_from_cache(entry)
+            else:
+                urls_to_fetch.append(url)
+
+        if urls_to_fetch:
+            global_semaphore = asyncio.Semaphore(self.max_concurrency)
+            domain_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+            client = self._get_client()
+            fetched = await asyncio.gather(*[
+                self._fetch_one(client, url, global_semaphore, domain_semaphores, cached_entries.get(url))
+                for url in urls_to_fetch
+            ])
+
+            self._update_cache(fetched)
+            results.update({result.url: result for result in fetched})
+
+        succeeded = sum(1 for result in results.values() if result.ok)
+        logger.info(f"{len(unique_urls)} URL'den {succeeded} tanesi hazır "
+                   f"(önbellekten: {len(unique_urls) - len(urls_to_fetch)}, ağdan istenen: {len(urls_to_fetch)})")
+        return results
+
+    def remember_text(self, url: str, text: str) -> None:
+        """
+        Ayrıştırılmış makale metnini önbelleğe yazar (önbellek etkinse).
+
+        Args:
+            url: Metnin ait olduğu URL
+            text: Ayrıştırılmış metin
+        """
+        if self.cache and text:
+            self.cache.store_text(url, text)
+
+    @staticmethod
+    def _result_from_cache(entry: CacheEntry, not_modified: bool = False) -> DownloadResult:
+        """Önbellek kaydını DownloadResult nesnesine dönüştürür."""
+        if not entry.ok:
+            return DownloadResult(url=entry.url, error=entry.error or "Önbellekte başarısız kayıt",
+                                  from_cache=True)
+        return DownloadResult(url=entry.url, final_url=entry.final_url, html=entry.html, text=entry.text,
+                              status_code=304 if not_modified else 200, etag=entry.etag,
+                              last_modified=entry.last_modified, from_cache=True, not_modified=not_modified)
+
+    def _update_cache(self, results) -> None:
+        """
+        Ağdan alınan sonuçları önbelleğe yansıtır ve gerekirse LRU temizliği yapar.
+
+        Args:
+            results: _fetch_one tarafından üretilen indirme sonuçları
+        """
+        if not self.cache:
+            return
+
+        for result in results:
+            if result.not_modified:
+                self.cache.mark_revalidated(result.url)
+            elif result.ok and not result.from_cache:
+                self.cache.store_response(result.url, result.html, final_url=result.final_url,
+                                          etag=result.etag, last_modified=result.last_modified)
+            elif not result.ok:
+                self.cache.store_failure(result.url, result.error or "Bilinmeyen hata")
+
+        self.cache.evict_if_needed()
+
+    async def aclose(self) -> None:
+        """
+        Uzun ömürlü istemciyi ve arka plan olay döngüsünü kapatır.
+
+        Sonraki bir indirme isteğinde istemci ve döngü yeniden oluşturulur.
+        """
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+        if loop is None:
+            return
+
+        async def close_client() -> None:
+            if self._client is not None and not self._client.is_closed:
+                await self._client.aclose()
+            self._client = None
+
+        await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(close_client(), loop))
+        loop.call_soon_threadsafe(loop.stop)
+        await asyncio.to_thread(thread.join)
+        loop.close()
+        logger.info("AsyncArticleDownloader istemcisi kapatıldı")
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """İstemcinin bağlı olduğu arka plan olay döngüsünü döndürür, gerekirse başlatır."""
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="article-downloader", daemon=True)
+                thread.start()
+                self._loop, self._loop_thread = loop, thread
+            return self._loop
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Uzun ömürlü istemciyi döndürür, gerekirse oluşturur (arka plan döngüsünde çağrılır)."""
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+        return self._client
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """Bağlantı havuzlu httpx istemcisini oluşturur."""
+        return httpx.AsyncClient(
+            transport=self.transport,
+            http2=self.http2,
+            follow_redirects=True,
+            headers={"User-Agent": self.user_agent},
+            timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, 5.0)),
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency
+            )
+        )
+
+    async def _fetch_one(self,
+                         client: httpx.AsyncClient,
+                         url: str,
+                         global_semaphore: asyncio.Semaphore,
+                         domain_semaphores: Dict[str, asyncio.Semaphore],
+                         cached_entry: Optional[CacheEntry] = None) -> DownloadResult:
+        """
+        Tek bir URL'yi global ve alan adı sınırları dahilinde indirir.
+
+        Önbellekte süresi dolmuş başarılı bir kayıt varsa koşullu GET yapılır; sunucu 304
+        dönerse veya istek başarısız olursa önbellekteki içerik kullanılır.
+
+        Args:
+            client: Paylaşılan httpx istemcisi
+            url: İndirilecek URL
+            global_semaphore: Toplam eşzamanlılık sınırı
+            domain_semaphores: Alan adı -> eşzamanlılık sınırı
+            cached_entry: Yeniden doğrulanacak önbellek kaydı (varsa)
+
+        Returns:
+            DownloadResult: İndirme sonucu
+        """
+        if not url.startswith(('http://', 'https://')):
+            return DownloadResult(url=url, error="Geçersiz URL")
+
+        with self._redirect_lock:
+            target_url = self._redirect_cache.get(url, url)
+
+        domain = urlparse(target_url).netloc.lower()
+        domain_semaphore = domain_semaphores.setdefault(domain, asyncio.Semaphore(self.per_domain_concurrency))
+
+        stale_entry = cached_entry if cached_entry and cached_entry.ok else None
+        conditional_headers = {}
+        if stale_entry:
+            if stale_entry.etag:
+                conditional_headers["If-None-Match"] = stale_entry.etag
+            if stale_entry.last_modified:
+                conditional_headers["If-Modified-Since"] = stale_entry.last_modified
+
+        try:
+            # Önce alan adı sınırı alınır; böylece bekleyen istekler global kotayı işgal etmez
+            async with domain_semaphore, global_semaphore:
+                response = await client.get(target_url, headers=conditional_headers)
+
+            if response.status_code == 304 and stale_entry:
+                return self._result_from_cache(stale_entry, not_modified=True)
+
+            final_url = str(response.url)
+            if final_url != target_url:
+                with self._redirect_lock:
+                    self._redirect_cache[url] = final_url
+
+            if response.status_code >= 400:
+                logger.warning(f"İçerik indirilemedi. URL: {url}, Durum: {response.status_code}")
+                return DownloadResult(url=url, final_url=final_url, status_code=response.status_code,
+                                      error=f"HTTP {response.status_code}")
+
+            content_type = response.headers.get("content-type", "")
+            if content_type and "html" not in content_type and "text" not in content_type:
+                logger.warning(f"HTML olmayan içerik atlandı. URL: {url}, Tür: {content_type}")
+                return DownloadResult(url=url, final_url=final_url, status_code=response.status_code,
+                                      error=f"Desteklenmeyen içerik türü: {content_type}")
+
+            return DownloadResult(url=url, final_url=final_url, html=response.text,
+                                  status_code=response.status_code,
+                                  etag=response.headers.get("etag"),
+                                  last_modified=response.headers.get("last-modified"))
+
+        except Exception as e:
+            if stale_entry:
+                logger.warning(f"İçerik indirilemedi, önbellekteki eski kopya kullanılıyor. URL: {url}, Hata: {e}")
+                return self._result_from_cache(stale_entry)
+            logger.error(f"İçerik indirme hatası. URL: {url}, Hata: {e}")
+            return DownloadResult(url=url, error=str(e))
+
+
+def parse_article_html(url: str, html: str, config: NewspaperConfig, **article_kwargs) -> Article:
+    """
+    Önceden indirilmiş HTML'i newspaper3k ile ayrıştırır (ağ isteği yapmadan).
+
+    Args:
+        url: Makalenin URL'si
+        html: İndirilmiş HTML içeriği
+        config: Newspaper3k konfigürasyonu
+        **article_kwargs: Article yapıcısına iletilecek ek parametreler (örn. language)
+
+    Returns:
+        Article: Ayrıştırılmış makale nesnesi
+    """
+    article = Article(url, config=config, **article_kwargs)
+    article.download(input_html=html)
+    article.parse()
+    return article
+
+
+# Süreç genelinde paylaşılan indirici (yönlendirme önbelleği tüm çağıranlar için ortaktır)
+_shared_downloader: Optional[AsyncArticleDownloader] = None
+_shared_downloader_lock = threading.Lock()
+
+
+def get_article_downloader() -> AsyncArticleDownloader:
+    """
+    Paylaşılan AsyncArticleDownloader örneğini döndürür, gerekirse oluşturur.
+
+    İndirici, süreç genelindeki ScrapeCache ile birlikte oluşturulur; böylece Faz 1 ve
+    Gemini analiz yolu aynı sayfa önbelleğini kullanır.
+
+    Returns:
+        AsyncArticleDownloader: Süreç genelinde tek indirici örneği
+    """
+    global _shared_downloader
+    with _shared_downloader_lock:
+        if _shared_downloader is None:
+            _shared_downloader = AsyncArticleDownloader(cache=get_scrape_cache())
+        return _shared_downloader
+
+
+async def close_article_downloader() -> None:
+    """Paylaşılan indiricinin istemcisini kapatır (uygulama kapanırken çağrılır)."""
+    global _shared_downloader
+    with _shared_downloader_lock:
+        downloader, _shared_downloader = _shared_downloader, None
+    if downloader is not None:
+        await downloader.aclose()
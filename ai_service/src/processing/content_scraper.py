@@ -7,6 +7,7 @@ from newspaper import Article
 from sqlalchemy.orm import Session
 
 from src.db.models import News
+from src.processing.article_downloader import get_article_downloader, parse_article_html
 
 # Logger oluştur
 logger = logging.getLogger(__name__)
@@ -25,12 +26,13 @@ def get_newspaper_config() -> newspaper.Config:
     return config
 
 
-def _scrape_single_article_content(url: str, config: newspaper.Config) -> Optional[Article]:
+def _scrape_single_article_content(url: str, config: newspaper.Config, html: Optional[str] = None) -> Optional[Article]:
     """Tek bir URL'den haber içeriğini çeker.
     
     Args:
         url: Haber içeriğinin çekileceği URL
         config: Newspaper3k konfigürasyonu
+        html: Önceden indirilmiş HTML içeriği. Verilirse ağ isteği yapılmaz.
         
     Returns:
         Çekilen haber metni veya None (başarısızlık durumunda)
@@ -40,22 +42,26 @@ def _scrape_single_article_content(url: str, config: newspaper.Config) -> Option
         return None
     
     try:
-        # Article nesnesi oluştur ve indir
-        article = Article(url, config=config, language='en')
-        article.download()
-        
-        # İndirme durumunu kontrol et
-        if article.download_state != 2:  # 2: İndirme başarılı
-            logger.warning(f"İçerik indirilemedi. URL: {url}, Durum: {article.download_state}")
-            return None
-        
-        # Article.download_exception_msg kontrol et
-        if hasattr(article, 'download_exception_msg') and article.download_exception_msg:
-            logger.warning(f"İndirme hatası. URL: {url}, Hata: {article.download_exception_msg}")
-            return None
-        
-        # İçeriği ayrıştır
-        article.parse()
+        if html is not None:
+            # Önceden indirilmiş HTML'i doğrudan ayrıştır
+            article = parse_article_html(url, html, config, language='en')
+        else:
+            # Article nesnesi oluştur ve indir
+            article = Article(url, config=config, language='en')
+            article.download()
+            
+            # İndirme durumunu kontrol et
+            if article.download_state != 2:  # 2: İndirme başarılı
+                logger.warning(f"İçerik indirilemedi. URL: {url}, Durum: {article.download_state}")
+                return None
+            
+            # Article.download_exception_msg kontrol et
+            if hasattr(article, 'download_exception_msg') and article.download_exception_msg:
+                logger.warning(f"İndirme hatası. URL: {url}, Hata: {article.download_exception_msg}")
+                return None
+            
+            # İçeriği ayrıştır
+            article.parse()
         
         # İçerik uzunluğunu kontrol et
         if not article.text or len(article.text.strip()) < 150:  # Minimum 150 karakter
@@ -111,12 +117,25 @@ def scrape_and_prepare_news_batch(news_items_from_db: List[News], newspaper_conf
     
     logger.info(f"İşlenecek haber sayısı: {len(news_items_from_db)}")
     
+    # Tüm URL'leri bağlantı havuzlu indirici ile eşzamanlı olarak indir
+    downloader = get_article_downloader()
+    downloads = downloader.download_many(news_item.url for news_item in news_items_from_db if news_item.url)
+    
     for news_item in news_items_from_db:
-        # Haberin URL'den içeriğini çek
-        article = _scrape_single_article_content(news_item.url, newspaper_config)
+        download = downloads.get(news_item.url)
+        if not download or not download.ok:
+            error = download.error if download else "Geçersiz URL"
+            logger.warning(f"İçerik indirilemedi, haber atlandı. ID: {news_item.id}, URL: {news_item.url}, Hata: {error}")
+            continue
+        
+        # İndirilen HTML'den içeriği ayrıştır
+        article = _scrape_single_article_content(news_item.url, newspaper_config, html=download.html)
         
         # Article nesnesi başarıyla oluşturulduysa sonuç listesine ekle
         if article:
+            # Ayrıştırılmış metni Faz 1 ile paylaşmak için önbelleğe yaz
+            downloader.remember_text(news_item.url, article.text)
+            
             # Anahtar kelimeleri al (NLP işlemi _scrape_single_article_content içinde yapılıyor)
             # Eğer anahtar kelime çıkarılamadıysa boş liste kullan
             extracted_keywords = article.keywords if hasattr(article, 'keywords') and article.keywords else []
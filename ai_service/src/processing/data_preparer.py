@@ -84,8 +84,8 @@ def prepare_news_for_analysis(db: Session) -> List[Dict]:
     # Newspaper3k konfigürasyonunu al
     newspaper_config = get_newspaper_config()
     
-    # Veritabanından TÜM işlenmemiş haberleri al (sınırsız)
-    unprocessed_news = get_unprocessed_news(db, None)
+    # Veritabanından en yeni işlenmemiş haberleri al (çalıştırma başına üst sınırla)
+    unprocessed_news = get_unprocessed_news(db, settings.NEWS_BATCH_SIZE or settings.ANALYSIS_MAX_NEWS)
     
     if not unprocessed_news:
         logger.info("İşlenecek yeni haber bulunamadı.")
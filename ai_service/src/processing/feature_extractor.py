@@ -7,12 +7,13 @@ gerçekleştiren FeatureExtractor sınıfını içerir.
 
 from typing import Dict, Any, List, Optional, Union, Set, Tuple
 import logging
+import concurrent.futures
 import numpy as np
 from newspaper import Article, Config as NewspaperConfig
 import spacy
-from sentence_transformers import SentenceTransformer
-import torch
 from ..core.config import settings
+from ..core.embedding_service import get_embedding_service
+from .article_downloader import DownloadResult, get_article_downloader, parse_article_html
 
 # Logger yapılandırması
 logger = logging.getLogger(__name__)
@@ -31,7 +32,7 @@ class FeatureExtractor:
         """
         FeatureExtractor sınıfını başlat.
         
-        Bu metod, spaCy ve SentenceTransformer modellerini yükler ve
+        Bu metod, spaCy modelini yükler, paylaşılan embedding servisini alır ve
         newspaper3k için yapılandırma oluşturur.
         """
         logger.info("FeatureExtractor başlatılıyor...")
@@ -42,6 +43,9 @@ class FeatureExtractor:
         self.newspaper_config.memoize_articles = False
         self.newspaper_config.request_timeout = 10
         
+        # Paylaşılan, bağlantı havuzlu indirici
+        self.downloader = get_article_downloader()
+        
         # spaCy NER modeli yükleme
         try:
             logger.info(f"spaCy modeli yükleniyor: {settings.SPACY_MODEL_NAME}")
@@ -52,17 +56,12 @@ class FeatureExtractor:
             logger.error("Lütfen 'python -m spacy download en_core_web_sm' komutunu çalıştırın")
             self.nlp = None
 
-        # Embedding modeli yükleme
+        # Paylaşılan embedding servisi (model süreç başına bir kez yüklenir)
         try:
-            logger.info(f"Embedding modeli yükleniyor: {settings.EMBEDDING_MODEL_NAME}")
-            self.embedder = SentenceTransformer(settings.EMBEDDING_MODEL_NAME)
-            # Cuda kullanılabilir mi kontrol et
-            self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-            self.embedder = self.embedder.to(self.device)
-            logger.info(f"Embedding modeli başarıyla yüklendi (Cihaz: {self.device})")
+            self.embedding_service = get_embedding_service(settings.EMBEDDING_MODEL_NAME)
         except Exception as e:
             logger.error(f"Embedding modeli yüklenirken hata: {e}")
-            self.embedder = None
+            self.embedding_service = None
 
     def extract_features(self, news_item: Dict[str, Any], entity_types: Set[str] = None) -> Dict[str, Any]:
         """
@@ -84,37 +83,124 @@ class FeatureExtractor:
                 "embedding_vector": List[float] veya None
             }
         """
-        result = {
-            "id": news_item.get("id"),
-            "full_text": None,
-            "entities": None,
-            "embedding_vector": None
-        }
-        
         if not news_item.get("url"):
             logger.error(f"Haber ID {news_item.get('id')} için URL bulunamadı")
-            return result
+            return {
+                "id": news_item.get("id"),
+                "full_text": None,
+                "entities": None,
+                "embedding_vector": None
+            }
         
         # Adım 1: URL'den tam metni çıkar
         full_text = self._extract_text(news_item["url"])
-        result["full_text"] = full_text
         
-        # Metin başarıyla çıkarılamazsa, diğer özellikleri hesaplama
-        if not full_text:
-            logger.warning(f"Haber ID {news_item.get('id')} için metin çıkarılamadı, diğer özellikler atlanıyor")
-            return result
+        # Adım 2-3: Tek elemanlı batch olarak varlıkları ve gömmeyi hesapla
+        return self.extract_features_batch(
+            [{"id": news_item.get("id"), "full_text": full_text}],
+            entity_types
+        )[0]
+
+    def download_texts(self, news_items: List[Dict[str, Any]], max_workers: int = 5) -> Dict[Any, Optional[str]]:
+        """
+        Haberlerin tam metinlerini eşzamanlı olarak indirir.
+        
+        Tüm URL'ler bağlantı havuzlu asenkron indirici ile tek seferde indirilir,
+        ardından HTML içerikleri iş parçacıkları ile newspaper3k üzerinden ayrıştırılır.
+        CPU yoğun NLP işlemleri bu aşamanın dışında, extract_features_batch ile toplu yapılır.
+        
+        Args:
+            news_items: En azından "id" ve "url" alanlarını içeren haber öğeleri
+            max_workers: HTML ayrıştırması yapacak maksimum iş parçacığı sayısı
             
-        # Adım 2: Metinden varlıkları çıkar
-        entities = self._extract_entities(full_text, entity_types)
-        result["entities"] = entities
+        Returns:
+            Dict[Any, Optional[str]]: Haber ID'si -> tam metin (indirilemeyenler için None)
+        """
+        texts = {}
+        
+        urls = []
+        for news_item in news_items:
+            if not news_item.get("url"):
+                logger.error(f"Haber ID {news_item.get('id')} için URL bulunamadı")
+                texts[news_item.get("id")] = None
+            else:
+                urls.append(news_item["url"])
+        
+        downloads = self.downloader.download_many(urls)
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_id = {}
+            for news_item in news_items:
+                if not news_item.get("url"):
+                    continue
+                download = downloads.get(news_item["url"]) or DownloadResult(url=news_item["url"], error="İndirme sonucu yok")
+                future = executor.submit(self._parse_text, download)
+                future_to_id[future] = news_item.get("id")
+            
+            for future in concurrent.futures.as_completed(future_to_id):
+                news_id = future_to_id[future]
+                try:
+                    texts[news_id] = future.result()
+                except Exception as e:
+                    logger.error(f"Haber ID {news_id} için metin ayrıştırılırken hata: {e}")
+                    texts[news_id] = None
+        
+        extracted = sum(1 for text in texts.values() if text)
+        logger.info(f"{len(news_items)} haberden {extracted} tanesinin metni çıkarıldı")
+        return texts
+
+    def extract_features_batch(self, news_items: List[Dict[str, Any]], entity_types: Set[str] = None) -> List[Dict[str, Any]]:
+        """
+        Metni önceden indirilmiş haberler için varlıkları ve gömme vektörlerini toplu olarak çıkarır.
+        
+        Varlık tanıma tek bir nlp.pipe çağrısıyla, gömme vektörleri ise tek bir encode
+        çağrısıyla hesaplanır. Böylece model çağrı başına maliyeti tüm batch'e yayılır.
+        
+        Args:
+            news_items: "id" ve "full_text" alanlarını içeren haber öğeleri
+            entity_types: Filtrelenecek varlık tipleri kümesi, ör: {"ORG", "PERSON", "GPE"}
+                         None verilirse tüm varlık tipleri alınır
         
-        # Adım 3: Metin gömmesini oluştur
-        embedding_vector = self._create_embedding(full_text)
-        if embedding_vector is not None:
-            # NumPy dizisini normal liste olarak serileştir
-            result["embedding_vector"] = embedding_vector.tolist()
+        Returns:
+            List[Dict[str, Any]]: Girdi sırasıyla zenginleştirilmiş haber bilgileri
+                                  (extract_features ile aynı formatta)
+        """
+        results = [
+            {
+                "id": news_item.get("id"),
+                "full_text": news_item.get("full_text"),
+                "entities": None,
+                "embedding_vector": None
+            }
+            for news_item in news_items
+        ]
+        
+        # Metni olmayan haberler için diğer özellikleri hesaplama
+        valid_indices = []
+        for index, result in enumerate(results):
+            if result["full_text"]:
+                valid_indices.append(index)
+            else:
+                logger.warning(f"Haber ID {result['id']} için metin çıkarılamadı, diğer özellikler atlanıyor")
         
-        return result
+        if not valid_indices:
+            return results
+        
+        texts = [results[index]["full_text"] for index in valid_indices]
+        
+        # Adım 2: Metinlerden varlıkları toplu olarak çıkar
+        entities_list = self._extract_entities_batch(texts, entity_types)
+        
+        # Adım 3: Metin gömmelerini toplu olarak oluştur
+        embeddings = self._create_embeddings_batch(texts)
+        
+        for position, index in enumerate(valid_indices):
+            results[index]["entities"] = entities_list[position]
+            if embeddings is not None:
+                # NumPy dizisini normal liste olarak serileştir
+                results[index]["embedding_vector"] = embeddings[position].tolist()
+        
+        return results
         
     def _extract_text(self, url: str) -> Optional[str]:
         """
@@ -126,17 +212,38 @@ class FeatureExtractor:
         Returns:
             Tam metin içeriği veya None (hata durumunda)
         """
+        logger.info(f"Metin çıkarılıyor: {url}")
+        download = self.downloader.download_many([url]).get(url) or DownloadResult(url=url, error="İndirme sonucu yok")
+        return self._parse_text(download)
+
+    def _parse_text(self, download: DownloadResult) -> Optional[str]:
+        """
+        İndirilmiş HTML'den newspaper3k ile tam metni ayrıştırır.
+        
+        Args:
+            download: AsyncArticleDownloader tarafından üretilen indirme sonucu
+            
+        Returns:
+            Tam metin içeriği veya None (hata durumunda)
+        """
+        url = download.url
+        if not download.ok:
+            logger.warning(f"URL indirilemediği için metin çıkarılamadı ({url}): {download.error}")
+            return None
+        
         try:
-            logger.info(f"Metin çıkarılıyor: {url}")
-            article = Article(url, config=self.newspaper_config)
-            article.download()
-            article.parse()
+            # Önbellekte daha önce ayrıştırılmış metin varsa tekrar ayrıştırma
+            text = download.text
+            if text is None:
+                article = parse_article_html(url, download.html, self.newspaper_config)
+                text = article.text
+                self.downloader.remember_text(url, text)
             
-            if not article.text or len(article.text) < 100:
+            if not text or len(text) < 100:
                 logger.warning(f"URL'den yetersiz içerik çıkarıldı: {url}")
                 return None
                 
-            return article.text
+            return text
             
         except Exception as e:
             logger.error(f"URL'den metin çıkarırken hata ({url}): {e}")
@@ -154,32 +261,61 @@ class FeatureExtractor:
         Returns:
             Varlık tipleri ve değerleri içeren sözlük veya None (hata durumunda)
         """
+        return self._extract_entities_batch([text], entity_types)[0]
+
+    def _extract_entities_batch(self, texts: List[str], entity_types: Set[str] = None) -> List[Optional[Dict[str, List[str]]]]:
+        """
+        Birden fazla metinden isim varlıklarını tek bir nlp.pipe çağrısıyla çıkarır.
+        
+        Args:
+            texts: İşlenecek metinler
+            entity_types: Filtrelenecek varlık tipleri kümesi, ör: {"ORG", "PERSON", "GPE"}
+                         None verilirse tüm tipler alınır
+            
+        Returns:
+            Her metin için varlık sözlüğü; hata durumunda tüm elemanlar None
+        """
         if not self.nlp:
             logger.error("spaCy modeli yüklenmemiş, varlık tanıma atlanıyor")
-            return None
+            return [None] * len(texts)
             
         try:
-            logger.info("Metinden varlıklar çıkarılıyor")
-            doc = self.nlp(text)
-            
-            # Varlıkları türlerine göre gruplandır
-            entities_by_type = {}
-            for ent in doc.ents:
-                # Eğer filtreleme yapılacaksa ve varlık tipi isteniyorsa ekle
-                if entity_types is None or ent.label_ in entity_types:
-                    if ent.label_ not in entities_by_type:
-                        entities_by_type[ent.label_] = []
-                    # Aynı değeri tekrar eklememek için kontrol et
-                    if ent.text not in entities_by_type[ent.label_]:
-                        # Çok kısa varlık adlarını filtrele (örn: 1-2 karakterlik)
-                        if len(ent.text.strip()) > 2:
-                            entities_by_type[ent.label_].append(ent.text)
-                    
-            return entities_by_type
+            logger.info(f"{len(texts)} metinden varlıklar çıkarılıyor")
+            docs = self.nlp.pipe(
+                texts,
+                batch_size=settings.NLP_BATCH_SIZE,
+                n_process=settings.NLP_N_PROCESS
+            )
+            return [self._group_entities(doc, entity_types) for doc in docs]
             
         except Exception as e:
             logger.error(f"Varlık çıkarma işlemi sırasında hata: {e}")
-            return None
+            return [None] * len(texts)
+
+    def _group_entities(self, doc, entity_types: Set[str] = None) -> Dict[str, List[str]]:
+        """
+        spaCy belgesindeki varlıkları türlerine göre gruplandırır.
+        
+        Args:
+            doc: spaCy Doc nesnesi
+            entity_types: Filtrelenecek varlık tipleri kümesi, None ise tüm tipler alınır
+            
+        Returns:
+            Varlık tipleri ve değerleri içeren sözlük
+        """
+        entities_by_type = {}
+        for ent in doc.ents:
+            # Eğer filtreleme yapılacaksa ve varlık tipi isteniyorsa ekle
+            if entity_types is None or ent.label_ in entity_types:
+                if ent.label_ not in entities_by_type:
+                    entities_by_type[ent.label_] = []
+                # Aynı değeri tekrar eklememek için kontrol et
+                if ent.text not in entities_by_type[ent.label_]:
+                    # Çok kısa varlık adlarını filtrele (örn: 1-2 karakterlik)
+                    if len(ent.text.strip()) > 2:
+                        entities_by_type[ent.label_].append(ent.text)
+                    
+        return entities_by_type
             
     def _create_embedding(self, text: str) -> Optional[np.ndarray]:
         """
@@ -191,39 +327,61 @@ class FeatureExtractor:
         Returns:
             Metin gömme vektörü veya None (hata durumunda)
         """
-        if not self.embedder:
+        embeddings = self._create_embeddings_batch([text])
+        if embeddings is None:
+            return None
+        return embeddings[0]
+
+    def _create_embeddings_batch(self, texts: List[str]) -> Optional[np.ndarray]:
+        """
+        Birden fazla metin için gömme vektörlerini tek bir encode çağrısıyla oluşturur.
+        
+        Args:
+            texts: Gömme vektörü oluşturulacak metinler
+            
+        Returns:
+            (metin sayısı, boyut) şeklinde gömme matrisi veya None (hata durumunda)
+        """
+        if not self.embedding_service:
             logger.error("Embedding modeli yüklenmemiş, gömme vektörü oluşturma atlanıyor")
             return None
             
         try:
-            logger.info("Metin gömmesi oluşturuluyor")
-            
-            words = text.split()
-            total_words = len(words)
-            
-            # Model maksimum token limitini aşan metinler için gelişmiş kesme stratejisi
-            max_tokens = 512
-            
-            if total_words <= max_tokens:
-                # Kısa metinler için tüm metni kullan
-                truncated_text = text
-            else:
-                logger.info(f"Uzun metin için gelişmiş kesme uyguluyorum (Toplam kelime: {total_words})")
-                
-                # Baştan ve sondan eşit miktarda token alarak önemli bilgileri koru
-                start_size = max_tokens // 2
-                end_size = max_tokens - start_size
-                
-                start_text = " ".join(words[:start_size])
-                end_text = " ".join(words[-end_size:])
-                
-                truncated_text = f"{start_text} [...] {end_text}"
-                
-                logger.info(f"Metin {total_words} kelimeden {max_tokens} kelimeye kısaltıldı")
+            logger.info(f"{len(texts)} metin için gömme oluşturuluyor")
             
-            embedding = self.embedder.encode(truncated_text)
-            return embedding
+            truncated_texts = [self._truncate_for_embedding(text) for text in texts]
+            return self.embedding_service.encode(truncated_texts, batch_size=settings.EMBEDDING_BATCH_SIZE)
             
         except Exception as e:
             logger.error(f"Gömme vektörü oluşturma işlemi sırasında hata: {e}")
             return None
+
+    def _truncate_for_embedding(self, text: str, max_tokens: int = 512) -> str:
+        """
+        Model maksimum token limitini aşan metinleri baştan ve sondan keserek kısaltır.
+        
+        Args:
+            text: Kısaltılacak metin
+            max_tokens: Korunacak maksimum kelime sayısı
+            
+        Returns:
+            str: Kısaltılmış metin
+        """
+        words = text.split()
+        total_words = len(words)
+        
+        if total_words <= max_tokens:
+            # Kısa metinler için tüm metni kullan
+            return text
+        
+        logger.info(f"Uzun metin için gelişmiş kesme uyguluyorum (Toplam kelime: {total_words})")
+        
+        # Baştan ve sondan eşit miktarda token alarak önemli bilgileri koru
+        start_size = max_tokens // 2
+        end_size = max_tokens - start_size
+        
+        start_text = " ".join(words[:start_size])
+        end_text = " ".join(words[-end_size:])
+        
+        logger.info(f"Metin {total_words} kelimeden {max_tokens} kelimeye kısaltıldı")
+        return f"{start_text} [...] {end_text}"
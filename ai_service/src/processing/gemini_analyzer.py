@@ -1,12 +1,14 @@
 import logging
 import json
+import textwrap
 from typing import List, Dict, Optional
 
-import google.generativeai as genai
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
 
 from src.schemas import GeminiGroupResponseSchema, AnalyzedStorySchema
 from src.core.config import settings
+from src.core.llm_client import LLMClient
+from src.processing.prompt_packer import pack_news_for_grouping, merge_shard_groups
 
 # Logger oluştur
 logger = logging.getLogger(__name__)
@@ -16,6 +18,10 @@ def group_news_stories_with_gemini(news_batch_to_group: List[Dict], api_key: str
     """
     Verilen haber listesini Gemini API'sini kullanarak anlamlı haber gruplarına ayırır.
     
+    Haberler başlık, anahtar kelimeler ve kısaltılmış giriş metniyle kompakt JSON olarak
+    gönderilir. Token bütçesine sığmayan listeler birden fazla gruplama çağrısına bölünür
+    ve parçalardan dönen gruplar embedding benzerliğiyle birleştirilir.
+    
     Args:
         news_batch_to_group: İşlenecek haberlerin listesi. Her haber şu alanları içermelidir:
                               {id, title, extracted_keywords, content}
@@ -37,12 +43,8 @@ def group_news_stories_with_gemini(news_batch_to_group: List[Dict], api_key: str
     logger.info(f"Gemini API ile {len(news_batch_to_group)} haber gruplanıyor...")
     
     try:
-        # Gemini API'yi yapılandır
-        genai.configure(api_key=api_key)
-        
-        # Gemini modelini başlat
-        model = genai.GenerativeModel(
-            model_name=settings.GEMINI_MODEL_NAME,
+        # Gemini istemcisini başlat (paylaşılan hız sınırı, yeniden deneme ve devre kesici ile)
+        llm_client = LLMClient(
             generation_config={
                 "temperature": 0.2,
                 "top_p": 0.8,
@@ -69,8 +71,9 @@ def group_news_stories_with_gemini(news_batch_to_group: List[Dict], api_key: str
             ]
         )
         
-        # Haberleri JSON string'ine dönüştür
-        news_json = json.dumps(news_batch_to_group, ensure_ascii=False, indent=2)
+        # Haberleri token bütçesine göre kompakt JSON parçalarına böl
+        news_shards = pack_news_for_grouping(news_batch_to_group)
+        logger.info(f"{len(news_batch_to_group)} haber {len(news_shards)} gruplama çağrısına bölündü")
         
         # Örnek amaçlı çıktıyı göster
         example_output = [
@@ -83,16 +86,16 @@ def group_news_stories_with_gemini(news_batch_to_group: List[Dict], api_key: str
                 "related_news_ids": ["2", "5"]
             }
         ]
-        example_output_json = json.dumps(example_output, ensure_ascii=False, indent=2)
+        example_output_json = json.dumps(example_output, ensure_ascii=False)
         
-        # Prompt oluştur - gelişen hikayeler için detaylı yönergeler ve örnek çıktı formatı içerir
-        
-        prompt = f"""
+        # Prompt şablonu oluştur - gelişen hikayeler için detaylı yönergeler ve örnek çıktı formatı içerir
+        # Haber verisi ({news_json}) her parça için ayrıca yerleştirilir
+        prompt_template = textwrap.dedent(f"""
         # GÖREV TANIMI: STRATEJİK FİNANSAL ANALİZ İLE ÖZGÜN VE BAĞLANTILI "GELİŞEN HİKAYE" GRUPLARI OLUŞTURMA
 
         Sen, küresel ekonomi, finansal piyasalar, şirket stratejileri, teknolojik kırılımlar ve jeopolitik dinamikler arasında karmaşık, genellikle gözden kaçan **nedensel ve tematik bağlantıları** tespit etme; farklı olaylar arasındaki **zincirleme reaksiyonları** ve altta yatan **makro temaları sentezleme** konusunda uzmanlaşmış, üst düzey bir **stratejik analiz ve araştırma direktörüsün.** Temel görevin, sinyali gürültüden ayırmak, yüzeysel benzerliklerin ötesine geçmek ve farklı bilgi parçacıklarından **bütüncül, içgörülü ve dinamik "gelişen hikayeler"** inşa etmektir.
         
-        SANA VERİLEN GÖREV: Aşağıda JSON formatında sunulan bir dizi haber makalesini (her biri `id`, `title`, `extracted_keywords` ve `content` alanlarını içerir) derinlemesine inceleyeceksin. Bu inceleme sonucunda, ilk bakışta bağımsız veya alakasız gibi görünen olaylar arasında **anlamlı, disiplinlerarası, çapraz tematik ve/veya potansiyel nedensel ilişkiler** kuran, birbirinden belirgin şekilde ayrışan **"gelişen hikaye" grupları** oluşturman beklenmektedir. **Amacın, sadece aynı konuyu farklı kaynaklardan bildiren haberleri bir araya getirmek KESİNLİKLE DEĞİLDİR.**
+        SANA VERİLEN GÖREV: Aşağıda JSON formatında sunulan bir dizi haber makalesini (her biri `id`, `title`, `keywords` ve haberin kısaltılmış giriş metni olan `lead` alanlarını içerir) derinlemesine inceleyeceksin. Bu inceleme sonucunda, ilk bakışta bağımsız veya alakasız gibi görünen olaylar arasında **anlamlı, disiplinlerarası, çapraz tematik ve/veya potansiyel nedensel ilişkiler** kuran, birbirinden belirgin şekilde ayrışan **"gelişen hikaye" grupları** oluşturman beklenmektedir. **Amacın, sadece aynı konuyu farklı kaynaklardan bildiren haberleri bir araya getirmek KESİNLİKLE DEĞİLDİR.**
         
         ## TEMEL PRENSİPLER VE KESİNLİKLE UYULMASI GEREKEN ÇIKTI KURALLARI:
         
@@ -186,7 +189,7 @@ def group_news_stories_with_gemini(news_batch_to_group: List[Dict], api_key: str
         
         ## ANALİZ EDİLECEK HABERLER (JSON Formatında):
         ```json
-        {news_json}
+        {{news_json}}
         ```
         SENDEN İSTENEN ÇIKTI:
         Lütfen analizinin sonucunu, KESİNLİKLE aşağıdaki JSON formatında bir liste olarak ver. Bu listenin her bir elemanı, yukarıdaki prensipler doğrultusunda belirlediğin bir "gelişen hikaye" grubunu temsil eden bir JSON objesi olmalıdır.
@@ -199,43 +202,75 @@ def group_news_stories_with_gemini(news_batch_to_group: List[Dict], api_key: str
         
         Eğer verilen haberler arasında yukarıdaki katı prensiplere uygun, related_news_ids listesinde en az iki haber ID'si içeren ve farklı olaylar arasında anlamlı, derin ve içgörülü bağlantılar kuran hiçbir "gelişen hikaye" grubu oluşturamıyorsan, boş bir JSON listesi [] döndür.
         **UNUTMA: Az sayıda (hatta hiç) yüksek kaliteli grup, çok sayıda düşük kaliteli gruptan çok daha değerlidir.**
-        """
-        
-        # Gemini API'ye isteği gönder
-        response = model.generate_content(prompt)
-        
-        # Yanıtı işle
-        result_text = response.text.strip()
-        
-        # Yanıttan JSON yüklemeye çalış
-        # Bazen Gemini kod blokları içinde yanıt döndürebilir (```json ... ```) 
-        # veya ekstra metin ekleyebilir, bunları temizleyelim
-        result_text = clean_gemini_response(result_text)
-        
-        # JSON'a çözme
-        try:
-            result_data = json.loads(result_text)
+        """)
+        
+        all_groups: List[Dict] = []
+        failed_shards = 0
+        for shard_index, news_json in enumerate(news_shards):
+            # Gemini API'ye isteği gönder
+            logger.info(f"Gruplama çağrısı {shard_index + 1}/{len(news_shards)} gönderiliyor...")
+            response = llm_client.generate_content(prompt_template.replace("{news_json}", news_json))
             
-            # Doğrulama için Pydantic modelini kullan
-            validated_data = validate_gemini_response(result_data)
-            
-            if validated_data:
-                logger.info(f"Gemini API ile {len(validated_data)} haber grubu başarıyla oluşturuldu")
-                return validated_data
-            else:
-                logger.error("Gemini yanıtı doğrulanamadı")
-                return None
-                
-        except json.JSONDecodeError as json_err:
-            logger.error(f"Gemini yanıtı JSON olarak ayrıştırılamadı: {json_err}")
-            logger.debug(f"Alınan yanıt metni: {result_text}")
+            groups = _parse_group_response(response.text)
+            if groups is None:
+                failed_shards += 1
+                continue
+            # Birleştirmede yalnızca farklı parçaların grupları eşleştirilsin diye parça numarası eklenir
+            for group in groups:
+                group["shard_index"] = shard_index
+            all_groups.extend(groups)
+        
+        if failed_shards == len(news_shards):
             return None
+        
+        # Farklı parçalarda oluşan aynı hikayeye ait grupları birleştir
+        if len(news_shards) > 1:
+            news_by_id = {str(news["id"]): news for news in news_batch_to_group}
+            all_groups = merge_shard_groups(all_groups, news_by_id)
+        
+        logger.info(f"Gemini API ile {len(all_groups)} haber grubu başarıyla oluşturuldu")
+        return all_groups
             
     except Exception as e:
         logger.error(f"Gemini API ile haber gruplama sırasında hata: {str(e)}")
         return None
 
 
+def _parse_group_response(response_text: str) -> Optional[List[Dict]]:
+    """
+    Gruplama yanıtını temizler, JSON olarak çözer ve doğrular.
+    
+    Args:
+        response_text: Gemini'den dönen ham yanıt metni
+        
+    Returns:
+        Doğrulanmış grup listesi veya None
+    """
+    # Yanıttan JSON yüklemeye çalış
+    # Bazen Gemini kod blokları içinde yanıt döndürebilir (```json ... ```) 
+    # veya ekstra metin ekleyebilir, bunları temizleyelim
+    result_text = clean_gemini_response(response_text.strip())
+    
+    # JSON'a çözme
+    try:
+        result_data = json.loads(result_text)
+    except json.JSONDecodeError as json_err:
+        logger.error(f"Gemini yanıtı JSON olarak ayrıştırılamadı: {json_err}")
+        logger.debug(f"Alınan yanıt metni: {result_text}")
+        return None
+    
+    # Boş liste geçerli bir yanıttır (güçlü bir hikaye bulunamadı)
+    if result_data == []:
+        return []
+    
+    # Doğrulama için Pydantic modelini kullan
+    validated_data = validate_gemini_response(result_data)
+    if not validated_data:
+        logger.error("Gemini yanıtı doğrulanamadı")
+        return None
+    return validated_data
+
+
 def clean_gemini_response(response_text: str) -> str:
     """
     Gemini API'den gelen yanıtı temizler ve düzgün bir JSON metni elde eder.
@@ -318,12 +353,8 @@ def analyze_individual_story_group(
     logger.info(f"Gemini API ile '{group_label_from_phase1}' başlıklı grupta {len(news_group_details)} haber analiz ediliyor...")
     
     try:
-        # Gemini API'yi yapılandır
-        genai.configure(api_key=api_key)
-        
-        # Gemini modelini başlat - Aşama 2 için daha yüksek token limiti
-        model = genai.GenerativeModel(
-            model_name=settings.GEMINI_MODEL_NAME,
+        # Gemini istemcisini başlat - Aşama 2 için daha yüksek token limiti
+        llm_client = LLMClient(
             generation_config={
                 "temperature": 0.2,
                 "top_p": 0.8,
@@ -442,7 +473,7 @@ def analyze_individual_story_group(
         """
         
         # Gemini API'ye isteği gönder
-        response = model.generate_content(prompt)
+        response = llm_client.generate_content(prompt)
         
         # Yanıtı işle
         result_text = response.text.strip()
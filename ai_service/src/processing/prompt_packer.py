@@ -0,0 +1,172 @@
+"""
+Prompt Packer Module
+
+Bu modül, Aşama 1 (Gruplama) için haberleri token bütçesine göre kompakt JSON
+parçalarına (shard) bölen ve parçalardan dönen grupları embedding benzerliğiyle
+birleştiren yardımcı fonksiyonları içerir.
+
+Her haber yalnızca id, başlık, ilk birkaç anahtar kelime ve kısaltılmış giriş metniyle
+(lead) temsil edilir ve boşluksuz JSON olarak serileştirilir. Haber sayısı tek bir
+prompt'a sığmadığında birden fazla gruplama çağrısı yapılır; farklı parçalarda
+oluşan aynı hikayeye ait gruplar sonradan birleştirilir.
+"""
+
+import json
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.core.config import settings
+from src.core.rate_limiter import estimate_tokens, CHARS_PER_TOKEN
+
+# Logger oluştur
+logger = logging.getLogger(__name__)
+
+
+def compact_news_item(news: Dict, lead_tokens: int, max_keywords: int) -> Dict:
+    """
+    Haberi gruplama prompt'u için kompakt forma dönüştürür.
+
+    Args:
+        news: {id, title, extracted_keywords, content} alanlarını içeren haber
+        lead_tokens: Giriş metni (lead) için token bütçesi
+        max_keywords: Alınacak maksimum anahtar kelime sayısı
+
+    Returns:
+        Dict: {id, title, keywords, lead} alanlarını içeren sözlük
+    """
+    content = " ".join((news.get("content") or "").split())
+    lead = content[:lead_tokens * CHARS_PER_TOKEN]
+    if len(lead) < len(content):
+        # Son yarım kelimeyi at
+        lead = lead.rsplit(" ", 1)[0] + "..."
+
+    return {
+        "id": str(news["id"]),
+        "title": news.get("title") or "",
+        "keywords": list(news.get("extracted_keywords") or [])[:max_keywords],
+        "lead": lead
+    }
+
+
+def pack_news_for_grouping(news_list: List[Dict],
+                           max_tokens: Optional[int] = None,
+                           lead_tokens: Optional[int] = None,
+                           max_keywords: Optional[int] = None) -> List[str]:
+    """
+    Haberleri token bütçesini aşmayan kompakt JSON parçalarına böler.
+
+    Args:
+        news_list: Gruplanacak haberler
+        max_tokens: Parça başına haber verisi için token bütçesi. None ise GROUPING_MAX_PROMPT_TOKENS.
+        lead_tokens: Haber başına giriş metni token bütçesi. None ise GROUPING_LEAD_TOKENS.
+        max_keywords: Haber başına anahtar kelime sayısı. None ise GROUPING_MAX_KEYWORDS.
+
+    Returns:
+        List[str]: Her biri bir JSON listesi olan prompt parçaları
+    """
+    max_tokens = max_tokens or settings.GROUPING_MAX_PROMPT_TOKENS
+    lead_tokens = lead_tokens or settings.GROUPING_LEAD_TOKENS
+    max_keywords = max_keywords or settings.GROUPING_MAX_KEYWORDS
+
+    shards: List[List[str]] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for news in news_list:
+        item_json = json.dumps(compact_news_item(news, lead_tokens, max_keywords),
+                               ensure_ascii=False, separators=(",", ":"))
+        item_tokens = estimate_tokens(item_json)
+
+        if current and current_tokens + item_tokens > max_tokens:
+            shards.append(current)
+            current, current_tokens = [], 0
+        current.append(item_json)
+        current_tokens += item_tokens
+
+    if current:
+        shards.append(current)
+
+    return ["[" + ",".join(items) + "]" for items in shards]
+
+
+def merge_shard_groups(groups: List[Dict], news_by_id: Dict[str, Dict], threshold: Optional[float] = None) -> List[Dict]:
+    """
+    Farklı parçalardan dönen grupları embedding benzerliğine göre birleştirir.
+
+    Her grup, etiketi ve haber başlıklarından oluşan bir metinle temsil edilir. Yalnızca
+    farklı parçalardan gelen ve kosinüs benzerliği eşiği aşan gruplar birleştirilir; aynı
+    parçadaki gruplar model tarafından bilerek ayrılmıştır ve geçişli olarak da aynı
+    grupta toplanmaz. Birleşen grubun etiketi en çok habere sahip gruptan alınır.
+
+    Args:
+        groups: {group_label, related_news_ids, shard_index} sözlükleri
+        news_by_id: Haber ID'si -> haber sözlüğü (başlıklar için)
+        threshold: Birleştirme için kosinüs benzerliği eşiği. None ise GROUPING_MERGE_THRESHOLD.
+
+    Returns:
+        List[Dict]: shard_index etiketi çıkarılmış, birleştirilmiş gruplar
+    """
+    shard_indices = [group.get("shard_index", 0) for group in groups]
+    groups = [{key: value for key, value in group.items() if key != "shard_index"} for group in groups]
+    if len(set(shard_indices)) < 2:
+        return groups
+
+    # Embedding modeli (torch) yalnızca birden fazla parça varsa yüklensin diye burada içe aktarılır
+    from src.core.embedding_service import get_embedding_service
+
+    threshold = threshold if threshold is not None else settings.GROUPING_MERGE_THRESHOLD
+
+    texts = []
+    for group in groups:
+        titles = [news_by_id[news_id].get("title", "") for news_id in group["related_news_ids"] if news_id in news_by_id]
+        texts.append(f"{group['group_label']}. " + " ".join(titles))
+
+    embeddings = get_embedding_service().encode(texts)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    embeddings = embeddings / np.where(norms == 0, 1.0, norms)
+    similarities = embeddings @ embeddings.T
+
+    # Aynı parçadaki grup çiftleri birleştirme adayı değildir
+    shards = np.asarray(shard_indices)
+    candidates = np.triu(similarities, k=1) >= threshold
+    candidates &= shards[:, None] != shards[None, :]
+
+    # Union-find ile benzer grupları birleştir; bileşen başına içerdiği parçalar tutulur
+    parents = list(range(len(groups)))
+    component_shards = [{shard} for shard in shard_indices]
+
+    def find(i: int) -> int:
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    # En benzer çiftler önce; aynı parçadan iki grubu içerecek birleştirmeler atlanır
+    rows, cols = np.where(candidates)
+    for i, j in sorted(zip(rows.tolist(), cols.tolist()), key=lambda pair: -similarities[pair]):
+        root_i, root_j = find(i), find(j)
+        if root_i == root_j or component_shards[root_i] & component_shards[root_j]:
+            continue
+        parents[root_i] = root_j
+        component_shards[root_j] |= component_shards[root_i]
+
+    components: Dict[int, List[int]] = {}
+    for i in range(len(groups)):
+        components.setdefault(find(i), []).append(i)
+
+    merged = []
+    for members in components.values():
+        if len(members) == 1:
+            merged.append(groups[members[0]])
+            continue
+
+        largest = max(members, key=lambda i: len(groups[i]["related_news_ids"]))
+        news_ids = list(dict.fromkeys(
+            news_id for i in members for news_id in groups[i]["related_news_ids"]
+        ))
+        merged.append({"group_label": groups[largest]["group_label"], "related_news_ids": news_ids})
+        logger.info(f"{len(members)} parça grubu birleştirildi: '{groups[largest]['group_label']}' ({len(news_ids)} haber)")
+
+    return merged
@@ -0,0 +1,135 @@
+"""
+Result Builder Module
+
+Bu modül, /trigger-analysis sürecinde Aşama 1 (Gruplama) ve Aşama 2 (Detaylı Analiz)
+sonuçlarını Spring Boot'a gönderilecek payload'a dönüştüren AnalysisResultBuilder
+sınıfını içerir.
+
+Hazırlanan haberler bir kez ID'ye göre indekslenir; grup haberlerinin çözülmesi,
+gruplanan haberlerin takibi ve gruplanamayan haberlerin belirlenmesi sözlük/küme
+işlemleriyle yapılır. Böylece toplam maliyet haber ve grup-haber ilişkisi sayısıyla
+doğrusal kalır (önceki sürümde her ID için liste taraması yapılıyordu).
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Set
+
+# Logger oluştur
+logger = logging.getLogger(__name__)
+
+
+class AnalysisResultBuilder:
+    """
+    Hazırlanmış haberleri ID'ye göre indeksleyip analiz sonuçlarını biriktiren yardımcı sınıf.
+
+    Kullanım:
+        builder = AnalysisResultBuilder(prepared_news_list)
+        details = builder.group_details(group["related_news_ids"])
+        builder.add_story(analyzed_story)
+        payload = builder.build_payload()
+    """
+
+    def __init__(self, prepared_news_list: List[Dict]):
+        """
+        AnalysisResultBuilder sınıfını başlatır.
+
+        Args:
+            prepared_news_list: prepare_news_for_analysis çıktısı ({id, title, extracted_keywords, content})
+        """
+        # Haber sırası korunur (gruplanamayan haberler bu sırayla raporlanır)
+        self.news_by_id: Dict[str, Dict] = {news["id"]: news for news in prepared_news_list}
+        self.analyzed_stories: List[Dict] = []
+        self.grouped_news_ids: Set[str] = set()
+        self.story_count = 0
+
+    def get_news(self, news_ids: List[str]) -> List[Dict]:
+        """
+        ID'leri verilen haberleri (bulunanları, verilen sırayla) döndürür.
+
+        Args:
+            news_ids: Haber ID'leri
+
+        Returns:
+            List[Dict]: Hazırlanmış haber sözlükleri
+        """
+        news_by_id = self.news_by_id
+        return [news_by_id[news_id] for news_id in news_ids if news_id in news_by_id]
+
+    def group_titles(self, news_ids: List[str]) -> List[str]:
+        """Gruptaki haberlerin başlıklarını döndürür."""
+        return [news["title"] for news in self.get_news(news_ids)]
+
+    def group_details(self, news_ids: List[str]) -> List[Dict]:
+        """
+        Aşama 2 prompt'u için gruptaki haberlerin gerekli alanlarını döndürür.
+
+        Args:
+            news_ids: Gruptaki haber ID'leri
+
+        Returns:
+            List[Dict]: {id, title, extracted_keywords, content} sözlükleri
+        """
+        return [
+            {
+                "id": news["id"],
+                "title": news["title"],
+                "extracted_keywords": news.get("extracted_keywords", []),
+                "content": news["content"]
+            }
+            for news in self.get_news(news_ids)
+        ]
+
+    def add_story(self, analyzed_story: Optional[Dict]) -> None:
+        """
+        Başarılı bir Aşama 2 sonucunu ekler ve haberlerini gruplanmış olarak işaretler.
+
+        Args:
+            analyzed_story: analyze_individual_story_group çıktısı (None ise yok sayılır)
+        """
+        if not analyzed_story:
+            return
+        self.analyzed_stories.append(analyzed_story)
+        self.mark_grouped(analyzed_story)
+
+    def mark_grouped(self, analyzed_story: Optional[Dict]) -> None:
+        """
+        Hikayeyi saklamadan yalnızca haberlerini gruplanmış olarak işaretler.
+
+        Hikayeler ResultSink ile tamamlandıkça gönderildiğinde kullanılır; böylece tüm
+        payload bellekte tutulmaz.
+
+        Args:
+            analyzed_story: analyze_individual_story_group çıktısı (None ise yok sayılır)
+        """
+        if not analyzed_story:
+            return
+        self.story_count += 1
+        self.grouped_news_ids.update(analyzed_story.get("related_news_ids", []))
+
+    def ungrouped_ids(self) -> List[str]:
+        """Hiçbir başarılı hikayeye dahil edilmeyen haber ID'lerini (hazırlanma sırasıyla) döndürür."""
+        grouped = self.grouped_news_ids
+        return [news_id for news_id in self.news_by_id if news_id not in grouped]
+
+    def ungrouped_preview(self, limit: int = 3) -> List[str]:
+        """İlk birkaç gruplanamayan haberin başlığını döndürür."""
+        grouped = self.grouped_news_ids
+        titles = []
+        for news_id, news in self.news_by_id.items():
+            if len(titles) >= limit:
+                break
+            if news_id not in grouped:
+                titles.append(news["title"])
+        return titles
+
+    def build_payload(self) -> Dict[str, Any]:
+        """
+        Spring Boot'a gönderilecek payload'u oluşturur.
+
+        Returns:
+            Dict[str, Any]: {'analyzed_stories', 'ungrouped_news_ids'}
+        """
+        return {
+            "analyzed_stories": self.analyzed_stories,
+            "ungrouped_news_ids": self.ungrouped_ids()
+        }
@@ -1,11 +1,255 @@
+import asyncio
+import gzip
+import json
 import logging
+import random
+import time
+import uuid
 import httpx
-from typing import Dict, Optional, List, Any
+from typing import Dict, Optional, List, Any, Tuple
 from pprint import pformat
 
+from src.core.config import settings
+
 # Logger oluştur
 logger = logging.getLogger(__name__)
 
+# Uygulama boyunca paylaşılan HTTP istemcisi (bağlantı havuzu ve keep-alive için)
+_http_client: Optional[httpx.AsyncClient] = None
+
+# Yeniden denenecek HTTP durum kodları (409: aynı Idempotency-Key'li parti backend'de hâlâ işleniyor)
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Spring Boot'a gönderim için paylaşılan (uzun ömürlü) HTTP istemcisini döndürür.
+    
+    Her gönderimde yeni istemci oluşturmak yerine bağlantılar havuzda tutulur ve
+    ardışık istekler aynı keep-alive bağlantılarını kullanır.
+    
+    Returns:
+        httpx.AsyncClient: Paylaşılan istemci
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.RESULT_SINK_TIMEOUT_SECONDS, connect=10.0),
+            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
+            transport=httpx.AsyncHTTPTransport(retries=3)  # Bağlantı kurma hatalarında 3 kez yeniden deneme
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Paylaşılan HTTP istemcisini kapatır (uygulama kapanırken çağrılır)."""
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+
+
+class ResultSink:
+    """
+    Analiz edilen hikayeleri tamamlandıkça küçük partiler halinde Spring Boot'a gönderen sınıf.
+    
+    - Hikayeler RESULT_SINK_BATCH_SIZE'a ulaşınca veya RESULT_SINK_FLUSH_SECONDS dolunca gönderilir;
+      böylece tüm grupların bitmesi beklenmez ve tüm payload bellekte tutulmaz.
+    - Gövde gzip ile sıkıştırılır (Content-Encoding: gzip).
+    - Her parti sabit bir Idempotency-Key taşır; yeniden denemelerde aynı anahtar kullanıldığından
+      Spring Boot aynı partiyi iki kez kaydetmez.
+    - Gruplanamayan haber ID'leri close() çağrısında son partiyle gönderilir.
+    
+    Kullanım:
+        sink = ResultSink(settings.SPRING_BOOT_SUBMIT_URL)
+        await sink.add(analyzed_story)
+        success = await sink.close(ungrouped_ids)
+    """
+    
+    def __init__(self,
+                 submit_url: str,
+                 batch_size: Optional[int] = None,
+                 flush_seconds: Optional[float] = None,
+                 use_gzip: Optional[bool] = None,
+                 max_retries: Optional[int] = None,
+                 client: Optional[httpx.AsyncClient] = None):
+        """
+        ResultSink sınıfını başlatır.
+        
+        Args:
+            submit_url: Spring Boot API endpoint URL'i
+            batch_size: Parti başına hikaye sayısı. None ise RESULT_SINK_BATCH_SIZE.
+            flush_seconds: Bekleyen hikayelerin en fazla bekletileceği süre. None ise RESULT_SINK_FLUSH_SECONDS.
+            use_gzip: Gövdenin gzip ile sıkıştırılıp sıkıştırılmayacağı. None ise RESULT_SINK_GZIP.
+            max_retries: Parti başına yeniden deneme sayısı. None ise RESULT_SINK_MAX_RETRIES.
+            client: HTTP istemcisi. None ise paylaşılan istemci kullanılır.
+        """
+        self.submit_url = submit_url
+        self.batch_size = max(1, batch_size or settings.RESULT_SINK_BATCH_SIZE)
+        self.flush_seconds = flush_seconds if flush_seconds is not None else settings.RESULT_SINK_FLUSH_SECONDS
+        self.use_gzip = use_gzip if use_gzip is not None else settings.RESULT_SINK_GZIP
+        self.max_retries = max_retries if max_retries is not None else settings.RESULT_SINK_MAX_RETRIES
+        self.client = client
+        
+        # Idempotency anahtarları bu çalıştırmaya özgü önek ve parti sırasıyla üretilir
+        self.run_id = uuid.uuid4().hex
+        self._sequence = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._buffer_since: Optional[float] = None
+        self._send_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._closed = False
+        
+        self.sent_stories = 0
+        self.sent_batches = 0
+        self.failed_batches = 0
+    
+    async def add(self, analyzed_story: Optional[Dict[str, Any]]) -> None:
+        """
+        Analiz edilen hikayeyi gönderim kuyruğuna ekler; parti dolduysa hemen gönderir.
+        
+        Args:
+            analyzed_story: Gönderilecek hikaye (None ise yok sayılır)
+        """
+        if not analyzed_story or self._closed:
+            return
+        
+        self._buffer.append(analyzed_story)
+        if self._buffer_since is None:
+            self._buffer_since = time.monotonic()
+        
+        if len(self._buffer) >= self.batch_size:
+            await self.flush()
+        elif self._flush_task is None and self.flush_seconds > 0:
+            self._flush_task = asyncio.create_task(self._flush_after_interval())
+    
+    async def _flush_after_interval(self) -> None:
+        """Bekleyen hikayeleri en fazla flush_seconds bekletip gönderir."""
+        try:
+            while self._buffer and not self._closed:
+                elapsed = time.monotonic() - (self._buffer_since or time.monotonic())
+                if elapsed >= self.flush_seconds:
+                    await self.flush()
+                else:
+                    await asyncio.sleep(self.flush_seconds - elapsed)
+        finally:
+            self._flush_task = None
+    
+    async def flush(self, ungrouped_news_ids: Optional[List[str]] = None) -> bool:
+        """
+        Bekleyen hikayeleri (ve verilmişse gruplanamayan haber ID'lerini) tek parti olarak gönderir.
+        
+        Args:
+            ungrouped_news_ids: Partiye eklenecek gruplanamayan haber ID'leri
+            
+        Returns:
+            Gönderim başarılıysa (veya gönderilecek bir şey yoksa) True
+        """
+        async with self._send_lock:
+            stories, self._buffer, self._buffer_since = self._buffer, [], None
+            if not stories and ungrouped_news_ids is None:
+                return True
+            
+            self._sequence += 1
+            batch = {
+                "analyzed_stories": stories,
+                "ungrouped_news_ids": ungrouped_news_ids or []
+            }
+            success = await self._send_batch(batch, f"{self.run_id}-{self._sequence}")
+            
+            if success:
+                self.sent_batches += 1
+                self.sent_stories += len(stories)
+            else:
+                self.failed_batches += 1
+            return success
+    
+    async def close(self, ungrouped_news_ids: Optional[List[str]] = None) -> bool:
+        """
+        Kalan hikayeleri ve gruplanamayan haber ID'lerini son parti olarak gönderir.
+        
+        Args:
+            ungrouped_news_ids: Hiçbir hikayeye dahil edilmeyen haber ID'leri
+            
+        Returns:
+            Tüm partiler başarıyla gönderildiyse True
+        """
+        self._closed = True
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        
+        await self.flush(ungrouped_news_ids or [])
+        logger.info(f"Sonuç gönderimi tamamlandı: {self.sent_stories} hikaye, {self.sent_batches} parti "
+                    f"gönderildi, {self.failed_batches} parti başarısız")
+        return self.failed_batches == 0
+    
+    def discard(self) -> None:
+        """Gönderimi yarıda bırakır (ör. iş iptal edildiğinde); bekleyen hikayeler gönderilmez."""
+        self._closed = True
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+        if self._buffer:
+            logger.warning(f"Sonuç gönderimi yarıda kaldı, {len(self._buffer)} hikaye gönderilmedi")
+        self._buffer, self._buffer_since = [], None
+    
+    def _encode(self, batch: Dict[str, Any]) -> Tuple[bytes, Dict[str, str]]:
+        """Partiyi JSON'a serileştirir ve gerekirse gzip ile sıkıştırır."""
+        body = json.dumps(batch, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if self.use_gzip:
+            body = gzip.compress(body, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+        return body, headers
+    
+    async def _send_batch(self, batch: Dict[str, Any], idempotency_key: str) -> bool:
+        """
+        Partiyi gönderir; geçici hatalarda aynı Idempotency-Key ile üstel geri çekilmeyle yeniden dener.
+        
+        Args:
+            batch: {analyzed_stories, ungrouped_news_ids} sözlüğü
+            idempotency_key: Partiye özgü anahtar (tüm denemelerde aynı)
+            
+        Returns:
+            Gönderim başarılıysa True
+        """
+        body, headers = self._encode(batch)
+        headers["Idempotency-Key"] = idempotency_key
+        client = self.client or get_http_client()
+        story_count = len(batch["analyzed_stories"])
+        
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await client.post(self.submit_url, content=body, headers=headers)
+                
+                if response.status_code in RETRYABLE_STATUS_CODES and attempt < self.max_retries:
+                    logger.warning(f"Spring Boot geçici hata döndürdü ({response.status_code}), "
+                                   f"parti {idempotency_key} yeniden denenecek")
+                else:
+                    response.raise_for_status()
+                    logger.info(f"Parti gönderildi ({idempotency_key}): {story_count} hikaye, "
+                                f"{len(batch['ungrouped_news_ids'])} gruplanamayan haber, {len(body)} bayt")
+                    return True
+                    
+            except httpx.HTTPStatusError as http_err:
+                # Yeniden denenmeyen HTTP hataları (4xx) veya denemeler tükendi
+                logger.error(f"Parti {idempotency_key} gönderilirken HTTP hatası: {http_err}")
+                return False
+                
+            except httpx.RequestError as req_err:
+                if attempt >= self.max_retries:
+                    logger.error(f"Parti {idempotency_key} gönderilemedi, istek hatası: {req_err}")
+                    return False
+                logger.warning(f"Parti {idempotency_key} gönderilirken istek hatası: {req_err}, yeniden denenecek")
+            
+            # Full jitter ile üstel geri çekilme
+            await asyncio.sleep(random.uniform(0, min(30.0, 2 ** attempt)))
+        
+        return False
+
 
 async def send_results_to_spring_boot(payload: Dict[str, Any], spring_boot_submit_url: str) -> bool:
     """
@@ -46,44 +290,39 @@ async def send_results_to_spring_boot(payload: Dict[str, Any], spring_boot_submi
     headers = {"Content-Type": "application/json"}
     
     try:
-        # Asenkron HTTP client'ı async with kullanarak oluştur (otomatik kapatma için)
-        # Bağlantı sorunlarını daha iyi yönetmek için yeniden deneme ve timeout ayarları
-        async with httpx.AsyncClient(
-            timeout=httpx.Timeout(30.0, connect=10.0),  # Bağlantı kurma için 10 saniye, toplam 30 saniye
-            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
-            transport=httpx.AsyncHTTPTransport(retries=3)  # Bağlantı hatalarında 3 kez yeniden deneme
-        ) as client:
-            logger.info(f"Spring Boot servisine bağlantı kurulmaya çalışılıyor: {spring_boot_submit_url}")
-            # POST isteğini gönder
-            response = await client.post(
-                spring_boot_submit_url,
-                json=payload,
-                headers=headers
-            )
-            
-            # HTTP hata kodlarını kontrol et
-            response.raise_for_status()
-            
-            # Yanıtı işle
-            status_code = response.status_code
-            
-            try:
-                response_body = response.json()
-                response_summary = pformat(response_body) if response_body else "(Boş yanıt gövdesi)"
-            except Exception as e:
-                # JSON parse hatası durumunda
-                response_summary = f"(JSON olarak parse edilemedi: {str(e)})"
-                response_body = response.text
+        # Paylaşılan (havuzlu) HTTP istemcisini kullan
+        client = get_http_client()
+        logger.info(f"Spring Boot servisine bağlantı kurulmaya çalışılıyor: {spring_boot_submit_url}")
+        # POST isteğini gönder
+        response = await client.post(
+            spring_boot_submit_url,
+            json=payload,
+            headers=headers
+        )
+        
+        # HTTP hata kodlarını kontrol et
+        response.raise_for_status()
+        
+        # Yanıtı işle
+        status_code = response.status_code
+        
+        try:
+            response_body = response.json()
+            response_summary = pformat(response_body) if response_body else "(Boş yanıt gövdesi)"
+        except Exception as e:
+            # JSON parse hatası durumunda
+            response_summary = f"(JSON olarak parse edilemedi: {str(e)})"
+            response_body = response.text
+        
+        if 200 <= status_code < 300:  # Başarılı yanıtlar
+            logger.info(f"Spring Boot'a gönderme başarılı. Durum kodu: {status_code}")
+            logger.info(f"Spring Boot yanıtı: {response_summary}")
+            return True
+        else:  # Beklenmeyen başarısız yanıt (raise_for_status'ten kaçmış olabilir)
+            logger.error(f"Spring Boot'a gönderme başarısız. Durum kodu: {status_code}")
+            logger.error(f"Spring Boot yanıtı: {response_summary}")
+            return False
             
-            if 200 <= status_code < 300:  # Başarılı yanıtlar
-                logger.info(f"Spring Boot'a gönderme başarılı. Durum kodu: {status_code}")
-                logger.info(f"Spring Boot yanıtı: {response_summary}")
-                return True
-            else:  # Beklenmeyen başarısız yanıt (raise_for_status'ten kaçmış olabilir)
-                logger.error(f"Spring Boot'a gönderme başarısız. Durum kodu: {status_code}")
-                logger.error(f"Spring Boot yanıtı: {response_summary}")
-                return False
-                
     except httpx.HTTPStatusError as http_err:
         # HTTP hata kodları için (4xx, 5xx)
         logger.error(f"Spring Boot'a gönderme sırasında HTTP hatası: {http_err}")
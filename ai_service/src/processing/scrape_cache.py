@@ -0,0 +1,379 @@
+"""
+Scrape Cache Module
+
+Bu modül, indirilen haber sayfalarının ham HTML'ini ve ayrıştırılmış metnini
+normalize edilmiş URL bazında yerel bir SQLite veritabanında saklayan ScrapeCache
+sınıfını içerir. Hem Gemini analiz yolu (content_scraper) hem de Faz 1
+(FeatureExtractor) aynı önbelleği paylaşır; böylece aynı makale iki kez çekilmez.
+
+Özellikler:
+- TTL: Taze kayıtlar ağa gitmeden döndürülür
+- Koşullu GET: Süresi dolan kayıtlar ETag/Last-Modified ile yeniden doğrulanır
+- Negatif önbellek: Başarısız indirmeler daha kısa bir TTL ile hatırlanır
+- Boyut tabanlı LRU: Toplam boyut sınırı aşıldığında en uzun süredir erişilmeyenler silinir
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from ..core.config import settings
+from ..core.paths import get_cache_dir
+
+# Logger yapılandırması
+logger = logging.getLogger(__name__)
+
+# Önbellek kayıt durumları
+CACHE_STATUS_OK = "OK"
+CACHE_STATUS_FAILED = "FAILED"
+
+# URL normalizasyonunda atılacak izleme parametreleri
+TRACKING_PARAM_PREFIXES = ("utm_",)
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ocid", "cmpid"}
+
+
+def normalize_url(url: str) -> str:
+    """
+    URL'yi önbellek anahtarı olarak kullanılabilecek kanonik biçime getirir.
+
+    Şema ve alan adı küçük harfe çevrilir, varsayılan portlar ve fragment atılır,
+    izleme parametreleri temizlenir ve kalan sorgu parametreleri sıralanır.
+
+    Args:
+        url: Normalize edilecek URL
+
+    Returns:
+        str: Normalize edilmiş URL
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+
+    if (scheme == "http" and netloc.endswith(":80")) or (scheme == "https" and netloc.endswith(":443")):
+        netloc = netloc.rsplit(":", 1)[0]
+
+    path = parts.path or "/"
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/")
+
+    query_params = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PARAM_PREFIXES)
+    ]
+    query = urlencode(sorted(query_params))
+
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+@dataclass
+class CacheEntry:
+    """Önbellekteki tek bir URL kaydı."""
+    url: str
+    status: str
+    fetched_at: float
+    final_url: Optional[str] = None
+    html: Optional[str] = None
+    text: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Kayıt başarılı bir indirmeye mi ait?"""
+        return self.status == CACHE_STATUS_OK and self.html is not None
+
+    def is_fresh(self, ttl_seconds: float, failure_ttl_seconds: float) -> bool:
+        """
+        Kaydın yeniden doğrulama yapılmadan kullanılıp kullanılamayacağını belirler.
+
+        Args:
+            ttl_seconds: Başarılı kayıtlar için geçerlilik süresi
+            failure_ttl_seconds: Başarısız kayıtlar için geçerlilik süresi
+
+        Returns:
+            bool: Kayıt tazeyse True
+        """
+        ttl = ttl_seconds if self.status == CACHE_STATUS_OK else failure_ttl_seconds
+        return (time.time() - self.fetched_at) < ttl
+
+
+class ScrapeCache:
+    """
+    Haber sayfası HTML'ini ve ayrıştırılmış metnini saklayan SQLite tabanlı önbellek.
+
+    Bağlantı iş parçacıkları arasında paylaşılır ve bir kilitle korunur. WAL modu
+    sayesinde aynı dosyayı kullanan farklı süreçler (API ve pipeline) birbirini bloklamaz.
+    """
+
+    def __init__(self,
+                 db_path: Optional[str] = None,
+                 ttl_seconds: Optional[float] = None,
+                 failure_ttl_seconds: Optional[float] = None,
+                 max_size_bytes: Optional[int] = None):
+        """
+        ScrapeCache sınıfını başlatır.
+
+        Args:
+            db_path: SQLite dosyasının yolu. None ise ayarlardan veya varsayılan önbellek dizininden alınır.
+            ttl_seconds: Başarılı kayıtların geçerlilik süresi (saniye)
+            failure_ttl_seconds: Başarısız kayıtların geçerlilik süresi (saniye)
+            max_size_bytes: Önbelleğin izin verilen toplam boyutu (bayt)
+        """
+        self.db_path = Path(db_path or settings.SCRAPE_CACHE_PATH or get_cache_dir() / "scrape_cache.sqlite3")
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds or settings.SCRAPE_CACHE_TTL_SECONDS
+        self.failure_ttl_seconds = failure_ttl_seconds or settings.SCRAPE_CACHE_FAILURE_TTL_SECONDS
+        self.max_size_bytes = max_size_bytes or settings.SCRAPE_CACHE_MAX_BYTES
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+        logger.info(f"ScrapeCache başlatıldı: {self.db_path} (TTL: {self.ttl_seconds}s, "
+                   f"maksimum boyut: {self.max_size_bytes} bayt)")
+
+    def _create_schema(self) -> None:
+        """Önbellek tablosunu ve indekslerini oluşturur."""
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS scrape_cache (
+                    url_key TEXT PRIMARY KEY,
+                    final_url TEXT,
+                    status TEXT NOT NULL,
+                    html BLOB,
+                    text TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    error TEXT,
+                    size_bytes INTEGER NOT NULL DEFAULT 0,
+                    fetched_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_scrape_cache_last_access ON scrape_cache (last_access)"
+            )
+
+    def lookup_many(self, urls: Iterable[str]) -> Dict[str, CacheEntry]:
+        """
+        Birden fazla URL için önbellek kayıtlarını getirir ve erişim zamanlarını günceller.
+
+        Args:
+            urls: Aranacak URL'ler
+
+        Returns:
+            Dict[str, CacheEntry]: Orijinal URL -> önbellek kaydı (bulunanlar için)
+        """
+        key_to_urls: Dict[str, list] = {}
+        for url in urls:
+            key_to_urls.setdefault(normalize_url(url), []).append(url)
+
+        if not key_to_urls:
+            return {}
+
+        entries = {}
+        now = time.time()
+        try:
+            with self._lock, self._conn:
+                keys = list(key_to_urls)
+                # SQLite parametre sınırına takılmamak için parçalar halinde sorgula
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        f"""
+                        SELECT url_key, final_url, status, html, text, etag, last_modified, error, fetched_at
+                        FROM scrape_cache WHERE url_key IN ({placeholders})
+                        """,
+                        chunk
+                    ).fetchall()
+
+                    for url_key, final_url, status, html, text, etag, last_modified, error, fetched_at in rows:
+                        for url in key_to_urls[url_key]:
+                            entries[url] = CacheEntry(
+                                url=url,
+                                status=status,
+                                fetched_at=fetched_at,
+                                final_url=final_url,
+                                html=zlib.decompress(html).decode("utf-8") if html else None,
+                                text=text,
+                                etag=etag,
+                                last_modified=last_modified,
+                                error=error
+                            )
+
+                    self._conn.execute(
+                        f"UPDATE scrape_cache SET last_access = ? WHERE url_key IN ({placeholders})",
+                        [now, *chunk]
+                    )
+        except Exception as e:
+            logger.error(f"Önbellek okunurken hata: {e}")
+
+        return entries
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Kaydın bu önbelleğin TTL ayarlarına göre taze olup olmadığını döndürür."""
+        return entry.is_fresh(self.ttl_seconds, self.failure_ttl_seconds)
+
+    def store_response(self,
+                       url: str,
+                       html: str,
+                       final_url: Optional[str] = None,
+                       etag: Optional[str] = None,
+                       last_modified: Optional[str] = None) -> None:
+        """
+        Başarılı bir indirmenin HTML içeriğini saklar. Önceki ayrıştırılmış metin geçersiz kılınır.
+
+        Args:
+            url: İndirilen URL
+            html: Ham HTML içeriği
+            final_url: Yönlendirme sonrası son URL
+            etag: Sunucunun döndürdüğü ETag başlığı
+            last_modified: Sunucunun döndürdüğü Last-Modified başlığı
+        """
+        compressed = zlib.compress(html.encode("utf-8"))
+        now = time.time()
+        self._execute("""
+            INSERT INTO scrape_cache (url_key, final_url, status, html, text, etag, last_modified,
+                                      error, size_bytes, fetched_at, last_access)
+            VALUES (?, ?, ?, ?, NULL, ?, ?, NULL, ?, ?, ?)
+            ON CONFLICT (url_key) DO UPDATE SET
+                final_url = excluded.final_url,
+                status = excluded.status,
+                html = excluded.html,
+                text = NULL,
+                etag = excluded.etag,
+                last_modified = excluded.last_modified,
+                error = NULL,
+                size_bytes = excluded.size_bytes,
+                fetched_at = excluded.fetched_at,
+                last_access = excluded.last_access
+        """, (normalize_url(url), final_url, CACHE_STATUS_OK, compressed, etag, last_modified,
+              len(compressed), now, now))
+
+    def store_text(self, url: str, text: str) -> None:
+        """
+        Bir URL için ayrıştırılmış metni saklar.
+
+        Args:
+            url: Metnin ait olduğu URL
+            text: newspaper3k ile ayrıştırılmış makale metni
+        """
+        self._execute("""
+            UPDATE scrape_cache
+            SET text = ?, size_bytes = COALESCE(length(html), 0) + ?
+            WHERE url_key = ? AND status = ?
+        """, (text, len(text.encode("utf-8")), normalize_url(url), CACHE_STATUS_OK))
+
+    def store_failure(self, url: str, error: str) -> None:
+        """
+        Başarısız bir indirmeyi kısa TTL ile saklar. Daha önce başarılı bir kayıt varsa korunur.
+
+        Args:
+            url: İndirilemeyen URL
+            error: Hata açıklaması
+        """
+        now = time.time()
+        self._execute("""
+            INSERT INTO scrape_cache (url_key, status, error, size_bytes, fetched_at, last_access)
+            VALUES (?, ?, ?, 0, ?, ?)
+            ON CONFLICT (url_key) DO UPDATE SET
+                status = excluded.status,
+                error = excluded.error,
+                fetched_at = excluded.fetched_at,
+                last_access = excluded.last_access
+            WHERE scrape_cache.status != 'OK'
+        """, (normalize_url(url), CACHE_STATUS_FAILED, error, now, now))
+
+    def mark_revalidated(self, url: str) -> None:
+        """
+        Koşullu GET sonucu 304 dönen bir kaydın tazelik süresini yeniler.
+
+        Args:
+            url: Yeniden doğrulanan URL
+        """
+        now = time.time()
+        self._execute(
+            "UPDATE scrape_cache SET fetched_at = ?, last_access = ? WHERE url_key = ?",
+            (now, now, normalize_url(url))
+        )
+
+    def evict_if_needed(self) -> int:
+        """
+        Toplam boyut sınırı aşıldıysa en uzun süredir erişilmeyen kayıtları siler.
+
+        Sınır aşıldığında boyut, sınırın %90'ına inene kadar silme yapılır.
+
+        Returns:
+            int: Silinen kayıt sayısı
+        """
+        try:
+            with self._lock, self._conn:
+                total_size = self._conn.execute(
+                    "SELECT COALESCE(SUM(size_bytes), 0) FROM scrape_cache"
+                ).fetchone()[0]
+
+                if total_size <= self.max_size_bytes:
+                    return 0
+
+                target_size = int(self.max_size_bytes * 0.9)
+                to_delete = []
+                for url_key, size_bytes in self._conn.execute(
+                    "SELECT url_key, size_bytes FROM scrape_cache ORDER BY last_access ASC"
+                ):
+                    if total_size <= target_size:
+                        break
+                    to_delete.append((url_key,))
+                    total_size -= size_bytes
+
+                self._conn.executemany("DELETE FROM scrape_cache WHERE url_key = ?", to_delete)
+
+            logger.info(f"Önbellekten {len(to_delete)} kayıt silindi (LRU)")
+            return len(to_delete)
+
+        except Exception as e:
+            logger.error(f"Önbellek temizlenirken hata: {e}")
+            return 0
+
+    def _execute(self, query: str, params: tuple) -> None:
+        """Tek bir yazma sorgusunu kilit altında çalıştırır; hatalar loglanıp yutulur."""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(query, params)
+        except Exception as e:
+            logger.error(f"Önbelleğe yazılırken hata: {e}")
+
+
+# Süreç genelinde paylaşılan önbellek örneği
+_shared_cache: Optional[ScrapeCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_scrape_cache() -> Optional[ScrapeCache]:
+    """
+    Paylaşılan ScrapeCache örneğini döndürür, gerekirse oluşturur.
+
+    Returns:
+        Optional[ScrapeCache]: Önbellek örneği; önbellek devre dışıysa veya açılamazsa None
+    """
+    global _shared_cache
+    if not settings.SCRAPE_CACHE_ENABLED:
+        return None
+
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            try:
+                _shared_cache = ScrapeCache()
+            except Exception as e:
+                logger.error(f"ScrapeCache başlatılamadı, önbelleksiz devam ediliyor: {e}")
+                return None
+        return _shared_cache
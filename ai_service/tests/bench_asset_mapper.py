@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+AssetMapper için mikro benchmark.
+
+rules/asset_rules.yaml kurallarıyla, önceki iç içe döngülü eşleştirme (her varlık için her
+kuralın her adıyla üç .lower() alt dize kontrolü) ile indeksli AssetMapper.map_assets'i
+artan varlık sayılarında karşılaştırır. Sonuçların aynı olduğunu ve indeksli eşleştirmenin
+süresinin varlık sayısıyla doğrusal arttığını doğrular. Kural dosyası büyüdükçe farkı
+göstermek için kurallar sentetik adlarla çoğaltılarak da ölçülür.
+
+Çalıştırma (ai_service dizininden):
+    python -m tests.bench_asset_mapper
+"""
+
+import logging
+import os
+import random
+import tempfile
+import time
+from typing import Callable, Dict, List, Set
+
+import yaml
+
+from processing.asset_mapper import AssetMapper
+from utils.rule_store import RuleStore
+
+# Rastgele varlıkların kurallardaki adlardan türetilme oranı (geri kalanı eşleşmeyen adlar)
+KNOWN_ENTITY_RATIO = 0.3
+# Doğrusal ölçeklenme için izin verilen sapma (10 kat veri için en fazla 10 * 2.5 kat süre)
+MAX_SCALING_FACTOR = 2.5
+
+FILLER_WORDS = ["Holdings", "Group", "Capital", "Energy", "Partners", "Global", "Industries",
+                "Minister", "Ministry", "Council", "Authority", "Agency", "Systems", "Labs"]
+
+
+def make_entities(mapper: AssetMapper, entity_count: int, seed: int = 42) -> Dict[str, List[str]]:
+    """Kurallardaki adlardan ve rastgele adlardan oluşan varlık sözlüğü üretir."""
+    rng = random.Random(seed)
+    names_by_type: Dict[str, List[str]] = {}
+    for mapping in mapper.mappings:
+        names_by_type.setdefault(mapping["entity_type"], []).extend(mapping.get("entity_names", []))
+    entity_types = sorted(names_by_type)
+
+    entities: Dict[str, List[str]] = {}
+    for i in range(entity_count):
+        entity_type = rng.choice(entity_types)
+        if rng.random() < KNOWN_ENTITY_RATIO:
+            # Kural adı, tek başına veya daha uzun bir ifadenin parçası olarak
+            name = rng.choice(names_by_type[entity_type])
+            entity = rng.choice([name, f"{name} {rng.choice(FILLER_WORDS)}", name.upper()])
+        else:
+            entity = f"{rng.choice(FILLER_WORDS)} {rng.choice(FILLER_WORDS)} {i}"
+        entities.setdefault(entity_type, []).append(entity)
+    return entities
+
+
+def scaled_mapper(factor: int, tmp_dir: str) -> AssetMapper:
+    """Kuralları sentetik adlarla factor katına çıkarılmış bir AssetMapper döndürür."""
+    base = list(AssetMapper().mappings)
+    mappings = list(base)
+    for k in range(1, factor):
+        for mapping in base:
+            mappings.append({
+                **mapping,
+                "entity_names": [f"{name} Unit{k}" for name in mapping.get("entity_names", [])],
+                "assets": [f"{asset}_{k}" for asset in mapping.get("assets", [])]
+            })
+
+    rules_path = os.path.join(tmp_dir, f"asset_rules_x{factor}.yaml")
+    with open(rules_path, "w", encoding="utf-8") as file:
+        yaml.safe_dump({"mappings": mappings}, file, allow_unicode=True)
+    return AssetMapper(rules_path=rules_path, rule_store=RuleStore(use_cache=False))
+
+
+def map_assets_naive(mapper: AssetMapper, entities: Dict[str, List[str]]) -> List[str]:
+    """Eski AssetMapper.map_assets eşleştirme mantığı (iç içe döngüler)."""
+    candidate_assets: Set[str] = set()
+    for mapping in mapper.mappings:
+        entity_type = mapping.get("entity_type")
+        entity_names = mapping.get("entity_names", [])
+        assets = mapping.get("assets", [])
+        if entity_type in entities:
+            for entity in entities[entity_type]:
+                for rule_entity in entity_names:
+                    if (rule_entity.lower() == entity.lower() or
+                            rule_entity.lower() in entity.lower() or
+                            entity.lower() in rule_entity.lower()):
+                        candidate_assets.update(assets)
+                        break
+    return sorted(candidate_assets)
+
+
+def map_assets_indexed(mapper: AssetMapper, entities: Dict[str, List[str]]) -> List[str]:
+    """İndeksli AssetMapper.map_assets."""
+    return mapper.map_assets(entities)
+
+
+def measure(func: Callable, mapper: AssetMapper, entity_count: int, repeat: int = 3) -> float:
+    """Fonksiyonun verilen varlık sayısındaki en iyi süresini (saniye) döndürür."""
+    entities = make_entities(mapper, entity_count)
+    best = float("inf")
+    for _ in range(repeat):
+        # Varlık önbelleğinin etkisini ölçmemek için her turda temizlenir
+        mapper._entity_cache.clear()
+        start = time.perf_counter()
+        func(mapper, entities)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    logging.disable(logging.INFO)
+    mapper = AssetMapper(rule_store=RuleStore(use_cache=False))
+    names = sum(len(mapping.get("entity_names", [])) for mapping in mapper.mappings)
+    print(f"{len(mapper.mappings)} eşleştirme kuralı, {names} varlık adı yüklendi")
+
+    # Sonuçların eşdeğer olduğunu kontrol et (tekil varlıklar ve rastgele kümeler)
+    for mapping in mapper.mappings:
+        for name in mapping.get("entity_names", []):
+            for entity in (name, name.lower(), f"{name} Group", name[:2], name[1:-1]):
+                single = {mapping["entity_type"]: [entity]}
+                assert map_assets_naive(mapper, single) == map_assets_indexed(mapper, single), entity
+    for seed in range(20):
+        entities = make_entities(mapper, 200, seed=seed)
+        assert map_assets_naive(mapper, entities) == map_assets_indexed(mapper, entities)
+
+    print(f"{'varlık':>8} {'iç içe döngü (s)':>18} {'indeksli (s)':>14}")
+    for entity_count in (100, 1000, 5000):
+        print(f"{entity_count:>8} {measure(map_assets_naive, mapper, entity_count, repeat=1):>18.4f} "
+              f"{measure(map_assets_indexed, mapper, entity_count):>14.4f}")
+
+    # Kural sayısı arttığında (varlık sayısı sabit)
+    print(f"{'kural':>8} {'iç içe döngü (s)':>18} {'indeksli (s)':>14}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for factor in (1, 10, 40):
+            scaled = scaled_mapper(factor, tmp_dir)
+            entities = make_entities(scaled, 300)
+            assert map_assets_naive(scaled, entities) == map_assets_indexed(scaled, entities)
+            print(f"{len(scaled.mappings):>8} {measure(map_assets_naive, scaled, 1000, repeat=1):>18.4f} "
+                  f"{measure(map_assets_indexed, scaled, 1000):>14.4f}")
+
+    # Doğrusal ölçeklenme kontrolü
+    small, large = 5000, 50000
+    small_time = measure(map_assets_indexed, mapper, small)
+    large_time = measure(map_assets_indexed, mapper, large)
+    ratio = large_time / small_time
+    print(f"indeksli: {small} varlık {small_time:.4f}s, {large} varlık {large_time:.4f}s (oran: {ratio:.1f}x)")
+    assert ratio < (large / small) * MAX_SCALING_FACTOR, f"Doğrusal olmayan ölçeklenme: {ratio:.1f}x"
+    print("OK: AssetMapper varlık sayısıyla doğrusal ölçekleniyor")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+AnalysisResultBuilder için mikro benchmark.
+
+Önceki liste taramalı birleştirme (her related_news_id için prepared_news_list taraması,
+gruplanamayan haberler için liste üyelik kontrolü) ile AnalysisResultBuilder'ı artan haber
+sayılarında karşılaştırır. Builder'ın süresinin haber sayısıyla doğrusal arttığını
+(boyut 10 katına çıktığında süre de ~10 kat) doğrular.
+
+Çalıştırma (ai_service dizininden):
+    python -m tests.bench_result_builder
+"""
+
+import random
+import time
+from typing import Callable, Dict, List
+
+from src.processing.result_builder import AnalysisResultBuilder
+
+# Hikaye başına haber sayısı ve haberlerin gruplanma oranı
+GROUP_SIZE = 5
+GROUPED_RATIO = 0.6
+# Doğrusal ölçeklenme için izin verilen sapma (10 kat veri için en fazla 10 * 2.5 kat süre)
+MAX_SCALING_FACTOR = 2.5
+
+
+def make_dataset(news_count: int, seed: int = 42):
+    """Rastgele haberler, gruplar ve analiz sonuçları üretir."""
+    rng = random.Random(seed)
+    prepared_news_list = [
+        {"id": str(i), "title": f"Haber {i}", "extracted_keywords": ["a", "b"], "content": "metin " * 20}
+        for i in range(news_count)
+    ]
+    grouped_ids = [news["id"] for news in prepared_news_list]
+    rng.shuffle(grouped_ids)
+    grouped_ids = grouped_ids[:int(news_count * GROUPED_RATIO)]
+    groups = [grouped_ids[i:i + GROUP_SIZE] for i in range(0, len(grouped_ids), GROUP_SIZE)]
+    stories = [{"story_title": f"Hikaye {i}", "related_news_ids": ids} for i, ids in enumerate(groups)]
+    return prepared_news_list, groups, stories
+
+
+def assemble_naive(prepared_news_list: List[Dict], groups: List[List[str]], stories: List[Dict]) -> Dict:
+    """Eski main.py birleştirme mantığı (liste taramaları)."""
+    for related_ids in groups:
+        titles = []
+        for news_id in related_ids:
+            for news in prepared_news_list:
+                if news["id"] == news_id:
+                    titles.append(news["title"])
+                    break
+        details = []
+        for news_id in related_ids:
+            for news in prepared_news_list:
+                if news["id"] == news_id:
+                    details.append({"id": news["id"], "title": news["title"],
+                                    "extracted_keywords": news.get("extracted_keywords", []),
+                                    "content": news["content"]})
+                    break
+
+    processed = set()
+    for story in stories:
+        processed.update(story["related_news_ids"])
+    ungrouped_ids = list({news["id"] for news in prepared_news_list} - processed)
+
+    preview = []
+    for news in prepared_news_list:
+        if news["id"] in ungrouped_ids:
+            preview.append(news["title"])
+            if len(preview) >= 3:
+                break
+    return {"analyzed_stories": stories, "ungrouped_news_ids": ungrouped_ids}
+
+
+def assemble_indexed(prepared_news_list: List[Dict], groups: List[List[str]], stories: List[Dict]) -> Dict:
+    """AnalysisResultBuilder ile birleştirme."""
+    builder = AnalysisResultBuilder(prepared_news_list)
+    for related_ids in groups:
+        builder.group_titles(related_ids)
+        builder.group_details(related_ids)
+    for story in stories:
+        builder.add_story(story)
+    builder.ungrouped_preview(3)
+    return builder.build_payload()
+
+
+def measure(func: Callable, news_count: int, repeat: int = 3) -> float:
+    """Fonksiyonun verilen veri boyutundaki en iyi süresini (saniye) döndürür."""
+    dataset = make_dataset(news_count)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*dataset)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    # Sonuçların eşdeğer olduğunu kontrol et
+    dataset = make_dataset(500)
+    naive, indexed = assemble_naive(*dataset), assemble_indexed(*dataset)
+    assert sorted(naive["ungrouped_news_ids"]) == sorted(indexed["ungrouped_news_ids"])
+    assert naive["analyzed_stories"] == indexed["analyzed_stories"]
+
+    print(f"{'haber':>8} {'liste taraması (s)':>20} {'indeksli (s)':>14}")
+    for news_count in (1000, 4000):
+        print(f"{news_count:>8} {measure(assemble_naive, news_count, repeat=1):>20.4f} "
+              f"{measure(assemble_indexed, news_count):>14.4f}")
+
+    # Doğrusal ölçeklenme kontrolü
+    small, large = 10000, 100000
+    small_time = measure(assemble_indexed, small)
+    large_time = measure(assemble_indexed, large)
+    ratio = large_time / small_time
+    print(f"indeksli: {small} haber {small_time:.4f}s, {large} haber {large_time:.4f}s (oran: {ratio:.1f}x)")
+    assert ratio < (large / small) * MAX_SCALING_FACTOR, f"Doğrusal olmayan ölçeklenme: {ratio:.1f}x"
+    print("OK: AnalysisResultBuilder haber sayısıyla doğrusal ölçekleniyor")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+pytest ortak ayarları.
+
+Testler ai_service dizininden çalıştırılır (python -m pytest tests). ai_service kök dizini
+import yoluna eklenir; zorunlu ayarlar ortamda tanımlı değilse test değerleriyle doldurulur.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# ai_service kök dizini (src, processing, utils, data_ingestion)
+AI_SERVICE_DIR = Path(__file__).parent.parent
+if str(AI_SERVICE_DIR) not in sys.path:
+    sys.path.insert(0, str(AI_SERVICE_DIR))
+
+# Settings() içe aktarılırken zorunlu alanlar (gerçek servislere bağlanılmaz)
+TEST_ENV = {
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_PORT": "5432",
+    "POSTGRES_DB": "test",
+    "LOG_LEVEL": "WARNING",
+    "GEMINI_API_KEY": "test",
+    "SPRING_BOOT_SUBMIT_URL": "http://localhost:8080/api/internal/submit-analysis",
+    "FMP_API_KEY": "test",
+    "NEWSDATA_API_KEY": "test",
+    "FINNHUB_API_KEY": "test",
+}
+for name, value in TEST_ENV.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,63 @@
+"""
+AsyncArticleDownloader testleri.
+
+Haber siteleri httpx.MockTransport ile taklit edilir; ağ çağrısı yapılmaz.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.processing.article_downloader import AsyncArticleDownloader
+
+
+def html_site(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, html=f"<html><body>{request.url.path}</body></html>")
+
+
+@pytest.fixture
+def downloader():
+    instance = AsyncArticleDownloader(http2=False, transport=httpx.MockTransport(html_site))
+    yield instance
+    asyncio.run(instance.aclose())
+
+
+def test_client_is_reused_across_calls(downloader):
+    first = downloader.download_many(["https://example.com/a", "https://example.com/b"])
+    client = downloader._client
+    second = downloader.download_many(["https://example.com/c"])
+
+    assert all(result.ok for result in {**first, **second}.values())
+    assert downloader._client is client
+    assert not client.is_closed
+
+
+def test_download_many_inside_running_loop(downloader):
+    async def caller():
+        return downloader.download_many(["https://example.com/a"])
+
+    assert asyncio.run(caller())["https://example.com/a"].ok
+
+
+def test_fetch_many_from_another_loop_uses_same_client(downloader):
+    downloader.download_many(["https://example.com/a"])
+    client = downloader._client
+
+    results = asyncio.run(downloader.fetch_many(["https://example.com/b"]))
+
+    assert results["https://example.com/b"].html == "<html><body>/b</body></html>"
+    assert downloader._client is client
+
+
+def test_aclose_closes_client_and_loop(downloader):
+    downloader.download_many(["https://example.com/a"])
+    client, thread = downloader._client, downloader._loop_thread
+
+    asyncio.run(downloader.aclose())
+
+    assert client.is_closed
+    assert not thread.is_alive()
+    # Kapatıldıktan sonraki indirme yeni bir istemciyle çalışır
+    assert downloader.download_many(["https://example.com/b"])["https://example.com/b"].ok
+    assert downloader._client is not client
@@ -0,0 +1,150 @@
+"""
+LLMAssetFilter toplu filtreleme testleri.
+
+LLM istemcisi, prompt'a göre sabit yanıt döndüren sahte bir istemciyle; yanıt önbelleği
+ise bellekte çalışan sahte bir PersistenceManager ile değiştirilir.
+"""
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.core.config import settings
+from src.llm.response_cache import LLMResponseCache
+
+AI_SERVICE_DIR = Path(__file__).parent.parent
+
+# asset_filter, ai_service.src.llm.parser'ı mutlak yolla içe aktarır
+if str(AI_SERVICE_DIR.parent) not in sys.path:
+    sys.path.append(str(AI_SERVICE_DIR.parent))
+
+
+def load_asset_filter_module():
+    """
+    llm/asset_filter.py'yi pipeline_orchestrator'daki '..llm.asset_filter' içe aktarmasının
+    çözüldüğü ad (src.llm.asset_filter) ile yükler; modülün göreli içe aktarmaları
+    (..core, .response_cache) bu paket altında çözülür.
+    """
+    name = "src.llm.asset_filter"
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, AI_SERVICE_DIR / "llm" / "asset_filter.py")
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+
+asset_filter = load_asset_filter_module()
+
+BATCH_PROMPT = "TOPLU\n{articles}"
+SINGLE_PROMPT = "TEK {candidate_assets}\n{text}"
+
+
+class FakeLLMClient:
+    """Toplu prompt'lara batch_reply, tekil prompt'lara single_reply döndüren sahte istemci."""
+
+    def __init__(self, batch_reply, single_reply="[]"):
+        self.batch_reply = batch_reply
+        self.single_reply = single_reply
+        self.batch_calls = 0
+        self.single_calls = 0
+
+    def generate_text(self, prompt):
+        if prompt.startswith("TOPLU"):
+            self.batch_calls += 1
+            return self.batch_reply(prompt) if callable(self.batch_reply) else self.batch_reply
+        self.single_calls += 1
+        return self.single_reply
+
+
+class FakePersistence:
+    """llm_interactions tablosu yerine sözlük kullanan sahte PersistenceManager."""
+
+    def __init__(self):
+        self.rows = {}
+
+    def fetch_cached_llm_output(self, prompt_hash, ttl_seconds):
+        return self.rows.get(prompt_hash)
+
+    def save_llm_interaction(self, prompt_hash, raw_output, **kwargs):
+        self.rows[prompt_hash] = raw_output
+        return True
+
+
+def make_filter(llm_client, cache=None):
+    asset_filter_instance = asset_filter.LLMAssetFilter.__new__(asset_filter.LLMAssetFilter)
+    asset_filter_instance.llm_client = llm_client
+    asset_filter_instance.response_cache = cache or LLMResponseCache(FakePersistence(), enabled=True)
+    asset_filter_instance.prompt_template = SINGLE_PROMPT
+    asset_filter_instance.batch_prompt_template = BATCH_PROMPT
+    asset_filter_instance.max_batch_items = settings.ASSET_FILTER_BATCH_MAX_ITEMS
+    return asset_filter_instance
+
+
+def items(count):
+    return [{"id": n, "text": f"Haber {n} metni", "candidate_assets": ["AAPL", "MSFT"]} for n in range(1, count + 1)]
+
+
+def reply_for(prompt, news_ids=None):
+    """Prompt'taki (veya verilen) haberler için AAPL'yi etkilenen varlık olarak döndüren yanıt."""
+    if news_ids is None:
+        news_ids = [int(line.split("news_id=")[1]) for line in prompt.splitlines() if "news_id=" in line]
+    return json.dumps({"results": [
+        {"news_id": news_id, "affected_assets": [{"asset": "AAPL", "reason": "r", "impact": "positive"}]}
+        for news_id in news_ids
+    ]})
+
+
+@pytest.mark.parametrize("reply", ['{"results": []}', reply_for("", news_ids=[999, 1000])])
+def test_empty_or_unknown_reply_makes_bounded_calls(reply):
+    llm = FakeLLMClient(reply)
+    batch = items(8)
+
+    results = make_filter(llm).filter_assets_batch(batch)
+
+    assert set(results) == {item["id"] for item in batch}
+    # Bölme ağacı derinlikle sınırlı; sonrasında haberler tek tek analiz edilir
+    max_depth = settings.ASSET_FILTER_MAX_RETRY_DEPTH
+    assert llm.batch_calls <= 2 ** max_depth - 1
+    assert llm.single_calls == len(batch)
+
+
+def test_empty_reply_is_not_cached():
+    llm = FakeLLMClient('{"results": []}')
+    persistence = FakePersistence()
+
+    make_filter(llm, LLMResponseCache(persistence, enabled=True)).filter_assets_batch(items(4))
+
+    cached = [json.loads(row) for row in persistence.rows.values() if row.startswith("{")]
+    assert cached == []
+
+
+def test_partial_reply_retries_only_missing_items():
+    calls = []
+
+    def partial(prompt):
+        calls.append(prompt)
+        news_ids = [int(line.split("news_id=")[1]) for line in prompt.splitlines() if "news_id=" in line]
+        return reply_for(prompt, news_ids=news_ids[:2] if len(calls) == 1 else news_ids)
+
+    llm = FakeLLMClient(partial)
+    results = make_filter(llm).filter_assets_batch(items(4))
+
+    assert llm.batch_calls == 2
+    assert "news_id=1" not in calls[1] and "news_id=3" in calls[1]
+    assert all(results[n] == [{"asset": "AAPL", "reason": "r", "impact": "positive"}] for n in range(1, 5))
+
+
+def test_complete_reply_is_cached_and_reused():
+    llm = FakeLLMClient(reply_for)
+    cache = LLMResponseCache(FakePersistence(), enabled=True)
+
+    first = make_filter(llm, cache).filter_assets_batch(items(3))
+    second = make_filter(llm, cache).filter_assets_batch(items(3))
+
+    assert first == second
+    assert llm.batch_calls == 1
+    assert cache.stats() == {"hits": 1, "misses": 1}
@@ -0,0 +1,81 @@
+"""
+BatchedFeatureWriter testleri.
+
+PersistenceManager, kaydedilen batch'leri ve yazma zamanlarını tutan sahte bir nesneyle
+değiştirilir.
+"""
+
+import threading
+import time
+
+from src.db.feature_writer import BatchedFeatureWriter
+from src.db.persistence_manager import PROCESSING_FAILED, PROCESSING_SUCCESS
+
+
+class FakePersistence:
+    """İlk yazmayı first_write_delay kadar geciktiren sahte PersistenceManager."""
+
+    def __init__(self, first_write_delay=0.0, fail=False):
+        self.first_write_delay = first_write_delay
+        self.fail = fail
+        self.batches = []
+        self.written_at = {}
+        self._lock = threading.Lock()
+
+    def save_features_batch(self, rows):
+        with self._lock:
+            first = not self.batches
+            self.batches.append([item["id"] for item, _ in rows])
+        if first and self.first_write_delay:
+            time.sleep(self.first_write_delay)
+        if self.fail:
+            raise RuntimeError("veritabanı hatası")
+        now = time.monotonic()
+        for item, _ in rows:
+            self.written_at[item["id"]] = now
+        return {item["id"]: PROCESSING_SUCCESS for item, _ in rows}
+
+
+def test_writes_full_batches_and_rest_on_close():
+    persistence = FakePersistence()
+    with BatchedFeatureWriter(persistence, batch_size=2, flush_interval=60) as writer:
+        futures = [writer.submit({"id": n}, "v1") for n in range(5)]
+
+    assert [f.result(timeout=1) for f in futures] == [PROCESSING_SUCCESS] * 5
+    assert sorted(n for batch in persistence.batches for n in batch) == list(range(5))
+    assert all(len(batch) <= 2 for batch in persistence.batches)
+
+
+def test_partial_batch_is_written_after_flush_interval():
+    persistence = FakePersistence()
+    with BatchedFeatureWriter(persistence, batch_size=10, flush_interval=0.05) as writer:
+        future = writer.submit({"id": 1}, "v1")
+        assert future.result(timeout=1) == PROCESSING_SUCCESS
+
+
+def test_leftover_items_keep_their_enqueue_time():
+    flush_interval = 0.2
+    persistence = FakePersistence(first_write_delay=0.3)
+    writer = BatchedFeatureWriter(persistence, batch_size=2, flush_interval=flush_interval)
+    try:
+        writer.submit({"id": 1}, "v1")
+        writer.submit({"id": 2}, "v1")
+        time.sleep(0.02)  # İlk batch yazılırken üç öğe daha kuyruğa girer
+        enqueued_at = time.monotonic()
+        futures = [writer.submit({"id": n}, "v1") for n in (3, 4, 5)]
+
+        for future in futures:
+            future.result(timeout=2)
+    finally:
+        writer.close()
+
+    # 5 numaralı öğe, kısmi boşaltmadan sonra sayacın sıfırlanmasıyla yeniden
+    # flush_interval beklememeli; süresi ilk yazma biterken zaten dolmuştu
+    assert persistence.written_at[5] - enqueued_at < 0.3 + flush_interval / 2
+
+
+def test_failed_write_resolves_futures_as_failed():
+    with BatchedFeatureWriter(FakePersistence(fail=True), batch_size=2, flush_interval=60) as writer:
+        futures = [writer.submit({"id": n}, "v1") for n in range(2)]
+
+    assert [f.result(timeout=1) for f in futures] == [PROCESSING_FAILED] * 2
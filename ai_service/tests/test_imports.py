@@ -0,0 +1,41 @@
+"""
+Kural tabanlı modüller için içe aktarma testleri.
+
+news_fetcher, asset_mapper ve event_classifier, RuleStore'u ai_service kökündeki
+utils paketinden içe aktarır; yanlış bir import yolu servisi açılışta bozar.
+"""
+
+import importlib
+
+import pytest
+
+
+@pytest.mark.parametrize("module_name", [
+    "utils.rule_store",
+    "processing.asset_mapper",
+    "processing.event_classifier",
+    "data_ingestion.news_fetcher",
+])
+def test_module_imports(module_name):
+    module = importlib.import_module(module_name)
+    assert module is not None
+
+
+def test_news_fetcher_uses_shared_rule_store():
+    from data_ingestion import news_fetcher
+    from utils import rule_store
+
+    assert news_fetcher.RuleStore is rule_store.RuleStore
+    assert news_fetcher.get_rule_store is rule_store.get_rule_store
+
+
+def test_fetching_rules_compile_through_rule_store(tmp_path):
+    from data_ingestion.news_fetcher import compile_fetching_rules, DEFAULT_FETCHING_RULES
+    from utils.rule_store import RuleStore
+    import yaml
+
+    rules_path = tmp_path / "fetching_rules.yaml"
+    rules_path.write_text(yaml.safe_dump(DEFAULT_FETCHING_RULES), encoding="utf-8")
+
+    store = RuleStore(use_cache=False)
+    assert store.get(str(rules_path), compile_fetching_rules) == DEFAULT_FETCHING_RULES
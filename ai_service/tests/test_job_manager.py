@@ -0,0 +1,380 @@
+"""
+AnalysisJobManager ve analiz işi CRUD fonksiyonları için testler.
+
+PostgreSQL yerine geçici bir SQLite veritabanı kullanılır; tek aktif iş kısıtı
+(uq_analysis_jobs_active) V13 migration'ındaki kısmi benzersiz indeksle aynı şekilde oluşturulur.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+from src.db import crud
+from src.db.models import AnalysisJob
+from src.pipeline import job_manager as job_manager_module
+from src.pipeline.job_manager import AnalysisJobManager, raise_if_cancelled
+
+JOB_TYPE = "news_analysis"
+
+
+@compiles(JSONB, "sqlite")
+def _compile_jsonb_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    AnalysisJob.__table__.create(engine)
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE UNIQUE INDEX uq_analysis_jobs_active ON analysis_jobs (job_type) "
+            "WHERE status IN ('queued', 'running')"
+        ))
+    yield sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    engine.dispose()
+
+
+def make_manager(session_factory, **kwargs):
+    options = dict(owner="test-owner", heartbeat_seconds=0.02, stale_seconds=60,
+                   cancel_wait_seconds=0.2, finish_retries=3)
+    options.update(kwargs)
+    return AnalysisJobManager(session_factory=session_factory, job_type=JOB_TYPE, **options)
+
+
+def insert_job(session_factory, status=crud.JOB_RUNNING, owner="other-owner", heartbeat_age=0.0):
+    """Başka bir süreçte çalışan (veya çökmüş) bir iş kaydı ekler."""
+    db = session_factory()
+    try:
+        now = datetime.now(timezone.utc)
+        job, created = crud.create_job_if_idle(db, JOB_TYPE, owner)
+        assert created
+        job.status = status
+        job.heartbeat_at = now - timedelta(seconds=heartbeat_age)
+        job.created_at = job.heartbeat_at
+        db.commit()
+        return job.id
+    finally:
+        db.close()
+
+
+def load_job(session_factory, job_id):
+    db = session_factory()
+    try:
+        return job_manager_module.job_to_dict(crud.get_job(db, job_id))
+    finally:
+        db.close()
+
+
+class BlockingJob:
+    """Bir iş parçacığı adımında bekleyen, adım sonrasında iptal bayrağını kontrol eden sahte iş."""
+
+    def __init__(self, released=False):
+        self.step_started = threading.Event()
+        self.release_step = threading.Event()
+        if released:
+            self.release_step.set()
+        self.step_finished = threading.Event()
+        self.after_step_ran = False
+
+    def _step(self):
+        self.step_started.set()
+        self.release_step.wait(5)
+        self.step_finished.set()
+
+    async def __call__(self, cancel_event):
+        await asyncio.to_thread(self._step)
+        raise_if_cancelled(cancel_event)
+        self.after_step_ran = True
+        return {"prepared_news": 1}
+
+
+async def wait_for_status(manager, job_id, status, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = await manager.get(job_id)
+        if job["status"] == status:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"İş {status} durumuna geçmedi: {job}")
+
+
+class TestSingleFlight:
+
+    def test_duplicate_trigger_returns_active_job(self, session_factory):
+        async def scenario():
+            manager = make_manager(session_factory)
+            job = BlockingJob()
+
+            first, created = await manager.submit(job)
+            second, created_again = await manager.submit(job)
+
+            assert created and not created_again
+            assert second["job_id"] == first["job_id"]
+            assert second["status"] in crud.ACTIVE_JOB_STATUSES
+
+            job.release_step.set()
+            done = await wait_for_status(manager, first["job_id"], crud.JOB_DONE)
+            assert done["result_summary"] == {"prepared_news": 1}
+            assert done["finished_at"] is not None
+
+            third, created_third = await manager.submit(BlockingJob(released=True))
+            assert created_third and third["job_id"] != first["job_id"]
+            await wait_for_status(manager, third["job_id"], crud.JOB_DONE)
+
+        asyncio.run(scenario())
+
+    def test_failed_job_records_error(self, session_factory):
+        async def failing(cancel_event):
+            raise RuntimeError("Gruplama başarısız")
+
+        async def scenario():
+            manager = make_manager(session_factory)
+            job, _ = await manager.submit(failing)
+            failed = await wait_for_status(manager, job["job_id"], crud.JOB_FAILED)
+            assert failed["error_message"] == "Gruplama başarısız"
+
+        asyncio.run(scenario())
+
+    def test_job_owned_by_other_live_process_blocks_trigger(self, session_factory):
+        other_id = insert_job(session_factory, heartbeat_age=1)
+
+        async def scenario():
+            job, created = await make_manager(session_factory).submit(BlockingJob())
+            assert not created and job["job_id"] == other_id
+
+        asyncio.run(scenario())
+
+    def test_stale_job_does_not_block_trigger(self, session_factory):
+        stale_id = insert_job(session_factory, heartbeat_age=600)
+
+        async def scenario():
+            manager = make_manager(session_factory)
+            job = BlockingJob()
+            new_job, created = await manager.submit(job)
+            assert created and new_job["job_id"] != stale_id
+            job.release_step.set()
+            await wait_for_status(manager, new_job["job_id"], crud.JOB_DONE)
+
+        asyncio.run(scenario())
+        assert load_job(session_factory, stale_id)["status"] == crud.JOB_FAILED
+
+
+class TestCancel:
+
+    def test_cancel_waits_for_in_flight_step(self, session_factory):
+        async def scenario():
+            manager = make_manager(session_factory, cancel_wait_seconds=0.05)
+            job = BlockingJob()
+            submitted, _ = await manager.submit(job)
+            job_id = submitted["job_id"]
+            await asyncio.to_thread(job.step_started.wait, 2)
+
+            cancelled = await manager.cancel(job_id)
+
+            # Adım sürerken iş 'running' kalır ve single-flight kilidi serbest bırakılmaz
+            assert cancelled["status"] == crud.JOB_RUNNING
+            assert cancelled["cancel_requested_at"] is not None
+            duplicate, created = await manager.submit(BlockingJob())
+            assert not created and duplicate["job_id"] == job_id
+
+            job.release_step.set()
+            final = await wait_for_status(manager, job_id, crud.JOB_CANCELLED)
+            assert job.step_finished.is_set()
+            assert not job.after_step_ran
+            assert final["error_message"] == "İş iptal edildi"
+
+            next_job, created = await manager.submit(BlockingJob(released=True))
+            assert created
+            await wait_for_status(manager, next_job["job_id"], crud.JOB_DONE)
+
+        asyncio.run(scenario())
+
+    def test_cancel_returns_cancelled_when_step_stops_in_time(self, session_factory):
+        async def scenario():
+            manager = make_manager(session_factory, cancel_wait_seconds=2)
+            job = BlockingJob()
+            submitted, _ = await manager.submit(job)
+            await asyncio.to_thread(job.step_started.wait, 2)
+
+            asyncio.get_running_loop().call_later(0.05, job.release_step.set)
+            cancelled = await manager.cancel(submitted["job_id"])
+            assert cancelled["status"] == crud.JOB_CANCELLED
+
+        asyncio.run(scenario())
+
+    def test_cancel_finished_job_is_noop(self, session_factory):
+        async def scenario():
+            manager = make_manager(session_factory)
+            submitted, _ = await manager.submit(BlockingJob(released=True))
+            await wait_for_status(manager, submitted["job_id"], crud.JOB_DONE)
+
+            assert (await manager.cancel(submitted["job_id"]))["status"] == crud.JOB_DONE
+
+        asyncio.run(scenario())
+
+    def test_cancel_unknown_job(self, session_factory):
+        async def scenario():
+            manager = make_manager(session_factory)
+            assert await manager.cancel("not-a-uuid") is None
+            assert await manager.cancel("00000000-0000-0000-0000-000000000000") is None
+
+        asyncio.run(scenario())
+
+    def test_cancel_job_of_other_live_process_only_requests(self, session_factory):
+        other_id = insert_job(session_factory, heartbeat_age=1)
+
+        async def scenario():
+            job = await make_manager(session_factory).cancel(other_id)
+            assert job["status"] == crud.JOB_RUNNING
+            assert job["cancel_requested_at"] is not None
+
+        asyncio.run(scenario())
+
+    def test_cancel_stale_job_marks_cancelled(self, session_factory):
+        stale_id = insert_job(session_factory, heartbeat_age=600)
+
+        async def scenario():
+            job = await make_manager(session_factory).cancel(stale_id)
+            assert job["status"] == crud.JOB_CANCELLED
+
+        asyncio.run(scenario())
+
+    def test_cancel_request_from_other_process_stops_job(self, session_factory):
+        async def scenario():
+            owner = make_manager(session_factory, owner="owner-a")
+            other = make_manager(session_factory, owner="owner-b")
+            job = BlockingJob()
+            submitted, _ = await owner.submit(job)
+            job_id = submitted["job_id"]
+            await asyncio.to_thread(job.step_started.wait, 2)
+
+            requested = await other.cancel(job_id)
+            assert requested["status"] == crud.JOB_RUNNING
+
+            # Sahip süreç isteği heartbeat sırasında görür
+            await asyncio.sleep(0.1)
+            job.release_step.set()
+            await wait_for_status(owner, job_id, crud.JOB_CANCELLED)
+            assert not job.after_step_ran
+
+        asyncio.run(scenario())
+
+
+class TestRecoveryAndHeartbeat:
+
+    def test_recover_fails_only_stale_jobs(self, session_factory):
+        live_id = insert_job(session_factory, heartbeat_age=1)
+
+        async def recover():
+            return await make_manager(session_factory).recover()
+
+        # Başka bir canlı süreçte çalışan iş yeniden başlatmada etkilenmez
+        assert asyncio.run(recover()) == 0
+        assert load_job(session_factory, live_id)["status"] == crud.JOB_RUNNING
+
+        db = session_factory()
+        try:
+            job = crud.get_job(db, live_id)
+            job.heartbeat_at = datetime.now(timezone.utc) - timedelta(seconds=600)
+            db.commit()
+        finally:
+            db.close()
+
+        assert asyncio.run(recover()) == 1
+        recovered = load_job(session_factory, live_id)
+        assert recovered["status"] == crud.JOB_FAILED
+        assert "heartbeat" in recovered["error_message"]
+
+    def test_heartbeat_is_updated_while_running(self, session_factory):
+        async def scenario():
+            manager = make_manager(session_factory, heartbeat_seconds=0.02)
+            job = BlockingJob()
+            submitted, _ = await manager.submit(job)
+            await asyncio.to_thread(job.step_started.wait, 2)
+            first = (await manager.get(submitted["job_id"]))["heartbeat_at"]
+            await asyncio.sleep(0.1)
+            second = (await manager.get(submitted["job_id"]))["heartbeat_at"]
+            assert second > first
+            job.release_step.set()
+            await wait_for_status(manager, submitted["job_id"], crud.JOB_DONE)
+
+        asyncio.run(scenario())
+
+    def test_job_taken_over_as_stale_stops_and_keeps_failed_status(self, session_factory):
+        async def scenario():
+            manager = make_manager(session_factory)
+            job = BlockingJob()
+            submitted, _ = await manager.submit(job)
+            job_id = submitted["job_id"]
+            await asyncio.to_thread(job.step_started.wait, 2)
+
+            # Başka bir süreç işi zaman aşımına uğramış sayıp kapatır
+            db = session_factory()
+            try:
+                crud.fail_stale_jobs(db, JOB_TYPE, "zaman aşımı", datetime.now(timezone.utc) + timedelta(seconds=1))
+            finally:
+                db.close()
+
+            await asyncio.sleep(0.1)
+            job.release_step.set()
+            while job_id in manager._tasks:
+                await asyncio.sleep(0.01)
+
+            final = await manager.get(job_id)
+            assert final["status"] == crud.JOB_FAILED
+            assert not job.after_step_ran
+
+        asyncio.run(scenario())
+
+    def test_finish_status_is_retried(self, session_factory, monkeypatch):
+        real_update_job = crud.update_job
+        failures = {"count": 0}
+
+        def flaky_update_job(db, job_id, status, **kwargs):
+            if status == crud.JOB_DONE and failures["count"] < 2:
+                failures["count"] += 1
+                raise RuntimeError("bağlantı koptu")
+            return real_update_job(db, job_id, status, **kwargs)
+
+        monkeypatch.setattr(crud, "update_job", flaky_update_job)
+
+        async def scenario():
+            manager = make_manager(session_factory, heartbeat_seconds=0.01)
+            submitted, _ = await manager.submit(BlockingJob(released=True))
+            await wait_for_status(manager, submitted["job_id"], crud.JOB_DONE)
+
+        asyncio.run(scenario())
+        assert failures["count"] == 2
+
+    def test_unwritable_finish_expires_through_heartbeat(self, session_factory, monkeypatch):
+        real_update_job = crud.update_job
+
+        def broken_finish(db, job_id, status, **kwargs):
+            if status == crud.JOB_DONE:
+                raise RuntimeError("veritabanı erişilemiyor")
+            return real_update_job(db, job_id, status, **kwargs)
+
+        monkeypatch.setattr(crud, "update_job", broken_finish)
+
+        async def scenario():
+            manager = make_manager(session_factory, heartbeat_seconds=0.01, stale_seconds=0.2, finish_retries=2)
+            submitted, _ = await manager.submit(BlockingJob(released=True))
+            while submitted["job_id"] in manager._tasks:
+                await asyncio.sleep(0.01)
+            assert (await manager.get(submitted["job_id"]))["status"] == crud.JOB_RUNNING
+
+            # Heartbeat durduğu için kayıt zaman aşımına uğrar ve yeni tetiklemeyi engellemez
+            await asyncio.sleep(0.3)
+            _, created = await manager.submit(BlockingJob(released=True))
+            assert created
+            assert (await manager.get(submitted["job_id"]))["status"] == crud.JOB_FAILED
+
+        asyncio.run(scenario())
@@ -0,0 +1,264 @@
+"""
+LLMClient, CircuitBreaker ve RateLimiter testleri.
+
+Gemini modeli, generate_content / generate_content_async sağlayan basit bir sahte
+nesneyle değiştirilir; ağ çağrısı yapılmaz.
+"""
+
+import asyncio
+import time
+
+import pytest
+from google.api_core import exceptions as google_exceptions
+
+from src.core import llm_client as llm_client_module
+from src.core.llm_client import CircuitBreaker, CircuitOpenError, LLMClient, LLMClientError
+from src.core.rate_limiter import RateLimiter
+
+RESET_SECONDS = 0.05
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """Sırayla verilen sonuçları döndüren (veya hataları fırlatan) sahte Gemini modeli."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes) or ["ok"]
+        self.calls = 0
+
+    def _next(self):
+        self.calls += 1
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return FakeResponse(outcome)
+
+    def generate_content(self, prompt, request_options=None):
+        return self._next()
+
+    async def generate_content_async(self, prompt):
+        return self._next()
+
+
+class HangingModel(FakeModel):
+    """Asenkron çağrısı hiç tamamlanmayan sahte model (iptal senaryosu için)."""
+
+    def __init__(self):
+        super().__init__()
+        self.started = asyncio.Event()
+
+    async def generate_content_async(self, prompt):
+        self.calls += 1
+        self.started.set()
+        await asyncio.sleep(3600)
+
+
+def make_client(model=None, limiter=None, breaker=None, timeout=5.0, max_retries=0):
+    client = LLMClient(
+        model_name="test-model",
+        rate_limiter=limiter or RateLimiter(requests_per_minute=0, tokens_per_minute=0),
+        circuit_breaker=breaker or CircuitBreaker(failure_threshold=1, reset_timeout=RESET_SECONDS),
+        timeout=timeout,
+        max_retries=max_retries
+    )
+    client.model = model or FakeModel()
+    return client
+
+
+def open_breaker(breaker):
+    """Devreyi açar ve deneme çağrısına izin verilecek kadar bekler."""
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    assert breaker.is_open
+    time.sleep(RESET_SECONDS * 1.5)
+
+
+def paused_limiter():
+    limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=0)
+    limiter.pause(60)
+    return limiter
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(llm_client_module.settings, "LLM_RETRY_BASE_SECONDS", 0.001)
+    monkeypatch.setattr(llm_client_module.settings, "LLM_RETRY_MAX_SECONDS", 0.001)
+
+
+class TestCircuitBreaker:
+
+    def test_opens_after_threshold_and_rejects(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.is_open
+        assert not breaker.allow()
+
+    def test_half_open_allows_single_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=RESET_SECONDS)
+        open_breaker(breaker)
+        assert breaker.admit() is True
+        assert breaker.admit() is None
+
+    def test_release_probe_allows_next_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=RESET_SECONDS)
+        open_breaker(breaker)
+        assert breaker.admit() is True
+        breaker.release_probe()
+        assert breaker.is_open
+        assert breaker.admit() is True
+
+    def test_success_closes(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=RESET_SECONDS)
+        open_breaker(breaker)
+        assert breaker.admit() is True
+        breaker.record_success()
+        assert not breaker.is_open
+        assert breaker.admit() is False
+
+    def test_disabled_breaker_never_opens(self):
+        breaker = CircuitBreaker(failure_threshold=0, reset_timeout=60)
+        for _ in range(10):
+            breaker.record_failure()
+        assert breaker.allow()
+
+
+class TestRateLimiter:
+
+    def test_acquire_times_out_while_paused(self):
+        assert not paused_limiter().acquire(1, timeout=0.01)
+
+    def test_request_bucket_limits_burst(self):
+        limiter = RateLimiter(requests_per_minute=2, tokens_per_minute=0)
+        assert limiter.acquire(1, timeout=0.01)
+        assert limiter.acquire(1, timeout=0.01)
+        assert not limiter.acquire(1, timeout=0.01)
+
+    def test_large_token_request_is_capped(self):
+        limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=100)
+        assert limiter.acquire(10_000, timeout=0.01)
+
+    def test_acquire_async(self):
+        limiter = RateLimiter(requests_per_minute=1, tokens_per_minute=0)
+        assert asyncio.run(limiter.acquire_async(1, timeout=0.01))
+        assert not asyncio.run(limiter.acquire_async(1, timeout=0.01))
+
+
+class TestLLMClientProbe:
+
+    def test_probe_released_when_rate_limit_times_out(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=RESET_SECONDS)
+        open_breaker(breaker)
+
+        with pytest.raises(LLMClientError):
+            make_client(limiter=paused_limiter(), breaker=breaker, timeout=0.05).generate_content("p")
+
+        # Sağlıklı sınırlayıcı ve modelle sonraki çağrı deneme yapabilmeli ve devreyi kapatmalı
+        healthy = make_client(breaker=breaker)
+        assert healthy.generate_text("p") == "ok"
+        assert not breaker.is_open
+
+    def test_probe_released_when_deadline_expires(self, monkeypatch):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=RESET_SECONDS)
+        open_breaker(breaker)
+        client = make_client(breaker=breaker)
+
+        def expired(deadline):
+            raise LLMClientError("LLM çağrısı için süre sınırı doldu")
+
+        monkeypatch.setattr(client, "_remaining", expired)
+        with pytest.raises(LLMClientError):
+            client.generate_content("p")
+
+        assert make_client(breaker=breaker).generate_text("p") == "ok"
+
+    def test_probe_released_when_async_rate_limit_times_out(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=RESET_SECONDS)
+        open_breaker(breaker)
+
+        with pytest.raises(LLMClientError):
+            asyncio.run(make_client(limiter=paused_limiter(), breaker=breaker, timeout=0.05)
+                        .generate_content_async("p"))
+
+        assert asyncio.run(make_client(breaker=breaker).generate_text_async("p")) == "ok"
+        assert not breaker.is_open
+
+    def test_probe_released_when_async_call_cancelled(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=RESET_SECONDS)
+        open_breaker(breaker)
+        model = HangingModel()
+
+        async def cancel_probe():
+            task = asyncio.create_task(make_client(model=model, breaker=breaker).generate_content_async("p"))
+            await model.started.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_probe())
+        assert make_client(breaker=breaker).generate_text("p") == "ok"
+
+    def test_rejected_while_probe_in_flight(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=RESET_SECONDS)
+        open_breaker(breaker)
+        assert breaker.admit() is True
+
+        model = FakeModel()
+        with pytest.raises(CircuitOpenError):
+            make_client(model=model, breaker=breaker).generate_content("p")
+        assert model.calls == 0
+
+    def test_failed_probe_reopens_circuit(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        breaker.record_failure()
+        breaker._opened_at -= 61
+
+        with pytest.raises(LLMClientError):
+            make_client(model=FakeModel(google_exceptions.ServiceUnavailable("down")),
+                        breaker=breaker).generate_content("p")
+        assert breaker.is_open
+        with pytest.raises(CircuitOpenError):
+            make_client(breaker=breaker).generate_content("p")
+
+
+class TestLLMClientRetry:
+
+    def test_retries_transient_errors(self):
+        model = FakeModel(google_exceptions.ServiceUnavailable("down"), "ok")
+        breaker = CircuitBreaker(failure_threshold=5, reset_timeout=60)
+        client = make_client(model=model, breaker=breaker, max_retries=2)
+
+        assert client.generate_text("p") == "ok"
+        assert model.calls == 2
+        assert not breaker.is_open
+
+    def test_gives_up_after_max_retries(self):
+        model = FakeModel(google_exceptions.ServiceUnavailable("down"))
+        client = make_client(model=model, breaker=CircuitBreaker(5, 60), max_retries=2)
+
+        with pytest.raises(LLMClientError):
+            client.generate_content("p")
+        assert model.calls == 3
+
+    def test_permanent_error_is_not_retried(self):
+        model = FakeModel(google_exceptions.InvalidArgument("bad prompt"))
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+
+        with pytest.raises(google_exceptions.InvalidArgument):
+            make_client(model=model, breaker=breaker, max_retries=3).generate_content("p")
+        assert model.calls == 1
+        assert not breaker.is_open
+
+    def test_quota_error_pauses_shared_limiter(self):
+        limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=0)
+        error = google_exceptions.ResourceExhausted("quota, retry in 0.01s")
+        model = FakeModel(error, "ok")
+
+        client = make_client(model=model, limiter=limiter, breaker=CircuitBreaker(5, 60), max_retries=1)
+        assert client.generate_text("p") == "ok"
+        assert limiter._paused_until > 0
@@ -0,0 +1,90 @@
+"""
+merge_shard_groups testleri.
+
+Embedding servisi, her grup metnine önceden belirlenmiş bir vektör döndüren sahte
+bir servisle değiştirilir; model yüklenmez.
+"""
+
+import sys
+import types
+
+import numpy as np
+import pytest
+
+from src.processing.prompt_packer import merge_shard_groups
+
+NEWS_BY_ID = {}
+
+
+class FakeEmbeddingService:
+    """Grup etiketine göre sabit vektör döndüren sahte embedding servisi."""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.calls = 0
+
+    def encode(self, texts):
+        self.calls += 1
+        return np.array([self.vectors[text.split(".")[0]] for text in texts], dtype=float)
+
+
+@pytest.fixture
+def embeddings(monkeypatch):
+    """Sahte embedding servisini src.core.embedding_service yerine kaydeder."""
+    def install(vectors):
+        service = FakeEmbeddingService(vectors)
+        module = types.ModuleType("src.core.embedding_service")
+        module.get_embedding_service = lambda model_name=None: service
+        monkeypatch.setitem(sys.modules, "src.core.embedding_service", module)
+        return service
+    return install
+
+
+def group(label, news_ids, shard_index):
+    return {"group_label": label, "related_news_ids": news_ids, "shard_index": shard_index}
+
+
+def grouped_ids(groups):
+    return sorted(tuple(g["related_news_ids"]) for g in groups)
+
+
+def test_merges_similar_groups_from_different_shards(embeddings):
+    embeddings({"Fed faiz": [1, 0], "Fed faiz kararı": [1, 0.05], "Petrol": [0, 1]})
+    groups = [group("Fed faiz", ["a", "b"], 0), group("Petrol", ["c", "d"], 0),
+              group("Fed faiz kararı", ["e", "f"], 1)]
+
+    merged = merge_shard_groups(groups, NEWS_BY_ID, threshold=0.9)
+
+    assert grouped_ids(merged) == [("a", "b", "e", "f"), ("c", "d")]
+    assert all("shard_index" not in g for g in merged)
+
+
+def test_does_not_merge_groups_from_same_shard(embeddings):
+    embeddings({"Fed faiz": [1, 0], "Fed faiz kararı": [1, 0.05], "Petrol": [0, 1]})
+    groups = [group("Fed faiz", ["a", "b"], 0), group("Fed faiz kararı", ["c", "d"], 0),
+              group("Petrol", ["e", "f"], 1)]
+
+    merged = merge_shard_groups(groups, NEWS_BY_ID, threshold=0.9)
+
+    assert grouped_ids(merged) == [("a", "b"), ("c", "d"), ("e", "f")]
+
+
+def test_same_shard_groups_not_merged_transitively(embeddings):
+    # B (parça 1) hem A'ya hem C'ye benzer; A ve C aynı parçada olduğundan yalnızca biri B ile birleşir
+    embeddings({"A": [1, 0], "B": [1, 1], "C": [0.9, 1]})
+    groups = [group("A", ["a1", "a2"], 0), group("C", ["c1", "c2"], 0), group("B", ["b1", "b2"], 1)]
+
+    merged = merge_shard_groups(groups, NEWS_BY_ID, threshold=0.7)
+
+    assert grouped_ids(merged) == [("a1", "a2"), ("c1", "c2", "b1", "b2")]
+
+
+def test_single_shard_skips_embeddings(embeddings):
+    service = embeddings({})
+    groups = [group("Fed faiz", ["a", "b"], 0), group("Petrol", ["c", "d"], 0)]
+
+    merged = merge_shard_groups(groups, NEWS_BY_ID)
+
+    assert service.calls == 0
+    assert merged == [{"group_label": "Fed faiz", "related_news_ids": ["a", "b"]},
+                      {"group_label": "Petrol", "related_news_ids": ["c", "d"]}]
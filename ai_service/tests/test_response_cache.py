@@ -0,0 +1,92 @@
+"""
+LLMResponseCache testleri.
+
+PersistenceManager, psycopg2 ThreadedConnectionPool gibi havuz dolduğunda beklemek
+yerine hata fırlatan, bellekte çalışan sahte bir nesneyle değiştirilir.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.core.config import settings
+from src.llm import response_cache as response_cache_module
+from src.llm.response_cache import LLMResponseCache
+
+
+class PoolExhausted(Exception):
+    pass
+
+
+class FakePooledPersistence:
+    """En fazla max_conn eşzamanlı çağrıya izin veren sahte PersistenceManager."""
+
+    def __init__(self, max_conn, delay=0.01):
+        self.max_conn = max_conn
+        self.delay = delay
+        self.rows = {}
+        self.in_use = 0
+        self.peak = 0
+        self.exhausted = 0
+        self._lock = threading.Lock()
+
+    def _use(self, action):
+        with self._lock:
+            if self.in_use >= self.max_conn:
+                self.exhausted += 1
+                raise PoolExhausted("connection pool exhausted")
+            self.in_use += 1
+            self.peak = max(self.peak, self.in_use)
+        try:
+            time.sleep(self.delay)
+            return action()
+        finally:
+            with self._lock:
+                self.in_use -= 1
+
+    def fetch_cached_llm_output(self, prompt_hash, max_age_seconds):
+        return self._use(lambda: self.rows.get(prompt_hash))
+
+    def save_llm_interaction(self, prompt_hash, raw_output, **kwargs):
+        def save():
+            self.rows[prompt_hash] = raw_output
+            return True
+        return self._use(save)
+
+
+def lookup_concurrently(cache, threads=12):
+    def call(n):
+        return cache.get_or_generate("test", "v1", "model", f"prompt {n % 3}", generate=lambda: "yanıt")
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return list(executor.map(call, range(threads * 4)))
+
+
+def test_lookups_wait_for_free_connection():
+    persistence = FakePooledPersistence(max_conn=2)
+    cache = LLMResponseCache(persistence, enabled=True, max_connections=2)
+
+    assert lookup_concurrently(cache) == ["yanıt"] * 48
+    assert persistence.exhausted == 0
+    # Her prompt yalnızca ilk kez LLM'e gider (eşzamanlı ilk çağrılar hariç)
+    assert cache.stats()["hits"] > 0
+    assert len(persistence.rows) == 3
+
+
+def test_cache_pool_is_sized_for_concurrent_callers(monkeypatch):
+    created = {}
+
+    class RecordingPersistence(FakePooledPersistence):
+        def __init__(self, min_conn, max_conn):
+            created["max_conn"] = max_conn
+            super().__init__(max_conn)
+
+    monkeypatch.setattr(response_cache_module, "PersistenceManager", RecordingPersistence)
+    monkeypatch.setattr(response_cache_module, "_llm_response_cache", None)
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", True)
+
+    cache = response_cache_module.get_llm_response_cache()
+
+    assert created["max_conn"] == settings.CLUSTER_MAX_CONCURRENCY + settings.ASSET_FILTER_MAX_CONCURRENCY
+    lookup_concurrently(cache, threads=created["max_conn"] + 4)
+    assert cache.persistence_manager.exhausted == 0
@@ -0,0 +1,208 @@
+"""
+ResultSink testleri.
+
+Spring Boot, httpx.MockTransport ile taklit edilir; ağ çağrısı yapılmaz.
+"""
+
+import asyncio
+import gzip
+import json
+
+import httpx
+import pytest
+
+from src.processing import result_sender
+from src.processing.result_sender import ResultSink
+
+SUBMIT_URL = "http://backend.test/api/internal/submit-ai-results"
+
+
+class FakeBackend:
+    """Gelen istekleri kaydeden ve sırayla verilen durum kodlarını döndüren sahte Spring Boot."""
+
+    def __init__(self, *status_codes):
+        self.status_codes = list(status_codes) or [200]
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        status = self.status_codes.pop(0) if len(self.status_codes) > 1 else self.status_codes[0]
+        return httpx.Response(status, json={"success": status == 200})
+
+    def keys(self):
+        return [request.headers["Idempotency-Key"] for request in self.requests]
+
+    def batches(self):
+        batches = []
+        for request in self.requests:
+            body = request.content
+            if request.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            batches.append(json.loads(body))
+        return batches
+
+
+def story(n):
+    return {"story_title": f"Hikaye {n}", "main_categories": ["test"]}
+
+
+def run_sink(backend, scenario, **kwargs):
+    """Sahte backend'e bağlı bir ResultSink oluşturur ve senaryoyu çalıştırır."""
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(backend)) as client:
+            options = {"batch_size": 2, "flush_seconds": 0, "use_gzip": True, "max_retries": 2}
+            options.update(kwargs)
+            sink = ResultSink(SUBMIT_URL, client=client, **options)
+            result = await scenario(sink)
+            return sink, result
+
+    return asyncio.run(main())
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    async def no_sleep(seconds):
+        return None
+
+    monkeypatch.setattr(result_sender.asyncio, "sleep", no_sleep)
+
+
+def test_sends_full_batches_and_rest_on_close():
+    backend = FakeBackend()
+
+    async def scenario(sink):
+        for n in range(3):
+            await sink.add(story(n))
+        assert len(backend.requests) == 1
+        return await sink.close(["u1", "u2"])
+
+    sink, ok = run_sink(backend, scenario)
+
+    assert ok
+    batches = backend.batches()
+    assert [len(b["analyzed_stories"]) for b in batches] == [2, 1]
+    assert batches[0]["ungrouped_news_ids"] == []
+    assert batches[1]["ungrouped_news_ids"] == ["u1", "u2"]
+    assert sink.sent_stories == 3 and sink.sent_batches == 2
+
+
+def test_body_is_gzipped():
+    backend = FakeBackend()
+
+    async def scenario(sink):
+        await sink.add(story(1))
+        return await sink.close()
+
+    run_sink(backend, scenario, batch_size=5)
+
+    request = backend.requests[0]
+    assert request.headers["Content-Encoding"] == "gzip"
+    assert request.headers["Content-Type"] == "application/json"
+    assert json.loads(gzip.decompress(request.content))["analyzed_stories"] == [story(1)]
+
+
+def test_plain_body_without_gzip():
+    backend = FakeBackend()
+
+    async def scenario(sink):
+        await sink.add(story(1))
+        return await sink.close()
+
+    run_sink(backend, scenario, batch_size=5, use_gzip=False)
+
+    request = backend.requests[0]
+    assert "Content-Encoding" not in request.headers
+    assert json.loads(request.content)["analyzed_stories"] == [story(1)]
+
+
+@pytest.mark.parametrize("transient_status", [503, 409, 429])
+def test_retry_reuses_idempotency_key(transient_status):
+    backend = FakeBackend(transient_status, transient_status, 200)
+
+    async def scenario(sink):
+        await sink.add(story(1))
+        await sink.add(story(2))
+        return await sink.close()
+
+    sink, ok = run_sink(backend, scenario, batch_size=5)
+
+    assert ok
+    keys = backend.keys()
+    assert len(keys) == 3
+    assert len(set(keys)) == 1
+    assert keys[0] == f"{sink.run_id}-1"
+    assert sink.failed_batches == 0
+
+
+def test_connection_error_is_retried_with_same_key():
+    attempts = []
+
+    def flaky(request):
+        attempts.append(request.headers["Idempotency-Key"])
+        if len(attempts) == 1:
+            raise httpx.ConnectError("bağlantı reddedildi", request=request)
+        return httpx.Response(200, json={"success": True})
+
+    async def scenario(sink):
+        await sink.add(story(1))
+        return await sink.close()
+
+    _, ok = run_sink(flaky, scenario, batch_size=5)
+
+    assert ok
+    assert len(attempts) == 2 and attempts[0] == attempts[1]
+
+
+def test_keys_increment_per_batch():
+    backend = FakeBackend()
+
+    async def scenario(sink):
+        for n in range(4):
+            await sink.add(story(n))
+        return await sink.close([])
+
+    sink, _ = run_sink(backend, scenario)
+
+    assert backend.keys() == [f"{sink.run_id}-1", f"{sink.run_id}-2", f"{sink.run_id}-3"]
+
+
+def test_gives_up_after_max_retries():
+    backend = FakeBackend(503)
+
+    async def scenario(sink):
+        await sink.add(story(1))
+        return await sink.close()
+
+    sink, ok = run_sink(backend, scenario, batch_size=5, max_retries=2)
+
+    assert not ok
+    assert len(backend.requests) == 3
+    assert sink.failed_batches == 1
+
+
+def test_client_error_is_not_retried():
+    backend = FakeBackend(400)
+
+    async def scenario(sink):
+        await sink.add(story(1))
+        return await sink.close()
+
+    sink, ok = run_sink(backend, scenario, batch_size=5)
+
+    assert not ok
+    assert len(backend.requests) == 1
+
+
+def test_discard_drops_pending_stories():
+    backend = FakeBackend()
+
+    async def scenario(sink):
+        await sink.add(story(1))
+        sink.discard()
+        await sink.add(story(2))
+        return None
+
+    sink, _ = run_sink(backend, scenario, batch_size=5)
+
+    assert backend.requests == []
+    assert sink.sent_stories == 0
@@ -13,14 +13,14 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
-import google.generativeai as genai
 import numpy as np
-from tenacity import retry, stop_after_attempt, wait_exponential
 
 from src.core.config import settings
+from src.core.llm_client import LLMClient
 from src.core.paths import get_prompt_path
 from src.db.persistence_manager import PersistenceManager
 from src.llm.parser import LLMOutputParser
+from src.llm.response_cache import get_llm_response_cache
 
 # Logging yapılandırması
 logger = logging.getLogger(__name__)
@@ -64,9 +64,11 @@ class StoryTracker:
         # PersistenceManager'ı kaydet
         self.persistence_manager = persistence_manager
         
-        # API anahtarını ayarla ve Gemini modelini oluştur
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel(settings.GEMINI_MODEL_NAME)
+        # Paylaşılan hız sınırı, yeniden deneme ve devre kesici ile Gemini istemcisi
+        self.llm_client = LLMClient()
+        
+        # Paylaşılan LLM yanıt önbelleği
+        self.response_cache = get_llm_response_cache()
         
         # Süreklilik prompt şablonunu yükle
         continuity_prompt_path = get_prompt_path("continuity", "v1.0")
@@ -179,7 +181,6 @@ class StoryTracker:
             if conn:
                 self.persistence_manager.conn_pool.putconn(conn)
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def _check_story_continuity(self, new_story: Dict, candidate_stories: List[Dict]) -> Optional[ContinuityResponse]:
         """
         Yeni hikayenin aday geçmiş hikayelerden birinin devamı olup olmadığını kontrol eder.
@@ -216,9 +217,15 @@ Hikaye {i+1}:
                 candidate_stories=candidates_text
             )
             
-            # Gemini API'sine istek gönder
-            response = self.model.generate_content(filled_prompt)
-            response_text = response.text
+            # Gemini API'sine istek gönder (önbellekte yoksa)
+            response_text = self.response_cache.get_or_generate(
+                task_type="continuity",
+                prompt_version="v1.0",
+                model_name=settings.GEMINI_MODEL_NAME,
+                prompt=filled_prompt,
+                generate=lambda: self.llm_client.generate_text(filled_prompt),
+                validator=lambda text: LLMOutputParser.parse_model_response(text, ContinuityResponse) is not None
+            )
             
             # Yanıtı parse et
             validated_response = LLMOutputParser.parse_model_response(response_text, ContinuityResponse)
@@ -0,0 +1,253 @@
+"""
+Rule Store Module
+
+Bu modül, rules/ klasöründeki YAML kural dosyalarını derlenmiş eşleştirici nesnelerine
+dönüştüren ve süreç boyunca paylaşan RuleStore sınıfını içerir.
+
+- Derleme: Her kural dosyası, kayıt sırasında verilen derleyici fonksiyonla (ör.
+  compile_event_rules) bir kez derlenir; EventTypeClassifier, AssetMapper ve NewsFetcher
+  aynı derlenmiş nesneyi kullanır.
+- Önbellek: Derlenmiş nesne, dosya içeriğinin SHA-256 özeti ve derleyici adıyla
+  anahtarlanarak pickle olarak saklanır; dosya değişmediyse sonraki açılışlarda YAML
+  ayrıştırma ve derleme atlanır.
+- Sıcak yeniden yükleme: Dosyanın değişiklik zamanı/boyutu en fazla check_seconds
+  aralıklarla kontrol edilir. İçerik değiştiyse yeni sürüm kilit dışında derlenir ve tek bir
+  referans atamasıyla (atomik olarak) devreye alınır; servis yeniden başlatılmaz, spaCy ve
+  SentenceTransformer modelleri yeniden yüklenmez. Derleme başarısız olursa önceki sürüm
+  kullanılmaya devam eder.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import yaml
+
+# Logger yapılandırması
+logger = logging.getLogger(__name__)
+
+# Varsayılan önbellek dizini
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / ".rule_cache"
+
+# Dosya değişikliklerinin kontrol edilme aralığı (saniye)
+DEFAULT_CHECK_SECONDS = 5.0
+
+# Önbellek biçimi değiştiğinde artırılır (eski pickle dosyaları kullanılmaz)
+CACHE_FORMAT_VERSION = 1
+
+
+@dataclass
+class RuleVersion:
+    """Bir kural dosyasının derlenmiş sürümü."""
+    path: str
+    digest: str
+    compiled: Any
+    mtime_ns: int
+    size: int
+    loaded_at: float
+
+
+class RuleStore:
+    """
+    YAML kural dosyalarını derleyip önbelleğe alan ve değiştiklerinde yeniden yükleyen depo.
+
+    Kullanım:
+        store = get_rule_store()
+        compiled = store.get(rules_path, compile_event_rules)
+    """
+
+    def __init__(self,
+                 cache_dir: Optional[str] = None,
+                 check_seconds: Optional[float] = None,
+                 use_cache: bool = True):
+        """
+        RuleStore sınıfını başlatır.
+
+        Args:
+            cache_dir: Derlenmiş kuralların pickle önbelleği dizini. None ise ai_service/.rule_cache.
+            check_seconds: Dosya değişikliği kontrol aralığı. None ise DEFAULT_CHECK_SECONDS.
+            use_cache: Derlenmiş kurallar diskte önbelleğe alınsın mı
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.check_seconds = check_seconds if check_seconds is not None else DEFAULT_CHECK_SECONDS
+        self.use_cache = use_cache
+
+        self._versions: Dict[Tuple[str, str], RuleVersion] = {}
+        self._last_checked: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _compiler_name(compiler: Callable[[Any], Any]) -> str:
+        """Önbellek anahtarı için derleyicinin tam adını döndürür."""
+        return f"{compiler.__module__}.{compiler.__qualname__}"
+
+    def get(self, rules_path: str, compiler: Callable[[Any], Any]) -> Optional[Any]:
+        """
+        Kural dosyasının derlenmiş halini döndürür; dosya değiştiyse yeniden yükler.
+
+        Args:
+            rules_path: YAML kural dosyasının yolu
+            compiler: YAML verisini (dict) derlenmiş nesneye dönüştüren fonksiyon
+
+        Returns:
+            Optional[Any]: Derlenmiş kurallar veya dosya hiç yüklenemediyse None
+        """
+        key = (os.path.abspath(rules_path), self._compiler_name(compiler))
+        version = self._versions.get(key)
+
+        now = time.monotonic()
+        if version is not None and now - self._last_checked.get(key, 0.0) < self.check_seconds:
+            return version.compiled
+
+        self._last_checked[key] = now
+        try:
+            stat = os.stat(key[0])
+        except OSError as e:
+            if version is None:
+                logger.error(f"Kural dosyası bulunamadı: {key[0]} ({e})")
+                return None
+            logger.warning(f"Kural dosyasına erişilemedi, önceki sürüm kullanılıyor: {key[0]} ({e})")
+            return version.compiled
+
+        if version is not None and (stat.st_mtime_ns, stat.st_size) == (version.mtime_ns, version.size):
+            return version.compiled
+
+        new_version = self._load(key, compiler, stat, version)
+        return new_version.compiled if new_version is not None else None
+
+    def reload(self, rules_path: str, compiler: Callable[[Any], Any]) -> Optional[Any]:
+        """
+        Kontrol aralığını beklemeden kural dosyasını yeniden kontrol eder.
+
+        Args:
+            rules_path: YAML kural dosyasının yolu
+            compiler: Derleyici fonksiyon
+
+        Returns:
+            Optional[Any]: Güncel derlenmiş kurallar
+        """
+        self._last_checked.pop((os.path.abspath(rules_path), self._compiler_name(compiler)), None)
+        return self.get(rules_path, compiler)
+
+    def _load(self,
+              key: Tuple[str, str],
+              compiler: Callable[[Any], Any],
+              stat: os.stat_result,
+              previous: Optional[RuleVersion]) -> Optional[RuleVersion]:
+        """Dosyayı okuyup (önbellekten veya derleyerek) yeni sürümü devreye alır."""
+        path, compiler_name = key
+        try:
+            with open(path, "rb") as file:
+                raw = file.read()
+        except OSError as e:
+            logger.error(f"Kural dosyası okunamadı: {path} ({e})")
+            return previous
+
+        digest = hashlib.sha256(raw).hexdigest()
+        if previous is not None and previous.digest == digest:
+            # İçerik aynı (ör. yalnızca dosya zamanı değişti)
+            previous.mtime_ns, previous.size = stat.st_mtime_ns, stat.st_size
+            return previous
+
+        compiled = self._read_cache(compiler_name, digest)
+        if compiled is None:
+            try:
+                compiled = compiler(yaml.safe_load(raw.decode("utf-8")) or {})
+            except Exception as e:
+                if previous is not None:
+                    logger.error(f"Kural dosyası derlenemedi, önceki sürüm kullanılıyor: {path} ({e})")
+                else:
+                    logger.error(f"Kural dosyası derlenemedi: {path} ({e})")
+                return previous
+            self._write_cache(compiler_name, digest, compiled)
+
+        version = RuleVersion(
+            path=path,
+            digest=digest,
+            compiled=compiled,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            loaded_at=time.time()
+        )
+
+        # Yeni sürüm tek atamayla devreye alınır; okuyucular ya eski ya yeni nesneyi görür
+        with self._lock:
+            current = self._versions.get(key)
+            if current is not None and current.digest == digest:
+                return current
+            self._versions[key] = version
+
+        if previous is None:
+            logger.info(f"Kural dosyası yüklendi: {path} ({digest[:12]})")
+        else:
+            logger.info(f"Kural dosyası değişti, yeni sürüm devreye alındı: {path} "
+                        f"({previous.digest[:12]} -> {digest[:12]})")
+        return version
+
+    def _cache_path(self, compiler_name: str, digest: str) -> Path:
+        """Derlenmiş kurallar için önbellek dosyasının yolunu döndürür."""
+        name = hashlib.sha256(f"{CACHE_FORMAT_VERSION}:{compiler_name}:{digest}".encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{name[:32]}.pkl"
+
+    def _read_cache(self, compiler_name: str, digest: str) -> Optional[Any]:
+        """Önbellekteki derlenmiş kuralları okur; yoksa veya okunamazsa None döndürür."""
+        if not self.use_cache:
+            return None
+
+        cache_path = self._cache_path(compiler_name, digest)
+        if not cache_path.exists():
+            return None
+        try:
+            with open(cache_path, "rb") as file:
+                compiled = pickle.load(file)
+            logger.debug(f"Derlenmiş kurallar önbellekten yüklendi: {cache_path}")
+            return compiled
+        except Exception as e:
+            logger.warning(f"Kural önbelleği okunamadı, yeniden derlenecek: {cache_path} ({e})")
+            return None
+
+    def _write_cache(self, compiler_name: str, digest: str, compiled: Any) -> None:
+        """Derlenmiş kuralları geçici dosya + yeniden adlandırma ile atomik olarak önbelleğe yazar."""
+        if not self.use_cache:
+            return
+
+        cache_path = self._cache_path(compiler_name, digest)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    pickle.dump(compiled, file, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        except Exception as e:
+            logger.warning(f"Kural önbelleği yazılamadı: {cache_path} ({e})")
+
+
+# Süreç genelinde paylaşılan kural deposu
+_rule_store: Optional[RuleStore] = None
+_rule_store_lock = threading.Lock()
+
+
+def get_rule_store() -> RuleStore:
+    """
+    Paylaşılan RuleStore örneğini döndürür (ilk çağrıda oluşturulur).
+
+    Returns:
+        RuleStore: Paylaşılan kural deposu
+    """
+    global _rule_store
+    if _rule_store is None:
+        with _rule_store_lock:
+            if _rule_store is None:
+                _rule_store = RuleStore()
+    return _rule_store
@@ -0,0 +1,121 @@
+package com.example.summaryfinance.config;
+
+import jakarta.servlet.FilterChain;
+import jakarta.servlet.ReadListener;
+import jakarta.servlet.ServletException;
+import jakarta.servlet.ServletInputStream;
+import jakarta.servlet.http.HttpServletRequest;
+import jakarta.servlet.http.HttpServletRequestWrapper;
+import jakarta.servlet.http.HttpServletResponse;
+import org.springframework.http.HttpHeaders;
+import org.springframework.stereotype.Component;
+import org.springframework.web.filter.OncePerRequestFilter;
+
+import java.io.BufferedReader;
+import java.io.IOException;
+import java.io.InputStreamReader;
+import java.nio.charset.StandardCharsets;
+import java.util.Collections;
+import java.util.Enumeration;
+import java.util.zip.GZIPInputStream;
+
+/**
+ * "Content-Encoding: gzip" ile gönderilen istek gövdelerini açan filtre.
+ * Python AI servisi analiz sonuçlarını gzip ile sıkıştırılmış partiler halinde gönderir.
+ */
+@Component
+public class GzipRequestFilter extends OncePerRequestFilter {
+
+    private static final String GZIP = "gzip";
+
+    @Override
+    protected boolean shouldNotFilter(HttpServletRequest request) {
+        String encoding = request.getHeader(HttpHeaders.CONTENT_ENCODING);
+        return encoding == null || !encoding.toLowerCase().contains(GZIP);
+    }
+
+    @Override
+    protected void doFilterInternal(HttpServletRequest request, HttpServletResponse response, FilterChain filterChain)
+            throws ServletException, IOException {
+        filterChain.doFilter(new GzipRequestWrapper(request), response);
+    }
+
+    /**
+     * Gövdeyi GZIPInputStream üzerinden okuyan istek sarmalayıcısı.
+     * Content-Encoding ve Content-Length başlıkları açılmış gövdeyle uyumlu olacak şekilde gizlenir.
+     */
+    private static class GzipRequestWrapper extends HttpServletRequestWrapper {
+
+        private final GZIPInputStream gzipStream;
+
+        GzipRequestWrapper(HttpServletRequest request) throws IOException {
+            super(request);
+            this.gzipStream = new GZIPInputStream(request.getInputStream());
+        }
+
+        @Override
+        public ServletInputStream getInputStream() {
+            return new ServletInputStream() {
+                @Override
+                public int read() throws IOException {
+                    return gzipStream.read();
+                }
+
+                @Override
+                public int read(byte[] b, int off, int len) throws IOException {
+                    return gzipStream.read(b, off, len);
+                }
+
+                @Override
+                public boolean isFinished() {
+                    try {
+                        return gzipStream.available() == 0;
+                    } catch (IOException e) {
+                        return true;
+                    }
+                }
+
+                @Override
+                public boolean isReady() {
+                    return true;
+                }
+
+                @Override
+                public void setReadListener(ReadListener readListener) {
+                    throw new UnsupportedOperationException("Asenkron okuma desteklenmiyor");
+                }
+            };
+        }
+
+        @Override
+        public BufferedReader getReader() {
+            return new BufferedReader(new InputStreamReader(getInputStream(), StandardCharsets.UTF_8));
+        }
+
+        @Override
+        public int getContentLength() {
+            return -1;
+        }
+
+        @Override
+        public long getContentLengthLong() {
+            return -1L;
+        }
+
+        @Override
+        public String getHeader(String name) {
+            if (HttpHeaders.CONTENT_ENCODING.equalsIgnoreCase(name)) {
+                return null;
+            }
+            return super.getHeader(name);
+        }
+
+        @Override
+        public Enumeration<String> getHeaders(String name) {
+            if (HttpHeaders.CONTENT_ENCODING.equalsIgnoreCase(name)) {
+                return Collections.emptyEnumeration();
+            }
+            return super.getHeaders(name);
+        }
+    }
+}
@@ -1,12 +1,16 @@
 package com.example.summaryfinance.controller;
 
 import com.example.summaryfinance.dto.AiProcessingResultDTO;
+import com.example.summaryfinance.service.IdempotencyService;
 import com.example.summaryfinance.service.ProcessedAiResultsService;
 import lombok.RequiredArgsConstructor;
 import lombok.extern.slf4j.Slf4j;
+import org.springframework.dao.ConcurrencyFailureException;
+import org.springframework.http.HttpStatus;
 import org.springframework.http.ResponseEntity;
 import org.springframework.web.bind.annotation.PostMapping;
 import org.springframework.web.bind.annotation.RequestBody;
+import org.springframework.web.bind.annotation.RequestHeader;
 import org.springframework.web.bind.annotation.RequestMapping;
 import org.springframework.web.bind.annotation.RestController;
 
@@ -24,30 +28,37 @@ import java.util.Map;
 public class InternalApiController {
 
     private final ProcessedAiResultsService processedAiResultsService;
+    private final IdempotencyService idempotencyService;
     
     /**
      * Python AI servisinden gelen analiz edilmiş haber sonuçlarını kaydeder.
+     * Sonuçlar tek seferde veya küçük partiler halinde (Idempotency-Key ile) gönderilebilir.
      * 
      * @param resultDto AI servisi tarafından gönderilen işlenmiş veri
+     * @param idempotencyKey Partiye özgü anahtar; aynı anahtarla gelen tekrar istekler yeniden kaydedilmez,
+     *                       ilk isteğin yanıtını alır. İlk istek hâlâ sürüyorsa ikinci istek onu bekler,
+     *                       bekleme süresi dolarsa 409 döner.
      * @return Kayıt işleminin sonucu
      */
     @PostMapping("/submit-ai-results")
-    public ResponseEntity<Map<String, Object>> submitAiResults(@RequestBody AiProcessingResultDTO resultDto) {
-        log.info("AI işleme sonuçları alındı: {} özet, {} gruplanamayan haber", 
-                resultDto.getAnalyzedStories() != null ? resultDto.getAnalyzedStories().size() : 0,
-                resultDto.getUngroupedNewsIds() != null ? resultDto.getUngroupedNewsIds().size() : 0);
-        
+    public ResponseEntity<Map<String, Object>> submitAiResults(
+            @RequestBody AiProcessingResultDTO resultDto,
+            @RequestHeader(value = "Idempotency-Key", required = false) String idempotencyKey) {
         try {
-            int savedCount = processedAiResultsService.saveAiResults(resultDto);
-            
-            Map<String, Object> response = new HashMap<>();
-            response.put("success", true);
-            response.put("message", "AI işleme sonuçları başarıyla kaydedildi");
-            response.put("savedStoriesCount", savedCount);
-            response.put("ungroupedNewsCount", 
-                    resultDto.getUngroupedNewsIds() != null ? resultDto.getUngroupedNewsIds().size() : 0);
+            // Anahtar, partinin kaydıyla aynı transaction'da processed_batches tablosunda ayrılır
+            Map<String, Object> response = idempotencyKey != null
+                    ? idempotencyService.executeOnce(idempotencyKey, () -> saveResults(resultDto))
+                    : saveResults(resultDto);
             
             return ResponseEntity.ok(response);
+        } catch (ConcurrencyFailureException e) {
+            log.warn("Aynı parti hâlâ işleniyor, istek reddedildi (Idempotency-Key: {})", idempotencyKey);
+            
+            Map<String, Object> conflictResponse = new HashMap<>();
+            conflictResponse.put("success", false);
+            conflictResponse.put("message", "Aynı Idempotency-Key ile gönderilen parti hâlâ işleniyor");
+            
+            return ResponseEntity.status(HttpStatus.CONFLICT).body(conflictResponse);
         } catch (Exception e) {
             log.error("AI işleme sonuçları kaydedilirken bir hata oluştu", e);
             
@@ -58,4 +69,23 @@ public class InternalApiController {
             return ResponseEntity.badRequest().body(errorResponse);
         }
     }
+
+    /**
+     * Sonuçları kaydeder ve başarı yanıtını oluşturur.
+     */
+    private Map<String, Object> saveResults(AiProcessingResultDTO resultDto) {
+        log.info("AI işleme sonuçları alındı: {} özet, {} gruplanamayan haber", 
+                resultDto.getAnalyzedStories() != null ? resultDto.getAnalyzedStories().size() : 0,
+                resultDto.getUngroupedNewsIds() != null ? resultDto.getUngroupedNewsIds().size() : 0);
+        
+        int savedCount = processedAiResultsService.saveAiResults(resultDto);
+        
+        Map<String, Object> response = new HashMap<>();
+        response.put("success", true);
+        response.put("message", "AI işleme sonuçları başarıyla kaydedildi");
+        response.put("savedStoriesCount", savedCount);
+        response.put("ungroupedNewsCount", 
+                resultDto.getUngroupedNewsIds() != null ? resultDto.getUngroupedNewsIds().size() : 0);
+        return response;
+    }
 }
@@ -26,8 +26,8 @@ public class AiProcessingLog {
     @Column(name = "status", nullable = false, length = 255)
     private String status = "PENDING";
     
-    @Column(name = "last_attempt_at")
-    private ZonedDateTime lastAttemptAt;
+    @Column(name = "last_attempt_at", nullable = false)
+    private ZonedDateTime lastAttemptAt = ZonedDateTime.now();
     
     @Column(name = "attempt_count", nullable = false)
     private Integer attemptCount = 0;
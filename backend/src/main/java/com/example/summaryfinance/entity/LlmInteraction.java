@@ -10,7 +10,8 @@ import java.time.ZonedDateTime;
 
 @Entity
 @Table(name = "llm_interactions", indexes = {
-        @Index(name = "idx_llm_interactions_task_type", columnList = "task_type")
+        @Index(name = "idx_llm_interactions_task_type", columnList = "task_type"),
+        @Index(name = "idx_llm_interactions_prompt_hash", columnList = "prompt_hash, request_timestamp")
 })
 @Getter
 @Setter
@@ -33,6 +34,9 @@ public class LlmInteraction {
     @Column(name = "model_version", length = 255)
     private String modelVersion;
     
+    @Column(name = "prompt_hash", length = 64)
+    private String promptHash;
+    
     @Column(name = "input_prompt", columnDefinition = "TEXT")
     private String inputPrompt;
     
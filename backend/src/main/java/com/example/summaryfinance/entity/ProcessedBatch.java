@@ -0,0 +1,32 @@
+package com.example.summaryfinance.entity;
+
+import jakarta.persistence.*;
+import lombok.Getter;
+import lombok.NoArgsConstructor;
+import lombok.Setter;
+import org.hibernate.annotations.JdbcTypeCode;
+import org.hibernate.type.SqlTypes;
+import java.time.ZonedDateTime;
+
+/**
+ * AI servisinden gelen ve işlenmiş bir sonuç partisinin Idempotency-Key kaydı.
+ * Tablo Flyway migration'ı (V16) ile oluşturulur.
+ */
+@Entity
+@Table(name = "processed_batches")
+@Getter
+@Setter
+@NoArgsConstructor
+public class ProcessedBatch {
+
+    @Id
+    @Column(name = "idempotency_key", length = 255)
+    private String idempotencyKey;
+
+    @Column(name = "response", columnDefinition = "jsonb")
+    @JdbcTypeCode(SqlTypes.JSON)
+    private String response;
+
+    @Column(name = "created_at", nullable = false)
+    private ZonedDateTime createdAt;
+}
@@ -0,0 +1,43 @@
+package com.example.summaryfinance.repository;
+
+import com.example.summaryfinance.entity.ProcessedBatch;
+import org.springframework.data.jpa.repository.JpaRepository;
+import org.springframework.data.jpa.repository.Modifying;
+import org.springframework.data.jpa.repository.Query;
+import org.springframework.data.repository.query.Param;
+import org.springframework.stereotype.Repository;
+
+import java.time.ZonedDateTime;
+
+@Repository
+public interface ProcessedBatchRepository extends JpaRepository<ProcessedBatch, String> {
+
+    /**
+     * Idempotency-Key'i ayırır. Aynı anahtar başka bir işlemde henüz kaydedilmemişse PostgreSQL
+     * o işlem bitene kadar bekletir; ilk işlem kaydedildiyse 0, geri alındıysa 1 döner.
+     *
+     * @param idempotencyKey Parti anahtarı
+     * @return Anahtar bu işlemde ayrıldıysa 1, daha önce işlenmişse 0
+     */
+    @Modifying
+    @Query(value = "INSERT INTO processed_batches (idempotency_key, created_at) VALUES (:key, NOW()) " +
+            "ON CONFLICT (idempotency_key) DO NOTHING", nativeQuery = true)
+    int reserve(@Param("key") String idempotencyKey);
+
+    /**
+     * Ayrılmış anahtara ilk isteğe verilen yanıtı yazar.
+     */
+    @Modifying
+    @Query(value = "UPDATE processed_batches SET response = CAST(:response AS jsonb) WHERE idempotency_key = :key",
+            nativeQuery = true)
+    int saveResponse(@Param("key") String idempotencyKey, @Param("response") String response);
+
+    /**
+     * Verilen zamandan eski anahtar kayıtlarını siler.
+     *
+     * @return Silinen kayıt sayısı
+     */
+    @Modifying
+    @Query("DELETE FROM ProcessedBatch p WHERE p.createdAt < :before")
+    int deleteCreatedBefore(@Param("before") ZonedDateTime before);
+}
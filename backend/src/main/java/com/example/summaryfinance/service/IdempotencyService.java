@@ -0,0 +1,100 @@
+package com.example.summaryfinance.service;
+
+import com.example.summaryfinance.repository.ProcessedBatchRepository;
+import com.fasterxml.jackson.core.JsonProcessingException;
+import com.fasterxml.jackson.core.type.TypeReference;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import lombok.RequiredArgsConstructor;
+import lombok.extern.slf4j.Slf4j;
+import org.springframework.scheduling.annotation.Scheduled;
+import org.springframework.stereotype.Service;
+import org.springframework.transaction.annotation.Transactional;
+
+import jakarta.persistence.EntityManager;
+import java.time.ZonedDateTime;
+import java.util.HashMap;
+import java.util.Map;
+import java.util.function.Supplier;
+
+/**
+ * Idempotency-Key ile gelen isteklerin yalnızca bir kez işlenmesini sağlayan servis.
+ * Anahtar processed_batches tablosunda, işin kendisiyle aynı veritabanı işleminde (transaction) ayrılır;
+ * böylece kayıt ya anahtarla birlikte kalıcı olur ya da ikisi birlikte geri alınır.
+ */
+@Service
+@RequiredArgsConstructor
+@Slf4j
+public class IdempotencyService {
+
+    /** Aynı anahtarla eşzamanlı gelen isteğin, ilk isteğin bitmesini bekleyeceği en uzun süre */
+    private static final String LOCK_TIMEOUT = "30s";
+
+    /** Anahtarların saklanacağı gün sayısı (AI servisinin yeniden deneme süresinden çok daha uzun) */
+    private static final int RETENTION_DAYS = 7;
+
+    private final ProcessedBatchRepository processedBatchRepository;
+    private final EntityManager entityManager;
+    private final ObjectMapper objectMapper;
+
+    /**
+     * İşlemi anahtar başına bir kez çalıştırır.
+     * Anahtar daha önce işlenmişse işlem çalıştırılmaz ve ilk isteğe verilen yanıt döner.
+     * Aynı anahtarla eşzamanlı gelen ikinci istek, ilk istek tamamlanana kadar veritabanında bekler;
+     * ilk istek kaydedilirse onun yanıtını alır, geri alınırsa işlemi kendisi çalıştırır.
+     *
+     * @param idempotencyKey İsteğe özgü anahtar
+     * @param action Anahtar ilk kez görüldüğünde çalıştırılacak işlem; aynı transaction'a katılmalıdır
+     * @return İşlemin (veya ilk isteğin) yanıtı
+     * @throws org.springframework.dao.ConcurrencyFailureException İlk istek bekleme süresi içinde bitmezse
+     */
+    @Transactional
+    public Map<String, Object> executeOnce(String idempotencyKey, Supplier<Map<String, Object>> action) {
+        // Eşzamanlı aynı anahtarın sonsuza kadar beklemesini önle (yalnızca bu transaction için geçerli)
+        entityManager.createNativeQuery("SELECT set_config('lock_timeout', :timeout, true)")
+                .setParameter("timeout", LOCK_TIMEOUT)
+                .getSingleResult();
+
+        if (processedBatchRepository.reserve(idempotencyKey) == 0) {
+            log.info("Parti daha önce işlenmiş, tekrar kaydedilmiyor (Idempotency-Key: {})", idempotencyKey);
+            return processedBatchRepository.findById(idempotencyKey)
+                    .map(batch -> readResponse(batch.getResponse()))
+                    .orElseGet(HashMap::new);
+        }
+
+        Map<String, Object> response = action.get();
+        processedBatchRepository.saveResponse(idempotencyKey, writeResponse(response));
+        return response;
+    }
+
+    /**
+     * Saklama süresini geçen anahtar kayıtlarını her gece siler.
+     */
+    @Scheduled(cron = "0 30 3 * * *")
+    @Transactional
+    public void deleteExpiredKeys() {
+        int deleted = processedBatchRepository.deleteCreatedBefore(ZonedDateTime.now().minusDays(RETENTION_DAYS));
+        if (deleted > 0) {
+            log.info("{} eski Idempotency-Key kaydı silindi", deleted);
+        }
+    }
+
+    private String writeResponse(Map<String, Object> response) {
+        try {
+            return objectMapper.writeValueAsString(response);
+        } catch (JsonProcessingException e) {
+            throw new IllegalStateException("Yanıt JSON'a dönüştürülemedi", e);
+        }
+    }
+
+    private Map<String, Object> readResponse(String json) {
+        if (json == null) {
+            return new HashMap<>();
+        }
+        try {
+            return objectMapper.readValue(json, new TypeReference<Map<String, Object>>() {});
+        } catch (JsonProcessingException e) {
+            log.warn("Kayıtlı yanıt okunamadı: {}", e.getMessage());
+            return new HashMap<>();
+        }
+    }
+}
@@ -0,0 +1,14 @@
+-- İşlenmiş haberlerin zaman penceresine göre çekilmesi için indeksler
+-- (PersistenceManager.iter_processed_news / fetch_newly_processed_news)
+
+-- Pencere sorgusu: WHERE publication_date >= ? ORDER BY publication_date DESC, id DESC
+-- Yalnızca embedding vektörü olan haberleri kapsayan kısmi indeks
+CREATE INDEX idx_news_publication_date_id_embedded
+    ON news (publication_date DESC, id DESC)
+    WHERE embedding_vector IS NOT NULL;
+
+-- Durum filtresiyle birlikte haber ID'sine göre birleştirme
+CREATE INDEX idx_ai_processing_log_status_news_id ON ai_processing_log (status, news_id);
+
+-- Artımlı graf hesaplaması: son watermark'tan sonra işlenen haberler
+CREATE INDEX idx_ai_processing_log_status_last_attempt ON ai_processing_log (status, last_attempt_at, news_id);
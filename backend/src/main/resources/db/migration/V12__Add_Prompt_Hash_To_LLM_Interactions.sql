@@ -0,0 +1,8 @@
+-- llm_interactions tablosunu LLM yanıt önbelleği olarak kullanmak için prompt_hash sütunu ekle
+-- prompt_hash: sha256(task_type, prompt_version, model_version, doldurulmuş prompt) hex özeti
+ALTER TABLE llm_interactions ADD COLUMN prompt_hash CHAR(64);
+
+-- Önbellek sorgusu: WHERE prompt_hash = ? AND request_timestamp >= ? ORDER BY request_timestamp DESC LIMIT 1
+CREATE INDEX idx_llm_interactions_prompt_hash ON llm_interactions (prompt_hash, request_timestamp DESC);
+
+COMMENT ON COLUMN llm_interactions.prompt_hash IS 'LLM yanıt önbelleği anahtarı (görev türü, prompt sürümü, model ve prompt metninin sha256 özeti)';
@@ -0,0 +1,22 @@
+-- /trigger-analysis çalıştırmalarını kalıcı iş kaydı olarak takip etmek için analysis_jobs tablosu
+-- Spring Boot zamanlayıcısı iş durumunu GET /jobs/{id} ile sorgular
+CREATE TABLE analysis_jobs (
+    id UUID PRIMARY KEY,
+    job_type VARCHAR(50) NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE,
+    result_summary JSONB,
+    error_message TEXT,
+
+    CONSTRAINT check_analysis_job_status CHECK (status IN ('queued', 'running', 'done', 'failed', 'cancelled'))
+);
+
+-- Single-flight: aynı türden aynı anda yalnızca bir aktif (queued/running) iş olabilir
+CREATE UNIQUE INDEX uq_analysis_jobs_active ON analysis_jobs (job_type) WHERE status IN ('queued', 'running');
+CREATE INDEX idx_analysis_jobs_created_at ON analysis_jobs (created_at DESC);
+
+COMMENT ON TABLE analysis_jobs IS 'AI servisindeki analiz işlerinin durumu ve zamanlamaları';
+COMMENT ON COLUMN analysis_jobs.status IS 'queued, running, done, failed veya cancelled';
+COMMENT ON COLUMN analysis_jobs.result_summary IS 'Tamamlanan işin özet sayıları (hazırlanan haber, analiz edilen hikaye vb.)';
@@ -0,0 +1,7 @@
+-- Ekonomik olay adında anahtar kelime araması için trigram indeksi
+-- (PersistenceManager.find_economic_events_by_date_range_and_keywords / find_economic_events_for_lookups)
+
+-- event_name ILIKE '%kelime%' koşulları tablo taraması yerine bu indeksi kullanır
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX idx_economic_events_name_trgm ON economic_events USING GIN (event_name gin_trgm_ops);
@@ -0,0 +1,15 @@
+-- Analiz işlerine sahip süreç ve heartbeat bilgisi
+-- Servis yeniden başlatıldığında yalnızca heartbeat'i zaman aşımına uğramış işler 'failed' olarak
+-- işaretlenir; başka bir canlı süreçte (worker/replica) çalışan iş etkilenmez
+ALTER TABLE analysis_jobs ADD COLUMN owner VARCHAR(255);
+ALTER TABLE analysis_jobs ADD COLUMN heartbeat_at TIMESTAMP WITH TIME ZONE;
+ALTER TABLE analysis_jobs ADD COLUMN cancel_requested_at TIMESTAMP WITH TIME ZONE;
+
+-- Var olan aktif işlerin heartbeat'i oluşturulma zamanından başlar
+UPDATE analysis_jobs SET heartbeat_at = COALESCE(started_at, created_at) WHERE status IN ('queued', 'running');
+
+CREATE INDEX idx_analysis_jobs_active_heartbeat ON analysis_jobs (job_type, heartbeat_at) WHERE status IN ('queued', 'running');
+
+COMMENT ON COLUMN analysis_jobs.owner IS 'İşi çalıştıran süreç (hostname:pid:örnek)';
+COMMENT ON COLUMN analysis_jobs.heartbeat_at IS 'Sahip sürecin işi en son canlı olarak bildirdiği zaman';
+COMMENT ON COLUMN analysis_jobs.cancel_requested_at IS 'İptal isteği zamanı; sahip süreç bir sonraki aşama sınırında işi durdurur';
@@ -0,0 +1,13 @@
+-- AI servisinden gelen sonuç partilerinin Idempotency-Key kayıtları
+-- Anahtar, partinin kaydıyla aynı işlemde eklenir; yeniden denenen veya eşzamanlı gelen aynı parti
+-- ikinci kez kaydedilmez. Kayıtlar veritabanında tutulduğu için yeniden başlatmada ve birden fazla
+-- backend örneğinde de geçerlidir.
+CREATE TABLE processed_batches (
+    idempotency_key VARCHAR(255) PRIMARY KEY,
+    response JSONB,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX idx_processed_batches_created_at ON processed_batches (created_at);
+
+COMMENT ON TABLE processed_batches IS 'İşlenmiş AI sonuç partileri (Idempotency-Key) ve ilk isteğe verilen yanıt';
@@ -0,0 +1,14 @@
+-- Artımlı graf hesaplaması (PersistenceManager.fetch_newly_processed_news) watermark olarak
+-- doğrudan last_attempt_at sütununu kullanır; (status, last_attempt_at, news_id) indeksinin
+-- (V11) sıralama ve aralık taraması için kullanılabilmesi sütunun boş olmamasını gerektirir.
+
+-- İşlenme zamanı olmayan eski kayıtlara haberin çekilme zamanını yaz
+UPDATE ai_processing_log l
+SET last_attempt_at = n.fetched_at
+FROM news n
+WHERE l.news_id = n.id
+  AND l.last_attempt_at IS NULL;
+
+ALTER TABLE ai_processing_log
+    ALTER COLUMN last_attempt_at SET DEFAULT NOW(),
+    ALTER COLUMN last_attempt_at SET NOT NULL;